@@ -58,21 +58,26 @@ static
 Constant
     Descriptor for read-only instance-level constant values.
 
+ContextStack, submit_in_context
+    Context-local activation of opt-in helpers, and pool submission that
+    carries it to worker threads.
+
 ----------------------------------------------------------------------
 Filesystem and path utilities
 ----------------------------------------------------------------------
 
 Path helpers:
-    to_path, normpath, with_suffix, path_depth
+    to_path, normpath, with_suffix, path_depth, PathCache
 
 Filesystem checks:
     check_folder, ensure_folder, check_file
 
 File operations:
-    copytree, create_backup, make_temp_dir
+    copytree, CopyResult, create_backup, BackupStore, make_temp_dir
 
 Traversal:
-    apply_to_files, ApplyResult, find_file
+    walk_files, apply_to_files, iter_apply_to_files, ApplyResult, find_file,
+    FileLocator
 
 Introspection:
     get_this_filename
@@ -82,8 +87,10 @@ Binary detection:
 
 Text file IO:
     detect_file_encoding
+    configure_encoding_cache, clear_encoding_cache
+    read_text_with_info, TextFileInfo
     get_file_content
-    set_file_content
+    set_file_content, same_file_content, rewrite_file_content
 
 ----------------------------------------------------------------------
 Text utilities
@@ -152,6 +159,8 @@ from .core import (
     handle_exception,
     static,
     Constant,
+    ContextStack,
+    submit_in_context,
     check_len,
 )
 
@@ -164,20 +173,32 @@ from .fs import (
     normpath,
     with_suffix,
     path_depth,
+    PathCache,
     check_folder,
     ensure_folder,
     check_file,
     copytree,
+    CopyResult,
     create_backup,
+    BackupStore,
     make_temp_dir,
+    walk_files,
     apply_to_files,
+    iter_apply_to_files,
     ApplyResult,
     find_file,
+    FileLocator,
     get_this_filename,
     is_binary_file,
     detect_file_encoding,
+    configure_encoding_cache,
+    clear_encoding_cache,
+    TextFileInfo,
+    read_text_with_info,
     get_file_content,
     set_file_content,
+    same_file_content,
+    rewrite_file_content,
 )
 
 # ---------------------------------------------------------------------
@@ -221,6 +242,8 @@ __all__ = [
     "handle_exception",
     "static",
     "Constant",
+    "ContextStack",
+    "submit_in_context",
     "check_len",
 
     # Filesystem / path
@@ -228,20 +251,32 @@ __all__ = [
     "normpath",
     "with_suffix",
     "path_depth",
+    "PathCache",
     "check_folder",
     "ensure_folder",
     "check_file",
     "copytree",
+    "CopyResult",
     "create_backup",
+    "BackupStore",
     "make_temp_dir",
+    "walk_files",
     "apply_to_files",
+    "iter_apply_to_files",
     "ApplyResult",
     "find_file",
+    "FileLocator",
     "get_this_filename",
     "is_binary_file",
     "detect_file_encoding",
+    "configure_encoding_cache",
+    "clear_encoding_cache",
+    "TextFileInfo",
+    "read_text_with_info",
     "get_file_content",
     "set_file_content",
+    "same_file_content",
+    "rewrite_file_content",
 
     # Text
     "convert_for_stdout",
@@ -14,6 +14,9 @@ This module contains:
 - A **runtime error enrichment decorator** (``handle_exception``)
 - A **constant descriptor** (``Constant``)
 - A small decorator to emulate **function static attributes** (``static``)
+- A **context-local activation stack** (``ContextStack``) for opt-in helpers
+  entered with ``with``, and ``submit_in_context`` to hand the current
+  context to pool workers
 
 It intentionally avoids any filesystem or text/markdown specific logic. Those
 concerns live in sibling modules (e.g. ``pymdtools.common.fs`` and
@@ -84,6 +87,8 @@ Emulate static variables in a function:
 from __future__ import annotations
 
 import functools
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextvars import ContextVar, Token, copy_context
 from os import PathLike
 from pathlib import Path
 from typing import (
@@ -264,6 +269,95 @@ def static(**attributes: Any) -> Callable[[F], F]:
 # -----------------------------------------------------------------------------
 
 
+# =============================================================================
+# Context helpers
+# =============================================================================
+
+
+# -----------------------------------------------------------------------------
+class ContextStack(Generic[T]):
+    """
+    Context-local stack of the active instances of an opt-in helper.
+
+    Helpers such as :class:`~pymdtools.common.PathCache` push themselves on
+    enter and pop themselves on exit. The active instance is stored in a
+    :class:`contextvars.ContextVar`, so it is seen by the code running in
+    the context that entered it, including pool tasks submitted with
+    :func:`submit_in_context`, but never by unrelated threads. Exits must
+    mirror entries: popping an instance that is not the innermost active
+    one raises ``RuntimeError`` and leaves the stack unchanged.
+
+    Example:
+        _active: ContextStack[MyCache] = ContextStack("my_cache")
+
+        class MyCache:
+            def __enter__(self) -> MyCache:
+                _active.push(self)
+                return self
+
+            def __exit__(self, *exc_info: object) -> None:
+                _active.pop(self)
+    """
+
+    def __init__(self, name: str) -> None:
+        self._active: ContextVar[Optional[T]] = ContextVar(name, default=None)
+        self._tokens: ContextVar[tuple[Token[Optional[T]], ...]] = ContextVar(
+            f"{name}_tokens", default=()
+        )
+
+    def get(self) -> Optional[T]:
+        """Return the innermost active instance, or None."""
+        return self._active.get()
+
+    def push(self, value: T) -> None:
+        """Make ``value`` the active instance of the current context."""
+        token = self._active.set(value)
+        self._tokens.set(self._tokens.get() + (token,))
+
+    def pop(self, value: T) -> None:
+        """
+        Restore the instance that was active before ``value`` was pushed.
+
+        Raises:
+            RuntimeError: If ``value`` is not the innermost instance pushed
+                in the current context.
+        """
+        tokens = self._tokens.get()
+        if not tokens or self._active.get() is not value:
+            raise RuntimeError(
+                f"{type(value).__name__} exited out of order or in another context"
+            )
+        self._tokens.set(tokens[:-1])
+        self._active.reset(tokens[-1])
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def submit_in_context(
+    pool: Executor, fn: Callable[..., R], /, *args: Any, **kwargs: Any
+) -> Future[R]:
+    """
+    Submit ``fn(*args, **kwargs)`` to ``pool``, in a copy of the current context.
+
+    Thread pool workers then see the helpers active in the caller (see
+    :class:`ContextStack`). Process pools cannot share them and receive the
+    call unchanged.
+
+    Args:
+        pool: Executor receiving the call.
+        fn: Callable to run.
+        *args: Positional arguments for ``fn``.
+        **kwargs: Keyword arguments for ``fn``.
+
+    Returns:
+        The future of the call.
+    """
+    if isinstance(pool, ThreadPoolExecutor):
+        return pool.submit(copy_context().run, fn, *args, **kwargs)
+    return pool.submit(fn, *args, **kwargs)
+# -----------------------------------------------------------------------------
+
+
 # =============================================================================
 # Validation helpers
 # =============================================================================
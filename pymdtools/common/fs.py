@@ -23,6 +23,7 @@ Included here:
     - ``normpath``: normalized absolute path
     - ``with_suffix``: safe suffix replacement
     - ``path_depth``: count path components
+    - ``PathCache``: opt-in per-batch memo of ``resolve()`` and ``stat()``
 
 - Filesystem checks and creation:
     - ``check_folder``: assert a directory exists
@@ -30,25 +31,36 @@ Included here:
     - ``check_file``: assert a file exists
 
 - Directory tree copy:
-    - ``copytree``: incremental directory tree copy
+    - ``copytree``: incremental, optionally parallel directory tree copy
+    - ``CopyResult``: summary of a ``copytree`` run
     - ``_copy_file_if_needed``: internal helper for copy decisions
 
 - Backup and binary detection:
     - ``create_backup``: create a ``.bak`` copy (or configurable suffix)
+    - ``BackupStore``: content-addressed, deduplicating backup backend
     - ``is_binary_file``: heuristic binary check
 
 - Text encoding detection and file I/O:
-    - ``detect_file_encoding``: BOM + chardet-based detection (optional dependency)
+    - ``detect_file_encoding``: BOM + UTF-8 + chardet-based detection (optional dependency)
+    - ``configure_encoding_cache`` / ``clear_encoding_cache``: opt-in LRU cache
+      of detected encodings
+    - ``read_text_with_info``: read a text file once, with encoding and size
     - ``get_file_content``: read text file
-    - ``set_file_content``: write text file
+    - ``set_file_content``: write text file, optionally only when it changes
+    - ``same_file_content``: compare text with a file's bytes before writing
+    - ``rewrite_file_content``: back up and rewrite a file in place, optionally
+      only when it changes
 
 - Temporary directories:
     - ``make_temp_dir``: create and return a temp directory
 
 - Traversal / search helpers:
     - ``ApplyResult``: summary dataclass
+    - ``walk_files``: ``os.scandir`` tree walk with directory pruning
     - ``apply_to_files``: traverse a file or directory and apply a function
+    - ``iter_apply_to_files``: streaming variant yielding each file's outcome
     - ``find_file``: search file from multiple anchors, with upward walk
+    - ``FileLocator``: memoized ``find_file`` over cached folder listings
     - ``get_this_filename``: return the filename of the current module
 
 Dependencies
@@ -68,19 +80,62 @@ re-exported by ``pymdtools.common`` (the package façade).
 from __future__ import annotations
 
 import codecs
+import errno
+import hashlib
+import logging
 import os
 import stat
 import sys
 import shutil
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    wait,
+)
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from fnmatch import fnmatchcase
+from functools import lru_cache
 from pathlib import Path, PureWindowsPath
-from typing import Callable, Iterable, Optional, Sequence, Set
-
-from .core import PathInput, T
+from typing import (
+    Callable,
+    Final,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    cast,
+    overload,
+)
+
+from .core import ContextStack, PathInput, T, submit_in_context
 from .datetime_utils import today_utc
 
+if sys.platform.startswith("linux"):
+    import fcntl
+
+    def _reflink(source_fd: int, destination_fd: int) -> bool:
+        """Clone a whole file with the ``FICLONE`` ioctl; False if refused."""
+        try:
+            fcntl.ioctl(destination_fd, 0x40049409, source_fd)  # FICLONE, linux/fs.h
+        except OSError:
+            return False
+        return True
+else:  # pragma: no cover - platform specific
+    def _reflink(source_fd: int, destination_fd: int) -> bool:
+        """Reflinks are only attempted on Linux."""
+        del source_fd, destination_fd
+        return False
+
 
 # =============================================================================
 # Filesystem & Path utilities
@@ -162,7 +217,11 @@ def to_path(
         path = path.expanduser()
 
     if resolve:
-        path = path.resolve(strict=strict)
+        cache = _path_caches.get()
+        if cache is None:
+            path = path.resolve(strict=strict)
+        else:
+            path = cache.resolve(path, strict=strict)
 
     return path
 # -----------------------------------------------------------------------------
@@ -203,6 +262,169 @@ def _require_str(value: object, *, name: str) -> str:
     return value
 # -----------------------------------------------------------------------------
 
+# -----------------------------------------------------------------------------
+# errno values for which Path.exists() and Path.is_file() answer False.
+_MISSING_ERRNOS: Final[frozenset[int]] = frozenset(
+    {errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP}
+)
+
+_path_caches: ContextStack[PathCache] = ContextStack("pymdtools_path_cache")
+
+
+class PathCache:
+    """
+    Opt-in memo of ``resolve()`` and ``stat()`` results for a batch.
+
+    While a cache is active (inside its ``with`` block), ``to_path`` with
+    ``resolve=True``, ``normpath``, ``check_file``, ``check_folder`` and
+    ``ensure_folder`` reuse the resolved form and the file type of paths
+    they have already seen, so validating the same file several times in
+    one operation costs one ``realpath`` and one ``stat``.
+
+    Only existing paths are remembered: files and folders created during
+    the batch are seen on the next check, but removals and symbolic links
+    changed during the batch are not. Call :meth:`invalidate` after such
+    changes. The cache is active in the context that entered it and in the
+    pool workers this package starts from there; other threads do not see
+    it. Caches nest, and must be left in the reverse order of entry.
+
+    Examples
+    --------
+    >>> with PathCache() as cache:
+    ...     for name in ("a.md", "a.md"):
+    ...         check_file(name, ".md")
+    >>> cache.hits  # resolve() and stat() calls saved
+    4
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._resolved: dict[tuple[str, bool], Path] = {}
+        self._modes: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def __enter__(self) -> PathCache:
+        _path_caches.push(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        _path_caches.pop(self)
+
+    @property
+    def hits(self) -> int:
+        """Number of ``resolve()`` / ``stat()`` calls answered from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of ``resolve()`` / ``stat()`` calls made on the filesystem."""
+        return self._misses
+
+    def resolve(self, path: Path, *, strict: bool = False) -> Path:
+        """
+        Return ``path.resolve(strict=strict)``, memoized.
+
+        Relative paths are keyed with the current working directory.
+        """
+        key = (_path_cache_key(path), strict)
+        with self._lock:
+            resolved = self._resolved.get(key)
+            if resolved is not None:
+                self._hits += 1
+                return resolved
+            self._misses += 1
+        resolved = path.resolve(strict=strict)
+        with self._lock:
+            self._resolved[key] = resolved
+        return resolved
+
+    def mode(self, path: Path) -> Optional[int]:
+        """
+        Return the ``st_mode`` of ``path`` (links followed), or ``None`` if missing.
+
+        Raises
+        ------
+        OSError
+            For errors other than a missing path, like ``Path.exists()``.
+        """
+        key = _path_cache_key(path)
+        with self._lock:
+            mode = self._modes.get(key)
+            if mode is not None:
+                self._hits += 1
+                return mode
+            self._misses += 1
+        try:
+            mode = path.stat().st_mode
+        except OSError as exc:
+            if exc.errno in _MISSING_ERRNOS:
+                return None
+            raise
+        except ValueError:
+            return None
+        with self._lock:
+            self._modes[key] = mode
+        return mode
+
+    def invalidate(self, path: Optional[PathInput] = None) -> None:
+        """
+        Forget cached results.
+
+        Parameters
+        ----------
+        path : str | os.PathLike[str] | Path | None, default=None
+            Path whose entries are dropped (resolved forms and file type).
+            ``None`` drops everything.
+        """
+        with self._lock:
+            if path is None:
+                self._resolved.clear()
+                self._modes.clear()
+                return
+            key = _path_cache_key(_p(path))
+            self._modes.pop(key, None)
+            for strict in (False, True):
+                self._resolved.pop((key, strict), None)
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _path_cache_key(path: Path) -> str:
+    """Return a key for ``path`` that does not depend on the working directory."""
+    return str(path) if path.is_absolute() else os.path.join(os.getcwd(), path)
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _exists(p: Path) -> bool:
+    """``p.exists()``, answered by the active ``PathCache`` when there is one."""
+    cache = _path_caches.get()
+    return p.exists() if cache is None else cache.mode(p) is not None
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _is_dir(p: Path) -> bool:
+    """``p.is_dir()``, answered by the active ``PathCache`` when there is one."""
+    cache = _path_caches.get()
+    if cache is None:
+        return p.is_dir()
+    mode = cache.mode(p)
+    return mode is not None and stat.S_ISDIR(mode)
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _is_file(p: Path) -> bool:
+    """``p.is_file()``, answered by the active ``PathCache`` when there is one."""
+    cache = _path_caches.get()
+    if cache is None:
+        return p.is_file()
+    mode = cache.mode(p)
+    return mode is not None and stat.S_ISREG(mode)
+# -----------------------------------------------------------------------------
+
 # -----------------------------------------------------------------------------
 def normpath(path: PathInput) -> Path:
     """
@@ -254,10 +476,10 @@ def check_folder(path: PathInput) -> Path:
     """
     p = normpath(path)
 
-    if not p.exists():
+    if not _exists(p):
         raise FileNotFoundError(f"Folder does not exist: {p}")
 
-    if not p.is_dir():
+    if not _is_dir(p):
         raise NotADirectoryError(f"Not a folder: {p}")
 
     return p
@@ -291,8 +513,8 @@ def ensure_folder(path: PathInput) -> Path:
     """
     p = normpath(path)
 
-    if p.exists():
-        if not p.is_dir():
+    if _exists(p):
+        if not _is_dir(p):
             raise NotADirectoryError(f"Path exists but is not a directory: {p}")
         return p
 
@@ -338,10 +560,10 @@ def check_file(
     """
     p = normpath(path)
 
-    if not p.exists():
+    if not _exists(p):
         raise FileNotFoundError(f"File does not exist: {p}")
 
-    if not p.is_file():
+    if not _is_file(p):
         raise IsADirectoryError(f"Not a regular file: {p}")
 
     if expected_ext is not None:
@@ -432,13 +654,51 @@ def path_depth(path: PathInput) -> int:
 
 
 # -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class CopyResult:
+    """Summary of a :func:`copytree` run."""
+    destination: Path
+    copied: int
+    skipped: int
+    bytes_copied: int
+
+
+@overload
+def copytree(
+    src: PathInput,
+    dst: PathInput,
+    *,
+    symlinks: bool = ...,
+    ignore: Optional[Callable[[str, list[str]], Iterable[str]]] = ...,
+    compare: Literal["mtime", "hash"] = ...,
+    max_workers: int | None = ...,
+    summary: Literal[False] = ...,
+) -> Path: ...
+
+
+@overload
+def copytree(
+    src: PathInput,
+    dst: PathInput,
+    *,
+    symlinks: bool = ...,
+    ignore: Optional[Callable[[str, list[str]], Iterable[str]]] = ...,
+    compare: Literal["mtime", "hash"] = ...,
+    max_workers: int | None = ...,
+    summary: Literal[True],
+) -> CopyResult: ...
+
+
 def copytree(
     src: PathInput,
     dst: PathInput,
     *,
     symlinks: bool = False,
     ignore: Optional[Callable[[str, list[str]], Iterable[str]]] = None,
-) -> Path:
+    compare: Literal["mtime", "hash"] = "mtime",
+    max_workers: int | None = None,
+    summary: bool = False,
+) -> Path | CopyResult:
     """
     Copy a directory tree from *src* to *dst* (incremental, dirs_exist_ok=True).
 
@@ -446,7 +706,8 @@ def copytree(
     - Recursively copies files
     - Supports an ``ignore`` callable compatible with shutil.copytree
     - Optionally preserves symlinks when ``symlinks=True``
-    - Copies a file only if destination missing, sizes differ, or source is newer
+    - Copies a file only if destination missing, sizes differ, or source is
+      newer (``compare="mtime"``) or its content differs (``compare="hash"``)
 
     Parameters
     ----------
@@ -460,11 +721,20 @@ def copytree(
     ignore : callable | None, default=None
         Callable with signature ``ignore(dirpath, names) -> iterable`` returning
         the names to ignore in *dirpath* (same contract as shutil.copytree).
+    compare : {"mtime", "hash"}, default="mtime"
+        How an existing destination file of the same size is judged stale.
+        ``"hash"`` compares SHA-256 digests and ignores timestamps, for trees
+        whose mtimes are meaningless (fresh CI checkouts, extracted archives).
+    max_workers : int | None, default=None
+        If greater than 1, copy files in a thread pool of that size. The tree
+        itself is still walked and validated in the calling thread.
+    summary : bool, default=False
+        If True, return a :class:`CopyResult` instead of the destination path.
 
     Returns
     -------
-    Path
-        Destination directory path.
+    Path | CopyResult
+        Destination directory path, or the copy summary when ``summary=True``.
 
     Raises
     ------
@@ -473,14 +743,26 @@ def copytree(
     NotADirectoryError
         If *src* is not a directory.
     ValueError
-        If *dst* is *src*, is contained in *src*, or a followed directory
-        symlink introduces a traversal cycle.
+        If *dst* is *src*, is contained in *src*, a followed directory
+        symlink introduces a traversal cycle, or an option is invalid.
     FileExistsError
         If source and destination entries have incompatible types, or copying
         a symbolic link would replace an existing entry.
     OSError
         For underlying filesystem errors.
+
+    Notes
+    -----
+    File data is copied as a reflink (Linux ``FICLONE``) or with
+    ``os.copy_file_range`` when the filesystem allows it, so the bytes never
+    pass through user space; otherwise :func:`shutil.copy2` is used. Metadata
+    is copied as with ``copy2`` in every case.
     """
+    if compare not in ("mtime", "hash"):
+        raise ValueError(f"compare must be 'mtime' or 'hash', got: {compare!r}")
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be >= 1, got: {max_workers}")
+
     src_p = _p(src)
     dst_p = _p(dst)
 
@@ -520,6 +802,23 @@ def copytree(
         path.mkdir(parents=True, exist_ok=True)
 
     active_directories: Set[tuple[int, int, Path]] = set()
+    pool = (
+        ThreadPoolExecutor(max_workers=max_workers)
+        if max_workers is not None and max_workers > 1
+        else None
+    )
+    pending: list[Future[int | None]] = []
+    outcomes: list[int | None] = []
+
+    def _copy_file(source: Path, destination: Path) -> None:
+        if pool is None:
+            outcomes.append(_copy_file_if_needed(source, destination, compare))
+        else:
+            pending.append(
+                submit_in_context(
+                    pool, _copy_file_if_needed, source, destination, compare
+                )
+            )
 
     def _copy_directory(source_dir: Path, destination_dir: Path) -> None:
         source_resolved = _validate_destination(source_dir, destination_dir)
@@ -558,24 +857,42 @@ def copytree(
                             source.readlink(),
                             target_is_directory=target_is_directory,
                         )
+                        outcomes.append(0)
                     elif source.is_dir():
                         _copy_directory(source, destination)
                     else:
-                        _copy_file_if_needed(source, destination)
+                        _copy_file(source, destination)
                     continue
 
                 if source.is_dir():
                     _copy_directory(source, destination)
                 else:
-                    _copy_file_if_needed(source, destination)
+                    _copy_file(source, destination)
         finally:
             active_directories.remove(identity)
 
-    _copy_directory(src_p, dst_p)
-
-    return dst_p
+    try:
+        _copy_directory(src_p, dst_p)
+        # Surface the first failure in walk order, as a serial copy would.
+        outcomes.extend(future.result() for future in pending)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    if not summary:
+        return dst_p
+    copied = [size for size in outcomes if size is not None]
+    return CopyResult(
+        destination=dst_p,
+        copied=len(copied),
+        skipped=len(outcomes) - len(copied),
+        bytes_copied=sum(copied),
+    )
 
-def _copy_file_if_needed(source: PathInput, destination: PathInput) -> Path:
+def _copy_file_if_needed(
+    source: PathInput, destination: PathInput, compare: str = "mtime"
+) -> int | None:
+    """Copy one file when stale; return the bytes copied, None if skipped."""
     src = _p(source)
     dst = _p(destination)
 
@@ -586,17 +903,62 @@ def _copy_file_if_needed(source: PathInput, destination: PathInput) -> Path:
             f"Cannot copy a file over a directory or symbolic link: {dst}"
         )
 
-    if not dst.exists():
-        shutil.copy2(src, dst)
-        return dst
+    if dst.exists():
+        s = src.stat()
+        d = dst.stat()
+        if s.st_size == d.st_size and (
+            _file_digest(src) == _file_digest(dst)
+            if compare == "hash"
+            else s.st_mtime <= d.st_mtime
+        ):
+            return None
+
+    return _copy_file_data(src, dst)
+
+
+def _copy_file_data(source: Path, destination: Path) -> int:
+    """
+    Copy ``source`` to ``destination`` with its metadata, like ``copy2``.
+
+    A reflink is tried first, then ``os.copy_file_range``; both keep the data
+    in the kernel. When neither applies, :func:`shutil.copy2` does the copy.
+    Returns the number of bytes copied.
+    """
+    with open(source, "rb") as fsrc, open(destination, "wb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = _reflink(fsrc.fileno(), fdst.fileno()) or _copy_range(
+            fsrc.fileno(), fdst.fileno(), size
+        )
+    if not copied:
+        shutil.copy2(source, destination)
+        return destination.stat().st_size
+    shutil.copystat(source, destination)
+    return size
+
 
-    s = src.stat()
-    d = dst.stat()
+_COPY_RANGE_UNSUPPORTED: Final = frozenset(
+    {errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL, errno.EPERM}
+)
 
-    if s.st_size != d.st_size or s.st_mtime > d.st_mtime:
-        shutil.copy2(src, dst)
 
-    return dst
+def _copy_range(source_fd: int, destination_fd: int, size: int) -> bool:
+    """Copy ``size`` bytes with ``os.copy_file_range``; False if unsupported."""
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None:  # pragma: no cover - platform specific
+        return False
+    offset = 0
+    while offset < size:
+        try:
+            sent = copy_file_range(source_fd, destination_fd, size - offset)
+        except OSError as exc:
+            # Nothing written yet: let the caller fall back to a plain copy.
+            if offset == 0 and exc.errno in _COPY_RANGE_UNSUPPORTED:
+                return False
+            raise
+        if sent == 0:
+            break
+        offset += sent
+    return True
 # -----------------------------------------------------------------------------
 
 
@@ -607,6 +969,7 @@ def create_backup(
     ext: str = ".bak",
     max_tries: int = 100,
     date_prefix: str | None = None,
+    store: BackupStore | None = None,
 ) -> Path:
     """
     Create a backup copy of a file next to it.
@@ -617,6 +980,12 @@ def create_backup(
     Example:
         report.md -> report.md.2026-02-27-1.bak
 
+    Names are reserved with an exclusive create, so parallel workers backing
+    up the same file never overwrite each other's copy.
+
+    When a :class:`BackupStore` is given, or is active (``with store:``), the
+    backup goes to that store instead; ``date_prefix`` is then unused.
+
     Parameters
     ----------
     file_path : str | os.PathLike[str] | Path
@@ -628,11 +997,15 @@ def create_backup(
     date_prefix : str | None, default=None
         Optional override for the date prefix (format not enforced).
         If None, uses today_utc() from your module.
+    store : BackupStore | None, default=None
+        Content-addressed store to back up into. If None, the active store
+        is used, if any.
 
     Returns
     -------
     Path
-        Path to the created backup file.
+        Path to the created backup file. With a store, the latest snapshot
+        of the file, which is not a new one when the content is unchanged.
 
     Raises
     ------
@@ -656,6 +1029,11 @@ def create_backup(
     if not ext.startswith("."):
         ext = f".{ext}"
 
+    if store is None:
+        store = _backup_stores.get()
+    if store is not None:
+        return store.backup(src, ext=ext, max_tries=max_tries)
+
     # Date prefix: keep your existing convention
     prefix = date_prefix if date_prefix is not None else today_utc()  # e.g. "2026-02-27"
 
@@ -666,9 +1044,14 @@ def create_backup(
 
     for i in range(1, max_tries + 1):
         backup = folder / f"{base}.{prefix}-{i:03d}{ext}"
-        if not backup.exists():
+        if not _reserve(backup):
+            continue
+        try:
             shutil.copy2(src, backup)
-            return backup
+        except BaseException:
+            backup.unlink(missing_ok=True)
+            raise
+        return backup
 
     raise FileExistsError(
         f"Unable to find available backup filename for {src} after {max_tries} tries "
@@ -677,6 +1060,298 @@ def create_backup(
 # -----------------------------------------------------------------------------
 
 
+# -----------------------------------------------------------------------------
+def _reserve(path: Path) -> bool:
+    """Create the empty file ``path`` exclusively; return False if it exists."""
+    try:
+        with open(path, "xb"):
+            pass
+    except FileExistsError:
+        return False
+    return True
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _clone_file(source: Path, destination: Path) -> None:
+    """
+    Copy ``source`` over the existing file ``destination``.
+
+    On Linux the copy is first attempted as a reflink (``FICLONE``), which
+    shares the data blocks copy-on-write on Btrfs, XFS and similar
+    filesystems; elsewhere, or when the filesystem refuses, the data is
+    copied.
+    """
+    with open(source, "rb") as fsrc, open(destination, "r+b") as fdst:
+        if _reflink(fsrc.fileno(), fdst.fileno()):
+            return
+    shutil.copyfile(source, destination)
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+BACKUP_STORE_DIRNAME: Final[str] = ".pymdtools-backups"
+
+# Snapshot names: <UTC stamp>-<NNN>.<sha256><ext>; stamps sort chronologically.
+_SNAPSHOT_STAMP_FORMAT: Final[str] = "%Y%m%dT%H%M%S%fZ"
+
+_backup_stores: ContextStack[BackupStore] = ContextStack("pymdtools_backup_store")
+
+
+class BackupStore:
+    """
+    Content-addressed, deduplicating backend for :func:`create_backup`.
+
+    Each backup is a *snapshot* of one source file::
+
+        <store>/objects/<ab>/<sha256>                    one blob per content
+        <store>/snapshots/<name>-<path hash>/<stamp>-<NNN>.<sha256><ext>
+
+    A snapshot is a hard link to its blob, so identical contents are stored
+    once, whatever the file they come from. The blob itself is a reflink of
+    the source where the filesystem allows it, and a copy otherwise; when
+    hard links are not available, the snapshot is a reflink or copy of its
+    blob. A backup is skipped when the content equals the latest snapshot of
+    the same file: the unchanged case costs one read and no write.
+
+    After each new snapshot the retention policy is applied to the snapshots
+    of that file: only the ``keep`` most recent ones, and only those younger
+    than ``max_age``, are kept. The latest snapshot is never removed. Blobs
+    are deleted with their last snapshot.
+
+    Snapshot names are reserved with exclusive creates, so threads and
+    processes can share a store. Within its ``with`` block, a store receives
+    the :func:`create_backup` calls of the entering context only; stores
+    entered one inside another must be left in reverse order.
+
+    Parameters
+    ----------
+    root : str | os.PathLike[str] | Path | None, default=None
+        Store directory, created on first use. If None, each file is backed
+        up into ``.pymdtools-backups`` next to it.
+    keep : int | None, default=None
+        Maximum number of snapshots kept per file.
+    max_age : datetime.timedelta | None, default=None
+        Maximum age of the snapshots kept per file.
+
+    Raises
+    ------
+    ValueError
+        If ``keep`` is lower than 1 or ``max_age`` is negative.
+
+    Examples
+    --------
+    >>> with BackupStore("docs/.pymdtools-backups", keep=5):
+    ...     md_file_beautifier("docs/page.md")
+    """
+
+    def __init__(
+        self,
+        root: PathInput | None = None,
+        *,
+        keep: int | None = None,
+        max_age: timedelta | None = None,
+    ) -> None:
+        if keep is not None and keep < 1:
+            raise ValueError(f"keep must be >= 1, got: {keep}")
+        if max_age is not None and max_age < timedelta(0):
+            raise ValueError(f"max_age must not be negative, got: {max_age}")
+        self.root: Path | None = None if root is None else normpath(root)
+        self.keep = keep
+        self.max_age = max_age
+
+    def __enter__(self) -> BackupStore:
+        _backup_stores.push(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        _backup_stores.pop(self)
+
+    def backup(self, path: PathInput, *, ext: str = ".bak", max_tries: int = 100) -> Path:
+        """
+        Back up a file into the store.
+
+        Parameters
+        ----------
+        path : str | os.PathLike[str] | Path
+            Source file.
+        ext : str, default=".bak"
+            Snapshot extension (with or without leading dot).
+        max_tries : int, default=100
+            Maximum number of snapshot names tried for one timestamp.
+
+        Returns
+        -------
+        Path
+            The new snapshot, or the latest one if the content is unchanged.
+
+        Raises
+        ------
+        FileNotFoundError, IsADirectoryError
+            If ``path`` is not an existing regular file.
+        ValueError
+            If ``ext`` is empty or ``max_tries`` is not positive.
+        FileExistsError
+            If no snapshot name is available within ``max_tries``.
+        """
+        src = check_file(path)
+        if not ext:
+            raise ValueError("ext must not be empty")
+        if max_tries <= 0:
+            raise ValueError("max_tries must be > 0")
+        if not ext.startswith("."):
+            ext = f".{ext}"
+
+        store = self._store_root(src)
+        folder = self._snapshot_folder(store, src)
+        digest = _file_digest(src)
+        snapshots = self.snapshots(src)
+        if snapshots and snapshots[-1].name.split(".")[1] == digest:
+            return snapshots[-1]
+
+        folder.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime(_SNAPSHOT_STAMP_FORMAT)
+        for i in range(1, max_tries + 1):
+            snapshot = folder / f"{stamp}-{i:03d}.{digest}{ext}"
+            if self._add_snapshot(store, src, digest, snapshot):
+                break
+        else:
+            raise FileExistsError(
+                f"Unable to find available snapshot name for {src} after {max_tries} tries."
+            )
+
+        self._apply_retention(store, src)
+        return snapshot
+
+    def snapshots(self, path: PathInput) -> list[Path]:
+        """
+        Return the snapshots of a file, oldest first.
+
+        Parameters
+        ----------
+        path : str | os.PathLike[str] | Path
+            Source file; it does not need to exist anymore.
+
+        Returns
+        -------
+        list[Path]
+            Snapshot paths in chronological order.
+        """
+        src = normpath(path)
+        folder = self._snapshot_folder(self._store_root(src), src)
+        try:
+            with os.scandir(folder) as it:
+                names = sorted(entry.name for entry in it if entry.name.count(".") >= 2)
+        except FileNotFoundError:
+            return []
+        return [folder / name for name in names]
+
+    def _store_root(self, src: Path) -> Path:
+        """Return the store used for ``src``."""
+        return self.root if self.root is not None else src.parent / BACKUP_STORE_DIRNAME
+
+    @staticmethod
+    def _snapshot_folder(store: Path, src: Path) -> Path:
+        """Return the folder holding the snapshots of ``src``."""
+        path_hash = hashlib.sha256(str(src).encode("utf-8")).hexdigest()[:16]
+        return store / "snapshots" / f"{src.name}-{path_hash}"
+
+    @staticmethod
+    def _blob(store: Path, digest: str) -> Path:
+        """Return the blob path of a content digest."""
+        return store / "objects" / digest[:2] / digest
+
+    def _add_snapshot(self, store: Path, src: Path, digest: str, snapshot: Path) -> bool:
+        """
+        Create ``snapshot`` from the blob of ``digest``, creating the blob if needed.
+
+        Returns False if the snapshot name is already taken.
+        """
+        blob = self._blob(store, digest)
+        while True:
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=blob.parent, prefix=".tmp-")
+                os.close(fd)
+                tmp = Path(tmp_name)
+                try:
+                    _clone_file(src, tmp)
+                    os.replace(tmp, blob)
+                except BaseException:
+                    tmp.unlink(missing_ok=True)
+                    raise
+            try:
+                os.link(blob, snapshot)
+                return True
+            except FileExistsError:
+                return False
+            except FileNotFoundError:
+                # The blob was released by a concurrent prune; store it again.
+                continue
+            except OSError:
+                break
+
+        # No hard links here: the snapshot is a standalone copy of the blob.
+        if not _reserve(snapshot):
+            return False
+        try:
+            _clone_file(blob, snapshot)
+        except BaseException:
+            snapshot.unlink(missing_ok=True)
+            raise
+        self._release_blob(blob)
+        return True
+
+    @staticmethod
+    def _release_blob(blob: Path) -> None:
+        """Delete a blob that no snapshot links to anymore."""
+        try:
+            if blob.stat().st_nlink <= 1:
+                blob.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _apply_retention(self, store: Path, src: Path) -> None:
+        """Delete the snapshots of ``src`` beyond ``keep`` or older than ``max_age``."""
+        if self.keep is None and self.max_age is None:
+            return
+        snapshots = self.snapshots(src)
+        count = 0 if self.keep is None else max(0, len(snapshots) - self.keep)
+        expired = snapshots[:count]
+        if self.max_age is not None:
+            limit = datetime.now(timezone.utc) - self.max_age
+            expired += [
+                snapshot
+                for snapshot in snapshots[count:-1]
+                if _snapshot_time(snapshot) < limit
+            ]
+
+        for snapshot in expired:
+            digest = snapshot.name.split(".")[1]
+            snapshot.unlink(missing_ok=True)
+            self._release_blob(self._blob(store, digest))
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _snapshot_time(snapshot: Path) -> datetime:
+    """Return the UTC creation time encoded in a snapshot name."""
+    stamp = snapshot.name.split("-", 1)[0]
+    return datetime.strptime(stamp, _SNAPSHOT_STAMP_FORMAT).replace(tzinfo=timezone.utc)
+# -----------------------------------------------------------------------------
+
+
 # -----------------------------------------------------------------------------
 def get_this_filename() -> Path:
     """
@@ -748,6 +1423,13 @@ def is_binary_file(
     with p.open("rb") as f:
         chunk = f.read(sample_size)
 
+    return _is_binary_sample(chunk, encoding)
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _is_binary_sample(chunk: bytes, encoding: str | None) -> bool:
+    """Apply the :func:`is_binary_file` heuristic to bytes already read."""
     if not chunk:
         # Empty file → text
         return False
@@ -774,29 +1456,96 @@ def is_binary_file(
     ):
         return True
 
-    def _decoded_text_is_binary(text: str) -> bool:
-        if not text:
-            return False
-        controls = sum(
-            1 for char in text if not char.isprintable() and char not in "\n\r\t\f"
-        )
-        return controls / len(text) > 0.30
-
-    if normalized_encoding is not None:
-        try:
-            return _decoded_text_is_binary(chunk.decode(normalized_encoding))
-        except UnicodeDecodeError:
+    if normalized_encoding is None or normalized_encoding == "utf-8":
+        if chunk.isascii():
+            # Also the CP1252 answer: both decode ASCII bytes the same way.
+            controls = len(chunk.translate(None, _ASCII_TEXT_BYTES))
+            return _controls_ratio(controls, len(chunk))
+        utf8_controls = _utf8_controls(chunk)
+        if utf8_controls is not None:
+            return _controls_ratio(
+                utf8_controls,
+                len(chunk) - len(chunk.translate(None, _UTF8_CHAR_START_BYTES)),
+            )
+        if normalized_encoding is not None:
+            return True
+        # CP1252 covers the common non-UTF-8 text produced on Windows while
+        # still rejecting undefined bytes and control-heavy binary samples.
+        normalized_encoding = "cp1252"
+
+    classes = _single_byte_classes(normalized_encoding)
+    if classes is not None:
+        text_bytes, control_bytes = classes
+        rest = chunk.translate(None, text_bytes)
+        if rest.translate(None, control_bytes):
+            # Bytes the codec leaves undefined would fail to decode.
             return True
+        return _controls_ratio(len(rest), len(chunk))
 
+    # Multibyte codecs: decode and inspect every character.
     try:
-        return _decoded_text_is_binary(chunk.decode("utf-8"))
+        text = chunk.decode(normalized_encoding)
     except UnicodeDecodeError:
-        # CP1252 covers the common non-UTF-8 text produced on Windows while
-        # still rejecting undefined bytes and control-heavy binary samples.
+        return True
+    if not text:
+        return False
+    return _controls_ratio(_count_controls(text), len(text))
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+# Byte classes for the binary heuristic. A character is a "control" when it is
+# not printable and not one of "\n\r\t\f".
+_TEXT_WHITESPACE = "\n\r\t\f"
+_ASCII_TEXT_BYTES = bytes(
+    b for b in range(128) if chr(b).isprintable() or chr(b) in _TEXT_WHITESPACE
+)
+_ASCII_BYTES = bytes(range(128))
+# Every byte except UTF-8 continuation bytes starts a character.
+_UTF8_CHAR_START_BYTES = bytes(b for b in range(256) if not 0x80 <= b <= 0xBF)
+# Codecs that map each byte to at most one character on their own.
+_SINGLE_BYTE_CODECS = frozenset({"ascii", "iso8859-1", "iso8859-15", "cp1252"})
+
+
+def _controls_ratio(controls: int, length: int) -> bool:
+    return controls / length > 0.30
+
+
+def _count_controls(text: str) -> int:
+    if text.isprintable():
+        return 0
+    return sum(1 for char in text if not char.isprintable() and char not in _TEXT_WHITESPACE)
+
+
+def _utf8_controls(chunk: bytes) -> int | None:
+    """Count controls in a UTF-8 sample, or return None if it is not UTF-8."""
+    try:
+        chunk.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+    # Dropping the ASCII bytes of valid UTF-8 keeps the other sequences whole.
+    non_ascii = chunk.translate(None, _ASCII_BYTES)
+    ascii_controls = len(chunk.translate(None, _ASCII_TEXT_BYTES)) - len(non_ascii)
+    return ascii_controls + _count_controls(non_ascii.decode("utf-8"))
+
+
+@lru_cache(maxsize=None)
+def _single_byte_classes(encoding: str) -> tuple[bytes, bytes] | None:
+    """Return (text bytes, control bytes) of a single-byte codec, else None."""
+    if encoding not in _SINGLE_BYTE_CODECS:
+        return None
+    text_bytes = bytearray()
+    control_bytes = bytearray()
+    for b in range(256):
         try:
-            return _decoded_text_is_binary(chunk.decode("cp1252"))
+            char = bytes((b,)).decode(encoding)
         except UnicodeDecodeError:
-            return True
+            continue
+        if char.isprintable() or char in _TEXT_WHITESPACE:
+            text_bytes.append(b)
+        else:
+            control_bytes.append(b)
+    return bytes(text_bytes), bytes(control_bytes)
 # -----------------------------------------------------------------------------
 
 
@@ -813,10 +1562,16 @@ def detect_file_encoding(
     Detect the text encoding of a file using chardet, with BOM handling.
 
     The function reads up to `sample_size` bytes. If a known Unicode BOM is
-    present, it returns the corresponding encoding immediately. Otherwise it
-    delegates to chardet and returns the detected encoding if the confidence is
+    present, it returns the corresponding encoding immediately. A sample that
+    is pure ASCII returns "ascii" and a sample that is strictly valid UTF-8
+    returns "utf-8", without importing chardet. Otherwise it delegates to
+    chardet and returns the detected encoding if the confidence is
     >= `min_confidence`. If detection is inconclusive, it returns `default`.
 
+    When the encoding cache is enabled (see :func:`configure_encoding_cache`),
+    results are reused while the file size and modification time are
+    unchanged.
+
     Parameters
     ----------
     path : str | os.PathLike[str] | Path
@@ -856,9 +1611,117 @@ def detect_file_encoding(
 
     p = check_file(path)
 
+    key = None
+    if _encoding_cache_size > 0:
+        key = _encoding_cache_key(
+            p, p.stat(), (default, min_confidence, sample_size, prefer_utf8_sig)
+        )
+        cached = _encoding_cache_get(key)
+        if cached is not None:
+            return cached
+
     with p.open("rb") as f:
         data = f.read(sample_size)
 
+    enc = _detect_sample_encoding(
+        data,
+        default=default,
+        min_confidence=min_confidence,
+        prefer_utf8_sig=prefer_utf8_sig,
+        complete=len(data) < sample_size,
+    )
+    if key is not None:
+        _encoding_cache_put(key, enc)
+    return enc
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+# Detected encodings, most recently used last. Disabled while the size is 0.
+_EncodingCacheKey = tuple[str, int, int, tuple[str, float, int, bool]]
+_encoding_cache: OrderedDict[_EncodingCacheKey, str] = OrderedDict()
+_encoding_cache_lock = threading.Lock()
+_encoding_cache_size = 0
+
+
+def configure_encoding_cache(maxsize: int = 4096) -> None:
+    """
+    Enable, resize or disable the process-wide encoding cache.
+
+    Encodings detected by :func:`detect_file_encoding` and
+    :func:`read_text_with_info` are kept for the `maxsize` most recently used
+    files, keyed by path, size and ``st_mtime_ns``, so later reads of an
+    unchanged file skip detection.
+
+    Parameters
+    ----------
+    maxsize : int, default=4096
+        Maximum number of cached entries. 0 disables the cache and drops it.
+
+    Raises
+    ------
+    ValueError
+        If `maxsize` is negative.
+    """
+    global _encoding_cache_size
+    if maxsize < 0:
+        raise ValueError(f"maxsize must be >= 0, got: {maxsize}")
+
+    with _encoding_cache_lock:
+        _encoding_cache_size = maxsize
+        while len(_encoding_cache) > maxsize:
+            _encoding_cache.popitem(last=False)
+
+
+def clear_encoding_cache() -> None:
+    """Drop every entry of the encoding cache, keeping its size."""
+    with _encoding_cache_lock:
+        _encoding_cache.clear()
+
+
+def _encoding_cache_key(
+    p: Path,
+    st: os.stat_result,
+    options: tuple[str, float, int, bool],
+) -> _EncodingCacheKey:
+    return (str(p), st.st_size, st.st_mtime_ns, options)
+
+
+def _encoding_cache_get(key: _EncodingCacheKey) -> str | None:
+    with _encoding_cache_lock:
+        enc = _encoding_cache.get(key)
+        if enc is not None:
+            _encoding_cache.move_to_end(key)
+        return enc
+
+
+def _encoding_cache_put(key: _EncodingCacheKey, enc: str) -> None:
+    with _encoding_cache_lock:
+        _encoding_cache[key] = enc
+        _encoding_cache.move_to_end(key)
+        while len(_encoding_cache) > _encoding_cache_size:
+            _encoding_cache.popitem(last=False)
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+_UTF8_DECODER = codecs.getincrementaldecoder("utf-8")
+
+
+def _detect_sample_encoding(
+    data: bytes,
+    *,
+    default: str,
+    min_confidence: float,
+    prefer_utf8_sig: bool,
+    complete: bool,
+) -> str:
+    """
+    Apply the :func:`detect_file_encoding` rules to bytes already read.
+
+    `complete` tells whether `data` is the whole file; a truncated sample may
+    end in the middle of a UTF-8 sequence.
+    """
     if not data:
         return default.lower()
 
@@ -874,6 +1737,16 @@ def detect_file_encoding(
     if data.startswith(b"\xef\xbb\xbf"):
         return "utf-8-sig" if prefer_utf8_sig else "utf-8"
 
+    # Fast path for the usual case; chardet agrees on these samples.
+    if data.isascii():
+        return "ascii"
+    try:
+        _UTF8_DECODER().decode(data, final=complete)
+    except UnicodeDecodeError:
+        pass
+    else:
+        return "utf-8"
+
     try:
         import chardet
     except ImportError as ex:
@@ -891,7 +1764,17 @@ def detect_file_encoding(
 
 
 # -----------------------------------------------------------------------------
-def get_file_content(
+@dataclass(frozen=True)
+class TextFileInfo:
+    """Text of a file with the encoding used to decode it and its byte size."""
+    text: str
+    encoding: str
+    size: int
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def read_text_with_info(
     path: PathInput,
     *,
     encoding: str | None = None,
@@ -901,12 +1784,15 @@ def get_file_content(
     errors: str = "strict",
     reject_binary: bool = True,
     strip_bom: bool = True,
-) -> str:
+) -> TextFileInfo:
     """
-    Read a text file and return its content, with BOM protection.
+    Read a text file once and return its content, encoding and size.
 
-    If `encoding` is not provided, the encoding is detected (BOM first,
-    then chardet). Optionally rejects binary files and strips leading BOM.
+    The file bytes are read a single time. Encoding detection (BOM first,
+    then chardet) and the binary check work on the leading sample, with the
+    same rules as :func:`detect_file_encoding` and :func:`is_binary_file`;
+    the rest of the file is only read once the sample is accepted. Decoding
+    follows ``Path.read_text`` (universal newlines).
 
     Parameters
     ----------
@@ -919,7 +1805,7 @@ def get_file_content(
     min_confidence : float, default=0.50
         Minimum confidence threshold for chardet when auto-detecting.
     sample_size : int, default=256*1024
-        Number of bytes read for encoding detection.
+        Number of leading bytes used for encoding and binary detection.
     errors : str, default="strict"
         Error handler for decoding.
     reject_binary : bool, default=True
@@ -930,64 +1816,214 @@ def get_file_content(
 
     Returns
     -------
-    str
-        File content as text.
+    TextFileInfo
+        The decoded text, the encoding used to decode it and the number of
+        bytes read.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the file does not exist.
+    IsADirectoryError
+        If the path is not a file.
+    ValueError
+        If the file appears binary (with `reject_binary`) or a detection
+        parameter is out of range.
+    UnicodeDecodeError
+        If the content cannot be decoded with `errors="strict"`.
     """
     p = check_file(path)
 
-    enc = encoding
-    if enc is None:
-        enc = detect_file_encoding(
-            p,
-            default=default_encoding,
-            min_confidence=min_confidence,
-            sample_size=sample_size,
-        )
-
-    if reject_binary and is_binary_file(p, sample_size=sample_size, encoding=enc):
-        raise ValueError(f"Binary file detected: {p}")
+    # Same argument checks, in the same order, as the detection helpers.
+    if encoding is None and not (0.0 <= min_confidence <= 1.0):
+        raise ValueError(f"min_confidence must be within [0.0, 1.0], got: {min_confidence}")
+    if (encoding is None or reject_binary) and sample_size <= 0:
+        raise ValueError(f"sample_size must be > 0, got: {sample_size}")
 
-    text = p.read_text(encoding=enc, errors=errors)
+    key = None
+    with p.open("rb") as f:
+        st = os.fstat(f.fileno())
+        if encoding is None and _encoding_cache_size > 0:
+            key = _encoding_cache_key(
+                p, st, (default_encoding, min_confidence, sample_size, True)
+            )
+        # The file is read into one buffer sized from fstat and decoded from
+        # it, so the bytes are never copied. The spare byte detects a file
+        # that grew since fstat; one byte past the sample tells whether it
+        # holds the whole file.
+        data = bytearray(max(st.st_size, sample_size) + 1)
+        with memoryview(data) as view:
+            n = f.readinto(view[: sample_size + 1]) if sample_size > 0 else 0
+            sample = bytes(view[: min(n, sample_size)])
+
+        enc = encoding
+        if enc is None and key is not None:
+            enc = _encoding_cache_get(key)
+        if enc is None:
+            enc = _detect_sample_encoding(
+                sample,
+                default=default_encoding,
+                min_confidence=min_confidence,
+                prefer_utf8_sig=True,
+                complete=n <= sample_size,
+            )
+            if key is not None:
+                _encoding_cache_put(key, enc)
+
+        if reject_binary and _is_binary_sample(sample, enc):
+            raise ValueError(f"Binary file detected: {p}")
+
+        if sample_size <= 0 or n > sample_size:
+            while True:
+                with memoryview(data) as view:
+                    n += f.readinto(view[n:])
+                if n < len(data):
+                    break
+                data.extend(bytes(len(data)))
+    del data[n:]
+
+    text = data.decode(enc, errors)
+    # Path.read_text translates every line ending to "\n".
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
 
     if strip_bom and text.startswith("\ufeff"):
         text = text[1:]
 
-    return text
+    return TextFileInfo(text=text, encoding=enc, size=n)
 # -----------------------------------------------------------------------------
 
 
 # -----------------------------------------------------------------------------
-def set_file_content(
+def get_file_content(
     path: PathInput,
-    content: str,
-    encoding: str = "utf-8",
-    bom: bool = False,
     *,
-    atomic: bool = True,
-    newline: Optional[str] = "\n",
-    create_parents: bool = True,
-) -> Path:
+    encoding: str | None = None,
+    default_encoding: str = "utf-8",
+    min_confidence: float = 0.50,
+    sample_size: int = 256 * 1024,
+    errors: str = "strict",
+    reject_binary: bool = True,
+    strip_bom: bool = True,
+) -> str:
+    """
+    Read a text file and return its content, with BOM protection.
+
+    If `encoding` is not provided, the encoding is detected (BOM first,
+    then chardet). Optionally rejects binary files and strips leading BOM.
+    The file is read once; see :func:`read_text_with_info`.
+
+    Parameters
+    ----------
+    path : str | os.PathLike[str] | Path
+        File path.
+    encoding : str | None, default=None
+        If provided, this encoding is used directly (no detection).
+    default_encoding : str, default="utf-8"
+        Default encoding used when detection is inconclusive.
+    min_confidence : float, default=0.50
+        Minimum confidence threshold for chardet when auto-detecting.
+    sample_size : int, default=256*1024
+        Number of bytes read for encoding detection.
+    errors : str, default="strict"
+        Error handler for decoding.
+    reject_binary : bool, default=True
+        If True, raises ValueError when file appears binary.
+    strip_bom : bool, default=True
+        If True, removes leading Unicode BOM character (U+FEFF)
+        from the decoded content.
+
+    Returns
+    -------
+    str
+        File content as text.
+    """
+    return read_text_with_info(
+        path,
+        encoding=encoding,
+        default_encoding=default_encoding,
+        min_confidence=min_confidence,
+        sample_size=sample_size,
+        errors=errors,
+        reject_binary=reject_binary,
+        strip_bom=strip_bom,
+    ).text
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+@overload
+def set_file_content(
+    path: PathInput,
+    content: str,
+    encoding: str = "utf-8",
+    bom: bool = False,
+    *,
+    atomic: bool = True,
+    newline: Optional[str] = "\n",
+    create_parents: bool = True,
+    skip_if_unchanged: Literal[False] = False,
+) -> Path: ...
+@overload
+def set_file_content(
+    path: PathInput,
+    content: str,
+    encoding: str = "utf-8",
+    bom: bool = False,
+    *,
+    atomic: bool = True,
+    newline: Optional[str] = "\n",
+    create_parents: bool = True,
+    skip_if_unchanged: Literal[True],
+) -> bool: ...
+@overload
+def set_file_content(
+    path: PathInput,
+    content: str,
+    encoding: str = "utf-8",
+    bom: bool = False,
+    *,
+    atomic: bool = True,
+    newline: Optional[str] = "\n",
+    create_parents: bool = True,
+    skip_if_unchanged: bool,
+) -> Path | bool: ...
+def set_file_content(
+    path: PathInput,
+    content: str,
+    encoding: str = "utf-8",
+    bom: bool = False,
+    *,
+    atomic: bool = True,
+    newline: Optional[str] = "\n",
+    create_parents: bool = True,
+    skip_if_unchanged: bool = False,
+) -> Path | bool:
     """
     Write text content to a file, optionally adding a UTF-8 BOM.
+
+    With ``skip_if_unchanged=True`` the encoded content is first compared
+    with the bytes on disk (size, then content); an identical file is left
+    untouched, keeping its mtime, and the function returns whether it wrote.
+    Otherwise it returns the written path.
     """
     content = _require_str(content, name="content")
 
     p = _p(path)
+    enc = _write_encoding(encoding, bom)
+    if skip_if_unchanged and same_file_content(
+        p, content, encoding, bom, newline=newline
+    ):
+        return False
+
     if create_parents:
         p.parent.mkdir(parents=True, exist_ok=True)
 
     target = p.resolve(strict=False)
 
-    normalized_encoding = codecs.lookup(encoding).name
-    if bom and normalized_encoding not in {"utf-8", "utf-8-sig"}:
-        raise ValueError("bom=True is only supported with UTF-8 encodings")
-    enc = "utf-8-sig" if bom else (
-        "utf-8" if normalized_encoding == "utf-8-sig" else encoding
-    )
-
     if not atomic:
         target.write_text(content, encoding=enc, newline=newline)
-        return target
+        return True if skip_if_unchanged else target
 
     tmp_path: Path | None = None
     existing_mode: int | None = None
@@ -1010,7 +2046,7 @@ def set_file_content(
             os.chmod(tmp_path, existing_mode)
 
         tmp_path.replace(target)
-        return target
+        return True if skip_if_unchanged else target
 
     finally:
         if tmp_path is not None and tmp_path.exists():
@@ -1021,6 +2057,132 @@ def set_file_content(
 # -----------------------------------------------------------------------------
 
 
+# -----------------------------------------------------------------------------
+def same_file_content(
+    path: PathInput,
+    content: str,
+    encoding: str = "utf-8",
+    bom: bool = False,
+    *,
+    newline: Optional[str] = "\n",
+) -> bool:
+    """
+    Tell whether ``set_file_content`` would leave a file byte-for-byte unchanged.
+
+    ``content`` is encoded as ``set_file_content`` would write it (encoding,
+    BOM and newline translation). A file whose size differs is rejected
+    from its metadata; otherwise its bytes are compared.
+
+    Parameters
+    ----------
+    path : str | os.PathLike[str] | Path
+        File to compare with; it does not need to exist.
+    content, encoding, bom, newline
+        Same meaning as for ``set_file_content``.
+
+    Returns
+    -------
+    bool
+        True if ``path`` is a regular file holding exactly the encoded content.
+
+    Raises
+    ------
+    ValueError
+        If ``bom=True`` is used with a non UTF-8 encoding.
+    UnicodeEncodeError
+        If ``content`` cannot be encoded.
+    """
+    content = _require_str(content, name="content")
+    enc = _write_encoding(encoding, bom)
+    if newline is None:
+        newline = os.linesep
+    if newline not in ("", "\n"):
+        content = content.replace("\n", newline)
+    data = content.encode(enc)
+
+    try:
+        with open(_p(path), "rb") as f:
+            st = os.fstat(f.fileno())
+            if not stat.S_ISREG(st.st_mode) or st.st_size != len(data):
+                return False
+            return f.read(len(data) + 1) == data
+    except OSError:
+        return False
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def rewrite_file_content(
+    path: PathInput,
+    content: str,
+    *,
+    encoding: str = "utf-8",
+    backup: bool = False,
+    backup_ext: str = ".bak",
+    backup_date_prefix: str | None = None,
+    skip_if_unchanged: bool = False,
+) -> bool:
+    """
+    Back up and rewrite a file in place; return whether it was written.
+
+    This is the write step shared by the in-place Markdown helpers. With
+    ``skip_if_unchanged=True`` a file already holding ``content`` (once
+    encoded, see :func:`same_file_content`) is neither backed up nor
+    rewritten, and each file is logged at INFO level as changed or unchanged.
+
+    Parameters
+    ----------
+    path : str | os.PathLike[str] | Path
+        File to rewrite.
+    content : str
+        New text content.
+    encoding : str, default="utf-8"
+        Encoding used to write ``content``.
+    backup : bool, default=False
+        If True, back the file up with :func:`create_backup` before writing.
+    backup_ext : str, default=".bak"
+        Backup extension.
+    backup_date_prefix : str | None, default=None
+        Date prefix of the backup name; see :func:`create_backup`.
+    skip_if_unchanged : bool, default=False
+        If True, leave an identical file (and its mtime) untouched.
+
+    Returns
+    -------
+    bool
+        True if the file was written.
+
+    Raises
+    ------
+    FileNotFoundError / IsADirectoryError
+        Propagated from :func:`create_backup`.
+    OSError
+        Propagated from :func:`set_file_content`.
+    """
+    if skip_if_unchanged and same_file_content(path, content, encoding):
+        logging.info("Unchanged %s", path)
+        return False
+    if backup:
+        create_backup(path, ext=backup_ext, date_prefix=backup_date_prefix)
+    set_file_content(path, content, encoding=encoding)
+    if skip_if_unchanged:
+        logging.info("Changed %s", path)
+    return True
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _write_encoding(encoding: str, bom: bool) -> str:
+    """Return the codec used by ``set_file_content`` for ``encoding`` and ``bom``."""
+    normalized_encoding = codecs.lookup(encoding).name
+    if bom and normalized_encoding not in {"utf-8", "utf-8-sig"}:
+        raise ValueError("bom=True is only supported with UTF-8 encodings")
+    return "utf-8-sig" if bom else (
+        "utf-8" if normalized_encoding == "utf-8-sig" else encoding
+    )
+# -----------------------------------------------------------------------------
+
+
 # -----------------------------------------------------------------------------
 def make_temp_dir(
     *,
@@ -1083,6 +2245,9 @@ def apply_to_files(
     expected_ext: str | tuple[str, ...] | None = None,
     follow_symlinks: bool = False,
     on_error: str = "raise",  # "raise" | "collect"
+    executor: str | None = None,  # None | "thread" | "process"
+    max_workers: int | None = None,
+    timeout: float | None = None,
 ) -> tuple[list[T], ApplyResult, list[tuple[Path, Exception]]]:
     """
     Apply a function to files under a path (file or directory).
@@ -1111,6 +2276,17 @@ def apply_to_files(
     on_error : {"raise","collect"}, default="raise"
         - "raise": stop at first error
         - "collect": continue and return errors list
+    executor : {None,"thread","process"}, default=None
+        - None: call `func` in the calling thread, file after file
+        - "thread": run the calls in a thread pool
+        - "process": run the calls in a process pool; `func`, its results
+          and its exceptions must be picklable
+    max_workers : int | None, default=None
+        Pool size, passed to the executor (its default when None).
+    timeout : float | None, default=None
+        Seconds to wait for each file once the earlier files are done.
+        A file that takes longer fails with ``TimeoutError``. Requires an
+        executor; the late call is abandoned, not interrupted.
 
     Returns
     -------
@@ -1123,72 +2299,42 @@ def apply_to_files(
     -----
     - This function does not perform I/O by itself except directory traversal.
     - `func` is responsible for reading/writing file contents.
+    - The tree is walked with :func:`walk_files`. A directory whose every
+      path is excluded (``build/*``, ``*/.git/*``) is not entered, so its
+      files are not counted; with `follow_symlinks`, each directory is
+      visited once.
+    - With an executor, the files are selected first, then processed
+      concurrently. Results, errors and counters are reported in file order,
+      as in serial mode. In "raise" mode the first failure cancels the calls
+      that have not started and is raised once the running calls finish.
     """
     if on_error not in {"raise", "collect"}:
         raise ValueError(
             f"on_error must be either 'raise' or 'collect', got: {on_error!r}"
         )
+    if executor not in {None, "thread", "process"}:
+        raise ValueError(
+            f"executor must be None, 'thread' or 'process', got: {executor!r}"
+        )
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be >= 1, got: {max_workers}")
+    if timeout is not None and executor is None:
+        raise ValueError("timeout requires executor='thread' or 'process'")
 
     root_p = _p(root)
-
-    # Normalize expected extensions (lowercase, leading dot)
-    exts: tuple[str, ...] | None
-    if expected_ext is None:
-        exts = None
-    else:
-        raw = (expected_ext,) if isinstance(expected_ext, str) else expected_ext
-        exts = tuple(e.lower() if e.startswith(".") else f".{e.lower()}" for e in raw)
-
-    def _match(rel_posix: str) -> bool:
-        if include_globs and not any(fnmatchcase(rel_posix, pat) for pat in include_globs):
-            return False
-        if exclude_globs and any(fnmatchcase(rel_posix, pat) for pat in exclude_globs):
-            return False
-        return True
-
-    def _iter_files(base: Path) -> Iterable[Path]:
-        if base.is_file():
-            yield base
-            return
-
-        if not base.exists():
-            raise FileNotFoundError(f"Path does not exist: {base}")
-        if not base.is_dir():
-            raise NotADirectoryError(f"Not a directory: {base}")
-
-        seen_directories: Set[tuple[int, int, Path]] = set()
-
-        def _walk(directory: Path) -> Iterable[Path]:
-            directory_stat = directory.stat()
-            identity = (
-                directory_stat.st_dev,
-                directory_stat.st_ino,
-                directory.resolve(strict=False),
-            )
-            if identity in seen_directories:
-                return
-            seen_directories.add(identity)
-
-            for p in sorted(directory.iterdir(), key=lambda item: item.name):
-                if p.is_dir():
-                    if recursive and (follow_symlinks or not p.is_symlink()):
-                        yield from _walk(p)
-                    continue
-
-                if p.is_file():
-                    yield p
-
-        yield from _walk(base)
+    exts = _normalize_exts(expected_ext)
 
     results: list[T] = []
     errors: list[tuple[Path, Exception]] = []
 
     processed = succeeded = failed = skipped = 0
+    selected: list[Path] = []
 
-    base_dir = root_p if root_p.is_dir() else root_p.parent
-
-    for f in _iter_files(root_p):
+    for path, rel in _iter_apply_candidates(
+        root_p, recursive, follow_symlinks, exclude_globs
+    ):
         processed += 1
+        f = Path(path)
 
         # Extension filter
         if exts is not None and f.suffix.lower() not in exts:
@@ -1196,16 +2342,14 @@ def apply_to_files(
             continue
 
         # Pattern filters (relative path, POSIX form for stable matching)
-        try:
-            rel = f.relative_to(base_dir).as_posix()
-        except ValueError:
-            # Defensive: if relative_to fails, fall back to name
-            rel = f.name
-
-        if not _match(rel):
+        if not _glob_match(rel, include_globs, exclude_globs):
             skipped += 1
             continue
 
+        if executor is not None:
+            selected.append(f)
+            continue
+
         try:
             results.append(func(f))
             succeeded += 1
@@ -1215,6 +2359,22 @@ def apply_to_files(
                 raise
             errors.append((f, exc))
 
+    if executor is not None:
+        for f, outcome in _apply_in_pool(
+            func,
+            selected,
+            executor=executor,
+            max_workers=max_workers,
+            timeout=timeout,
+            stop_on_error=on_error == "raise",
+        ):
+            if isinstance(outcome, _Failure):
+                failed += 1
+                errors.append((f, outcome.exc))
+            else:
+                results.append(outcome)
+                succeeded += 1
+
     summary = ApplyResult(
         processed=processed,
         succeeded=succeeded,
@@ -1225,6 +2385,375 @@ def apply_to_files(
 # -----------------------------------------------------------------------------
 
 
+# -----------------------------------------------------------------------------
+def _normalize_exts(
+    expected_ext: str | tuple[str, ...] | None,
+) -> tuple[str, ...] | None:
+    """Normalize expected extensions (lowercase, leading dot)."""
+    if expected_ext is None:
+        return None
+    raw = (expected_ext,) if isinstance(expected_ext, str) else expected_ext
+    return tuple(e.lower() if e.startswith(".") else f".{e.lower()}" for e in raw)
+
+
+def _glob_match(
+    rel_posix: str,
+    include_globs: Sequence[str],
+    exclude_globs: Sequence[str],
+) -> bool:
+    if include_globs and not any(fnmatchcase(rel_posix, pat) for pat in include_globs):
+        return False
+    if exclude_globs and any(fnmatchcase(rel_posix, pat) for pat in exclude_globs):
+        return False
+    return True
+
+
+def _excludes_directory(rel_dir: str, exclude_globs: Sequence[str]) -> bool:
+    """
+    Tell whether `exclude_globs` exclude every path below `rel_dir`.
+
+    A pattern ``X*`` that matches ``rel_dir + "/"`` matches any longer path
+    with that prefix, since ``*`` also matches ``/`` for fnmatch.
+    """
+    prefix = f"{rel_dir}/"
+    return any(
+        pat.endswith("*") and fnmatchcase(prefix, pat) for pat in exclude_globs
+    )
+
+
+def walk_files(
+    root: PathInput,
+    *,
+    max_depth: int | None = None,
+    follow_symlinks: bool = False,
+    exclude_globs: Sequence[str] = (),
+    sort: bool = True,
+    files_first: bool = False,
+    files_only: bool = True,
+) -> Iterator[Path]:
+    """
+    Yield the files below a directory, using ``os.scandir`` entry types.
+
+    Entries are classified from the type information returned by
+    ``os.scandir``, so regular files and directories cost no extra stat call;
+    only symbolic links are resolved. Directories excluded as a whole by
+    `exclude_globs` are not entered.
+
+    Parameters
+    ----------
+    root : str | os.PathLike[str] | Path
+        Directory to walk.
+    max_depth : int | None, default=None
+        Number of directory levels to descend below `root` (0: `root` only).
+        None means unlimited.
+    follow_symlinks : bool, default=False
+        If True, descend into symlinked directories. Each directory is then
+        visited once, identified by ``(st_dev, st_ino)``, which also breaks
+        cycles. Symlinked files are yielded either way.
+    exclude_globs : Sequence[str], default=()
+        fnmatch patterns applied to POSIX paths relative to `root`. Matching
+        files are not yielded; a directory is pruned when a pattern ending
+        in ``*`` matches its ``"rel/"`` prefix (``build/*``, ``*/.git/*``).
+    sort : bool, default=True
+        Visit entries in name order; if False, keep the ``os.scandir`` order.
+    files_first : bool, default=False
+        Yield the files of a directory before descending into its
+        subdirectories, instead of visiting subdirectories where they sort.
+    files_only : bool, default=True
+        If False, also yield entries that are neither files nor traversed
+        directories: broken links, FIFOs, sockets, unfollowed directory links.
+
+    Yields
+    ------
+    Path
+        ``root / relative path`` of each file.
+
+    Raises
+    ------
+    FileNotFoundError
+        If `root` does not exist (when iteration starts).
+    NotADirectoryError
+        If `root` is not a directory (when iteration starts).
+    """
+    for path, rel in _walk_tree(
+        os.fspath(_p(root)),
+        max_depth=max_depth,
+        follow_symlinks=follow_symlinks,
+        prune_globs=exclude_globs,
+        sort=sort,
+        files_first=files_first,
+        files_only=files_only,
+    ):
+        if exclude_globs and any(fnmatchcase(rel, pat) for pat in exclude_globs):
+            continue
+        yield Path(path)
+
+
+def _walk_tree(
+    base: str,
+    *,
+    max_depth: int | None,
+    follow_symlinks: bool,
+    prune_globs: Sequence[str],
+    sort: bool,
+    files_first: bool,
+    files_only: bool = True,
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(path, relative POSIX path)`` pairs for :func:`walk_files`."""
+    seen: Set[tuple[int, int]] = set()
+
+    def _walk(directory: str, rel_dir: str, depth: int) -> Iterator[tuple[str, str]]:
+        if follow_symlinks:
+            st = os.stat(directory)
+            identity = (st.st_dev, st.st_ino)
+            if identity in seen:
+                return
+            seen.add(identity)
+
+        with os.scandir(directory) as it:
+            entries = list(it)
+        if sort:
+            entries.sort(key=lambda item: item.name)
+
+        descend = max_depth is None or depth < max_depth
+        subdirs: list[tuple[str, str]] = []
+        for entry in entries:
+            rel = f"{rel_dir}{entry.name}"
+            if entry.is_dir(follow_symlinks=False) or (
+                follow_symlinks and entry.is_symlink() and entry.is_dir()
+            ):
+                if not descend or _excludes_directory(rel, prune_globs):
+                    continue
+                if files_first:
+                    subdirs.append((entry.path, rel))
+                else:
+                    yield from _walk(entry.path, f"{rel}/", depth + 1)
+            elif not files_only or entry.is_file():
+                yield entry.path, rel
+
+        for path, rel in subdirs:
+            yield from _walk(path, f"{rel}/", depth + 1)
+
+    yield from _walk(base, "", 0)
+
+
+def iter_apply_to_files(
+    root: PathInput,
+    func: Callable[[Path], T],
+    *,
+    recursive: bool = True,
+    include_globs: Sequence[str] = ("*",),
+    exclude_globs: Sequence[str] = (),
+    expected_ext: str | tuple[str, ...] | None = None,
+    follow_symlinks: bool = False,
+    executor: str | None = None,  # None | "thread" | "process"
+    max_workers: int | None = None,
+) -> Iterator[tuple[Path, T | Exception] | ApplyResult]:
+    """
+    Apply a function to files under a path and yield each outcome.
+
+    Streaming counterpart of :func:`apply_to_files`: the tree is walked
+    lazily and ``(path, result)`` or ``(path, exception)`` is yielded as soon
+    as `func` finishes with a file. The last item is the :class:`ApplyResult`
+    of the run. Only the current directory branch (and, with an executor, a
+    bounded window of pending calls) is held in memory.
+
+    Parameters
+    ----------
+    root : str | os.PathLike[str] | Path
+        A file path or a directory path.
+    func : Callable[[Path], T]
+        Function applied to each selected file.
+    recursive, include_globs, exclude_globs, expected_ext, follow_symlinks
+        Same meaning as for :func:`apply_to_files`.
+    executor : {None,"thread","process"}, default=None
+        Run `func` in the calling thread, a thread pool or a process pool.
+        With a pool, outcomes are yielded in completion order.
+    max_workers : int | None, default=None
+        Pool size, passed to the executor (its default when None).
+
+    Yields
+    ------
+    tuple[Path, T | Exception] | ApplyResult
+        One pair per selected file, then the summary.
+
+    Notes
+    -----
+    - The tree is walked with :func:`walk_files`: filters only look at
+      names, and regular files cost no stat call.
+    - A directory whose every path is excluded (``build/*``, ``*/.git/*``) is
+      not entered; its files are neither processed nor counted.
+    - Closing the generator early cancels the calls not started yet.
+    """
+    if executor not in {None, "thread", "process"}:
+        raise ValueError(
+            f"executor must be None, 'thread' or 'process', got: {executor!r}"
+        )
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be >= 1, got: {max_workers}")
+
+    root_p = _p(root)
+    exts = _normalize_exts(expected_ext)
+    processed = succeeded = failed = skipped = 0
+
+    def _selected() -> Iterator[Path]:
+        nonlocal processed, skipped
+        for path, rel in _iter_apply_candidates(
+            root_p, recursive, follow_symlinks, exclude_globs
+        ):
+            processed += 1
+            if (
+                exts is not None and os.path.splitext(rel)[1].lower() not in exts
+            ) or not _glob_match(rel, include_globs, exclude_globs):
+                skipped += 1
+                continue
+            yield Path(path)
+
+    if executor is None:
+        for f in _selected():
+            try:
+                value = func(f)
+            except Exception as exc:
+                failed += 1
+                yield f, exc
+            else:
+                succeeded += 1
+                yield f, value
+    else:
+        pool: Executor
+        if executor == "process":
+            pool = ProcessPoolExecutor(max_workers=max_workers)
+        else:
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+        window = 2 * (max_workers or os.cpu_count() or 1)
+        pending: dict[Future[T], Path] = {}
+        try:
+            files = _selected()
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < window:
+                    f = next(files, None)
+                    if f is None:
+                        exhausted = True
+                    else:
+                        pending[submit_in_context(pool, func, f)] = f
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in [item for item in pending if item in done]:
+                    f = pending.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        succeeded += 1
+                        yield f, future.result()
+                    else:
+                        failed += 1
+                        yield f, cast(Exception, exc)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    yield ApplyResult(
+        processed=processed,
+        succeeded=succeeded,
+        failed=failed,
+        skipped=skipped,
+    )
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _iter_apply_candidates(
+    root_p: Path,
+    recursive: bool,
+    follow_symlinks: bool,
+    exclude_globs: Sequence[str],
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(path, path relative to the base folder)`` for the apply helpers."""
+    if root_p.is_file():
+        yield str(root_p), root_p.name
+        return
+
+    if not root_p.exists():
+        raise FileNotFoundError(f"Path does not exist: {root_p}")
+    if not root_p.is_dir():
+        raise NotADirectoryError(f"Not a directory: {root_p}")
+
+    yield from _walk_tree(
+        str(root_p),
+        max_depth=None if recursive else 0,
+        follow_symlinks=follow_symlinks,
+        prune_globs=exclude_globs,
+        sort=True,
+        files_first=False,
+    )
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class _Failure:
+    """Exception raised by `func` for one file of a pooled apply."""
+    exc: Exception
+
+
+def _apply_in_pool(
+    func: Callable[[Path], T],
+    files: Sequence[Path],
+    *,
+    executor: str,
+    max_workers: int | None,
+    timeout: float | None,
+    stop_on_error: bool,
+) -> list[tuple[Path, T | _Failure]]:
+    """
+    Run `func` over `files` in a pool and return the outcomes in file order.
+
+    With `stop_on_error`, the first failure cancels every call not started
+    yet and the first failure in file order is raised.
+    """
+    pool: Executor
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    futures: list[Future[T]] = []
+
+    def _cancel_on_error(future: Future[T]) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            for other in futures:
+                other.cancel()
+
+    outcomes: list[tuple[Path, T | _Failure]] = []
+    abandoned = False
+    try:
+        futures.extend(submit_in_context(pool, func, f) for f in files)
+        if stop_on_error:
+            for future in futures:
+                future.add_done_callback(_cancel_on_error)
+
+        for f, future in zip(files, futures):
+            try:
+                # Pools start calls in submission order, so the calls
+                # cancelled by a failure all come after it in the list.
+                outcomes.append((f, future.result(timeout=timeout)))
+                continue
+            except FutureTimeoutError:
+                abandoned = not future.cancel()
+                exc: Exception = TimeoutError(
+                    f"Processing {f} did not finish within {timeout} s"
+                )
+            except Exception as error:
+                exc = error
+            if stop_on_error:
+                raise exc
+            outcomes.append((f, _Failure(exc)))
+    finally:
+        pool.shutdown(wait=not abandoned, cancel_futures=True)
+    return outcomes
+# -----------------------------------------------------------------------------
+
+
 # -----------------------------------------------------------------------------
 def find_file(
     filename: str,
@@ -1314,6 +2843,40 @@ def find_file(
       - <cwd.parent.parent> / "configs" / "config.yml"
       - then the same pattern for "other/start".
     """
+    filename, rel_paths = _check_find_file_arguments(filename, relative_paths, max_up)
+    tested: list[Path] = []
+
+    for start in start_points:
+        base = _p(start)
+
+        # We do not require base to exist; we simply build candidates.
+        for up in range(0, max_up + 1):
+            anchor = base
+            for _ in range(up):
+                anchor = anchor.parent
+
+            for rel_p in rel_paths:
+                resolved_anchor = anchor.resolve(strict=False)
+                candidate = (resolved_anchor / rel_p / filename).resolve(strict=False)
+                if not candidate.is_relative_to(resolved_anchor):
+                    raise ValueError(
+                        f"Resolved search path escapes its anchor: {anchor / rel_p}"
+                    )
+                tested.append(candidate)
+                if candidate.is_file():
+                    return candidate
+
+    raise FileNotFoundError(
+        f"File not found: {filename!r}. Tested {len(tested)} paths: {[str(p) for p in tested]}"
+    )
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _check_find_file_arguments(
+    filename: str, relative_paths: Sequence[PathInput], max_up: int
+) -> tuple[str, list[Path]]:
+    """Validate the ``find_file`` arguments and normalize ``relative_paths``."""
     filename = _require_str(filename, name="filename")
     if not filename.strip():
         raise ValueError("filename must be a non-empty string")
@@ -1338,32 +2901,235 @@ def find_file(
         if ".." in windows_rel.parts:
             raise ValueError(f"relative_paths must not contain '..', got: {rel_p}")
         rel_paths.append(rel_p)
+    return filename, rel_paths
+# -----------------------------------------------------------------------------
 
-    tested: list[Path] = []
 
-    for start in start_points:
-        base = _p(start)
+# -----------------------------------------------------------------------------
+# Entry kinds stored in a FileLocator listing.
+_ENTRY_FILE: Final[int] = 0
+_ENTRY_OTHER: Final[int] = 1
+_ENTRY_LINK: Final[int] = 2
 
-        # We do not require base to exist; we simply build candidates.
-        for up in range(0, max_up + 1):
-            anchor = base
-            for _ in range(up):
-                anchor = anchor.parent
 
-            for rel_p in rel_paths:
-                resolved_anchor = anchor.resolve(strict=False)
-                candidate = (resolved_anchor / rel_p / filename).resolve(strict=False)
-                if not candidate.is_relative_to(resolved_anchor):
-                    raise ValueError(
-                        f"Resolved search path escapes its anchor: {anchor / rel_p}"
-                    )
-                tested.append(candidate)
-                if candidate.is_file():
-                    return candidate
+class FileLocator:
+    """
+    Memoized ``find_file`` for a batch of lookups.
 
-    raise FileNotFoundError(
-        f"File not found: {filename!r}. Tested {len(tested)} paths: {[str(p) for p in tested]}"
-    )
+    A locator remembers, for its whole lifetime, the resolved anchors, the
+    resolved search folders and one ``os.scandir`` listing per folder. Once a
+    folder has been listed, every candidate below it is answered by a
+    dictionary lookup, including the negative ones: a missing file costs no
+    system call. Only candidates that are symbolic links are resolved on the
+    filesystem, once each.
+
+    ``FileLocator.find_file`` has the same signature, search order, returned
+    paths, anchor-escape checks and errors as :func:`find_file`.
+
+    The locator does not watch the filesystem. Files created or removed
+    during the batch are only seen after :meth:`invalidate`. A locator is
+    safe to share between threads.
+
+    Examples
+    --------
+    >>> locator = FileLocator()
+    >>> for name in ("a.md", "b.md"):
+    ...     locator.find_file(name, [Path.cwd()], [".", "docs"], max_up=2)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._anchors: dict[str, Path] = {}
+        self._folders: dict[tuple[Path, Path], Path] = {}
+        self._listings: dict[Path, Optional[tuple[dict[str, int], frozenset[str]]]] = {}
+        self._links: dict[Path, tuple[Path, bool]] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """Number of folder lookups answered from a cached listing."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of folders listed on the filesystem."""
+        return self._misses
+
+    def find_file(
+        self,
+        filename: str,
+        start_points: Sequence[PathInput],
+        relative_paths: Sequence[PathInput],
+        *,
+        max_up: int = 4,
+    ) -> Path:
+        """
+        Find a file like :func:`find_file`, using the cached listings.
+
+        Parameters
+        ----------
+        filename, start_points, relative_paths, max_up
+            See :func:`find_file`.
+
+        Returns
+        -------
+        Path
+            Absolute normalized path of the first file found.
+
+        Raises
+        ------
+        ValueError
+            For invalid arguments, or if a resolved candidate escapes its anchor.
+        FileNotFoundError
+            If no matching file is found. The message lists the tested paths.
+        """
+        filename, rel_paths = _check_find_file_arguments(
+            filename, relative_paths, max_up
+        )
+        leaf = Path(filename).name
+        cwd: Optional[str] = None
+        tested: list[Path] = []
+
+        for start in start_points:
+            base = _p(start)
+            for up in range(0, max_up + 1):
+                anchor = base
+                for _ in range(up):
+                    anchor = anchor.parent
+
+                if cwd is None and not anchor.is_absolute():
+                    cwd = os.getcwd()
+                resolved_anchor = self._resolve_anchor(anchor, cwd)
+                for rel_p in rel_paths:
+                    candidate, found = self._probe(resolved_anchor, rel_p, leaf)
+                    if not candidate.is_relative_to(resolved_anchor):
+                        raise ValueError(
+                            f"Resolved search path escapes its anchor: {anchor / rel_p}"
+                        )
+                    tested.append(candidate)
+                    if found:
+                        return candidate
+
+        raise FileNotFoundError(
+            f"File not found: {filename!r}. Tested {len(tested)} paths: {[str(p) for p in tested]}"
+        )
+
+    def invalidate(self, path: Optional[PathInput] = None) -> int:
+        """
+        Forget cached listings.
+
+        Parameters
+        ----------
+        path : str | os.PathLike[str] | Path | None, default=None
+            Folder whose content changed, or a file created or removed in it.
+            The listings of ``path`` and of its parent folder are dropped.
+            ``None`` drops everything, including the resolved anchors and
+            folders; use it after links or folders were moved.
+
+        Returns
+        -------
+        int
+            The number of dropped folder listings.
+        """
+        with self._lock:
+            if path is None:
+                dropped = len(self._listings)
+                self._anchors.clear()
+                self._folders.clear()
+                self._listings.clear()
+                self._links.clear()
+                return dropped
+
+            resolved = _p(path).resolve(strict=False)
+            folders = {resolved, resolved.parent}
+            dropped = 0
+            for folder in folders:
+                if self._listings.pop(folder, False) is not False:
+                    dropped += 1
+            for link in [link for link in self._links if link.parent in folders]:
+                del self._links[link]
+            return dropped
+
+    def _resolve_anchor(self, anchor: Path, cwd: Optional[str]) -> Path:
+        """Return ``anchor.resolve(strict=False)``, memoized per absolute anchor."""
+        key = str(anchor) if cwd is None else os.path.join(cwd, anchor)
+        with self._lock:
+            resolved = self._anchors.get(key)
+        if resolved is None:
+            resolved = anchor.resolve(strict=False)
+            with self._lock:
+                self._anchors[key] = resolved
+        return resolved
+
+    def _probe(self, resolved_anchor: Path, rel_p: Path, leaf: str) -> tuple[Path, bool]:
+        """
+        Return the resolved candidate ``anchor / rel / leaf`` and whether it is a file.
+
+        The folder is resolved once; the leaf is looked up in its listing and
+        only resolved on the filesystem when it is a link, or when the
+        listing is unavailable or differs only by case.
+        """
+        key = (resolved_anchor, rel_p)
+        with self._lock:
+            folder = self._folders.get(key)
+        if folder is None:
+            folder = (resolved_anchor / rel_p).resolve(strict=False)
+            with self._lock:
+                self._folders[key] = folder
+
+        listing = self._listing(folder)
+        candidate = folder / leaf
+        if listing is not None:
+            entries, folded = listing
+            kind = entries.get(leaf)
+            if kind is None and leaf.casefold() not in folded:
+                return candidate, False
+            if kind == _ENTRY_FILE:
+                return candidate, True
+            if kind == _ENTRY_OTHER:
+                return candidate, False
+
+        with self._lock:
+            cached = self._links.get(candidate)
+        if cached is None:
+            resolved = candidate.resolve(strict=False)
+            cached = (resolved, resolved.is_file())
+            with self._lock:
+                self._links[candidate] = cached
+        return cached
+
+    def _listing(
+        self, folder: Path
+    ) -> Optional[tuple[dict[str, int], frozenset[str]]]:
+        """Return the cached entries of ``folder``, listing it on first use."""
+        with self._lock:
+            if folder in self._listings:
+                self._hits += 1
+                return self._listings[folder]
+            self._misses += 1
+
+        listing: Optional[tuple[dict[str, int], frozenset[str]]]
+        try:
+            entries: dict[str, int] = {}
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.is_symlink():
+                        entries[entry.name] = _ENTRY_LINK
+                    elif entry.is_file(follow_symlinks=False):
+                        entries[entry.name] = _ENTRY_FILE
+                    else:
+                        entries[entry.name] = _ENTRY_OTHER
+            listing = (entries, frozenset(name.casefold() for name in entries))
+        except (FileNotFoundError, NotADirectoryError):
+            listing = ({}, frozenset())
+        except OSError:
+            # Unreadable folder: fall back to per-candidate checks.
+            listing = None
+
+        with self._lock:
+            self._listings[folder] = listing
+        return listing
 # -----------------------------------------------------------------------------
 
 
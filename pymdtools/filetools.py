@@ -14,15 +14,25 @@ filesystem behavior. It provides:
 
 - ``get_template_file``: read a file from a local ``template/`` directory.
 - ``get_template_files_in_folder``: list direct files under a template subfolder.
+- ``configure_template_cache``, ``preload_templates``, ``template_cache_info``:
+  opt-in LRU cache of template lookups and contents.
 - ``FileName``: keep and edit a normalized file path by path/name/suffix.
-- ``FileContent``: keep a file path together with an editable text buffer.
+- ``FileContent``: keep a file path together with an editable text buffer,
+  optionally loaded on first use, with a memory-mapped raw-bytes view.
 
 The module is intentionally text-oriented. Binary detection, encoding detection,
 atomic writes, backups, and path validation are delegated to ``pymdtools.common``.
 """
 
+import mmap
+import os
+import stat
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path, PureWindowsPath
-from typing import Optional, List
+from typing import Generator, Optional, List, TypeVar, Union
 
 from . import common
 
@@ -118,12 +128,44 @@ def get_template_file(
         OSError: Propagated from the underlying file read operation.
     """
     rel = _relative_template_path(filename, name="filename")
+    if _template_cache_size == 0:
+        return common.get_file_content(_locate_template(rel, start_folder))
+
+    key = (_template_cache_base(start_folder), rel.as_posix())
+    with _template_cache_lock:
+        candidate = _template_paths.get(key)
+        if candidate is not None:
+            _template_paths.move_to_end(key)
+    if candidate is None:
+        candidate = _locate_template(rel, start_folder)
+        _template_cache_put(_template_paths, key, candidate)
+
+    try:
+        st = candidate.stat()
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        # Gone or replaced: forget the lookup and raise the uncached error.
+        with _template_cache_lock:
+            _template_paths.pop(key, None)
+        return common.get_file_content(_locate_template(rel, start_folder))
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _template_cache_get(_template_texts, candidate, stamp)
+    if cached is not None:
+        return cached
+    text = common.get_file_content(candidate)
+    _template_cache_put(_template_texts, candidate, (stamp, text))
+    return text
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _locate_template(rel: Path, start_folder: common.PathInput | None) -> Path:
+    """Return the checked template file *rel*, rejecting escapes."""
     template_dir = common.check_folder(_template_base(start_folder) / "template")
     candidate = _resolve_template_child(template_dir, rel, name="template path")
-
-    # --- read content ---
-    common.check_file(candidate)
-    return common.get_file_content(candidate)
+    return common.check_file(candidate)
 # -----------------------------------------------------------------------------
 
 
@@ -149,6 +191,37 @@ def get_template_files_in_folder(
         NotADirectoryError: If the resolved template folder is not a directory.
     """
     rel = _relative_template_path(folder, name="folder")
+    if _template_cache_size == 0:
+        return _list_template_folder(rel, start_folder)[1]
+
+    key = (_template_cache_base(start_folder), rel.as_posix())
+    with _template_cache_lock:
+        listing = _template_listings.get(key)
+    stamp: Optional[int] = None
+    if listing is not None:
+        try:
+            stamp = listing[1][0].stat().st_mtime_ns
+        except OSError:
+            pass
+    # A directory's mtime changes whenever an entry is added or removed.
+    cached = _template_cache_get(_template_listings, key, stamp)
+    if cached is not None:
+        return list(cached[1])
+
+    local_template_folder, files = _list_template_folder(rel, start_folder)
+    stamp = local_template_folder.stat().st_mtime_ns
+    _template_cache_put(
+        _template_listings, key, (stamp, (local_template_folder, tuple(files)))
+    )
+    return files
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _list_template_folder(
+    rel: Path, start_folder: common.PathInput | None
+) -> tuple[Path, List[str]]:
+    """Return the checked folder ``template/<rel>`` and its template files."""
     template_dir = common.check_folder(_template_base(start_folder) / "template")
     local_template_folder = common.check_folder(
         _resolve_template_child(template_dir, rel, name="template folder")
@@ -164,7 +237,181 @@ def get_template_files_in_folder(
         if resolved_file.is_file():
             files.append((rel / p.name).as_posix())
 
-    return files
+    return local_template_folder, files
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+# Template lookups, contents and folder listings, most recently used last.
+# Contents are stamped with (st_mtime_ns, st_size) and listings with the
+# folder's st_mtime_ns. Disabled while the size is 0.
+_TemplateKey = tuple[Optional[str], str]
+_K = TypeVar("_K")
+_S = TypeVar("_S")
+_V = TypeVar("_V")
+_template_paths: OrderedDict[_TemplateKey, Path] = OrderedDict()
+_template_texts: OrderedDict[Path, tuple[tuple[int, int], str]] = OrderedDict()
+_template_listings: OrderedDict[
+    _TemplateKey, tuple[int, tuple[Path, tuple[str, ...]]]
+] = OrderedDict()
+_template_cache_lock = threading.Lock()
+_template_cache_size = 0
+_template_cache_hits = 0
+_template_cache_misses = 0
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class TemplateCacheInfo:
+    """Statistics of the template cache."""
+    hits: int
+    misses: int
+    currsize: int
+    maxsize: int
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def configure_template_cache(maxsize: int = 256) -> None:
+    """
+    Enable, resize or disable the process-wide template cache.
+
+    While enabled, :func:`get_template_file` validates and resolves each
+    template path once, then serves its content from memory until the file's
+    ``st_mtime_ns`` or size changes; :func:`get_template_files_in_folder`
+    reuses a listing until the folder's ``st_mtime_ns`` changes. Lookups are
+    remembered until :func:`clear_template_cache`, so a template replaced by
+    a symbolic link is not checked for escapes again.
+
+    Args:
+        maxsize: Maximum number of templates (and, separately, of lookups and
+            folder listings) kept. 0 disables the cache and drops it.
+
+    Raises:
+        ValueError: If ``maxsize`` is negative.
+    """
+    global _template_cache_size
+    if maxsize < 0:
+        raise ValueError(f"maxsize must be >= 0, got: {maxsize}")
+
+    with _template_cache_lock:
+        _template_cache_size = maxsize
+        for entries in (_template_paths, _template_texts, _template_listings):
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def clear_template_cache() -> None:
+    """Drop every entry of the template cache and reset its statistics."""
+    global _template_cache_hits, _template_cache_misses
+    with _template_cache_lock:
+        _template_paths.clear()
+        _template_texts.clear()
+        _template_listings.clear()
+        _template_cache_hits = _template_cache_misses = 0
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def template_cache_info() -> TemplateCacheInfo:
+    """
+    Return the template cache statistics.
+
+    ``hits`` and ``misses`` count template contents and folder listings
+    served from memory or read from disk; ``currsize`` is the number of
+    cached template contents.
+    """
+    with _template_cache_lock:
+        return TemplateCacheInfo(
+            hits=_template_cache_hits,
+            misses=_template_cache_misses,
+            currsize=len(_template_texts),
+            maxsize=_template_cache_size,
+        )
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def preload_templates(
+    folder: common.PathInput = ".",
+    start_folder: common.PathInput | None = None,
+) -> int:
+    """
+    Read every template below ``template/<folder>`` into the template cache.
+
+    Files that cannot be loaded as text templates (binary assets, links
+    escaping the template directory) are skipped. Templates beyond the cache
+    size evict the ones read first.
+
+    Args:
+        folder: Subfolder of the ``template/`` directory; ``"."`` for all.
+        start_folder: Optional folder or file used to locate ``template/``.
+
+    Returns:
+        The number of templates read.
+
+    Raises:
+        ValueError: If the cache is disabled, or ``folder`` is invalid.
+        FileNotFoundError: If the template folder does not exist.
+        NotADirectoryError: If the template folder is not a directory.
+    """
+    if _template_cache_size == 0:
+        raise ValueError("template cache is disabled; call configure_template_cache()")
+
+    rel = _relative_template_path(folder, name="folder")
+    template_dir = common.check_folder(_template_base(start_folder) / "template")
+    local_template_folder = common.check_folder(
+        _resolve_template_child(template_dir, rel, name="template folder")
+    )
+
+    count = 0
+    for path in common.walk_files(local_template_folder):
+        try:
+            get_template_file(path.relative_to(template_dir), start_folder)
+        except ValueError:
+            continue
+        count += 1
+    return count
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _template_cache_base(start_folder: common.PathInput | None) -> Optional[str]:
+    """Key a ``start_folder`` argument; relative ones follow the cwd."""
+    if start_folder is None:
+        return None
+    return os.path.abspath(os.fspath(start_folder))
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _template_cache_get(
+    entries: "OrderedDict[_K, tuple[_S, _V]]", key: _K, stamp: Optional[_S]
+) -> Optional[_V]:
+    """Return the cached value of *key* if its stamp matches, else None."""
+    global _template_cache_hits, _template_cache_misses
+    with _template_cache_lock:
+        entry = entries.get(key)
+        if entry is None or entry[0] != stamp:
+            _template_cache_misses += 1
+            return None
+        entries.move_to_end(key)
+        _template_cache_hits += 1
+        return entry[1]
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+def _template_cache_put(entries: "OrderedDict[_K, _V]", key: _K, value: _V) -> None:
+    """Store *value* under *key* as most recently used, evicting beyond the size."""
+    with _template_cache_lock:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > _template_cache_size:
+            entries.popitem(last=False)
 # -----------------------------------------------------------------------------
 
 
@@ -326,16 +573,22 @@ class FileContent(FileName):
     ``FileContent`` extends ``FileName`` with an in-memory text buffer:
 
     - if instantiated with an existing filename and ``content is None``, the
-      file is read immediately;
+      file is read immediately, or on first access to ``content`` when
+      ``lazy=True``;
     - setting ``content`` marks the object as needing a save;
     - ``read()`` reloads content from disk and clears ``save_needed``;
     - ``write()`` writes the current content to disk and clears ``save_needed``;
     - if ``backup`` is true, ``write()`` creates a numbered backup before
-      overwriting an existing file.
+      overwriting an existing file;
+    - ``write(skip_if_unchanged=True)`` leaves a file that already holds the
+      content untouched, without backup.
 
     ``content`` may be ``None`` to represent an empty/unloaded buffer, but
     ``write()`` requires actual text. Assigning any non-string, non-``None``
     value raises ``TypeError``.
+
+    ``raw_view()`` maps the file on disk read-only, so byte-level scanners can
+    search a large file without decoding it or loading the text buffer.
     """
 
     def __init__(
@@ -345,16 +598,24 @@ class FileContent(FileName):
         *,
         backup: bool = True,
         encoding: str | None = None,
+        lazy: bool = False,
     ) -> None:
         super().__init__(filename=filename)
 
         self._content: Optional[str] = None
+        self._disk_content: Optional[str] = None
         self._backup: bool = bool(backup)
         self._save_needed: bool = False
+        # File still to be read on first access to ``content`` (lazy mode).
+        self._pending: Optional[Path] = None
+        self._encoding: str | None = encoding
 
         if self.is_file() and content is None:
-            self.read(encoding=encoding)
-            self._save_needed = False
+            if lazy:
+                self._pending = self._path
+            else:
+                self.read(encoding=encoding)
+                self._save_needed = False
 
         if content is not None:
             self.content = content  # sets save_needed
@@ -362,14 +623,27 @@ class FileContent(FileName):
     @property
     def content(self) -> Optional[str]:
         """Return the in-memory text content, or ``None`` if unloaded."""
+        if self._pending is not None:
+            path = self._path
+            self.read(self._pending, encoding=self._encoding)
+            if path != self._path:
+                # Loading is not a rename: keep a path edited in the meantime.
+                self._path = path
+                self._disk_content = None
         return self._content
 
     @content.setter
     def content(self, value: Optional[str]) -> None:
         """Set the in-memory text content and mark the file as needing a save."""
         self._content = _validate_text_content(value)
+        self._pending = None
         self._save_needed = True
 
+    @property
+    def loaded(self) -> bool:
+        """Return whether a lazy read is no longer pending."""
+        return self._pending is None
+
     @property
     def backup(self) -> bool:
         """Return whether writes create a backup before overwriting a file."""
@@ -405,35 +679,83 @@ class FileContent(FileName):
         content = common.get_file_content(target, encoding=encoding)
         self._path = target
         self._content = content
+        self._disk_content = content
+        self._pending = None
         self._save_needed = False
 
+    @contextmanager
+    def raw_view(self) -> Generator[Union[mmap.mmap, bytes], None, None]:
+        """
+        Yield a read-only view of the raw bytes of the file on disk.
+
+        The view is a memory map, so the operating system pages the file in on
+        demand: ``find()``, slicing and ``re`` patterns on ``bytes`` work on it
+        without reading or decoding the whole file. An empty file yields
+        ``b""``. The view reflects the file, not unsaved in-memory content,
+        and does not load the text buffer. It is closed on exit.
+        """
+        if self._path is None:
+            raise ValueError("cannot map content without a filename")
+
+        with open(common.check_file(self._path), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                yield view
+
     def write(
         self,
         filename: common.PathInput | None = None,
         *,
         encoding: str = "utf-8",
         backup_ext: str = ".bak",
-    ) -> None:
+        skip_if_unchanged: bool = False,
+    ) -> bool:
         """
         Write the in-memory text content to disk.
 
         If ``filename`` is provided, it replaces the current stored path only
         after a successful write. When backups are enabled and the target file
         already exists, a backup is created before writing the new content.
+
+        With ``skip_if_unchanged=True``, a target that already holds the
+        encoded content is neither backed up nor rewritten. Content that
+        differs from the text last read from or written to the same file is
+        known to be new and is written without comparing.
+
+        Returns ``True`` if the file was written, ``False`` if it was skipped.
         """
         target = common.normpath(filename) if filename is not None else self._path
         if target is None:
             raise ValueError("cannot write content without a filename")
 
-        if self._content is None:
+        content = self.content
+        if content is None:
             raise ValueError("cannot write: content is None")
 
+        known_changed = target == self._path and self._disk_content not in (
+            None,
+            content,
+        )
+        if (
+            skip_if_unchanged
+            and not known_changed
+            and common.same_file_content(target, content, encoding)
+        ):
+            self._path = target
+            self._disk_content = content
+            self._save_needed = False
+            return False
+
         if self.backup and target.is_file():
             common.create_backup(target, ext=backup_ext)
 
-        common.set_file_content(target, self._content, encoding=encoding)
+        common.set_file_content(target, content, encoding=encoding)
         self._path = target
+        self._disk_content = content
         self._save_needed = False
+        return True
 
     def __repr__(self) -> str:
         return f"FileContent(filename={self.full_filename!r}, content_len={None if self._content is None else len(self._content)})"
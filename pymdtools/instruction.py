@@ -28,9 +28,16 @@ from __future__ import annotations
 # Markdown Tools develops for Florent TOURNOIS
 #
 # -----------------------------------------------------------------------------
+import json
 import logging
 import os
 import re
+import sqlite3
+import threading
+from bisect import bisect_left
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from typing import (
@@ -45,15 +52,28 @@ from typing import (
     Optional,
     Pattern,
     Sequence,
+    Set,
     Union,
+    cast,
+    overload,
 )
 
 from . import common
-from .mdcommon import markdown_code_ranges, merge_ranges, position_in_ranges
+from .mdcommon import HTML_COMMENT_RE, DocumentScan, scan_markdown
 
 TitleStyle          = Literal["preserve", "setext", "atx"]
 IncludeRenderMode   = Literal["box", "raw"]
 RegexInput          = Union[str, Pattern[str]]
+DirectiveKind       = Literal[
+    "begin-ref",
+    "end-ref",
+    "begin-include",
+    "end-include",
+    "begin-var",
+    "end-var",
+    "var",
+    "include-file",
+]
 
 
 # -----------------------------------------------------------------------------
@@ -72,10 +92,10 @@ RegexInput          = Union[str, Pattern[str]]
 #
 # Used for: stripping comments from markdown text.
 # Notes:
-# - DOTALL to match multi-line comments.
-# - Non-greedy to stop at the first closing marker.
+# - The pattern of pymdtools.mdcommon, which also locates comments for
+#   DocumentScan: both modules agree on what a comment is.
 # -----------------------------------------------------------------------------
-_XML_COMMENT_RE: Final[re.Pattern[str]] = re.compile(r"<!--.*?-->", re.DOTALL)
+_XML_COMMENT_RE: Final[re.Pattern[str]] = HTML_COMMENT_RE
 
 
 # -----------------------------------------------------------------------------
@@ -259,6 +279,41 @@ _END_VAR_RE: Final[re.Pattern[str]] = re.compile(
 )
 
 
+# -----------------------------------------------------------------------------
+# 9) Directive lexer
+#
+# Every directive above starts with "<!--", optional spaces and a keyword.
+# _DIRECTIVE_HEAD_RE finds each such comment opening once; the keyword selects
+# the full pattern that is then matched at that position.
+#
+# Groups:
+# - keyword: directive keyword, a key of _DIRECTIVE_PATTERNS
+# -----------------------------------------------------------------------------
+_DIRECTIVE_HEAD_RE: Final[re.Pattern[str]] = re.compile(
+    r"""
+    <!--\s*
+    (?P<keyword>begin-ref|end-ref|begin-include|end-include
+               |begin-var|end-var|var|include-file)
+    """,
+    re.VERBOSE,
+)
+
+_DIRECTIVE_PATTERNS: Final[dict[DirectiveKind, re.Pattern[str]]] = {
+    "begin-ref": _BEGIN_REF_RE,
+    "end-ref": _END_REF_RE,
+    "begin-include": _BEGIN_INCLUDE_RE,
+    "end-include": _END_INCLUDE_RE,
+    "begin-var": _BEGIN_VAR_RE,
+    "end-var": _END_VAR_RE,
+    "var": _VAR_RE,
+    "include-file": _INCLUDE_FILE_RE,
+}
+
+_DIRECTIVE_KINDS: Final[dict[re.Pattern[str], DirectiveKind]] = {
+    pattern: kind for kind, pattern in _DIRECTIVE_PATTERNS.items()
+}
+
+
 # -----------------------------------------------------------------------------
 def _normalize_read_encoding(encoding: Optional[str]) -> Optional[str]:
     """
@@ -280,12 +335,6 @@ def _read_md_text(path: common.PathInput, encoding: Optional[str] = None) -> str
     return common.get_file_content(path, encoding=_normalize_read_encoding(encoding))
 
 
-# -----------------------------------------------------------------------------
-def _create_backup(path: common.PathInput, backup_ext: str) -> Path:
-    """Create a backup using the current ``common.create_backup`` signature."""
-    return common.create_backup(path, ext=backup_ext, date_prefix=common.today_utc())
-
-
 # -----------------------------------------------------------------------------
 def _require_str(value: object, name: str) -> str:
     """Return ``value`` as ``str`` or raise a stable runtime error."""
@@ -309,44 +358,206 @@ def _is_non_empty_str(value: object, *, strip: bool = False) -> bool:
     return bool(candidate)
 
 
+# -----------------------------------------------------------------------------
+@lru_cache(maxsize=64)
+def _compile_string_pattern(pattern: str) -> Pattern[str]:
+    """Compile a caller-provided pattern string once."""
+    return re.compile(pattern)
+
+
 # -----------------------------------------------------------------------------
 def _compile_pattern(pattern: RegexInput) -> Pattern[str]:
     """Return a compiled regex pattern."""
-    return re.compile(pattern) if isinstance(pattern, str) else pattern
+    return _compile_string_pattern(pattern) if isinstance(pattern, str) else pattern
 
 
 # -----------------------------------------------------------------------------
-def _finditer_outside_ranges(
-    pattern: Pattern[str],
-    text: str,
-    ranges: Sequence[tuple[int, int]],
-) -> list[Match[str]]:
-    """Return pattern matches whose opening character is not protected."""
-    return [
-        match
-        for match in pattern.finditer(text)
-        if not position_in_ranges(match.start(), ranges)
-    ]
+@dataclass(frozen=True)
+class DirectiveToken:
+    """
+    One directive comment found outside Markdown code.
+
+    Attributes:
+        kind: Directive keyword, such as ``"var"`` or ``"begin-include"``.
+        match: Match of the directive pattern on the source text.
+    """
+
+    kind: DirectiveKind
+    match: Match[str]
+
+    @property
+    def start(self) -> int:
+        """Offset of the opening ``<!--``."""
+        return self.match.start()
+
+    @property
+    def end(self) -> int:
+        """Offset just after the closing ``-->``."""
+        return self.match.end()
+
+    @property
+    def name(self) -> Optional[str]:
+        """Captured ``name`` group, or None for end markers."""
+        return self.match.groupdict().get("name")
 
 
 # -----------------------------------------------------------------------------
-def _search_outside_ranges(
+class _DirectiveIndex:
+    """
+    Directive matches of one text, grouped by kind.
+
+    ``found`` keeps, per kind, every match opening outside code. The helpers
+    of this module read it in two ways:
+
+    - listing helpers behave like ``finditer``: a directive nested inside an
+      earlier directive of the same kind is not reported, even when the outer
+      one is dropped for opening inside code. ``nested`` holds the positions
+      of those matches in ``found``;
+    - sequential helpers behave like ``search``: they take the first
+      directive opening at or after an offset, whatever precedes it.
+    """
+
+    def __init__(
+        self,
+        found: Dict[DirectiveKind, List[Match[str]]],
+        nested: Dict[DirectiveKind, set[int]],
+    ) -> None:
+        self._found = found
+        self._nested = nested
+        self._listed: Dict[DirectiveKind, List[Match[str]]] = {}
+        self._starts: Dict[DirectiveKind, List[int]] = {}
+        self._tokens: List[DirectiveToken] | None = None
+
+    def listed(self, kind: DirectiveKind) -> List[Match[str]]:
+        """Return the ``finditer``-style matches of ``kind``."""
+        listed = self._listed.get(kind)
+        if listed is None:
+            found = self._found[kind]
+            nested = self._nested[kind]
+            listed = (
+                [match for i, match in enumerate(found) if i not in nested]
+                if nested
+                else found
+            )
+            self._listed[kind] = listed
+        return listed
+
+    def search(self, kind: DirectiveKind, pos: int) -> Match[str] | None:
+        """Return the first match of ``kind`` opening at or after ``pos``."""
+        starts = self._starts.get(kind)
+        if starts is None:
+            starts = [match.start() for match in self._found[kind]]
+            self._starts[kind] = starts
+        index = bisect_left(starts, pos)
+        return self._found[kind][index] if index < len(starts) else None
+
+    @property
+    def tokens(self) -> List[DirectiveToken]:
+        """Return the listed matches of every kind in document order."""
+        if self._tokens is None:
+            self._tokens = sorted(
+                (
+                    DirectiveToken(kind, match)
+                    for kind in _DIRECTIVE_PATTERNS
+                    for match in self.listed(kind)
+                ),
+                key=lambda token: token.start,
+            )
+        return self._tokens
+
+
+# -----------------------------------------------------------------------------
+def _lex_directives(scan: DocumentScan) -> _DirectiveIndex:
+    """Classify every directive comment of ``scan.text`` in a single pass."""
+    text = scan.text
+    matchers = {kind: pattern.match for kind, pattern in _DIRECTIVE_PATTERNS.items()}
+    found: Dict[DirectiveKind, List[Match[str]]] = {
+        kind: [] for kind in _DIRECTIVE_PATTERNS
+    }
+    nested: Dict[DirectiveKind, set[int]] = {kind: set() for kind in _DIRECTIVE_PATTERNS}
+    listed_until = dict.fromkeys(_DIRECTIVE_PATTERNS, 0)
+
+    # Heads come in document order, so code ranges are walked alongside them.
+    no_more_code = (len(text) + 1, len(text) + 1)
+    code_spans = iter(scan.code_ranges.ranges)
+    code_start, code_end = next(code_spans, no_more_code)
+
+    for head in _DIRECTIVE_HEAD_RE.finditer(text):
+        kind = cast(DirectiveKind, head["keyword"])
+        start = head.start()
+        match = matchers[kind](text, start)
+        if match is None:
+            continue
+        while start >= code_end:
+            code_start, code_end = next(code_spans, no_more_code)
+        if start >= code_start:
+            if start >= listed_until[kind]:
+                listed_until[kind] = match.end()
+            continue
+        if start < listed_until[kind]:
+            nested[kind].add(len(found[kind]))
+        else:
+            listed_until[kind] = match.end()
+        found[kind].append(match)
+
+    return _DirectiveIndex(found, nested)
+
+
+# -----------------------------------------------------------------------------
+def _directive_index(scan: DocumentScan) -> _DirectiveIndex:
+    """Return the directive tokens of ``scan``, lexed once per scan."""
+    return scan.cached("instruction.directives", _lex_directives)
+
+
+# -----------------------------------------------------------------------------
+def _directive_matches(scan: DocumentScan, pattern: Pattern[str]) -> list[Match[str]]:
+    """Return ``finditer``-style matches of ``pattern`` outside code."""
+    kind = _DIRECTIVE_KINDS.get(pattern)
+    if kind is None:
+        return scan.matches(pattern)
+    return _directive_index(scan).listed(kind)
+
+
+# -----------------------------------------------------------------------------
+def _directive_search(
+    scan: DocumentScan,
     pattern: Pattern[str],
-    text: str,
-    start: int,
-    ranges: Sequence[tuple[int, int]],
+    pos: int,
 ) -> Match[str] | None:
-    """Return the first match at or after ``start`` outside protected ranges."""
-    match = pattern.search(text, start)
-    while match is not None and position_in_ranges(match.start(), ranges):
-        match = pattern.search(text, max(match.end(), match.start() + 1))
-    return match
+    """Return the first match of ``pattern`` at or after ``pos`` outside code."""
+    kind = _DIRECTIVE_KINDS.get(pattern)
+    if kind is None:
+        return scan.search(pattern, pos)
+    return _directive_index(scan).search(kind, pos)
 
 
 # -----------------------------------------------------------------------------
-def _directive_matches(pattern: Pattern[str], text: str) -> list[Match[str]]:
-    """Return directive matches that are outside Markdown code."""
-    return _finditer_outside_ranges(pattern, text, markdown_code_ranges(text))
+def tokenize_directives(
+    text: str,
+    *,
+    scan: Optional[DocumentScan] = None,
+) -> List[DirectiveToken]:
+    """
+    Return the directive comments of a markdown text in document order.
+
+    Each ``<!--`` is located once and classified by its keyword. Directives
+    opening inside Markdown code are skipped, and a directive nested inside an
+    earlier directive of the same kind is not reported, exactly as the
+    extraction helpers of this module see them.
+
+    Args:
+        text: Markdown text to analyze.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
+
+    Returns:
+        A new list of tokens. The tokens are cached with the scan.
+
+    Raises:
+        TypeError: If `text` is not a str.
+        ValueError: If `scan` was built for another text.
+    """
+    text = _require_str(text, "text")
+    return list(_directive_index(scan_markdown(text, scan)).tokens)
 
 
 # -----------------------------------------------------------------------------
@@ -368,26 +579,18 @@ def strip_xml_comment(text: str) -> str:
 
 
 # -----------------------------------------------------------------------------
-def _first_title_match(text: str) -> tuple[Match[str], TitleStyle] | None:
+def _first_title_match(
+    scan: DocumentScan,
+) -> tuple[Match[str], TitleStyle] | None:
     """Return the first real H1 and its source style."""
-    protected_ranges = merge_ranges(
-        [
-            *markdown_code_ranges(text),
-            *(match.span() for match in _XML_COMMENT_RE.finditer(text)),
-        ]
-    )
     candidates: list[tuple[Match[str], TitleStyle]] = []
     candidates.extend(
         (match, "setext")
-        for match in _finditer_outside_ranges(
-            _SETEXT_H1_RE, text, protected_ranges
-        )
+        for match in scan.matches(_SETEXT_H1_RE, skip_comments=True)
     )
     candidates.extend(
         (match, "atx")
-        for match in _finditer_outside_ranges(
-            _ATX_H1_RE, text, protected_ranges
-        )
+        for match in scan.matches(_ATX_H1_RE, skip_comments=True)
     )
     return min(candidates, key=lambda item: item[0].start()) if candidates else None
 
@@ -395,7 +598,9 @@ def _first_title_match(text: str) -> tuple[Match[str], TitleStyle] | None:
 # -----------------------------------------------------------------------------
 def get_refs_from_md_text(
         text: str, 
-        previous_refs: Optional[Dict[str, str]] = None
+        previous_refs: Optional[Dict[str, str]] = None,
+        *,
+        scan: Optional[DocumentScan] = None,
         ) -> Dict[str, str]:
     """
     Extract reference blocks from a markdown text.
@@ -409,20 +614,22 @@ def get_refs_from_md_text(
     Args:
         text: Input markdown text.
         previous_refs: Optional dict to update (copied to avoid side effects).
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         A dict mapping ref names to their raw extracted content.
 
     Raises:
-        ValueError: If a ref name is duplicated or an end marker is missing.
+        ValueError: If a ref name is duplicated or an end marker is missing,
+            or if `scan` was built for another text.
     """
     text = _require_str(text, "text")
     refs: Dict[str, str] = dict(previous_refs) if previous_refs else {}
-    code_ranges = markdown_code_ranges(text)
+    scan = scan_markdown(text, scan)
 
     pos = 0
     while True:
-        m_begin = _search_outside_ranges(_BEGIN_REF_RE, text, pos, code_ranges)
+        m_begin = _directive_search(scan, _BEGIN_REF_RE, pos)
         if not m_begin:
             return refs
 
@@ -431,7 +638,7 @@ def get_refs_from_md_text(
             raise ValueError(f"duplicate begin-ref({key})")
 
         after_begin = m_begin.end()
-        m_end = _search_outside_ranges(_END_REF_RE, text, after_begin, code_ranges)
+        m_end = _directive_search(scan, _END_REF_RE, after_begin)
         if not m_end:
             raise ValueError(f"begin-ref({key}) without end-ref")
 
@@ -440,11 +647,339 @@ def get_refs_from_md_text(
 # -----------------------------------------------------------------------------
 
 
+# -----------------------------------------------------------------------------
+_PARSE_CACHE_SCHEMA: Final[int] = 1
+
+# Directory scans read files in a process pool instead of threads once the
+# files to parse add up to this many bytes (and no ParseCache is involved).
+_PROCESS_POOL_MIN_BYTES: Final[int] = 16 * 1024 * 1024
+
+_ParseKind = Literal["refs", "vars"]
+_FileStamp = tuple[int, int, int]
+
+
+# -----------------------------------------------------------------------------
+def _parse_cache_key(path: common.PathInput) -> str:
+    """Return the :class:`ParseCache` key of a file: its resolved path."""
+    return str(common.normpath(path).resolve())
+
+
+# -----------------------------------------------------------------------------
+class ParseCache:
+    """
+    Opt-in on-disk cache of the refs and vars extracted from markdown files.
+
+    Entries live in a small SQLite database. Each one is keyed by the resolved
+    file path, so a symlink and its target share it, and stamped with the file size, modification time (ns) and
+    inode; a file whose stamp is unchanged is neither read, decoded nor
+    scanned again. Pass the cache with the ``cache=`` keyword of the
+    ``get_refs_*`` / ``get_vars_*`` file helpers and of
+    ``search_include_refs_to_md_file`` / ``search_include_vars_to_md_file``.
+
+    The cache is safe to share between threads. Files that fail to parse are
+    never stored, so their errors are raised again on the next call.
+
+    Args:
+        path: Database file, created when missing. ``":memory:"`` keeps the
+            cache in memory for the lifetime of the object.
+
+    Example:
+        >>> with ParseCache(".pymdtools-cache.sqlite") as cache:
+        ...     search_include_refs_to_md_file("docs/page.md", cache=cache)
+    """
+
+    def __init__(self, path: common.PathInput) -> None:
+        self.path: str = ":memory:" if path == ":memory:" else str(common.to_path(path))
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != _PARSE_CACHE_SCHEMA:
+                self._connection.execute("DROP TABLE IF EXISTS entries")
+                self._connection.execute(f"PRAGMA user_version = {_PARSE_CACHE_SCHEMA}")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " path TEXT NOT NULL, kind TEXT NOT NULL, encoding TEXT NOT NULL,"
+                " size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " inode INTEGER NOT NULL, payload TEXT NOT NULL,"
+                " PRIMARY KEY (path, kind, encoding))"
+            )
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups answered from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups that required reading the file."""
+        return self._misses
+
+    def invalidate(self, path: common.PathInput) -> int:
+        """
+        Drop the entries of one file.
+
+        Args:
+            path: File whose refs and vars must be parsed again.
+
+        Returns:
+            The number of removed entries.
+        """
+        key = _parse_cache_key(path)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "DELETE FROM entries WHERE path = ?", (key,)
+            )
+        return cursor.rowcount
+
+    def clear(self) -> int:
+        """
+        Drop every entry and reset the hit/miss counters.
+
+        Returns:
+            The number of removed entries.
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute("DELETE FROM entries")
+            self._hits = 0
+            self._misses = 0
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self) -> ParseCache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def lookup(
+        self,
+        path: str,
+        kind: _ParseKind,
+        encoding: str,
+    ) -> tuple[_FileStamp, Optional[Dict[str, str]]]:
+        """
+        Return the current stamp of a file and its entry when still valid.
+
+        Args:
+            path: File key, from :func:`_parse_cache_key`.
+            kind: ``"refs"`` or ``"vars"``.
+            encoding: Read encoding, ``""`` for auto-detection.
+
+        Returns:
+            The ``(size, mtime_ns, inode)`` stamp taken now, and the cached
+            values, or ``None`` on a miss.
+        """
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, inode, payload FROM entries"
+                " WHERE path = ? AND kind = ? AND encoding = ?",
+                (path, kind, encoding),
+            ).fetchone()
+            if row is not None and tuple(row[:3]) == stamp:
+                self._hits += 1
+                return stamp, cast(Dict[str, str], json.loads(row[3]))
+            self._misses += 1
+        return stamp, None
+
+    def store(
+        self,
+        path: str,
+        kind: _ParseKind,
+        encoding: str,
+        stamp: _FileStamp,
+        values: Mapping[str, str],
+    ) -> None:
+        """
+        Record the values parsed from a file.
+
+        Pass the stamp returned by :meth:`lookup` before the file was read:
+        if the file changed while it was read, the next lookup misses.
+
+        Args:
+            path: File key, from :func:`_parse_cache_key`.
+            kind: ``"refs"`` or ``"vars"``.
+            encoding: Read encoding, ``""`` for auto-detection.
+            stamp: Stamp returned by :meth:`lookup`.
+            values: Values extracted from this file alone.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, kind, encoding, *stamp, json.dumps(values)),
+            )
+
+
+# -----------------------------------------------------------------------------
+def _md_directory_files(
+    folder: common.PathInput,
+    kind: _ParseKind,
+    filename_ext: str,
+    depth: int,
+) -> List[str]:
+    """
+    Return the files read by the directory helpers, in scan order.
+
+    Each folder contributes its own files before its subfolders. Refs are
+    scanned in name order and keep files whose suffix is ``filename_ext``;
+    vars keep the directory order and files whose name ends with it.
+    Symlinked folders are followed, each directory being read once.
+    """
+    root = common.check_folder(str(folder))
+    files = common.walk_files(
+        root,
+        max_depth=None if depth < 0 else depth,
+        follow_symlinks=True,
+        sort=kind == "refs",
+        files_first=True,
+    )
+    if kind == "refs":
+        return [str(path) for path in files if path.suffix == filename_ext]
+    return [str(path) for path in files if path.name.endswith(filename_ext)]
+
+
+# -----------------------------------------------------------------------------
+def _merge_parsed(
+    merged: Dict[str, str],
+    values: Mapping[str, str],
+    kind: _ParseKind,
+) -> Dict[str, str]:
+    """Add one file's values to ``merged`` with the text helpers' duplicate check."""
+    marker = "begin-ref" if kind == "refs" else "var"
+    for key, value in values.items():
+        if key in merged:
+            raise ValueError(f"duplicate {marker}({key})")
+        merged[key] = value
+    return merged
+
+
+# -----------------------------------------------------------------------------
+def _parse_md_file(
+    checked: Path,
+    kind: _ParseKind,
+    previous: Optional[Dict[str, str]],
+    *,
+    cache: Optional[ParseCache],
+    encoding: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Extract refs or vars from a checked file, going through ``cache`` if set.
+
+    A cached entry holds the values of the file alone; they are merged into
+    ``previous`` with the same duplicate check as the text helpers. On a miss
+    the file is parsed exactly as without a cache, so errors are unchanged.
+    """
+    extract = get_refs_from_md_text if kind == "refs" else get_vars_from_md_text
+    if cache is None:
+        return extract(_read_md_text(checked, encoding), previous)
+
+    path = _parse_cache_key(checked)
+    encoding_key = _normalize_read_encoding(encoding) or ""
+    stamp, values = cache.lookup(path, kind, encoding_key)
+    if values is not None:
+        return _merge_parsed(dict(previous) if previous else {}, values, kind)
+
+    merged = extract(_read_md_text(checked, encoding), previous)
+    skipped = len(previous) if previous else 0
+    cache.store(
+        path, kind, encoding_key, stamp, dict(list(merged.items())[skipped:])
+    )
+    return merged
+
+
+# -----------------------------------------------------------------------------
+def _parse_md_file_alone(
+    filename: str,
+    kind: _ParseKind,
+    filename_ext: str,
+    encoding: Optional[str],
+    cache: Optional[ParseCache],
+) -> Dict[str, str]:
+    """Return the values declared by one file; runs in pool workers."""
+    checked = common.check_file(filename, filename_ext)
+    return _parse_md_file(checked, kind, None, cache=cache, encoding=encoding)
+
+
+# -----------------------------------------------------------------------------
+def _parse_md_files(
+    files: Sequence[str],
+    kind: _ParseKind,
+    filename_ext: str,
+    previous: Optional[Dict[str, str]],
+    *,
+    cache: Optional[ParseCache],
+    encoding: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """
+    Merge the values of ``files`` in order, reading them in a pool if asked.
+
+    Workers parse each file on its own; the results are merged in ``files``
+    order. A file whose parse fails is parsed again on top of the merged
+    values, which raises the error a sequential scan raises at that point.
+    Files after the first failure are cancelled.
+    """
+    merged: Dict[str, str] = dict(previous) if previous else {}
+    if max_workers is None or max_workers <= 1 or len(files) <= 1:
+        for filename in files:
+            checked = common.check_file(filename, filename_ext)
+            merged = _parse_md_file(
+                checked, kind, merged, cache=cache, encoding=encoding
+            )
+        return merged
+
+    pool: Executor
+    if cache is None and sum(
+        os.path.getsize(filename) for filename in files
+    ) >= _PROCESS_POOL_MIN_BYTES:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [
+            common.submit_in_context(
+                pool,
+                _parse_md_file_alone,
+                filename,
+                kind,
+                filename_ext,
+                encoding,
+                cache,
+            )
+            for filename in files
+        ]
+        for filename, future in zip(files, futures):
+            try:
+                values: Optional[Dict[str, str]] = future.result()
+            except ValueError:
+                values = None
+            if values is None:
+                checked = common.check_file(filename, filename_ext)
+                merged = _parse_md_file(
+                    checked, kind, merged, cache=cache, encoding=encoding
+                )
+            else:
+                merged = _merge_parsed(merged, values, kind)
+    finally:
+        pool.shutdown(cancel_futures=True)
+    return merged
+
+
 # -----------------------------------------------------------------------------
 def get_refs_from_md_file(
     filename: common.PathInput,
     filename_ext: str = ".md",
     previous_refs: Optional[Dict[str, str]] = None,
+    *,
+    cache: Optional[ParseCache] = None,
 ) -> Dict[str, str]:
     """
     Extract reference blocks from a markdown file.
@@ -457,6 +992,7 @@ def get_refs_from_md_file(
         filename: Path to the markdown file.
         filename_ext: Expected file extension (including dot), e.g. ".md".
         previous_refs: Optional dict to merge with extracted refs.
+        cache: Optional :class:`ParseCache` reused when the file is unchanged.
 
     Returns:
         A dict mapping ref names to extracted content.
@@ -467,8 +1003,7 @@ def get_refs_from_md_file(
         ValueError: propagated from `get_refs_from_md_text` for malformed refs.
     """
     checked = common.check_file(str(filename), filename_ext)
-    text = _read_md_text(checked)
-    return get_refs_from_md_text(text, previous_refs=previous_refs)
+    return _parse_md_file(checked, "refs", previous_refs, cache=cache)
 # -----------------------------------------------------------------------------
 
 
@@ -478,6 +1013,9 @@ def get_refs_from_md_directory(
     filename_ext: str = ".md",
     previous_refs: Optional[Dict[str, str]] = None,
     depth: int = -1,
+    *,
+    cache: Optional[ParseCache] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, str]:
     """
     Extract refs from markdown files in a directory tree.
@@ -492,55 +1030,29 @@ def get_refs_from_md_directory(
         filename_ext: File extension to include (e.g. ".md").
         previous_refs: Optional dict to merge with extracted refs (copied).
         depth: Recursion depth.
+        cache: Optional :class:`ParseCache` reused for unchanged files.
+        max_workers: If greater than 1, read and parse files in a pool of that
+            size. Threads are used, or processes when the files add up to
+            more than 16 MiB and no `cache` is given. Refs are merged in scan
+            order, so errors are the ones of a sequential scan.
 
     Returns:
         A dict mapping ref names to extracted content.
-    """
-    folder_checked = common.check_folder(str(folder))
-    root = Path(folder_checked)
 
-    refs: Dict[str, str] = dict(previous_refs) if previous_refs else {}
-
-    # Current directory files (deterministic)
-    md_files = sorted(
-        (p for p in root.iterdir() if p.is_file() and p.suffix == filename_ext),
-        key=lambda p: p.name,
+    Notes:
+        Files of a folder are scanned in name order, before its subfolders.
+    """
+    files = _md_directory_files(folder, "refs", filename_ext, depth)
+    return _parse_md_files(
+        files,
+        "refs",
+        filename_ext,
+        previous_refs,
+        cache=cache,
+        max_workers=max_workers,
     )
-    for p in md_files:
-        refs = get_refs_from_md_file(
-            str(p),
-            filename_ext=filename_ext,
-            previous_refs=refs,
-        )
 
-    # Stop recursion
-    if depth == 0:
-        return refs
-
-    # Subdirectories (deterministic)
-    subdirs = sorted((p for p in root.iterdir() if p.is_dir()), key=lambda p: p.name)
-
-    if depth < 0:
-        # unlimited
-        for d in subdirs:
-            refs = get_refs_from_md_directory(
-                d,
-                filename_ext=filename_ext,   # ✅ propagate correctly
-                previous_refs=refs,
-                depth=-1,
-            )
-    else:
-        # limited
-        next_depth = depth - 1
-        for d in subdirs:
-            refs = get_refs_from_md_directory(
-                d,
-                filename_ext=filename_ext,   # ✅ propagate correctly
-                previous_refs=refs,
-                depth=next_depth,
-            )
 
-    return refs
 # -----------------------------------------------------------------------------
 
 
@@ -551,6 +1063,7 @@ def get_refs_from_search_folders(
     refs: Optional[Dict[str, str]] = None,
     filename_ext: str = ".md",
     depth: int = -1,
+    cache: Optional[ParseCache] = None,
 ) -> Dict[str, str]:
     """
     Extend/collect refs by scanning one or more folders recursively.
@@ -560,6 +1073,7 @@ def get_refs_from_search_folders(
         refs: Existing refs mapping to extend (copied to avoid side effects).
         filename_ext: File extension to scan (e.g. ".md").
         depth: Recursion depth (-1 unlimited, 0 current dir only, >0 limited).
+        cache: Optional :class:`ParseCache` reused for unchanged files.
 
     Returns:
         A dict mapping ref names to extracted content.
@@ -572,12 +1086,45 @@ def get_refs_from_search_folders(
             filename_ext=filename_ext,
             previous_refs=result,
             depth=depth,
+            cache=cache,
         )
 
     return result
 # -----------------------------------------------------------------------------
 
 
+# -----------------------------------------------------------------------------
+def _check_search_depths(depth_up: int, depth_down: int) -> None:
+    """Validate the depths of the ``*_around_md_file`` helpers."""
+    if depth_up < 0:
+        raise ValueError(f"depth_up must be >= 0, got: {depth_up}")
+    if depth_down < -1:
+        raise ValueError(f"depth_down must be >= -1, got: {depth_down}")
+
+
+# -----------------------------------------------------------------------------
+def _refs_search_root(
+    filename: common.PathInput,
+    depth_up: int,
+    depth_down: int,
+) -> tuple[Path, int]:
+    """Return the folder and depth scanned for refs around ``filename``."""
+    current_dir = Path(filename).resolve().parent
+
+    moved_up = 0
+    while moved_up < depth_up:
+        parent = current_dir.parent
+        if parent == current_dir:
+            break  # filesystem root reached
+        current_dir = parent
+        moved_up += 1
+
+    effective_depth_down = depth_down
+    if depth_down > 0:
+        effective_depth_down = depth_down + moved_up
+    return current_dir, effective_depth_down
+
+
 # -----------------------------------------------------------------------------
 def get_refs_around_md_file(
     filename: common.PathInput,
@@ -585,6 +1132,8 @@ def get_refs_around_md_file(
     previous_refs: Optional[Dict[str, str]] = None,
     depth_up: int = 1,
     depth_down: int = -1,
+    *,
+    cache: Optional[ParseCache] = None,
 ) -> Dict[str, str]:
     """
     Discover refs around a markdown file by scanning parent folders.
@@ -609,6 +1158,7 @@ def get_refs_around_md_file(
         previous_refs: Optional dict to extend.
         depth_up: Number of parent levels to move up (>= 0).
         depth_down: Recursion depth from the computed root (-1 unlimited, >= 0 limited).
+        cache: Optional :class:`ParseCache` reused for unchanged files.
 
     Returns:
         A dict mapping ref names to extracted content.
@@ -616,37 +1166,27 @@ def get_refs_around_md_file(
     Raises:
         ValueError: If `depth_up` < 0 or `depth_down` < -1.
     """
-    if depth_up < 0:
-        raise ValueError(f"depth_up must be >= 0, got: {depth_up}")
-    if depth_down < -1:
-        raise ValueError(f"depth_down must be >= -1, got: {depth_down}")
-
-    p = Path(filename).resolve()
-    current_dir = p.parent
-
-    moved_up = 0
-    while moved_up < depth_up:
-        parent = current_dir.parent
-        if parent == current_dir:
-            break  # filesystem root reached
-        current_dir = parent
-        moved_up += 1
-
-    effective_depth_down = depth_down
-    if depth_down > 0:
-        effective_depth_down = depth_down + moved_up
+    _check_search_depths(depth_up, depth_down)
+    current_dir, effective_depth_down = _refs_search_root(
+        filename, depth_up, depth_down
+    )
 
     return get_refs_from_md_directory(
         current_dir,
         filename_ext=filename_ext,
         previous_refs=previous_refs,
         depth=effective_depth_down,
+        cache=cache,
     )
 # -----------------------------------------------------------------------------
 
 
 # -----------------------------------------------------------------------------
-def refs_in_md_text(text: str) -> List[str]:
+def refs_in_md_text(
+    text: str,
+    *,
+    scan: Optional[DocumentScan] = None,
+) -> List[str]:
     """
     Extract include reference names from markdown text.
 
@@ -658,6 +1198,7 @@ def refs_in_md_text(text: str) -> List[str]:
 
     Args:
         text: Markdown text to analyze.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         A list of include reference names (strings).
@@ -667,7 +1208,7 @@ def refs_in_md_text(text: str) -> List[str]:
 
     return [
         match.group("name")
-        for match in _directive_matches(_BEGIN_INCLUDE_RE, text)
+        for match in _directive_matches(scan_markdown(text, scan), _BEGIN_INCLUDE_RE)
     ]
 # -----------------------------------------------------------------------------
 
@@ -679,6 +1220,8 @@ def include_refs_to_md_text(
     begin_include_re: RegexInput = _BEGIN_INCLUDE_RE,
     end_include_re: RegexInput = _END_INCLUDE_RE,
     error_if_no_key: bool = True,
+    *,
+    scan: Optional[DocumentScan] = None,
 ) -> str:
     """
     Insert include references into a markdown text.
@@ -706,6 +1249,7 @@ def include_refs_to_md_text(
         begin_include_re: Regex (compiled or string) matching the begin marker and capturing group 'name'.
         end_include_re: Regex (compiled or string) matching the end marker.
         error_if_no_key: Whether to raise if the key is missing.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         The processed markdown text.
@@ -719,23 +1263,19 @@ def include_refs_to_md_text(
     begin_pattern = _compile_pattern(begin_include_re)
     end_pattern = _compile_pattern(end_include_re)
 
-    code_ranges = markdown_code_ranges(text)
+    scan = scan_markdown(text, scan)
     parts: list[str] = []
     cursor = 0
 
     while True:
-        match_begin = _search_outside_ranges(
-            begin_pattern, text, cursor, code_ranges
-        )
+        match_begin = _directive_search(scan, begin_pattern, cursor)
         if match_begin is None:
             parts.append(text[cursor:])
             return "".join(parts)
 
         key = match_begin.group("name")
         logging.debug("Find the include key %s", key)
-        match_end = _search_outside_ranges(
-            end_pattern, text, match_begin.end(), code_ranges
-        )
+        match_end = _directive_search(scan, end_pattern, match_begin.end())
         if match_end is None:
             raise ValueError(f"begin-include({key}) without end-include")
 
@@ -752,6 +1292,7 @@ def include_refs_to_md_text(
 
 
 # -----------------------------------------------------------------------------
+@overload
 def include_refs_to_md_file(
     filename: common.PathInput,
     refs: Mapping[str, str],
@@ -764,7 +1305,56 @@ def include_refs_to_md_file(
     error_if_no_key: bool = True,
     read_encoding: Optional[str] = None,
     write_encoding: str = "utf-8",
-) -> str:
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
+) -> str: ...
+@overload
+def include_refs_to_md_file(
+    filename: common.PathInput,
+    refs: Mapping[str, str],
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    begin_include_re: RegexInput = _BEGIN_INCLUDE_RE,
+    end_include_re: RegexInput = _END_INCLUDE_RE,
+    error_if_no_key: bool = True,
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+) -> bool: ...
+@overload
+def include_refs_to_md_file(
+    filename: common.PathInput,
+    refs: Mapping[str, str],
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    begin_include_re: RegexInput = _BEGIN_INCLUDE_RE,
+    end_include_re: RegexInput = _END_INCLUDE_RE,
+    error_if_no_key: bool = True,
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+) -> Union[str, bool]: ...
+def include_refs_to_md_file(
+    filename: common.PathInput,
+    refs: Mapping[str, str],
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    begin_include_re: RegexInput = _BEGIN_INCLUDE_RE,
+    end_include_re: RegexInput = _END_INCLUDE_RE,
+    error_if_no_key: bool = True,
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+) -> Union[str, bool]:
     """
     Apply include references to a markdown file in-place.
 
@@ -782,9 +1372,15 @@ def include_refs_to_md_file(
         error_if_no_key: Raise if an include name is unknown.
         read_encoding: Encoding used for reading. ``None`` triggers auto-detection.
         write_encoding: Encoding used for writing.
+        skip_if_unchanged: If True, leave the file (and its mtime) untouched,
+            without backup, when the new content is identical; each file is
+            logged at INFO level as changed or unchanged.
+        return_changed: If True, return whether the file was written instead
+            of its filename.
 
     Returns:
-        Normalized filename (string).
+        Normalized filename (string), or with ``return_changed`` whether the
+        file was written.
 
     Raises:
         ValueError/KeyError: Propagated from include processing.
@@ -794,9 +1390,6 @@ def include_refs_to_md_file(
 
     text = _read_md_text(checked, read_encoding)
 
-    if backup_option:
-        _create_backup(checked, backup_ext)
-
     new_text = include_refs_to_md_text(
         text,
         refs,
@@ -805,12 +1398,21 @@ def include_refs_to_md_file(
         error_if_no_key=error_if_no_key,
     )
 
-    common.set_file_content(checked, new_text, encoding=write_encoding)
-    return str(checked)
+    written = common.rewrite_file_content(
+        checked,
+        new_text,
+        encoding=write_encoding,
+        backup=backup_option,
+        backup_ext=backup_ext,
+        backup_date_prefix=common.today_utc(),
+        skip_if_unchanged=skip_if_unchanged,
+    )
+    return written if return_changed else str(checked)
 # -----------------------------------------------------------------------------
 
 
 # -----------------------------------------------------------------------------
+@overload
 def search_include_refs_to_md_file(
     filename: common.PathInput,
     *,
@@ -819,7 +1421,48 @@ def search_include_refs_to_md_file(
     filename_ext: str = ".md",
     depth_up: int = 1,
     depth_down: int = -1,
-) -> str:
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
+) -> str: ...
+@overload
+def search_include_refs_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+) -> bool: ...
+@overload
+def search_include_refs_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+) -> Union[str, bool]: ...
+def search_include_refs_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+) -> Union[str, bool]:
     """
     Discover refs around a markdown file and apply include substitutions in-place.
 
@@ -834,25 +1477,30 @@ def search_include_refs_to_md_file(
         filename_ext: Expected extension for `filename`.
         depth_up: Number of parent directory levels to move up for the search root (>= 0).
         depth_down: Depth for scanning downward (-1 unlimited, 0 current dir only, >0 limited).
+        cache: Optional :class:`ParseCache` reused for unchanged files.
+        skip_if_unchanged: If True, leave the file (and its mtime) untouched,
+            without backup, when the new content is identical; each file is
+            logged at INFO level as changed or unchanged.
+        return_changed: If True, return whether the file was written instead
+            of its filename.
 
     Returns:
-        Normalized filename (string).
+        Normalized filename (string), or with ``return_changed`` whether the
+        file was written.
 
     Raises:
         ValueError: If `depth_up` < 0 or `depth_down` < -1.
         KeyError/ValueError: Propagated from include resolution if refs are missing/malformed.
         RuntimeError/Exception: Propagated from filesystem helpers.
     """
-    if depth_up < 0:
-        raise ValueError(f"depth_up must be >= 0, got: {depth_up}")
-    if depth_down < -1:
-        raise ValueError(f"depth_down must be >= -1, got: {depth_down}")
+    _check_search_depths(depth_up, depth_down)
 
     refs = get_refs_around_md_file(
         filename,
         filename_ext=filename_ext,
         depth_up=depth_up,
         depth_down=depth_down,
+        cache=cache,
     )
     return include_refs_to_md_file(
         filename,
@@ -860,6 +1508,8 @@ def search_include_refs_to_md_file(
         backup_option=backup_option,
         backup_ext=backup_ext,
         filename_ext=filename_ext,
+        skip_if_unchanged=skip_if_unchanged,
+        return_changed=return_changed,
     )
 # -----------------------------------------------------------------------------
 
@@ -891,7 +1541,9 @@ def unescape_var_value(value: str) -> str:
 # -----------------------------------------------------------------------------
 def get_vars_from_md_text(
     text: str, 
-    previous_vars: Optional[Dict[str, str]] = None
+    previous_vars: Optional[Dict[str, str]] = None,
+    *,
+    scan: Optional[DocumentScan] = None,
 ) -> Dict[str, str]:
     """
     Extract variable declarations from markdown text and return interpreted values.
@@ -905,6 +1557,7 @@ def get_vars_from_md_text(
     Args:
         text: Markdown text to scan.
         previous_vars: Optional dict to extend (copied to avoid side effects).
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         A dict mapping variable names to interpreted string values.
@@ -917,7 +1570,7 @@ def get_vars_from_md_text(
 
     vars_: Dict[str, str] = dict(previous_vars) if previous_vars else {}
 
-    for m in _directive_matches(_VAR_RE, text):
+    for m in _directive_matches(scan_markdown(text, scan), _VAR_RE):
         key = m.group("name")
         raw_value = m.group("string")
         value = unescape_var_value(raw_value)
@@ -943,7 +1596,13 @@ def escape_var_value(value: str) -> str:
 # -----------------------------------------------------------------------------
 
 # -----------------------------------------------------------------------------
-def set_var_to_md_text(text: str, var_name: str, value: str) -> str:
+def set_var_to_md_text(
+    text: str,
+    var_name: str,
+    value: str,
+    *,
+    scan: Optional[DocumentScan] = None,
+) -> str:
     """
     Set or add a var(...) directive in markdown text.
 
@@ -955,6 +1614,7 @@ def set_var_to_md_text(text: str, var_name: str, value: str) -> str:
         text: Markdown text.
         var_name: Variable name (allowed: [A-Za-z0-9:_-]+).
         value: Interpreted value (will be escaped for storage).
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         Updated markdown text.
@@ -971,7 +1631,8 @@ def set_var_to_md_text(text: str, var_name: str, value: str) -> str:
 
     var_text = f'<!-- var({var_name})="{escape_var_value(value)}" -->'
 
-    var_matches = _directive_matches(_VAR_RE, text)
+    scan = scan_markdown(text, scan)
+    var_matches = _directive_matches(scan, _VAR_RE)
     matching_vars = [
         match for match in var_matches if match.group("name") == var_name
     ]
@@ -986,8 +1647,8 @@ def set_var_to_md_text(text: str, var_name: str, value: str) -> str:
         return "".join(parts)
 
     header_matches = [
-        *_directive_matches(_VAR_RE, text),
-        *_directive_matches(_INCLUDE_FILE_RE, text),
+        *var_matches,
+        *_directive_matches(scan, _INCLUDE_FILE_RE),
     ]
     insert_at = max((match.end() for match in header_matches), default=0)
     before = text[:insert_at]
@@ -999,13 +1660,19 @@ def set_var_to_md_text(text: str, var_name: str, value: str) -> str:
 
 
 # -----------------------------------------------------------------------------
-def del_var_to_md_text(text: str, var_name: str) -> str:
+def del_var_to_md_text(
+    text: str,
+    var_name: str,
+    *,
+    scan: Optional[DocumentScan] = None,
+) -> str:
     """
     Remove all var(...) directives with the given name from a markdown text.
 
     Args:
         text: Markdown text.
         var_name: Variable name to remove.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         Updated markdown text.
@@ -1022,7 +1689,7 @@ def del_var_to_md_text(text: str, var_name: str) -> str:
 
     parts: list[str] = []
     cursor = 0
-    for match in _directive_matches(_VAR_RE, text):
+    for match in _directive_matches(scan_markdown(text, scan), _VAR_RE):
         if match.group("name") != var_name:
             continue
         parts.append(text[cursor:match.start()])
@@ -1035,7 +1702,9 @@ def del_var_to_md_text(text: str, var_name: str) -> str:
 # -----------------------------------------------------------------------------
 def get_title_from_md_text(
     text: str, 
-    return_match: bool = False
+    return_match: bool = False,
+    *,
+    scan: Optional[DocumentScan] = None,
 ) -> Union[None, str, Match[str]]:
     """
     Extract the first level-1 Markdown title from text.
@@ -1048,6 +1717,7 @@ def get_title_from_md_text(
     Args:
         text: Markdown text.
         return_match: If True, return the `re.Match` object on the source text.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         The title string (stripped), or None if not found.
@@ -1058,7 +1728,7 @@ def get_title_from_md_text(
     """
     text = _require_str(text, "text")
 
-    title_match = _first_title_match(text)
+    title_match = _first_title_match(scan_markdown(text, scan))
     if title_match is None:
         return None
     m, _ = title_match
@@ -1075,7 +1745,8 @@ def set_title_in_md_text(
     text: str, 
     new_title: str, 
     *, 
-    style: TitleStyle = "preserve"
+    style: TitleStyle = "preserve",
+    scan: Optional[DocumentScan] = None,
 ) -> str:
     """
     Set or insert the first level-1 Markdown title in `text`.
@@ -1101,6 +1772,7 @@ def set_title_in_md_text(
         text: Markdown text.
         new_title: New title (must be non-empty after stripping).
         style: "preserve" | "setext" | "atx".
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         Updated markdown text.
@@ -1119,7 +1791,7 @@ def set_title_in_md_text(
     if style not in ("preserve", "setext", "atx"):
         raise ValueError(f"invalid style: {style!r}")
 
-    title_match = _first_title_match(text)
+    title_match = _first_title_match(scan_markdown(text, scan))
 
     # Decide output style
     if style == "preserve":
@@ -1160,6 +1832,7 @@ def get_vars_from_md_file(
     filename_ext: str = ".md",
     previous_vars: Optional[Dict[str, str]] = None,
     encoding: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
 ) -> Dict[str, str]:
     """
     Extract var(...) directives from a markdown file.
@@ -1172,6 +1845,7 @@ def get_vars_from_md_file(
         filename_ext: Expected file extension.
         previous_vars: Optional existing mapping to extend.
         encoding: Encoding to use for reading. ``None`` triggers auto-detection.
+        cache: Optional :class:`ParseCache` reused when the file is unchanged.
 
     Returns:
         A dict mapping variable names to interpreted values.
@@ -1183,8 +1857,9 @@ def get_vars_from_md_file(
     logging.debug("Find vars in the MD file %s", filename)
     checked = common.check_file(str(filename), filename_ext)
 
-    text = _read_md_text(checked, encoding)
-    return get_vars_from_md_text(text, previous_vars=previous_vars)
+    return _parse_md_file(
+        checked, "vars", previous_vars, cache=cache, encoding=encoding
+    )
 # -----------------------------------------------------------------------------
 
 
@@ -1196,6 +1871,7 @@ def include_vars_to_md_text(
     begin_var_re: RegexInput = _BEGIN_VAR_RE,
     end_var_re: RegexInput = _END_VAR_RE,
     error_if_var_not_found: bool = True,
+    scan: Optional[DocumentScan] = None,
 ) -> str:
     """
     Insert variable values into begin-var/end-var blocks in markdown text.
@@ -1214,6 +1890,7 @@ def include_vars_to_md_text(
         end_var_re: Regex matching the closing variable marker.
         error_if_var_not_found: If True, raise ``KeyError`` when a block refers
             to a missing variable. If False, leave that block unchanged.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         Markdown text with matching variable blocks updated.
@@ -1224,11 +1901,13 @@ def include_vars_to_md_text(
         begin_include_re=begin_var_re,
         end_include_re=end_var_re,
         error_if_no_key=error_if_var_not_found,
+        scan=scan,
     )
 # -----------------------------------------------------------------------------
 
 
 # -----------------------------------------------------------------------------
+@overload
 def include_vars_to_md_file(
     filename: common.PathInput,
     vars_include: Mapping[str, str],
@@ -1241,7 +1920,56 @@ def include_vars_to_md_file(
     error_if_var_not_found: bool = True,
     read_encoding: Optional[str] = None,
     write_encoding: str = "utf-8",
-) -> str:
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
+) -> str: ...
+@overload
+def include_vars_to_md_file(
+    filename: common.PathInput,
+    vars_include: Mapping[str, str],
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    begin_var_re: RegexInput = _BEGIN_VAR_RE,
+    end_var_re: RegexInput = _END_VAR_RE,
+    error_if_var_not_found: bool = True,
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+) -> bool: ...
+@overload
+def include_vars_to_md_file(
+    filename: common.PathInput,
+    vars_include: Mapping[str, str],
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    begin_var_re: RegexInput = _BEGIN_VAR_RE,
+    end_var_re: RegexInput = _END_VAR_RE,
+    error_if_var_not_found: bool = True,
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+) -> Union[str, bool]: ...
+def include_vars_to_md_file(
+    filename: common.PathInput,
+    vars_include: Mapping[str, str],
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    begin_var_re: RegexInput = _BEGIN_VAR_RE,
+    end_var_re: RegexInput = _END_VAR_RE,
+    error_if_var_not_found: bool = True,
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+) -> Union[str, bool]:
     """
     Apply begin-var/end-var substitutions to a markdown file in-place.
 
@@ -1258,9 +1986,15 @@ def include_vars_to_md_file(
         error_if_var_not_found: Raise if a referenced var is missing.
         read_encoding: Encoding used to read the file. ``None`` triggers auto-detection.
         write_encoding: Encoding used to write the file.
+        skip_if_unchanged: If True, leave the file (and its mtime) untouched,
+            without backup, when the new content is identical; each file is
+            logged at INFO level as changed or unchanged.
+        return_changed: If True, return whether the file was written instead
+            of its filename.
 
     Returns:
-        Normalized filename (string).
+        Normalized filename (string), or with ``return_changed`` whether the
+        file was written.
     """
     return include_refs_to_md_file(
         filename,
@@ -1273,6 +2007,8 @@ def include_vars_to_md_file(
         error_if_no_key=error_if_var_not_found,
         read_encoding=read_encoding,
         write_encoding=write_encoding,
+        skip_if_unchanged=skip_if_unchanged,
+        return_changed=return_changed,
     )
 # -----------------------------------------------------------------------------
 
@@ -1285,6 +2021,8 @@ def get_vars_from_md_directory(
     previous_vars: Optional[Dict[str, str]] = None,
     depth: int = -1,
     encoding: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, str]:
     """
     Find var(...) declarations in markdown files in `folder` and (optionally) its subfolders.
@@ -1300,6 +2038,9 @@ def get_vars_from_md_directory(
         previous_vars: Existing mapping to extend.
         depth: Recursion depth.
         encoding: Encoding for reading files. ``None`` triggers auto-detection.
+        cache: Optional :class:`ParseCache` reused for unchanged files.
+        max_workers: If greater than 1, read and parse files in a pool of that
+            size (see :func:`get_refs_from_md_directory`).
 
     Returns:
         A dict of var name -> interpreted value.
@@ -1309,39 +2050,43 @@ def get_vars_from_md_directory(
         ValueError: If duplicate var names are found across scanned files.
     """
     logging.debug('Find vars in the folder "%s"', folder)
-    folder_str = common.check_folder(str(folder))
-
-    vars_: Dict[str, str] = dict(previous_vars) if previous_vars else {}
+    files = _md_directory_files(folder, "vars", filename_ext, depth)
+    return _parse_md_files(
+        files,
+        "vars",
+        filename_ext,
+        previous_vars,
+        cache=cache,
+        encoding=encoding,
+        max_workers=max_workers,
+    )
 
-    # scan md files in current dir
-    for entry in os.listdir(folder_str):
-        p = os.path.join(folder_str, entry)
-        if os.path.isfile(p) and p.endswith(filename_ext):
-            vars_ = get_vars_from_md_file(
-                p,
-                filename_ext=filename_ext,
-                previous_vars=vars_,
-                encoding=encoding,
-            )
 
-    if depth == 0:
-        return vars_
-
-    # recurse into subdirs
-    next_depth = depth if depth < 0 else depth - 1
-    for entry in os.listdir(folder_str):
-        p = os.path.join(folder_str, entry)
-        if os.path.isdir(p):
-            vars_ = get_vars_from_md_directory(
-                p,
-                filename_ext=filename_ext,
-                previous_vars=vars_,
-                depth=next_depth,
-                encoding=encoding,
-            )
+# -----------------------------------------------------------------------------
 
-    return vars_
 # -----------------------------------------------------------------------------
+def _vars_search_root(
+    filename: common.PathInput,
+    depth_up: int,
+    depth_down: int,
+) -> tuple[str, int]:
+    """Return the folder and depth scanned for vars around ``filename``."""
+    filename_str = common.normpath(str(filename))
+    current_dir = os.path.abspath(os.path.dirname(filename_str))
+
+    # move up
+    du = depth_up
+    dd = depth_down
+    while du > 0:
+        new_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+        if new_dir == current_dir:
+            break
+        current_dir = new_dir
+        du -= 1
+        if dd > 0:
+            dd += 1  # keep total "down scan" horizon roughly stable
+    return current_dir, dd
+
 
 # -----------------------------------------------------------------------------
 def get_vars_around_md_file(
@@ -1352,6 +2097,7 @@ def get_vars_around_md_file(
     depth_up: int = 1,
     depth_down: int = -1,
     encoding: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
 ) -> Dict[str, str]:
     """
     Discover var(...) declarations around a markdown file by scanning nearby directories.
@@ -1366,6 +2112,7 @@ def get_vars_around_md_file(
         depth_up: Number of parent levels to move up (>= 0).
         depth_down: Downward recursion depth (-1 unlimited, 0 current dir only, >0 limited).
         encoding: Encoding used to read markdown files. ``None`` triggers auto-detection.
+        cache: Optional :class:`ParseCache` reused for unchanged files.
 
     Returns:
         A dict of var name -> interpreted value.
@@ -1374,27 +2121,9 @@ def get_vars_around_md_file(
         ValueError: If `depth_up` < 0 or `depth_down` < -1.
         RuntimeError/Exception: Propagated by filesystem helpers.
     """
-    if depth_up < 0:
-        raise ValueError(f"depth_up must be >= 0, got: {depth_up}")
-    if depth_down < -1:
-        raise ValueError(f"depth_down must be >= -1, got: {depth_down}")
-
-    filename_str = common.normpath(str(filename))
-    logging.debug('Discover vars around the file "%s"', filename_str)
-
-    current_dir = os.path.abspath(os.path.dirname(filename_str))
-
-    # move up
-    du = depth_up
-    dd = depth_down
-    while du > 0:
-        new_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
-        if new_dir == current_dir:
-            break
-        current_dir = new_dir
-        du -= 1
-        if dd > 0:
-            dd += 1  # keep total "down scan" horizon roughly stable
+    _check_search_depths(depth_up, depth_down)
+    logging.debug('Discover vars around the file "%s"', filename)
+    current_dir, dd = _vars_search_root(filename, depth_up, depth_down)
 
     return get_vars_from_md_directory(
         current_dir,
@@ -1402,10 +2131,12 @@ def get_vars_around_md_file(
         previous_vars=previous_vars,
         depth=dd,
         encoding=encoding,
+        cache=cache,
     )
 # -----------------------------------------------------------------------------
 
 # -----------------------------------------------------------------------------
+@overload
 def search_include_vars_to_md_file(
     filename: common.PathInput,
     *,
@@ -1415,9 +2146,59 @@ def search_include_vars_to_md_file(
     depth_up: int = 1,
     depth_down: int = -1,
     encoding: Optional[str] = None,
-) -> str:
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
+) -> str: ...
+@overload
+def search_include_vars_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    encoding: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+) -> bool: ...
+@overload
+def search_include_vars_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    encoding: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+) -> Union[str, bool]: ...
+def search_include_vars_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    encoding: Optional[str] = None,
+    cache: Optional[ParseCache] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+) -> Union[str, bool]:
     """
     Search vars around `filename` and apply begin-var/end-var substitutions in-place.
+
+    Unchanged files are not parsed again when a :class:`ParseCache` is given.
+    With ``skip_if_unchanged=True`` the file is not rewritten (nor backed up)
+    when its content does not change.
+    With ``return_changed=True`` it returns whether the file was written
+    instead of its filename.
     """
     vars_ = get_vars_around_md_file(
         filename,
@@ -1425,6 +2206,7 @@ def search_include_vars_to_md_file(
         depth_up=depth_up,
         depth_down=depth_down,
         encoding=encoding,
+        cache=cache,
     )
     return include_vars_to_md_file(
         filename,
@@ -1432,8 +2214,404 @@ def search_include_vars_to_md_file(
         backup_option=backup_option,
         backup_ext=backup_ext,
         filename_ext=filename_ext,
+        skip_if_unchanged=skip_if_unchanged,
+        return_changed=return_changed,
+    )
+# -----------------------------------------------------------------------------
+
+
+# -----------------------------------------------------------------------------
+class _DirectiveTree:
+    """
+    Scope walks and per-file parse results shared by a tree-wide run.
+
+    Every scope is walked once and every file is read and parsed once,
+    however many search scopes contain it. Walks follow the traversal of
+    :func:`get_refs_from_md_directory` (``kind="refs"``) or
+    :func:`get_vars_from_md_directory` (``kind="vars"``), so merged scopes and
+    duplicate errors are the ones the per-file helpers produce.
+
+    Only the values of each file stay in memory for the whole run. A text is
+    kept while its file waits to be rewritten, or for good when the file
+    cannot be parsed on its own.
+    """
+
+    def __init__(
+        self,
+        kind: _ParseKind,
+        filename_ext: str,
+        encoding: Optional[str] = None,
+    ) -> None:
+        self.kind: _ParseKind = kind
+        self.filename_ext = filename_ext
+        self.encoding = encoding
+        self._walks: Dict[tuple[str, int], List[str]] = {}
+        self._values: Dict[str, Optional[Dict[str, str]]] = {}
+        self._texts: Dict[str, str] = {}
+        self._pending: Set[str] = set()
+        self._scopes: Dict[tuple[str, int], Dict[str, str]] = {}
+
+    def _extract(
+        self,
+        text: str,
+        previous: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, str]:
+        """Run the text helper matching ``kind``."""
+        if self.kind == "refs":
+            return get_refs_from_md_text(text, previous)
+        return get_vars_from_md_text(text, previous)
+
+    def files(self, folder: str, depth: int) -> List[str]:
+        """Return the resolved files scanned from ``folder`` with ``depth``."""
+        key = (folder, depth)
+        files = self._walks.get(key)
+        if files is None:
+            files = [
+                str(common.normpath(filename))
+                for filename in _md_directory_files(
+                    folder, self.kind, self.filename_ext, depth
+                )
+            ]
+            self._walks[key] = files
+        return files
+
+    def keep_texts(self, filenames: Iterable[str]) -> None:
+        """Keep the texts of ``filenames`` once read, until :meth:`take_text`."""
+        self._pending.update(filenames)
+
+    def parse(self, filename: str) -> Optional[Dict[str, str]]:
+        """
+        Return the values ``filename`` declares alone.
+
+        The values are ``None`` when the file cannot be parsed on its own; its
+        text is then kept, so that merging it reproduces the error of the
+        per-file helpers.
+        """
+        if filename in self._values:
+            return self._values[filename]
+        checked = common.check_file(filename, self.filename_ext)
+        text = _read_md_text(checked, self.encoding)
+        try:
+            values: Optional[Dict[str, str]] = self._extract(text)
+        except ValueError:
+            values = None
+        if values is None or filename in self._pending:
+            self._texts[filename] = text
+        self._values[filename] = values
+        return values
+
+    def take_text(self, filename: str) -> str:
+        """Return the text of a file passed to :meth:`keep_texts` and release it."""
+        values = self.parse(filename)
+        self._pending.discard(filename)
+        if values is None:
+            return self._texts[filename]
+        return self._texts.pop(filename)
+
+    def prefetch(self, filenames: Iterable[str], max_workers: Optional[int]) -> None:
+        """Read and parse ``filenames`` ahead of time, in a thread pool if set."""
+        pending = [
+            name for name in dict.fromkeys(filenames) if name not in self._values
+        ]
+        if max_workers is None or max_workers <= 1 or len(pending) <= 1:
+            return
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                common.submit_in_context(pool, self.parse, name) for name in pending
+            ]
+        for future in futures:
+            future.exception()
+
+    def scope(self, folder: str, depth: int) -> Dict[str, str]:
+        """Return the values visible from ``folder`` scanned with ``depth``."""
+        key = (folder, depth)
+        merged = self._scopes.get(key)
+        if merged is None:
+            merged = {}
+            for filename in self.files(folder, depth):
+                values = self.parse(filename)
+                if values is None:
+                    # The file fails on its own: parsing it on top of the
+                    # merged values raises the error of the per-file helpers.
+                    merged = self._extract(self._texts[filename], merged)
+                else:
+                    merged = _merge_parsed(merged, values, self.kind)
+            self._scopes[key] = merged
+        return merged
+
+    def refresh(self, filename: str) -> None:
+        """Parse ``filename`` again after a write; drop scopes if it changed."""
+        known = filename in self._values
+        before = self._values.pop(filename, None)
+        self._texts.pop(filename, None)
+        if not known or before != self.parse(filename):
+            self._scopes.clear()
+
+
+# -----------------------------------------------------------------------------
+def _search_include_in_tree(
+    tree: _DirectiveTree,
+    root: common.PathInput,
+    *,
+    depth_up: int,
+    depth_down: int,
+    backup_option: bool,
+    backup_ext: str,
+    max_workers: Optional[int],
+    skip_if_unchanged: bool,
+) -> tuple[List[str], List[str]]:
+    """
+    Apply refs or vars to every markdown file under ``root``, in order.
+
+    Returns the processed files and, among them, the rewritten ones.
+    """
+    _check_search_depths(depth_up, depth_down)
+    targets = tree.files(str(common.check_folder(root)), -1)
+    if tree.encoding is None:
+        # Targets are rewritten from the text read to parse them.
+        tree.keep_texts(targets)
+    scopes: List[tuple[str, int]] = []
+    for target in targets:
+        if tree.kind == "refs":
+            folder, depth = _refs_search_root(target, depth_up, depth_down)
+            scopes.append((str(folder), depth))
+        else:
+            scopes.append(_vars_search_root(target, depth_up, depth_down))
+    tree.prefetch(
+        (
+            filename
+            for folder, depth in dict.fromkeys(scopes)
+            for filename in tree.files(folder, depth)
+        ),
+        max_workers,
+    )
+
+    processed: List[str] = []
+    rewritten: List[str] = []
+    for target, (folder, depth) in zip(targets, scopes):
+        values = tree.scope(folder, depth)
+        checked = common.check_file(target, tree.filename_ext)
+        if tree.encoding is None:
+            text = tree.take_text(target)
+        else:
+            text = _read_md_text(checked)
+        if tree.kind == "refs":
+            new_text = include_refs_to_md_text(text, values)
+        else:
+            new_text = include_vars_to_md_text(text, values)
+        if common.rewrite_file_content(
+            checked,
+            new_text,
+            encoding="utf-8",
+            backup=backup_option,
+            backup_ext=backup_ext,
+            backup_date_prefix=common.today_utc(),
+            skip_if_unchanged=skip_if_unchanged,
+        ):
+            # Later files may see this one in their scope: parse it again.
+            tree.refresh(target)
+            rewritten.append(str(checked))
+        processed.append(str(checked))
+    return processed, rewritten
+
+
+# -----------------------------------------------------------------------------
+@overload
+def search_include_refs_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
+) -> List[str]: ...
+@overload
+def search_include_refs_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+) -> tuple[List[str], List[str]]: ...
+@overload
+def search_include_refs_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+) -> Union[List[str], tuple[List[str], List[str]]]: ...
+def search_include_refs_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+) -> Union[List[str], tuple[List[str], List[str]]]:
+    """
+    Apply :func:`search_include_refs_to_md_file` to every markdown file under `root`.
+
+    Files are processed in the order :func:`get_refs_from_md_directory` visits
+    them, and the output is byte-identical to calling
+    :func:`search_include_refs_to_md_file` on each of them in that order. The
+    tree is walked once per search scope instead of once per file: each
+    file is read and parsed once, and the refs of each search scope are
+    merged once. A file rewritten by the run is parsed again, so
+    later files see its new content, as they would in the per-file loop.
+
+    Args:
+        root: Folder whose markdown files are processed (recursively).
+        backup_option: Whether to create a backup before overwriting each file.
+        backup_ext: Backup extension (e.g. ".bak").
+        filename_ext: Markdown file extension.
+        depth_up: Number of parent directory levels to move up for each
+            file's search root (>= 0).
+        depth_down: Depth for scanning downward (-1 unlimited, 0 current dir
+            only, >0 limited).
+        max_workers: If greater than 1, read and parse files in a thread pool
+            of that size before processing.
+        skip_if_unchanged: If True, leave the file (and its mtime) untouched,
+            without backup, when the new content is identical; each file is
+            logged at INFO level as changed or unchanged.
+        return_changed: If True, also return the files that were written.
+
+    Returns:
+        The normalized filenames, in processing order. With
+        ``return_changed``, a ``(processed, rewritten)`` pair where
+        ``rewritten`` lists the written files in the same order.
+
+    Raises:
+        ValueError: If `depth_up` < 0 or `depth_down` < -1.
+        KeyError/ValueError: Propagated from include resolution; files
+            processed before the failing one stay written.
+        RuntimeError/Exception: Propagated from filesystem helpers.
+    """
+    processed, rewritten = _search_include_in_tree(
+        _DirectiveTree("refs", filename_ext),
+        root,
+        depth_up=depth_up,
+        depth_down=depth_down,
+        backup_option=backup_option,
+        backup_ext=backup_ext,
+        max_workers=max_workers,
+        skip_if_unchanged=skip_if_unchanged,
     )
+    return (processed, rewritten) if return_changed else processed
+
+
 # -----------------------------------------------------------------------------
+@overload
+def search_include_vars_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    encoding: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
+) -> List[str]: ...
+@overload
+def search_include_vars_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    encoding: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+) -> tuple[List[str], List[str]]: ...
+@overload
+def search_include_vars_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    encoding: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+) -> Union[List[str], tuple[List[str], List[str]]]: ...
+def search_include_vars_in_tree(
+    root: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    depth_up: int = 1,
+    depth_down: int = -1,
+    encoding: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+) -> Union[List[str], tuple[List[str], List[str]]]:
+    """
+    Apply :func:`search_include_vars_to_md_file` to every markdown file under `root`.
+
+    This is the vars counterpart of :func:`search_include_refs_in_tree`: files
+    are processed in the order :func:`get_vars_from_md_directory` visits them
+    and the output is byte-identical to the per-file loop.
+
+    Args:
+        root: Folder whose markdown files are processed (recursively).
+        backup_option: Whether to create a backup before overwriting each file.
+        backup_ext: Backup extension.
+        filename_ext: Markdown file extension.
+        depth_up: Number of parent levels to move up for each file (>= 0).
+        depth_down: Downward recursion depth (-1 unlimited, 0 current dir only, >0 limited).
+        encoding: Encoding used to scan var declarations. ``None`` triggers auto-detection.
+        max_workers: If greater than 1, read and parse files in a thread pool
+            of that size before processing.
+        skip_if_unchanged: If True, leave the file (and its mtime) untouched,
+            without backup, when the new content is identical; each file is
+            logged at INFO level as changed or unchanged.
+        return_changed: If True, also return the files that were written.
+
+    Returns:
+        The normalized filenames, in processing order. With
+        ``return_changed``, a ``(processed, rewritten)`` pair where
+        ``rewritten`` lists the written files in the same order.
+    """
+    processed, rewritten = _search_include_in_tree(
+        _DirectiveTree("vars", filename_ext, _normalize_read_encoding(encoding)),
+        root,
+        depth_up=depth_up,
+        depth_down=depth_down,
+        backup_option=backup_option,
+        backup_ext=backup_ext,
+        max_workers=max_workers,
+        skip_if_unchanged=skip_if_unchanged,
+    )
+    return (processed, rewritten) if return_changed else processed
 
 
 # -----------------------------------------------------------------------------
@@ -1443,6 +2621,7 @@ def search_include_vars_to_md_text(
     error_if_var_not_found: bool = True,
     begin_var_re: RegexInput = _BEGIN_VAR_RE,
     end_var_re: RegexInput = _END_VAR_RE,
+    scan: Optional[DocumentScan] = None,
 ) -> str:
     """
     Extract var(...) declarations from `text` and apply begin-var/end-var substitutions.
@@ -1452,6 +2631,7 @@ def search_include_vars_to_md_text(
         error_if_var_not_found: Raise if a referenced var is missing.
         begin_var_re: Regex for begin-var marker (must capture group 'name').
         end_var_re: Regex for end-var marker.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         Updated markdown text.
@@ -1459,13 +2639,15 @@ def search_include_vars_to_md_text(
     Raises:
         KeyError/ValueError: If a referenced var is missing (depending on implementation).
     """
-    text_vars = get_vars_from_md_text(text)
+    scan = scan_markdown(text, scan)
+    text_vars = get_vars_from_md_text(text, scan=scan)
     return include_vars_to_md_text(
         text,
         text_vars,
         begin_var_re=begin_var_re,
         end_var_re=end_var_re,
         error_if_var_not_found=error_if_var_not_found,
+        scan=scan,
     )
 # -----------------------------------------------------------------------------
 
@@ -1479,6 +2661,7 @@ def get_file_content_to_include(
     relative_paths: Sequence[str] = (".", "referenced_files"),
     nb_up_path: int = 0,
     encoding: Optional[str] = None,
+    locator: Optional[common.FileLocator] = None,
 ) -> str:
     """
     Retrieve the content of a referenced file to include.
@@ -1498,6 +2681,8 @@ def get_file_content_to_include(
         relative_paths: Relative subpaths to probe under each start point.
         nb_up_path: Number of parent levels to traverse during the search.
         encoding: Encoding for reading. ``None`` triggers auto-detection.
+        locator: Optional :class:`~pymdtools.common.FileLocator` shared by a
+            batch of lookups, so each searched folder is listed only once.
 
     Returns:
         File content as text.
@@ -1533,7 +2718,8 @@ def get_file_content_to_include(
         requested, start_points, list(relative_paths), nb_up_path
     )
 
-    found = common.find_file(
+    find_file = common.find_file if locator is None else locator.find_file
+    found = find_file(
         requested,
         start_points,
         list(relative_paths),
@@ -1561,6 +2747,7 @@ def include_files_to_md_text(
     include_file_re: RegexInput = _INCLUDE_FILE_RE,
     error_if_no_file: bool = True,
     render_mode: IncludeRenderMode = "box",
+    scan: Optional[DocumentScan] = None,
     **kwargs: Any,
 ) -> str:
     """
@@ -1574,7 +2761,9 @@ def include_files_to_md_text(
         include_file_re: Regex to match include-file directives (must capture 'name').
         error_if_no_file: If False, keep the directive unchanged when the file is not found/readable.
         render_mode: "box" to wrap content in an ASCII box, "raw" to insert content as-is.
-        **kwargs: Forwarded to `get_file_content_to_include` (e.g. search_folders).
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
+        **kwargs: Forwarded to `get_file_content_to_include` (e.g. search_folders,
+            locator).
 
     Returns:
         Updated markdown text.
@@ -1582,12 +2771,12 @@ def include_files_to_md_text(
     pattern = _compile_pattern(include_file_re)
 
     text = _require_str(text, "text")
-    code_ranges = markdown_code_ranges(text)
+    scan = scan_markdown(text, scan)
     result_parts: list[str] = []
     pos = 0
 
     while True:
-        m = _search_outside_ranges(pattern, text, pos, code_ranges)
+        m = _directive_search(scan, pattern, pos)
         if not m:
             result_parts.append(text[pos:])
             break
@@ -1632,6 +2821,7 @@ def include_files_to_md_text(
 
 
 # -----------------------------------------------------------------------------
+@overload
 def include_files_to_md_file(
     filename: common.PathInput,
     *,
@@ -1642,8 +2832,54 @@ def include_files_to_md_file(
     write_encoding: str = "utf-8",
     error_if_no_file: bool = True,
     render_mode: IncludeRenderMode = "box",
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
     **kwargs: Any,
-) -> str:
+) -> str: ...
+@overload
+def include_files_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    error_if_no_file: bool = True,
+    render_mode: IncludeRenderMode = "box",
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+    **kwargs: Any,
+) -> bool: ...
+@overload
+def include_files_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    error_if_no_file: bool = True,
+    render_mode: IncludeRenderMode = "box",
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+    **kwargs: Any,
+) -> Union[str, bool]: ...
+def include_files_to_md_file(
+    filename: common.PathInput,
+    *,
+    backup_option: bool = True,
+    backup_ext: str = ".bak",
+    filename_ext: str = ".md",
+    read_encoding: Optional[str] = None,
+    write_encoding: str = "utf-8",
+    error_if_no_file: bool = True,
+    render_mode: IncludeRenderMode = "box",
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+    **kwargs: Any,
+) -> Union[str, bool]:
     """
     Apply include-file substitutions to a markdown file in-place.
 
@@ -1656,19 +2892,23 @@ def include_files_to_md_file(
         write_encoding: Encoding used to write.
         error_if_no_file: If False, keep unresolved directives unchanged.
         render_mode: Forwarded to include_files_to_md_text (e.g. "box" or "raw").
-        **kwargs: Forwarded to get_file_content_to_include (e.g. search_folders).
+        skip_if_unchanged: If True, leave the file (and its mtime) untouched,
+            without backup, when the new content is identical; each file is
+            logged at INFO level as changed or unchanged.
+        return_changed: If True, return whether the file was written instead
+            of its filename.
+        **kwargs: Forwarded to get_file_content_to_include (e.g. search_folders,
+            locator).
 
     Returns:
-        Normalized filename.
+        Normalized filename, or with ``return_changed`` whether the file was
+        written.
     """
     logging.debug("Include file to the file %s", filename)
     checked = common.check_file(str(filename), filename_ext)
 
     text = _read_md_text(checked, read_encoding)
 
-    if backup_option:
-        _create_backup(checked, backup_ext)
-
     configured_search_folders = kwargs.get("search_folders")
     search_folders = (
         [] if configured_search_folders is None else list(configured_search_folders)
@@ -1692,8 +2932,16 @@ def include_files_to_md_file(
         **kwargs,
     )
 
-    common.set_file_content(checked, text, encoding=write_encoding)
-    return str(checked)
+    written = common.rewrite_file_content(
+        checked,
+        text,
+        encoding=write_encoding,
+        backup=backup_option,
+        backup_ext=backup_ext,
+        backup_date_prefix=common.today_utc(),
+        skip_if_unchanged=skip_if_unchanged,
+    )
+    return written if return_changed else str(checked)
 # -----------------------------------------------------------------------------
 
 
@@ -1727,7 +2975,7 @@ def ensure_include_file_in_md_text(
     pattern = _compile_pattern(include_file_re)
 
     # If already present, return as-is
-    matches = _directive_matches(pattern, normalized)
+    matches = _directive_matches(scan_markdown(normalized), pattern)
     for m in matches:
         if m.group("name") == filename:
             return normalized
@@ -1766,6 +3014,7 @@ def get_include_file_list(
     *,
     include_file_re: RegexInput = _INCLUDE_FILE_RE,
     unique: bool = False,
+    scan: Optional[DocumentScan] = None,
 ) -> list[str]:
     """
     Return the list of filenames referenced by include-file(...) directives.
@@ -1774,6 +3023,7 @@ def get_include_file_list(
         text: Markdown text.
         include_file_re: Regex matching include-file directives; must capture group 'name'.
         unique: If True, remove duplicates while preserving first-seen order.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         A list of referenced filenames, in appearance order.
@@ -1781,7 +3031,10 @@ def get_include_file_list(
     pattern = _compile_pattern(include_file_re)
 
     text = _require_str(text, "text")
-    names = [m.group("name") for m in _directive_matches(pattern, text)]
+    names = [
+        m.group("name")
+        for m in _directive_matches(scan_markdown(text, scan), pattern)
+    ]
 
     if not unique:
         return names
@@ -1803,6 +3056,7 @@ def del_include_file_to_md_text(
     *,
     include_file_re: RegexInput = _INCLUDE_FILE_RE,
     first_only: bool = False,
+    scan: Optional[DocumentScan] = None,
 ) -> str:
     """
     Remove include-file directives referencing `filename` from markdown text.
@@ -1812,6 +3066,7 @@ def del_include_file_to_md_text(
         filename: Target referenced filename to remove.
         include_file_re: Regex matching include-file directives; must capture group 'name'.
         first_only: If True, remove only the first matching directive.
+        scan: Optional :class:`~pymdtools.mdcommon.DocumentScan` built for `text`.
 
     Returns:
         Updated markdown text.
@@ -1826,7 +3081,7 @@ def del_include_file_to_md_text(
     pos = 0
     removed = False
 
-    for m in _directive_matches(pattern, text):
+    for m in _directive_matches(scan_markdown(text, scan), pattern):
         name = m.group("name")
         if name == filename and (not first_only or not removed):
             # keep everything before the match, skip the match
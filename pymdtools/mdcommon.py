@@ -26,8 +26,10 @@ import json
 import logging
 import posixpath
 import re
-from collections.abc import Mapping, Sequence
-from typing import Final, TypeAlias
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Mapping, Sequence
+from functools import lru_cache
+from typing import Final, TypeAlias, TypeVar, cast
 from urllib.parse import urlparse, urlsplit, urlunsplit
 
 from . import common
@@ -36,6 +38,7 @@ LinkValue: TypeAlias = str | int | None
 LinkRecord: TypeAlias = dict[str, LinkValue]
 LinkMapping: TypeAlias = Mapping[str, LinkValue]
 LinkPair: TypeAlias = tuple[LinkMapping, LinkMapping]
+_T = TypeVar("_T")
 
 
 # -----------------------------------------------------------------------------
@@ -114,6 +117,39 @@ _REF_URL_RE: Final[re.Pattern[str]] = re.compile(
 )
 
 
+# -----------------------------------------------------------------------------
+# 4) Markdown code regions
+#
+# Used by markdown_code_ranges to protect code from link and directive parsing.
+#
+# - _FENCE_OPEN_RE : fence opener line (``` or ~~~, at most 3 spaces indented)
+# - _FENCE_CLOSE_RE: candidate closer line; the caller checks that the fence
+#                    character matches and that the run is long enough
+# - _BACKTICK_RUN_RE: maximal runs of backticks delimiting inline code spans
+#
+# Notes:
+# - Fence patterns are applied to one line at a time, so ``$`` only matches at
+#   the end of that line (or before its final newline).
+# -----------------------------------------------------------------------------
+_FENCE_OPEN_RE: Final[re.Pattern[str]] = re.compile(
+    r" {0,3}(`{3,}|~{3,})(.*?)(?:\r?\n)?$"
+)
+_FENCE_CLOSE_RE: Final[re.Pattern[str]] = re.compile(
+    r" {0,3}(`+|~+)[ \t]*(?:\r?\n)?$"
+)
+_BACKTICK_RUN_RE: Final[re.Pattern[str]] = re.compile(r"`+")
+
+
+# -----------------------------------------------------------------------------
+# 5) HTML comments: <!-- ... -->
+#
+# Used by DocumentScan to protect commented-out content (for example headings
+# hidden in a comment), and by pymdtools.instruction to strip comments.
+# DOTALL to match multi-line comments, non-greedy to stop at the first "-->".
+# -----------------------------------------------------------------------------
+HTML_COMMENT_RE: Final[re.Pattern[str]] = re.compile(r"<!--.*?-->", re.DOTALL)
+
+
 # -----------------------------------------------------------------------------
 def _require_string(value: object, *, key: str) -> str:
     """
@@ -202,21 +238,6 @@ def _copy_link(link: LinkMapping) -> LinkRecord:
     return dict(link)
 
 
-# -----------------------------------------------------------------------------
-def _line_number(text: str, index: int) -> int:
-    """
-    Return the one-based line number for a character index.
-
-    Args:
-        text: Source text.
-        index: Character offset inside ``text``.
-
-    Returns:
-        The one-based line number containing ``index``.
-    """
-    return text[:index].count("\n") + 1
-
-
 # -----------------------------------------------------------------------------
 def merge_ranges(ranges: Sequence[tuple[int, int]]) -> list[tuple[int, int]]:
     """Return sorted, overlapping character ranges as disjoint ranges."""
@@ -233,104 +254,175 @@ def merge_ranges(ranges: Sequence[tuple[int, int]]) -> list[tuple[int, int]]:
 
 
 # -----------------------------------------------------------------------------
-def markdown_code_ranges(text: str) -> list[tuple[int, int]]:
-    """Locate fenced, indented, and inline Markdown code regions."""
+def _is_indented_code_line(body: str) -> bool:
+    """Return whether a line body (without line ending) is indented code."""
+    return body.startswith(("    ", "\t")) and "\r" not in body
+
+
+# -----------------------------------------------------------------------------
+def _is_blank_line(body: str) -> bool:
+    """Return whether a line body (without line ending) is blank."""
+    return not body.strip(" \t")
+
+
+# -----------------------------------------------------------------------------
+def _is_escaped(text: str, index: int) -> bool:
+    """Return whether ``text[index]`` follows an odd number of backslashes."""
+    escape_start = index
+    while escape_start > 0 and text[escape_start - 1] == "\\":
+        escape_start -= 1
+    return (index - escape_start) % 2 == 1
+
+
+# -----------------------------------------------------------------------------
+def _block_code_ranges(text: str) -> list[tuple[int, int]]:
+    """
+    Locate fenced and indented code blocks in one pass over the lines.
+
+    Fences follow ``str.splitlines`` line boundaries. Indented blocks follow
+    ``\\n`` line boundaries: every indented line opens or extends a block, and
+    blank lines between indented lines stay part of the same block.
+    """
     ranges: list[tuple[int, int]] = []
-    fenced_ranges: list[tuple[int, int]] = []
+    text_length = len(text)
     offset = 0
+
     fence_start: int | None = None
     fence_char = ""
     fence_length = 0
 
+    line_start = 0
+    indented_start: int | None = None
+    indented_end = 0
+
     for line in text.splitlines(keepends=True):
+        line_end = offset + len(line)
+
+        head = line[:6].lstrip(" ")
         if fence_start is None:
-            opener = re.match(r" {0,3}(`{3,}|~{3,})(.*?)(?:\r?\n)?$", line)
-            if opener and not (
-                opener.group(1).startswith("`") and "`" in opener.group(2)
+            if head.startswith(("```", "~~~")):
+                opener = _FENCE_OPEN_RE.match(line)
+                if opener is not None and not (
+                    opener.group(1).startswith("`") and "`" in opener.group(2)
+                ):
+                    fence_start = offset
+                    fence_char = opener.group(1)[0]
+                    fence_length = len(opener.group(1))
+        elif head.startswith(fence_char * 3):
+            closer = _FENCE_CLOSE_RE.match(line)
+            if (
+                closer is not None
+                and closer.group(1)[0] == fence_char
+                and len(closer.group(1)) >= fence_length
             ):
-                fence_start = offset
-                fence_char = opener.group(1)[0]
-                fence_length = len(opener.group(1))
-        else:
-            closer = re.match(
-                rf" {{0,3}}{re.escape(fence_char)}{{{fence_length},}}[ \t]*(?:\r?\n)?$",
-                line,
-            )
-            if closer:
-                fenced_ranges.append((fence_start, offset + len(line)))
+                ranges.append((fence_start, line_end))
                 fence_start = None
-                fence_char = ""
-                fence_length = 0
-        offset += len(line)
+
+        if line.endswith("\n") or line_end == text_length:
+            segment = line if line_start == offset else text[line_start:line_end]
+            body = segment
+            if body.endswith("\n"):
+                body = body[:-2] if body.endswith("\r\n") else body[:-1]
+            if _is_indented_code_line(body):
+                if indented_start is None:
+                    indented_start = line_start
+                indented_end = line_end
+            elif indented_start is not None:
+                if _is_blank_line(body):
+                    indented_end = line_end
+                else:
+                    ranges.append((indented_start, indented_end))
+                    indented_start = None
+            line_start = line_end
+
+        offset = line_end
 
     if fence_start is not None:
-        fenced_ranges.append((fence_start, len(text)))
-
-    # Conservatively treat every Markdown-indented line as code. Blank lines
-    # between adjacent indented lines remain part of the same block, which
-    # prevents directives embedded in examples from being executed.
-    indented_ranges = [
-        match.span()
-        for match in re.finditer(
-            r"(?m)^(?: {4}|\t)[^\r\n]*(?:\r?\n|$)"
-            r"(?:^[ \t]*(?:\r?\n|$)|^(?: {4}|\t)[^\r\n]*(?:\r?\n|$))*",
-            text,
-        )
-    ]
-    block_ranges = merge_ranges([*fenced_ranges, *indented_ranges])
-    ranges.extend(block_ranges)
-
-    def in_block_range(index: int) -> tuple[int, int] | None:
-        for start, end in block_ranges:
-            if start <= index < end:
-                return start, end
-            if index < start:
-                break
-        return None
+        ranges.append((fence_start, text_length))
+    if indented_start is not None:
+        ranges.append((indented_start, indented_end))
+
+    return merge_ranges(ranges)
 
-    index = 0
-    while index < len(text):
-        code_block = in_block_range(index)
-        if code_block is not None:
-            index = code_block[1]
+
+# -----------------------------------------------------------------------------
+def _inline_code_ranges(
+    text: str,
+    block_ranges: Sequence[tuple[int, int]],
+) -> list[tuple[int, int]]:
+    """
+    Pair backtick runs outside code blocks into inline code spans.
+
+    A span opens on an unescaped backtick run and closes on the next run of the
+    same length. Runs are grouped by length, and each group keeps a cursor that
+    only moves forward, so every run is visited a bounded number of times.
+    """
+    runs: list[tuple[int, int]] = []
+    block_position = 0
+    for match in _BACKTICK_RUN_RE.finditer(text):
+        start = match.start()
+        while (
+            block_position < len(block_ranges)
+            and block_ranges[block_position][1] <= start
+        ):
+            block_position += 1
+        if (
+            block_position < len(block_ranges)
+            and block_ranges[block_position][0] <= start
+        ):
             continue
-        escape_start = index
-        while escape_start > 0 and text[escape_start - 1] == "\\":
-            escape_start -= 1
-        is_escaped = (index - escape_start) % 2 == 1
-        if text[index] != "`" or is_escaped:
-            index += 1
+        runs.append(match.span())
+
+    runs_by_length: dict[int, list[int]] = {}
+    for position, (start, end) in enumerate(runs):
+        runs_by_length.setdefault(end - start, []).append(position)
+    cursors: dict[int, int] = {}
+
+    ranges: list[tuple[int, int]] = []
+    position = 0
+    while position < len(runs):
+        start, end = runs[position]
+        if _is_escaped(text, start):
+            # Only the first backtick of a run can be escaped.
+            start += 1
+        length = end - start
+        if length == 0:
+            position += 1
             continue
 
-        opener_end = index + 1
-        while opener_end < len(text) and text[opener_end] == "`":
-            opener_end += 1
-        delimiter_length = opener_end - index
-        search_at = opener_end
-        closing_end: int | None = None
-        while search_at < len(text):
-            next_tick = text.find("`", search_at)
-            if next_tick < 0:
-                break
-            code_block = in_block_range(next_tick)
-            if code_block is not None:
-                search_at = code_block[1]
-                continue
-            run_end = next_tick + 1
-            while run_end < len(text) and text[run_end] == "`":
-                run_end += 1
-            if run_end - next_tick == delimiter_length:
-                closing_end = run_end
-                break
-            search_at = run_end
-
-        if closing_end is None:
-            index = opener_end
+        candidates = runs_by_length.get(length, [])
+        cursor = cursors.get(length, 0)
+        while cursor < len(candidates) and candidates[cursor] <= position:
+            cursor += 1
+        cursors[length] = cursor
+        if cursor == len(candidates):
+            position += 1
             continue
-        ranges.append((index, closing_end))
-        index = closing_end
 
-    return merge_ranges(ranges)
+        closing = candidates[cursor]
+        ranges.append((start, runs[closing][1]))
+        position = closing + 1
+
+    return ranges
+
+
+# -----------------------------------------------------------------------------
+def markdown_code_ranges(text: str) -> list[tuple[int, int]]:
+    """
+    Locate fenced, indented, and inline Markdown code regions.
+
+    The text is scanned once line by line for code blocks, then once over its
+    backtick runs for inline code spans, so the cost is linear in the text
+    length.
+
+    Args:
+        text: Markdown text to inspect.
+
+    Returns:
+        Sorted, disjoint ``(start, end)`` character ranges.
+    """
+    block_ranges = _block_code_ranges(text)
+    return merge_ranges([*block_ranges, *_inline_code_ranges(text, block_ranges)])
 
 
 # -----------------------------------------------------------------------------
@@ -345,14 +437,252 @@ def position_in_ranges(index: int, ranges: Sequence[tuple[int, int]]) -> bool:
 
 
 # -----------------------------------------------------------------------------
-def _matches_outside_code(pattern: re.Pattern[str], text: str) -> list[re.Match[str]]:
-    """Return regex matches whose opening character is not Markdown code."""
-    ranges = markdown_code_ranges(text)
-    return [
-        match
-        for match in pattern.finditer(text)
-        if not position_in_ranges(match.start(), ranges)
-    ]
+class CodeRangeIndex:
+    """
+    Bisection index over protected character ranges.
+
+    The ranges are merged once and stored as two sorted arrays of start and end
+    offsets. Membership and skip queries are then answered in ``O(log n)``
+    instead of walking the range list from the beginning for every regex match.
+
+    Args:
+        ranges: Character ranges to protect. They may overlap and do not need
+            to be sorted.
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, ranges: Sequence[tuple[int, int]] = ()) -> None:
+        merged = merge_ranges(ranges)
+        self._starts: list[int] = [start for start, _ in merged]
+        self._ends: list[int] = [end for _, end in merged]
+
+    @classmethod
+    def from_text(cls, text: str) -> CodeRangeIndex:
+        """Build the index of Markdown code regions found in ``text``."""
+        return cls(markdown_code_ranges(text))
+
+    @property
+    def ranges(self) -> list[tuple[int, int]]:
+        """Return the merged ranges as ``(start, end)`` tuples."""
+        return list(zip(self._starts, self._ends))
+
+    def __len__(self) -> int:
+        """Return the number of merged ranges."""
+        return len(self._starts)
+
+    def _range_end(self, index: int) -> int | None:
+        """Return the end of the range containing ``index``, if any."""
+        position = bisect_right(self._starts, index) - 1
+        if position >= 0 and index < self._ends[position]:
+            return self._ends[position]
+        return None
+
+    def contains(self, index: int) -> bool:
+        """
+        Return whether ``index`` belongs to a protected range.
+
+        Args:
+            index: Character offset to test.
+
+        Returns:
+            ``True`` when ``index`` is protected, otherwise ``False``.
+        """
+        return self._range_end(index) is not None
+
+    def next_unprotected(self, index: int) -> int:
+        """
+        Return the first unprotected offset at or after ``index``.
+
+        Merged ranges never touch each other, so the end of the range containing
+        ``index`` is always unprotected.
+
+        Args:
+            index: Character offset to start from.
+
+        Returns:
+            ``index`` itself when it is not protected, otherwise the end of the
+            protected range containing it.
+        """
+        end = self._range_end(index)
+        return index if end is None else end
+
+
+# -----------------------------------------------------------------------------
+class DocumentScan:
+    """
+    Parse-once view of a Markdown text.
+
+    A scan locates the Markdown code regions of ``text`` once and then serves
+    every regex lookup that must ignore code: link extraction here, directive
+    and heading lookups in :mod:`pymdtools.instruction`. Match lists are cached
+    per pattern, so helpers sharing a scan never run the same ``finditer``
+    twice.
+
+    Use :func:`scan_markdown` to obtain a scan; it memoizes recent texts so
+    chained helpers working on the same text share one scan automatically.
+
+    Args:
+        text: Markdown text to scan.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        self.code_ranges: CodeRangeIndex = CodeRangeIndex.from_text(text)
+        self._newlines: list[int] | None = None
+        self._comment_spans: list[tuple[int, int]] | None = None
+        self._protected_ranges: CodeRangeIndex | None = None
+        self._matches: dict[
+            tuple[re.Pattern[str], bool], list[re.Match[str]]
+        ] = {}
+        self._derived: dict[str, object] = {}
+
+    def cached(self, key: str, build: Callable[[DocumentScan], _T]) -> _T:
+        """
+        Return a view derived from this scan, built on first use.
+
+        Other modules use this to attach their own parse results to a shared
+        scan, for example the directive tokens of :mod:`pymdtools.instruction`.
+
+        Args:
+            key: Name of the derived view; use a module-qualified name.
+            build: Callable computing the view from the scan.
+
+        Returns:
+            The cached result of ``build(self)``.
+        """
+        if key not in self._derived:
+            self._derived[key] = build(self)
+        return cast(_T, self._derived[key])
+
+    def line_number(self, index: int) -> int:
+        """Return the one-based line number containing ``index``."""
+        if self._newlines is None:
+            self._newlines = [
+                match.start() for match in re.finditer("\n", self.text)
+            ]
+        return bisect_left(self._newlines, index) + 1
+
+    @property
+    def comment_spans(self) -> list[tuple[int, int]]:
+        """Return the spans of every ``<!-- ... -->`` comment, code included."""
+        if self._comment_spans is None:
+            self._comment_spans = [
+                match.span() for match in HTML_COMMENT_RE.finditer(self.text)
+            ]
+        return self._comment_spans
+
+    @property
+    def protected_ranges(self) -> CodeRangeIndex:
+        """Return the index of code regions merged with comment spans."""
+        if self._protected_ranges is None:
+            self._protected_ranges = CodeRangeIndex(
+                [*self.code_ranges.ranges, *self.comment_spans]
+            )
+        return self._protected_ranges
+
+    def matches(
+        self,
+        pattern: re.Pattern[str],
+        *,
+        skip_comments: bool = False,
+    ) -> list[re.Match[str]]:
+        """
+        Return the matches of ``pattern`` that do not open inside code.
+
+        The list is computed on first use and cached for the lifetime of the
+        scan. Callers must not mutate it.
+
+        Args:
+            pattern: Compiled pattern applied with ``finditer``.
+            skip_comments: Also drop matches opening inside an HTML comment.
+
+        Returns:
+            Matches in document order.
+        """
+        key = (pattern, skip_comments)
+        cached = self._matches.get(key)
+        if cached is None:
+            protected = (
+                self.protected_ranges if skip_comments else self.code_ranges
+            )
+            cached = [
+                match
+                for match in pattern.finditer(self.text)
+                if not protected.contains(match.start())
+            ]
+            self._matches[key] = cached
+        return cached
+
+    def search(self, pattern: re.Pattern[str], pos: int = 0) -> re.Match[str] | None:
+        """
+        Return the first match at or after ``pos`` that does not open in code.
+
+        When a candidate opens inside a code region, the search resumes at the
+        end of that region instead of retrying every candidate still inside it.
+        A candidate that opens in code therefore never hides a match that
+        starts right after the code region.
+
+        Args:
+            pattern: Compiled pattern to search for.
+            pos: Offset where the search starts.
+
+        Returns:
+            The first unprotected match, or ``None``.
+        """
+        ranges = self.code_ranges
+        match = pattern.search(self.text, ranges.next_unprotected(pos))
+        while match is not None and ranges.contains(match.start()):
+            match = pattern.search(self.text, ranges.next_unprotected(match.start()))
+        return match
+
+    @property
+    def inline_links(self) -> list[re.Match[str]]:
+        """Return inline links such as ``[label](url "title")``."""
+        return self.matches(_INLINE_LINK_RE)
+
+    @property
+    def reference_names(self) -> list[re.Match[str]]:
+        """Return reference-style link usages such as ``[label][id]``."""
+        return self.matches(_REF_NAME_RE)
+
+    @property
+    def reference_definitions(self) -> list[re.Match[str]]:
+        """Return reference definitions such as ``[id]: url "title"``."""
+        return self.matches(_REF_URL_RE)
+
+
+# -----------------------------------------------------------------------------
+@lru_cache(maxsize=16)
+def _cached_scan(text: str) -> DocumentScan:
+    """Return a memoized scan keyed by the text value."""
+    return DocumentScan(text)
+
+
+# -----------------------------------------------------------------------------
+def scan_markdown(text: str, scan: DocumentScan | None = None) -> DocumentScan:
+    """
+    Return the :class:`DocumentScan` describing ``text``.
+
+    A precomputed ``scan`` is returned as-is after checking that it was built
+    for the same text. Otherwise a scan is taken from a small memo of recent
+    texts, or built and memoized.
+
+    Args:
+        text: Markdown text to scan.
+        scan: Optional scan previously built for ``text``.
+
+    Returns:
+        A scan of ``text``.
+
+    Raises:
+        ValueError: If ``scan`` was built for a different text.
+    """
+    if scan is None:
+        return _cached_scan(text)
+    if scan.text is not text and scan.text != text:
+        raise ValueError("scan was built for a different text")
+    return scan
 
 
 # -----------------------------------------------------------------------------
@@ -505,6 +835,8 @@ class Link(dict[str, LinkValue]):
 def search_link_in_md_text(
     text: str,
     previous_links: Sequence[LinkMapping] | None = None,
+    *,
+    scan: DocumentScan | None = None,
 ) -> list[LinkRecord]:
     """
     Extract Markdown links from text.
@@ -518,38 +850,43 @@ def search_link_in_md_text(
     Args:
         text: Markdown text to inspect.
         previous_links: Optional existing links to prepend to the result.
+        scan: Optional :class:`DocumentScan` previously built for ``text``.
 
     Returns:
         A list of link records in discovery order. Each extracted record contains
         ``name``, ``url``, ``title`` and ``line`` when available.
+
+    Raises:
+        ValueError: If ``scan`` was built for a different text.
     """
+    document = scan_markdown(text, scan)
     result = [_copy_link(link) for link in previous_links] if previous_links else []
 
-    for match in _matches_outside_code(_INLINE_LINK_RE, text):
+    for match in document.inline_links:
         result.append(
             {
                 "name": match.group("name"),
                 "url": match.group("url"),
                 "title": match.group("title"),
-                "line": _line_number(text, match.start()),
+                "line": document.line_number(match.start()),
             }
         )
 
     links_by_ref: dict[str, LinkRecord] = {}
-    for match in _matches_outside_code(_REF_NAME_RE, text):
+    for match in document.reference_names:
         links_by_ref[match.group("id_link")] = {
             "name": match.group("name"),
             "url": None,
         }
 
-    for match in _matches_outside_code(_REF_URL_RE, text):
+    for match in document.reference_definitions:
         id_link = match.group("id_link")
         ref_link = links_by_ref.get(id_link)
         if ref_link is None:
             continue
         ref_link["url"] = match.group("url")
         ref_link["title"] = match.group("title")
-        ref_link["line"] = _line_number(text, match.start())
+        ref_link["line"] = document.line_number(match.start())
         result.append(ref_link)
 
     return result
@@ -683,7 +1020,13 @@ def move_base_path_in_md_text(text_md: str, mv_base_path: common.PathInput) -> s
 
 
 # -----------------------------------------------------------------------------
-def update_link_in_md_text(text_md: str, name: str, new_link: LinkMapping) -> str:
+def update_link_in_md_text(
+    text_md: str,
+    name: str,
+    new_link: LinkMapping,
+    *,
+    scan: DocumentScan | None = None,
+) -> str:
     """
     Replace links identified by their visible label.
 
@@ -703,17 +1046,18 @@ def update_link_in_md_text(text_md: str, name: str, new_link: LinkMapping) -> st
         TypeError: If required fields in ``new_link`` are missing or are not
             strings.
     """
+    document = scan_markdown(text_md, scan)
     link = _copy_link(new_link)
     replacement_inline = sub_string_link_md("", link)
     replacement_name = _link_string(link, "name")
     replacements: list[tuple[int, int, str]] = []
 
-    for match in _matches_outside_code(_INLINE_LINK_RE, text_md):
+    for match in document.inline_links:
         if match.group("name") == name:
             replacements.append((*match.span(), replacement_inline))
 
     reference_ids: set[str] = set()
-    for match in _matches_outside_code(_REF_NAME_RE, text_md):
+    for match in document.reference_names:
         if match.group("name") != name:
             continue
         id_link = match.group("id_link")
@@ -722,7 +1066,7 @@ def update_link_in_md_text(text_md: str, name: str, new_link: LinkMapping) -> st
             (*match.span(), f"[{replacement_name}][{id_link}]")
         )
 
-    for match in _matches_outside_code(_REF_URL_RE, text_md):
+    for match in document.reference_definitions:
         id_link = match.group("id_link")
         if id_link not in reference_ids:
             continue
@@ -745,6 +1089,8 @@ def update_link_from_old_link(
     text_md: str,
     old_link: LinkMapping,
     new_link: LinkMapping,
+    *,
+    scan: DocumentScan | None = None,
 ) -> str:
     """
     Replace a link identified by its previous label and URL.
@@ -766,23 +1112,24 @@ def update_link_from_old_link(
     """
     name = _link_string(old_link, "name")
     url = _link_string(old_link, "url")
+    document = scan_markdown(text_md, scan)
     link = _copy_link(new_link)
     replacement_inline = sub_string_link_md("", link)
     replacement_name = _link_string(link, "name")
     replacements: list[tuple[int, int, str]] = []
 
-    for match in _matches_outside_code(_INLINE_LINK_RE, text_md):
+    for match in document.inline_links:
         if match.group("name") == name and match.group("url") == url:
             replacements.append((*match.span(), replacement_inline))
 
     matching_reference_ids = {
         match.group("id_link")
-        for match in _matches_outside_code(_REF_URL_RE, text_md)
+        for match in document.reference_definitions
         if match.group("url") == url
     }
 
     referenced_ids: set[str] = set()
-    for match in _matches_outside_code(_REF_NAME_RE, text_md):
+    for match in document.reference_names:
         id_link = match.group("id_link")
         if match.group("name") != name or id_link not in matching_reference_ids:
             continue
@@ -791,7 +1138,7 @@ def update_link_from_old_link(
             (*match.span(), f"[{replacement_name}][{id_link}]")
         )
 
-    for match in _matches_outside_code(_REF_URL_RE, text_md):
+    for match in document.reference_definitions:
         id_link = match.group("id_link")
         if id_link not in referenced_ids or match.group("url") != url:
             continue
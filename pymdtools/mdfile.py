@@ -121,13 +121,15 @@ class MarkdownContent(filetools.FileContent):
 
     Args:
         filename: Optional file path. If it points to an existing file and
-            ``content`` is ``None``, the file is read immediately.
+            ``content`` is ``None``, the file is read immediately, or on first
+            access to ``content`` when ``lazy`` is true.
         content: Optional Markdown text to use as the initial buffer. Passing a
             string marks the inherited object as needing a save.
         backup: Whether inherited writes should create backups before
             overwriting existing files.
         encoding: Encoding used when reading an existing file. ``None`` keeps
             the automatic detection behavior provided by ``FileContent``.
+        lazy: Defer reading an existing file until ``content`` is first used.
         **kwargs: Options reused by include processing, such as
             ``search_folders``, ``relative_paths``, ``include_cwd``,
             ``nb_up_path``, ``error_if_no_file``, ``render_mode`` and
@@ -142,7 +144,8 @@ class MarkdownContent(filetools.FileContent):
     def __init__(self, filename: common.PathInput | None = None,
                  content: str | None = None,
                  backup: bool = True,
-                 encoding: str | None = None, **kwargs: Any) -> None:
+                 encoding: str | None = None, *, lazy: bool = False,
+                 **kwargs: Any) -> None:
         """
         Initialize a Markdown content wrapper.
 
@@ -155,7 +158,8 @@ class MarkdownContent(filetools.FileContent):
                                        content=content,
                                        filename=filename,
                                        backup=backup,
-                                       encoding=encoding)
+                                       encoding=encoding,
+                                       lazy=lazy)
 
         self.__var_dict = {}
         self.__var_dict_text = None
@@ -28,29 +28,50 @@ The module deliberately keeps external integrations at the edge:
 The public API is intentionally compatible with the historical module names:
 ``convert_md_to_html``, ``convert_html_to_pdf``, ``pdf_features`` and
 ``convert_md_to_pdf`` remain the main entry points.
+``convert_many_md_to_pdf`` runs the same pipeline over many files at once,
+and ``BuildCache`` reuses outputs whose inputs did not change.
 """
 
 from __future__ import annotations
 
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import AbstractContextManager, nullcontext
+from contextvars import ContextVar
 from copy import copy
+from dataclasses import dataclass
 from html import escape
 from importlib import import_module
 from pathlib import Path, PurePosixPath, PureWindowsPath
-from typing import Any, BinaryIO, cast
+from typing import Any, BinaryIO, TypeVar, cast
 
+import hashlib
+import io
+import json
 import logging
 import os
 import re
 import shutil
+import stat
+import subprocess
 import sys
 import tempfile
+import threading
 import time
 import warnings
 
 from . import common
 from . import instruction
 from . import mistune_integration as mistune
+from .version import __version__
 
 pdfkit = cast(Any, import_module("pdfkit"))
 mkd = cast(Any, import_module("markdown"))
@@ -64,6 +85,7 @@ PdfReader = getattr(_pdf_module, "PdfReader")
 PdfWriter = getattr(_pdf_module, "PdfWriter")
 
 MdToHtmlConverter = Callable[[str], str]
+_T = TypeVar("_T")
 
 DEFAULT_LAYOUT = "jasonm23-swiss"
 DEFAULT_MD_EXTENSION = ".md"
@@ -149,6 +171,21 @@ def _validate_pdf_file(path: Path, *, require_pages: bool = True) -> None:
         raise ValueError("PDF must contain at least one page")
 
 
+# -----------------------------------------------------------------------------
+def _read_pdf_bytes(data: bytes, *, name: str) -> Any:
+    """Return a reader over an in-memory PDF, with the file checks' errors."""
+    try:
+        if not data:
+            raise ValueError("empty output")
+        reader = PdfReader(io.BytesIO(data))
+        page_count = len(reader.pages)
+    except Exception as error:
+        raise RuntimeError(f"invalid PDF output: {name}") from error
+    if page_count == 0:
+        raise ValueError("PDF must contain at least one page")
+    return reader
+
+
 # -----------------------------------------------------------------------------
 def _stage_pdf_writer(writer: Any, target: Path) -> Path:
     """Write and validate a PDF in a temporary sibling of ``target``."""
@@ -175,6 +212,21 @@ def _write_pdf_writer_atomic(writer: Any, target: Path) -> None:
         staged.unlink(missing_ok=True)
 
 
+# -----------------------------------------------------------------------------
+def _write_pdf_bytes_atomic(data: bytes, target: Path) -> None:
+    """Write PDF bytes to ``target`` once they read back as a valid PDF."""
+    staged = _new_staged_path(target, suffix=DEFAULT_PDF_EXTENSION + ".tmp")
+    try:
+        with staged.open("wb") as stream:
+            stream.write(data)
+            stream.flush()
+            os.fsync(stream.fileno())
+        _validate_pdf_file(staged)
+        _commit_staged_file(staged, target)
+    finally:
+        staged.unlink(missing_ok=True)
+
+
 # -----------------------------------------------------------------------------
 def _write_text_atomic(
     target: Path,
@@ -282,8 +334,17 @@ def _layout_asset_namespace(layout_path: Path) -> Path:
 
 
 # -----------------------------------------------------------------------------
-def _copy_layout_assets(layout_path: Path, path_dest: Path) -> Path:
-    """Copy a complete layout asset tree into an isolated output namespace."""
+def _copy_layout_assets(
+    layout_path: Path,
+    path_dest: Path,
+    manifest: list[tuple[str, int, str]] | None = None,
+) -> Path:
+    """
+    Copy a complete layout asset tree into an isolated output namespace.
+
+    When ``manifest`` is given, a ``(relative path, size, sha256)`` entry is
+    appended for every asset published.
+    """
     layout_root = layout_path.resolve()
     assets_root = common.check_folder(layout_root / "assets").resolve()
     if not assets_root.is_relative_to(layout_root):
@@ -313,7 +374,8 @@ def _copy_layout_assets(layout_path: Path, path_dest: Path) -> Path:
         existing_by_case[relative.casefold()] = existing
 
     source_by_case: dict[str, Path] = {}
-    for source in sorted(assets_root.rglob("*")):
+    # Name order with each folder visited where it sorts, as sorted(rglob).
+    for source in common.walk_files(assets_root, files_only=False):
         if source.is_dir():
             continue
         if source.is_symlink() or not source.is_file():
@@ -347,81 +409,672 @@ def _copy_layout_assets(layout_path: Path, path_dest: Path) -> Path:
                     "layout asset collides on a case-insensitive filesystem: "
                     f"{destination}"
                 )
-            if existing.read_bytes() != source.read_bytes():
+            if (
+                existing.stat().st_size != source.stat().st_size
+                or existing.read_bytes() != source.read_bytes()
+            ):
                 raise FileExistsError(
                     f"layout asset would overwrite an existing file: {destination}"
                 )
+        else:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_copy_file(source, destination)
+            existing_by_case[relative_key] = destination
+
+        if manifest is not None:
+            data = source.read_bytes()
+            manifest.append(
+                (relative.as_posix(), len(data), hashlib.sha256(data).hexdigest())
+            )
+
+    return namespace
+
+
+# -----------------------------------------------------------------------------
+_asset_publishers: common.ContextStack[AssetPublisher] = common.ContextStack(
+    "pymdtools_asset_publisher"
+)
+
+
+class AssetPublisher:
+    """
+    Build-scoped publisher of layout assets.
+
+    Outside a publisher, every :func:`convert_md_to_html` call whose layout
+    references ``{{asset ...}}`` walks the layout and destination asset
+    trees, compares existing files and copies the missing ones. While a
+    publisher is active (inside its ``with`` block), each layout namespace
+    is published once per destination folder with the same collision and
+    symlink checks, and a manifest of ``(relative path, size, sha256)`` is
+    recorded; later documents going to that destination only look the
+    manifest up.
+
+    Asset files changed or removed in the output folder during the build are
+    not noticed; a new publisher checks everything again. Conversions in
+    other threads keep checking their assets unless they run in a pool
+    started from the ``with`` block, such as :func:`convert_many_md_to_pdf`.
+
+    Example:
+        >>> with AssetPublisher() as publisher:
+        ...     for page in pages:
+        ...         convert_md_to_html(page, path_dest="build/html")
+        >>> publisher.hits
+        41
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._manifests: dict[
+            tuple[Path, Path], tuple[Path, tuple[tuple[str, int, str], ...]]
+        ] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def __enter__(self) -> AssetPublisher:
+        _asset_publishers.push(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        _asset_publishers.pop(self)
+
+    @property
+    def hits(self) -> int:
+        """Number of documents served by an already published namespace."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of namespaces published (and checked) in full."""
+        return self._misses
+
+    def manifest(
+        self, layout_path: common.PathInput, path_dest: common.PathInput
+    ) -> tuple[tuple[str, int, str], ...] | None:
+        """
+        Return the manifest of a published layout namespace.
+
+        Args:
+            layout_path: Layout folder.
+            path_dest: Destination folder the assets were published to.
+
+        Returns:
+            ``(relative path, size, sha256)`` entries sorted as published, or
+            ``None`` if the layout was not published there by this publisher.
+        """
+        key = (common.to_path(layout_path).resolve(), common.to_path(path_dest).resolve())
+        with self._lock:
+            published = self._manifests.get(key)
+        return None if published is None else published[1]
+
+    def publish(self, layout_path: Path, path_dest: Path) -> Path:
+        """
+        Publish a layout's assets to ``path_dest`` once for this build.
+
+        Args:
+            layout_path: Layout folder containing ``assets/``.
+            path_dest: Destination folder of the generated HTML.
+
+        Returns:
+            The asset namespace, relative to ``path_dest``.
+
+        Raises:
+            ValueError: If an asset or the destination fails a safety check.
+            FileExistsError: If an asset would overwrite a different file.
+        """
+        key = (layout_path.resolve(), path_dest.resolve())
+        with self._lock:
+            published = self._manifests.get(key)
+        if published is not None:
+            namespace, _ = published
+            try:
+                mode = os.lstat(key[1] / namespace).st_mode
+            except OSError:
+                mode = 0
+            if stat.S_ISDIR(mode):
+                with self._lock:
+                    self._hits += 1
+                return namespace
+
+        manifest: list[tuple[str, int, str]] = []
+        namespace = _copy_layout_assets(layout_path, path_dest, manifest)
+        with self._lock:
+            self._manifests[key] = (namespace, tuple(manifest))
+            self._misses += 1
+        return namespace
+
+
+# -----------------------------------------------------------------------------
+_build_caches: common.ContextStack[BuildCache] = common.ContextStack(
+    "pymdtools_build_cache"
+)
+# Set while an output is built for the active cache: the HTML stage of a PDF
+# build is not cached on its own.
+_building_for_cache: ContextVar[bool] = ContextVar(
+    "pymdtools_building_for_cache", default=False
+)
+
+
+class BuildCache:
+    """
+    Content-addressed output cache for :func:`convert_md_to_pdf` and
+    :func:`convert_md_to_html`.
+
+    While a cache is active (inside its ``with`` block), each output is keyed
+    by a SHA-256 digest of everything it is built from: the Markdown bytes,
+    the layout's ``page.html`` and assets, the converter name, the PDF
+    features (overlay PDF contents and metadata) and the pymdtools and
+    ``wkhtmltopdf`` versions. On a hit the output is a hard link to the
+    cached entry, or a copy where links are not available, and neither the
+    renderer nor ``wkhtmltopdf`` runs. The cache folder holds::
+
+        <root>/objects/<ab>/<key>.pdf|.html    one entry per build key
+        <root>/sources/<name>-<path hash>.json key parts of each output
+
+    Entries are touched when used; once their total size exceeds
+    ``max_bytes``, the least recently used ones are evicted. The total is
+    kept up to date as entries are added, so the folder is only listed on
+    the first store and when the limit is crossed. Each miss is logged with
+    its reason, found by comparing the key parts with those of the previous
+    build of the same output.
+
+    The print date in the PDF footer is not part of the key: a PDF served
+    from the cache keeps the date of the build that produced it.
+
+    Outputs may share their data with the cache: replace them rather than
+    editing them in place. Layout files and the ``wkhtmltopdf`` version are
+    read once per cache object. Several processes may share the cache
+    folder; within a process, the cache only serves the conversions of the
+    context that entered it and of the pools it starts.
+
+    Args:
+        root: Cache folder, created on first use.
+        max_bytes: Size limit of the cached entries.
+
+    Raises:
+        ValueError: If ``max_bytes`` is not positive.
+
+    Example:
+        >>> with BuildCache("build/.pymdtools-cache") as cache:
+        ...     for item in convert_many_md_to_pdf(manuals):
+        ...         pass
+        >>> cache.hits
+        97
+    """
+
+    def __init__(
+        self, root: common.PathInput, *, max_bytes: int = 1024 * 1024 * 1024
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be > 0, got: {max_bytes}")
+        self.root = common.normpath(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._layouts: dict[Path, str] = {}
+        self._wkhtmltopdf: str | None = None
+        # Size of the entries, known after the first walk of the folder.
+        self._size: int | None = None
+        self._hits = 0
+        self._misses = 0
+
+    def __enter__(self) -> BuildCache:
+        _build_caches.push(self)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        _build_caches.pop(self)
+
+    @property
+    def hits(self) -> int:
+        """Number of outputs served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of outputs built and added to the cache."""
+        return self._misses
+
+    def pdf_key(
+        self, md_filename: Path, options: Mapping[str, Any]
+    ) -> dict[str, str]:
+        """
+        Return the key parts of a :func:`convert_md_to_pdf` output.
+
+        Args:
+            md_filename: Markdown source.
+            options: Keyword options given to :func:`convert_md_to_pdf`.
+
+        Returns:
+            Digest or text of each input, by name.
+
+        Raises:
+            FileNotFoundError: If the source or an overlay PDF is missing.
+        """
+        if self._wkhtmltopdf is None:
+            self._wkhtmltopdf = _wkhtmltopdf_version()
+        return {
+            "markdown": _sha256_file(md_filename),
+            # The page header falls back to the file name.
+            "name": md_filename.stem,
+            "layout": self._layout_digest(_get_layout_page(DEFAULT_LAYOUT).parent),
+            "converter": "mistune",
+            "features": _features_digest(options),
+            "versions": f"pymdtools {__version__}; {self._wkhtmltopdf}",
+        }
+
+    def html_key(
+        self,
+        md_filename: Path,
+        layout_path: Path,
+        converter: str | None,
+        encoding: str,
+    ) -> dict[str, str]:
+        """
+        Return the key parts of a :func:`convert_md_to_html` output.
+
+        Args:
+            md_filename: Markdown source.
+            layout_path: Layout folder.
+            converter: Markdown renderer name.
+            encoding: Encoding of the HTML file.
+
+        Returns:
+            Digest or text of each input, by name.
+        """
+        return {
+            "markdown": _sha256_file(md_filename),
+            "layout": self._layout_digest(layout_path),
+            "converter": (
+                converter if converter in _MD_TO_HTML_CONVERTERS else "mistune"
+            ),
+            "encoding": encoding,
+            "versions": f"pymdtools {__version__}",
+        }
+
+    def _layout_digest(self, layout_path: Path) -> str:
+        """Return the digest of a layout's ``page.html`` and assets."""
+        with self._lock:
+            cached = self._layouts.get(layout_path)
+        if cached is not None:
+            return cached
+        digest = hashlib.sha256()
+        files = [layout_path / "page.html"]
+        if (layout_path / "assets").is_dir():
+            files += common.walk_files(layout_path / "assets")
+        for path in files:
+            digest.update(path.relative_to(layout_path).as_posix().encode("utf-8"))
+            digest.update(b"\0" + _sha256_file(path).encode("ascii"))
+        with self._lock:
+            self._layouts[layout_path] = digest.hexdigest()
+        return digest.hexdigest()
+
+    def _entry(self, parts: Mapping[str, str], suffix: str) -> Path:
+        """Return the entry path of a build key."""
+        key = hashlib.sha256(
+            json.dumps(parts, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return self.root / "objects" / key[:2] / f"{key}{suffix}"
+
+    def _index(self, output: Path) -> Path:
+        """Return the file recording the key parts of ``output``'s last build."""
+        path_hash = hashlib.sha256(str(output).encode("utf-8")).hexdigest()[:16]
+        return self.root / "sources" / f"{output.name}-{path_hash}.json"
+
+    def fetch(
+        self,
+        parts: Mapping[str, str],
+        output: Path,
+        *,
+        prepare: Callable[[], object] | None = None,
+    ) -> bool:
+        """
+        Expose the cached entry of a build key at ``output``.
+
+        Misses are counted and logged with their reason.
+
+        Args:
+            parts: Key parts from :meth:`pdf_key` or :meth:`html_key`.
+            output: File to create or replace.
+            prepare: Called on a hit, before ``output`` is replaced.
+
+        Returns:
+            True on a hit, False if ``output`` must be built.
+        """
+        entry = self._entry(parts, output.suffix)
+        if not entry.is_file():
+            self._miss(output, self._miss_reason(parts, output))
+            return False
+        if prepare is not None:
+            prepare()
+        staged = _new_staged_path(output, suffix=output.suffix + ".tmp")
+        try:
+            staged.unlink()
+            try:
+                os.link(entry, staged)
+            except OSError:
+                shutil.copyfile(entry, staged)
+            os.utime(entry)
+            _commit_staged_file(staged, output)
+        except FileNotFoundError:
+            self._miss(output, "entry evicted")
+            return False
+        finally:
+            staged.unlink(missing_ok=True)
+        self._record(parts, output)
+        logging.info("Build cache hit for %s", output)
+        with self._lock:
+            self._hits += 1
+        return True
+
+    def store(self, parts: Mapping[str, str], output: Path) -> None:
+        """
+        Add a freshly built output to the cache, then evict down to size.
+
+        Args:
+            parts: Key parts computed before ``output`` was built.
+            output: The built file.
+        """
+        entry = self._entry(parts, output.suffix)
+        try:
+            replaced = entry.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        staged = _new_staged_path(entry)
+        try:
+            staged.unlink()
+            try:
+                os.link(output, staged)
+            except OSError:
+                shutil.copyfile(output, staged)
+            added = staged.stat().st_size - replaced
+            staged.replace(entry)
+        finally:
+            staged.unlink(missing_ok=True)
+        self._record(parts, output)
+        with self._lock:
+            if self._size is not None:
+                self._size += added
+            over_limit = self._size is None or self._size > self.max_bytes
+        if over_limit:
+            self._evict(keep=entry)
+
+    def _record(self, parts: Mapping[str, str], output: Path) -> None:
+        """Remember the key parts of ``output``'s build for miss reasons."""
+        _write_text_atomic(
+            self._index(output), json.dumps(parts, sort_keys=True), encoding="utf-8"
+        )
+
+    def _miss(self, output: Path, reason: str) -> None:
+        """Count and log a miss."""
+        logging.info("Build cache miss for %s: %s", output, reason)
+        with self._lock:
+            self._misses += 1
+
+    def _miss_reason(self, parts: Mapping[str, str], output: Path) -> str:
+        """Explain a miss from the key parts of ``output``'s previous build."""
+        try:
+            previous = json.loads(self._index(output).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            previous = None
+        if not isinstance(previous, dict):
+            return "no previous build"
+        previous_parts = cast(dict[str, Any], previous)
+        changed = [name for name in parts if previous_parts.get(name) != parts[name]]
+        if not changed:
+            return "entry evicted"
+        return f"{', '.join(changed)} changed"
+
+    def _evict(self, *, keep: Path) -> None:
+        """
+        Delete the least recently used entries beyond ``max_bytes``.
+
+        The entries are listed once per call; the size left is recorded so
+        that the next stores only walk the folder again when it is exceeded.
+        Eviction goes down to 90% of ``max_bytes`` to space the walks out.
+        """
+        entries: list[tuple[int, Path, int]] = []
+        for path in common.walk_files(self.root / "objects"):
+            if path.name.startswith("."):
+                continue
+            try:
+                stat_result = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat_result.st_mtime_ns, path, stat_result.st_size))
+        total = sum(size for _, _, size in entries)
+        if total > self.max_bytes:
+            low_water = self.max_bytes * 9 // 10
+            for _, path, size in sorted(entries):
+                if total <= low_water:
+                    break
+                if path == keep:
+                    continue
+                logging.info("Build cache evicts %s", path.name)
+                path.unlink(missing_ok=True)
+                total -= size
+        with self._lock:
+            self._size = total
+
+
+# -----------------------------------------------------------------------------
+def _current_build_cache() -> BuildCache | None:
+    """Return the active build cache, unless an output is being built for it."""
+    if _building_for_cache.get():
+        return None
+    return _build_caches.get()
+
+
+# -----------------------------------------------------------------------------
+def _sha256_file(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as stream:
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# -----------------------------------------------------------------------------
+def _stable_text(value: Any) -> str:
+    """Return an order-independent text form of an option value."""
+    if isinstance(value, Mapping):
+        mapping = cast(Mapping[Any, Any], value)
+        return json.dumps(
+            sorted([str(key), _stable_text(item)] for key, item in mapping.items())
+        )
+    return str(value)
+
+
+# -----------------------------------------------------------------------------
+def _features_digest(kwargs: Mapping[str, Any]) -> str:
+    """
+    Return the digest of :func:`pdf_features` options.
+
+    Overlay PDFs count by content, so the ``path`` option they are relative to
+    is left out.
+    """
+    items: list[list[str]] = []
+    for key, value in sorted(kwargs.items()):
+        if key == "path":
             continue
+        if key in OVERLAY_OPTION_ALIASES and value is not None:
+            value = _sha256_file(_overlay_path(value, kwargs.get("path")))
+        items.append([key, _stable_text(value)])
+    return hashlib.sha256(json.dumps(items).encode("utf-8")).hexdigest()
 
-        destination.parent.mkdir(parents=True, exist_ok=True)
-        _atomic_copy_file(source, destination)
-        existing_by_case[relative_key] = destination
 
-    return namespace
+# -----------------------------------------------------------------------------
+def _wkhtmltopdf_version() -> str:
+    """Return the ``wkhtmltopdf --version`` banner, for build cache keys."""
+    try:
+        executable = find_wk_html_to_pdf()
+    except FileNotFoundError:
+        return "wkhtmltopdf missing"
+    completed = subprocess.run(
+        [str(executable), "--version"],
+        capture_output=True,
+        text=True,
+        check=False,
+        timeout=60,
+    )
+    return completed.stdout.strip() or f"{executable} unknown version"
+
+
+# -----------------------------------------------------------------------------
+def _publish_layout_assets(layout_path: Path, path_dest: Path) -> Path:
+    """Copy a layout's assets to ``path_dest``, through the active publisher."""
+    publisher = _asset_publishers.get()
+    if publisher is None:
+        return _copy_layout_assets(layout_path, path_dest)
+    return publisher.publish(layout_path, path_dest)
+
+
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class _LayoutSlot:
+    """A placeholder of a compiled layout: its kind, argument and source text."""
+
+    kind: str  # "title" | "content" | "asset" | "var"
+    value: str
+    text: str
+
+
+@dataclass(frozen=True)
+class _CompiledLayout:
+    """A layout split once into literal chunks and placeholder slots."""
+
+    segments: tuple[str | _LayoutSlot, ...]
+    has_assets: bool
+
+
+# Compiled ``page.html`` files, stamped with (st_mtime_ns, st_size).
+_compiled_layouts: dict[Path, tuple[tuple[int, int], _CompiledLayout]] = {}
+_compiled_layouts_lock = threading.Lock()
+
+
+# -----------------------------------------------------------------------------
+def _compile_layout(page_html: str) -> _CompiledLayout:
+    """
+    Split a layout template into literal chunks and placeholder slots.
+
+    ``{{~> toc}}`` markers are dropped first, then every ``{{...}}`` becomes a
+    slot. Only the template is scanned: text substituted at render time is
+    never interpreted as a placeholder.
+    """
+    page_html = TOC_RE.sub("", page_html)
+    segments: list[str | _LayoutSlot] = []
+    position = 0
+    for match in PLACEHOLDER_RE.finditer(page_html):
+        inst = match.group(0)
+        logging.debug("instruction %s", inst)
+        if match.start() > position:
+            segments.append(page_html[position:match.start()])
+        position = match.end()
+
+        if inst == "{{title}}":
+            segments.append(_LayoutSlot("title", "", inst))
+            continue
+        if inst == "{{~> content}}":
+            segments.append(_LayoutSlot("content", "", inst))
+            continue
+        asset_match = ASSET_RE.fullmatch(inst)
+        if asset_match:
+            segments.append(_LayoutSlot("asset", asset_match.group("name"), inst))
+            continue
+        segments.append(_LayoutSlot("var", inst[2:-2], inst))
+    if position < len(page_html):
+        segments.append(page_html[position:])
+
+    return _CompiledLayout(
+        segments=tuple(segments),
+        has_assets=ASSET_RE.search(page_html) is not None,
+    )
+
+
+# -----------------------------------------------------------------------------
+def _load_layout(page_html_filename: Path) -> _CompiledLayout:
+    """
+    Return the compiled layout of a ``page.html`` file.
+
+    Compiled layouts are kept for the process lifetime and compiled again
+    when the file's modification time or size changes.
+    """
+    st = page_html_filename.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _compiled_layouts_lock:
+        cached = _compiled_layouts.get(page_html_filename)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    compiled = _compile_layout(common.get_file_content(page_html_filename))
+    with _compiled_layouts_lock:
+        _compiled_layouts[page_html_filename] = (stamp, compiled)
+    return compiled
 
 
 # -----------------------------------------------------------------------------
 def _replace_layout_placeholders(
-    page_html: str,
+    page_html: str | _CompiledLayout,
     *,
     title: str,
     content: str,
     content_vars: Mapping[str, str],
     layout_path: Path,
-    path_dest: Path,
+    path_dest: Path | None,
 ) -> str:
     """
     Replace pymdtools layout placeholders in an HTML template.
 
+    The page is built with a single join over the compiled segments, so the
+    rendered content is copied once whatever the number of placeholders.
+
     Args:
-        page_html: Layout template content.
+        page_html: Layout template content, or a layout already compiled by
+            :func:`_compile_layout`.
         title: Markdown title used for ``{{title}}``.
         content: Rendered HTML fragment used for ``{{~> content}}``.
         content_vars: Variables extracted from Markdown comments.
         layout_path: Folder containing the layout's ``page.html``.
         path_dest: Destination folder for generated HTML and copied assets.
+            ``None`` links the layout's own asset files by ``file:`` URI,
+            without copying them, for HTML that is never written to disk.
 
     Returns:
         HTML content with placeholders replaced.
     """
-    page_html = TOC_RE.sub("", page_html)
-    asset_namespace = (
-        _copy_layout_assets(layout_path, path_dest)
-        if ASSET_RE.search(page_html)
-        else None
+    layout = (
+        _compile_layout(page_html) if isinstance(page_html, str) else page_html
     )
-
-    for inst in PLACEHOLDER_RE.findall(page_html):
-        logging.debug("instruction %s", inst)
-        if inst == "{{title}}":
-            page_html = page_html.replace(inst, escape(title, quote=True))
-            continue
-
-        if inst == "{{~> content}}":
-            page_html = page_html.replace(inst, content)
-            continue
-
-        asset_match = ASSET_RE.fullmatch(inst)
-        if asset_match:
-            asset_rel = _validate_asset_name(asset_match.group("name"))
+    asset_namespace: Path | None = None
+    if layout.has_assets and path_dest is not None:
+        asset_namespace = _publish_layout_assets(layout_path, path_dest)
+    escaped_title = escape(title, quote=True)
+    assets_root = (layout_path / "assets").resolve()
+
+    parts: list[str] = []
+    for segment in layout.segments:
+        if isinstance(segment, str):
+            parts.append(segment)
+        elif segment.kind == "title":
+            parts.append(escaped_title)
+        elif segment.kind == "content":
+            parts.append(content)
+        elif segment.kind == "asset":
+            asset_rel = _validate_asset_name(segment.value)
             source_file = common.check_file(layout_path / "assets" / asset_rel)
-            assets_root = (layout_path / "assets").resolve()
-            if not source_file.resolve().is_relative_to(assets_root):
+            resolved_source = source_file.resolve()
+            if not resolved_source.is_relative_to(assets_root):
                 raise ValueError(f"layout asset resolves outside its root: {source_file}")
+            if path_dest is None:
+                parts.append(resolved_source.as_uri())
+                continue
             if asset_namespace is None:
                 raise RuntimeError("layout asset namespace was not initialized")
-            asset_url = asset_namespace / asset_rel
-            page_html = page_html.replace(inst, asset_url.as_posix())
-            continue
-
-        var_name = inst[2:-2]
-        if var_name in content_vars:
-            page_html = page_html.replace(
-                inst,
-                escape(content_vars[var_name], quote=True),
-            )
-
-    return page_html
+            parts.append((asset_namespace / asset_rel).as_posix())
+        elif segment.value in content_vars:
+            parts.append(escape(content_vars[segment.value], quote=True))
+        else:
+            parts.append(segment.text)
+    return "".join(parts)
 
 
 # -----------------------------------------------------------------------------
@@ -547,6 +1200,9 @@ def convert_md_to_html(
     """
     Convert a Markdown file to an HTML file using a packaged layout.
 
+    Under an active :class:`BuildCache`, a page whose inputs did not change
+    is served from the cache.
+
     Args:
         filename: Markdown file to convert.
         layout: Layout folder name under ``pymdtools/layouts``.
@@ -573,7 +1229,60 @@ def convert_md_to_html(
         else common.check_folder(path_dest)
     )
 
-    content = common.get_file_content(md_filename)
+    html_filename = common.normpath(destination / f"{md_filename.stem}.html")
+    cache = _current_build_cache()
+    parts: dict[str, str] | None = None
+    if cache is not None:
+        layout_page = _get_layout_page(layout)
+        parts = cache.html_key(md_filename, layout_page.parent, converter, encoding)
+
+        def publish_assets() -> None:
+            if _load_layout(layout_page).has_assets:
+                _publish_layout_assets(layout_page.parent, destination)
+
+        if cache.fetch(parts, html_filename, prepare=publish_assets):
+            return html_filename
+
+    page_html = _render_md_page(
+        common.get_file_content(md_filename),
+        md_filename,
+        layout=layout,
+        converter=converter,
+        path_dest=destination,
+    )
+
+    logging.info("        -> html %s", html_filename)
+
+    _write_text_atomic(html_filename, page_html, encoding=encoding)
+    if cache is not None and parts is not None:
+        cache.store(parts, html_filename)
+
+    return html_filename
+
+
+# -----------------------------------------------------------------------------
+def _render_md_page(
+    content: str,
+    md_filename: Path,
+    *,
+    layout: str,
+    converter: str | None,
+    path_dest: Path | None,
+) -> str:
+    """
+    Render Markdown text into a complete layout page.
+
+    Args:
+        content: Markdown text of ``md_filename``.
+        md_filename: Source file, for messages.
+        layout: Layout folder name under ``pymdtools/layouts``.
+        converter: Markdown renderer name.
+        path_dest: Output folder receiving the layout assets, or ``None`` to
+            link them in place (see :func:`_replace_layout_placeholders`).
+
+    Returns:
+        The HTML page.
+    """
     content_vars = instruction.get_vars_from_md_text(content)
     title = cast(str | None, instruction.get_title_from_md_text(content))
     if title is None:
@@ -587,29 +1296,25 @@ def convert_md_to_html(
 
     page_html_filename = _get_layout_page(layout)
     layout_path = common.check_folder(page_html_filename.parent)
-    page_html = common.get_file_content(page_html_filename)
-    page_html = _replace_layout_placeholders(
-        page_html,
+    return _replace_layout_placeholders(
+        _load_layout(page_html_filename),
         title=title,
         content=rendered_content,
         content_vars=content_vars,
         layout_path=layout_path,
-        path_dest=destination,
+        path_dest=path_dest,
     )
 
-    html_filename = common.normpath(destination / f"{md_filename.stem}.html")
-    logging.info("        -> html %s", html_filename)
-
-    _write_text_atomic(html_filename, page_html, encoding=encoding)
-
-    return html_filename
-
 
 # -----------------------------------------------------------------------------
-def find_wk_html_to_pdf() -> Path:
+def find_wk_html_to_pdf(*, locator: common.FileLocator | None = None) -> Path:
     """
     Locate the platform's ``wkhtmltopdf`` executable.
 
+    Args:
+        locator: Optional :class:`~pymdtools.common.FileLocator` reused across
+            conversions, so the install folders are listed only once.
+
     Returns:
         Normalized executable path.
 
@@ -650,9 +1355,10 @@ def find_wk_html_to_pdf() -> Path:
         if os.name == "nt"
         else ("wkhtmltopdf", "wkhtmltopdf.exe")
     )
+    find_file = common.find_file if locator is None else locator.find_file
     for executable_name in executable_names:
         try:
-            return common.find_file(
+            return find_file(
                 executable_name,
                 start_points,
                 relative_paths,
@@ -694,22 +1400,9 @@ def convert_html_to_pdf(
         else html_filename.stem
     )
 
-    date_print = time.strftime("%d/%m/%Y", time.gmtime())
-    options: dict[str, str] = {
-        # Permit the generated HTML to load only sibling layout assets rather
-        # than enabling unrestricted local-file access.
-        "allow": str(html_filename.parent),
-        "header-center": header_text,
-        "footer-center": "page [page] sur [toPage]",
-        "footer-font-size": "8",
-        "footer-right": date_print,
-        "margin-top": "20mm",
-        "margin-bottom": "20mm",
-        "footer-spacing": "10",
-        "header-spacing": "10",
-        "header-font-size": "8",
-        "quiet": "",
-    }
+    # Permit the generated HTML to load only sibling layout assets rather
+    # than enabling unrestricted local-file access.
+    options = _wkhtmltopdf_options(header_text, allow=html_filename.parent)
 
     pdf_filename = html_filename.with_suffix(DEFAULT_PDF_EXTENSION)
     staged_pdf = _new_staged_path(pdf_filename, suffix=DEFAULT_PDF_EXTENSION)
@@ -729,6 +1422,45 @@ def convert_html_to_pdf(
     return pdf_filename
 
 
+# -----------------------------------------------------------------------------
+def _wkhtmltopdf_options(header_text: str, *, allow: Path) -> dict[str, str]:
+    """Return the ``wkhtmltopdf`` options, local files limited to ``allow``."""
+    date_print = time.strftime("%d/%m/%Y", time.gmtime())
+    return {
+        "allow": str(allow),
+        "header-center": header_text,
+        "footer-center": "page [page] sur [toPage]",
+        "footer-font-size": "8",
+        "footer-right": date_print,
+        "margin-top": "20mm",
+        "margin-bottom": "20mm",
+        "footer-spacing": "10",
+        "header-spacing": "10",
+        "header-font-size": "8",
+        "quiet": "",
+    }
+
+
+# -----------------------------------------------------------------------------
+def _html_to_pdf_bytes(html: str, *, header_text: str, allow: Path) -> bytes:
+    """
+    Render an HTML page to PDF bytes through ``wkhtmltopdf`` pipes.
+
+    The page is written to the process's stdin and the PDF read from its
+    stdout; nothing touches the disk. Local files are limited to ``allow``.
+    """
+    config = pdfkit.configuration(wkhtmltopdf=find_wk_html_to_pdf())
+    return cast(
+        bytes,
+        pdfkit.from_string(
+            html,
+            False,
+            options=_wkhtmltopdf_options(header_text, allow=allow),
+            configuration=config,
+        ),
+    )
+
+
 # -----------------------------------------------------------------------------
 def _metadata_from_kwargs(
     source_metadata: Mapping[Any, Any],
@@ -769,6 +1501,18 @@ def _page_with_background(
     return background_page
 
 
+# -----------------------------------------------------------------------------
+def _overlay_path(value: Any, base_path: Any) -> Path:
+    """Resolve an overlay PDF option, relative to the ``path`` option if set."""
+    local_name = Path(cast(common.PathInput, value))
+    if base_path is not None and not local_name.is_absolute():
+        local_name = Path(cast(common.PathInput, base_path)) / local_name
+    return common.check_file(
+        local_name,
+        expected_ext=DEFAULT_PDF_EXTENSION,
+    ).resolve()
+
+
 # -----------------------------------------------------------------------------
 def _collect_overlay_pdfs(
     kwargs: Mapping[str, Any],
@@ -796,14 +1540,7 @@ def _collect_overlay_pdfs(
             if value is None:
                 continue
 
-            local_name = Path(cast(common.PathInput, value))
-            base_path = kwargs.get("path")
-            if base_path is not None and not local_name.is_absolute():
-                local_name = Path(cast(common.PathInput, base_path)) / local_name
-            local_path = common.check_file(
-                local_name,
-                expected_ext=DEFAULT_PDF_EXTENSION,
-            ).resolve()
+            local_path = _overlay_path(value, kwargs.get("path"))
 
             previous_path = overlay_paths.get(arg_name)
             if previous_path is not None:
@@ -830,6 +1567,83 @@ def _collect_overlay_pdfs(
         raise
 
 
+# -----------------------------------------------------------------------------
+def _pdf_features_writer(
+    pdf_reader: Any,
+    requested_metadata: Mapping[Any, Any] | None,
+    kwargs: Mapping[str, Any],
+    handles: list[BinaryIO],
+) -> Any:
+    """
+    Return a PDF writer holding ``pdf_reader``'s pages with features applied.
+
+    The overlay PDFs opened for the writer are appended to ``handles``; the
+    caller closes them once the writer has been written.
+    """
+    if not pdf_reader.pages:
+        raise ValueError("source PDF must contain at least one page")
+
+    metadata = _metadata_from_kwargs(
+        pdf_reader.metadata or {},
+        requested_metadata,
+    )
+
+    pdf_args, overlay_handles = _collect_overlay_pdfs(kwargs)
+    handles.extend(overlay_handles)
+
+    pdf_writer = PdfWriter()
+
+    for page_number, page in enumerate(pdf_reader.pages):
+        background = None
+        if page_number == 0:
+            if "background_first_page" in pdf_args:
+                background = pdf_args["background_first_page"]
+            elif "background" in pdf_args:
+                background = pdf_args["background"]
+        else:
+            if "background" in pdf_args:
+                background = pdf_args["background"]
+
+        if background is not None:
+            page = _page_with_background(page, background, pdf_writer)
+        else:
+            pdf_writer.add_page(page)
+            page = pdf_writer.pages[-1]
+
+        if "watermark" in pdf_args:
+            page.merge_page(pdf_args["watermark"].pages[0])
+
+    pdf_writer.add_metadata(metadata)
+    return pdf_writer
+
+
+# -----------------------------------------------------------------------------
+def _pdf_features_bytes(
+    pdf_bytes: bytes,
+    *,
+    name: str,
+    metadata: Mapping[str, str],
+    feature_options: Mapping[str, Any],
+) -> bytes:
+    """
+    Return ``pdf_bytes`` with metadata and overlays applied, all in memory.
+
+    Takes and returns plain bytes so that it can run in a worker process.
+    """
+    pdf_reader = _read_pdf_bytes(pdf_bytes, name=name)
+    handles: list[BinaryIO] = []
+    try:
+        pdf_writer = _pdf_features_writer(
+            pdf_reader, metadata, feature_options, handles
+        )
+        stream = io.BytesIO()
+        pdf_writer.write(stream)
+        return stream.getvalue()
+    finally:
+        for handle in handles:
+            handle.close()
+
+
 # -----------------------------------------------------------------------------
 def pdf_features(
     filename: common.PathInput,
@@ -875,40 +1689,9 @@ def pdf_features(
 
         pdf_reader, source_handle = _read_pdf(temp_pdf_filename)
         handles.append(source_handle)
-        if not pdf_reader.pages:
-            raise ValueError("source PDF must contain at least one page")
-
-        metadata = _metadata_from_kwargs(
-            pdf_reader.metadata or {},
-            requested_metadata,
+        pdf_writer = _pdf_features_writer(
+            pdf_reader, requested_metadata, kwargs, handles
         )
-
-        pdf_args, overlay_handles = _collect_overlay_pdfs(kwargs)
-        handles.extend(overlay_handles)
-
-        pdf_writer = PdfWriter()
-
-        for page_number, page in enumerate(pdf_reader.pages):
-            background = None
-            if page_number == 0:
-                if "background_first_page" in pdf_args:
-                    background = pdf_args["background_first_page"]
-                elif "background" in pdf_args:
-                    background = pdf_args["background"]
-            else:
-                if "background" in pdf_args:
-                    background = pdf_args["background"]
-
-            if background is not None:
-                page = _page_with_background(page, background, pdf_writer)
-            else:
-                pdf_writer.add_page(page)
-                page = pdf_writer.pages[-1]
-
-            if "watermark" in pdf_args:
-                page.merge_page(pdf_args["watermark"].pages[0])
-
-        pdf_writer.add_metadata(metadata)
         staged_output = _stage_pdf_writer(pdf_writer, pdf_filename)
     finally:
         for handle in handles:
@@ -927,6 +1710,8 @@ def pdf_features(
 def convert_md_to_pdf(
     filename: common.PathInput,
     filename_ext: str = DEFAULT_MD_EXTENSION,
+    *,
+    streaming: bool = False,
     **kwargs: Any,
 ) -> Path:
     """
@@ -936,17 +1721,117 @@ def convert_md_to_pdf(
     copied next to the source Markdown file and post-processed with
     :func:`pdf_features`.
 
+    With ``streaming=True`` no intermediate file is written: the HTML page is
+    piped to ``wkhtmltopdf``, which reads the layout assets in place and
+    writes the PDF to its stdout; metadata and overlays are applied in
+    memory and the final PDF is written once, atomically.
+
+    Under an active :class:`BuildCache`, a PDF whose inputs did not change
+    is served from the cache without running ``wkhtmltopdf``.
+
     Args:
         filename: Markdown file to convert.
         filename_ext: Expected Markdown extension.
+        streaming: Use the in-memory pipeline.
         **kwargs: Options forwarded to :func:`pdf_features`.
 
     Returns:
         Generated PDF path.
     """
+    return _convert_md_to_pdf(filename, filename_ext, kwargs, streaming=streaming)
+
+
+# -----------------------------------------------------------------------------
+def _run_stage(
+    cpu_pool: Executor | None,
+    func: Callable[..., _T],
+    *args: Any,
+    **kwargs: Any,
+) -> _T:
+    """Run a CPU-bound stage inline, or in ``cpu_pool`` and wait for it."""
+    if cpu_pool is None:
+        return func(*args, **kwargs)
+    return cpu_pool.submit(func, *args, **kwargs).result()
+
+
+# -----------------------------------------------------------------------------
+def _check_cancelled(cancelled: threading.Event | None) -> None:
+    """Stop a batch conversion between two stages once it is cancelled."""
+    if cancelled is not None and cancelled.is_set():
+        raise CancelledError()
+
+
+# -----------------------------------------------------------------------------
+def _convert_md_to_pdf(
+    filename: common.PathInput,
+    filename_ext: str,
+    kwargs: Mapping[str, Any],
+    *,
+    streaming: bool = False,
+    wkhtmltopdf_slots: threading.Semaphore | None = None,
+    cancelled: threading.Event | None = None,
+    cpu_pool: Executor | None = None,
+) -> Path:
+    """
+    Run the :func:`convert_md_to_pdf` pipeline for one file.
+
+    ``wkhtmltopdf_slots`` is held while ``wkhtmltopdf`` runs, bounding the
+    number of concurrent processes; ``cancelled`` is checked between stages.
+    With ``cpu_pool``, the rendering and PDF post-processing stages of the
+    streaming pipeline run in that pool.
+    The temporary folder is removed on every exit path. Under an active
+    :class:`BuildCache`, the PDF is served from or added to the cache.
+    """
     logging.info("Convert md -> pdf %s", filename)
     md_filename = common.check_file(filename, filename_ext)
-    md_metadata = instruction.get_vars_from_md_file(md_filename)
+    cache = _current_build_cache()
+    if cache is None:
+        return _build_md_to_pdf(
+            md_filename,
+            kwargs,
+            streaming=streaming,
+            wkhtmltopdf_slots=wkhtmltopdf_slots,
+            cancelled=cancelled,
+            cpu_pool=cpu_pool,
+        )
+
+    pdf_filename = md_filename.with_suffix(DEFAULT_PDF_EXTENSION)
+    parts = cache.pdf_key(md_filename, kwargs)
+    if cache.fetch(parts, pdf_filename):
+        return pdf_filename
+    token = _building_for_cache.set(True)
+    try:
+        _build_md_to_pdf(
+            md_filename,
+            kwargs,
+            streaming=streaming,
+            wkhtmltopdf_slots=wkhtmltopdf_slots,
+            cancelled=cancelled,
+            cpu_pool=cpu_pool,
+        )
+    finally:
+        _building_for_cache.reset(token)
+    cache.store(parts, pdf_filename)
+    return pdf_filename
+
+
+# -----------------------------------------------------------------------------
+def _build_md_to_pdf(
+    md_filename: Path,
+    kwargs: Mapping[str, Any],
+    *,
+    streaming: bool,
+    wkhtmltopdf_slots: threading.Semaphore | None,
+    cancelled: threading.Event | None,
+    cpu_pool: Executor | None = None,
+) -> Path:
+    """Build the PDF of a checked Markdown file, without the build cache."""
+    md_text = common.get_file_content(md_filename) if streaming else None
+    md_metadata = (
+        instruction.get_vars_from_md_file(md_filename)
+        if md_text is None
+        else instruction.get_vars_from_md_text(md_text)
+    )
     feature_options = dict(kwargs)
     requested_metadata = feature_options.pop("metadata", None)
     if requested_metadata is not None and not isinstance(
@@ -964,28 +1849,48 @@ def convert_md_to_pdf(
             }
         )
 
-    temp_dir = common.make_temp_dir()
+    title = None
+    if "title" in md_metadata:
+        title = md_metadata["title"]
+    if "page:title" in md_metadata:
+        title = md_metadata["page:title"]
+
+    slot: AbstractContextManager[Any] = (
+        nullcontext() if wkhtmltopdf_slots is None else wkhtmltopdf_slots
+    )
     pdf_filename = md_filename.with_suffix(DEFAULT_PDF_EXTENSION)
+    if md_text is not None:
+        return _stream_md_to_pdf(
+            md_text,
+            md_filename,
+            pdf_filename,
+            title=title,
+            metadata=combined_metadata,
+            feature_options=feature_options,
+            slot=slot,
+            cancelled=cancelled,
+            cpu_pool=cpu_pool,
+        )
+
+    temp_dir = common.make_temp_dir()
     try:
         temp_md_filename = Path(temp_dir) / md_filename.name
 
         logging.info("Copy file to temp")
         shutil.copy2(md_filename, temp_md_filename)
+        _check_cancelled(cancelled)
         logging.info("Convert md to html")
         temp_html_filename = convert_md_to_html(
             temp_md_filename,
             converter="mistune",
         )
 
-        title = None
-        if "title" in md_metadata:
-            title = md_metadata["title"]
-        if "page:title" in md_metadata:
-            title = md_metadata["page:title"]
-
-        logging.info("Convert html to pdf title=%s", title)
-        temp_pdf_filename = convert_html_to_pdf(temp_html_filename, title=title)
+        with slot:
+            _check_cancelled(cancelled)
+            logging.info("Convert html to pdf title=%s", title)
+            temp_pdf_filename = convert_html_to_pdf(temp_html_filename, title=title)
 
+        _check_cancelled(cancelled)
         pdf_features(
             temp_pdf_filename,
             filename_ext=DEFAULT_PDF_EXTENSION,
@@ -1003,6 +1908,187 @@ def convert_md_to_pdf(
     return pdf_filename
 
 
+# -----------------------------------------------------------------------------
+def _stream_md_to_pdf(
+    md_text: str,
+    md_filename: Path,
+    pdf_filename: Path,
+    *,
+    title: str | None,
+    metadata: Mapping[str, str],
+    feature_options: Mapping[str, Any],
+    slot: AbstractContextManager[Any],
+    cancelled: threading.Event | None,
+    cpu_pool: Executor | None = None,
+) -> Path:
+    """
+    Convert Markdown text to ``pdf_filename`` without intermediate files.
+
+    The page links the layout assets in place and ``wkhtmltopdf`` may only
+    read the layout folder. The PDF read from its stdout is post-processed
+    in memory, then staged, validated and committed once. Rendering and
+    post-processing run in ``cpu_pool`` when one is given; ``slot`` and the
+    ``wkhtmltopdf`` process stay on the calling thread.
+    """
+    logging.info("Convert md to html in memory")
+    page_html = _run_stage(
+        cpu_pool,
+        _render_md_page,
+        md_text,
+        md_filename,
+        layout=DEFAULT_LAYOUT,
+        converter="mistune",
+        path_dest=None,
+    )
+    layout_path = _get_layout_page(DEFAULT_LAYOUT).parent.resolve()
+
+    with slot:
+        _check_cancelled(cancelled)
+        logging.info("Convert html to pdf through pipes title=%s", title)
+        pdf_bytes = _html_to_pdf_bytes(
+            page_html,
+            header_text=md_filename.stem if title is None else str(title),
+            allow=layout_path,
+        )
+
+    _check_cancelled(cancelled)
+    pdf_bytes = _run_stage(
+        cpu_pool,
+        _pdf_features_bytes,
+        pdf_bytes,
+        name=pdf_filename.name,
+        metadata=metadata,
+        feature_options=feature_options,
+    )
+    _write_pdf_bytes_atomic(pdf_bytes, pdf_filename)
+    return pdf_filename
+
+
+# -----------------------------------------------------------------------------
+def convert_many_md_to_pdf(
+    filenames: Iterable[common.PathInput],
+    filename_ext: str = DEFAULT_MD_EXTENSION,
+    *,
+    max_workers: int | None = None,
+    max_wkhtmltopdf: int | None = None,
+    streaming: bool = False,
+    executor: str = "thread",  # "thread" | "process"
+    **kwargs: Any,
+) -> Iterator[tuple[Path, Path | Exception] | common.ApplyResult]:
+    """
+    Convert many Markdown files to PDF, yielding each outcome as it completes.
+
+    Every file goes through the :func:`convert_md_to_pdf` pipeline in a pool
+    of ``max_workers`` threads. At most ``max_wkhtmltopdf`` ``wkhtmltopdf``
+    processes run at any time. With ``executor="thread"``, only the waits on
+    those processes overlap: Markdown rendering, layout filling and the
+    ``pypdf`` post-processing hold the GIL, so they run one file at a time.
+    ``executor="process"`` moves these stages of the streaming pipeline to a
+    pool of ``max_workers`` processes; the threads keep driving the
+    ``wkhtmltopdf`` processes, so the limit still applies to the whole batch.
+
+    Items are ``(source, pdf_path)`` pairs, or ``(source, exception)`` for a
+    file that failed; one failure does not stop the batch. The last item is
+    a :class:`~pymdtools.common.ApplyResult` summary. Closing the generator
+    early cancels the files not started yet, stops the running ones at
+    their next stage, and waits until their temporary folders are removed.
+
+    Args:
+        filenames: Markdown files to convert. Consumed lazily.
+        filename_ext: Expected Markdown extension.
+        max_workers: Worker threads, and worker processes with
+            ``executor="process"``. Defaults to the CPU count.
+        max_wkhtmltopdf: Concurrent ``wkhtmltopdf`` processes. Defaults to the
+            CPU count.
+        streaming: Use the in-memory pipeline of :func:`convert_md_to_pdf`.
+        executor: ``"thread"`` or ``"process"``, where the rendering and PDF
+            post-processing stages run. ``"process"`` requires
+            ``streaming=True`` and picklable ``kwargs``.
+        **kwargs: Options forwarded to :func:`pdf_features` for every file.
+
+    Yields:
+        ``(source, pdf_path | exception)`` pairs, then the summary.
+
+    Raises:
+        ValueError: If ``max_workers`` or ``max_wkhtmltopdf`` is below 1, or
+            ``executor`` is unknown or ``"process"`` without ``streaming``.
+        TypeError: If ``metadata`` is not a mapping (per file, in the results).
+
+    Example:
+        >>> for source, outcome in convert_many_md_to_pdf(pages, max_workers=8):
+        ...     print(source, outcome)
+    """
+    if max_workers is not None and max_workers < 1:
+        raise ValueError(f"max_workers must be >= 1, got: {max_workers}")
+    if max_wkhtmltopdf is not None and max_wkhtmltopdf < 1:
+        raise ValueError(f"max_wkhtmltopdf must be >= 1, got: {max_wkhtmltopdf}")
+    if executor not in {"thread", "process"}:
+        raise ValueError(
+            f"executor must be 'thread' or 'process', got: {executor!r}"
+        )
+    if executor == "process" and not streaming:
+        raise ValueError("executor='process' requires streaming=True")
+
+    workers = max_workers or os.cpu_count() or 1
+    slots = threading.BoundedSemaphore(max_wkhtmltopdf or os.cpu_count() or 1)
+    cancelled = threading.Event()
+    processed = succeeded = failed = 0
+    pool = ThreadPoolExecutor(max_workers=workers)
+    cpu_pool = (
+        ProcessPoolExecutor(max_workers=workers) if executor == "process" else None
+    )
+    # A bounded window keeps a long input lazy and makes cancellation cheap.
+    window = 2 * workers
+    pending: dict[Future[Path], Path] = {}
+    try:
+        sources = iter(filenames)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                name = next(sources, None)
+                if name is None:
+                    exhausted = True
+                    continue
+                source = common.to_path(name)
+                pending[
+                    common.submit_in_context(
+                        pool,
+                        _convert_md_to_pdf,
+                        source,
+                        filename_ext,
+                        kwargs,
+                        streaming=streaming,
+                        wkhtmltopdf_slots=slots,
+                        cancelled=cancelled,
+                        cpu_pool=cpu_pool,
+                    )
+                ] = source
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in [item for item in pending if item in done]:
+                source = pending.pop(future)
+                processed += 1
+                error = future.exception()
+                if error is None:
+                    succeeded += 1
+                    yield source, future.result()
+                else:
+                    failed += 1
+                    logging.error("Conversion failed for %s: %s", source, error)
+                    yield source, cast(Exception, error)
+    finally:
+        cancelled.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+        # The threads wait on the processes, so this pool goes down last.
+        if cpu_pool is not None:
+            cpu_pool.shutdown(wait=True)
+
+    yield common.ApplyResult(
+        processed=processed, succeeded=succeeded, failed=failed, skipped=0
+    )
+
+
 # -----------------------------------------------------------------------------
 def __get_this_filename() -> str:
     """Return this module filename as text for legacy callers."""
@@ -1010,11 +2096,14 @@ def __get_this_filename() -> str:
 
 
 __all__ = [
+    "AssetPublisher",
+    "BuildCache",
     "__get_this_filename",
     "check_odd_pages",
     "convert_html_to_pdf",
     "convert_md_to_html",
     "convert_md_to_pdf",
+    "convert_many_md_to_pdf",
     "converter_md_to_html_markdown",
     "converter_md_to_html_mistune",
     "find_wk_html_to_pdf",
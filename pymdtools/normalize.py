@@ -32,6 +32,7 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
+from typing import Literal, overload
 
 from . import common
 from . import mistune_integration as mistune
@@ -71,6 +72,7 @@ def md_beautifier(text: object) -> str:
 
 
 # -----------------------------------------------------------------------------
+@overload
 def md_file_beautifier(
     filename: common.PathInput,
     backup_option: bool = True,
@@ -79,7 +81,44 @@ def md_file_beautifier(
     backup_ext: str = ".bak",
     read_encoding: str | None = None,
     write_encoding: str = "utf-8",
-) -> str:
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[False] = False,
+) -> str: ...
+@overload
+def md_file_beautifier(
+    filename: common.PathInput,
+    backup_option: bool = True,
+    filename_ext: str = ".md",
+    *,
+    backup_ext: str = ".bak",
+    read_encoding: str | None = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: Literal[True],
+) -> bool: ...
+@overload
+def md_file_beautifier(
+    filename: common.PathInput,
+    backup_option: bool = True,
+    filename_ext: str = ".md",
+    *,
+    backup_ext: str = ".bak",
+    read_encoding: str | None = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: bool,
+) -> str | bool: ...
+def md_file_beautifier(
+    filename: common.PathInput,
+    backup_option: bool = True,
+    filename_ext: str = ".md",
+    *,
+    backup_ext: str = ".bak",
+    read_encoding: str | None = None,
+    write_encoding: str = "utf-8",
+    skip_if_unchanged: bool = False,
+    return_changed: bool = False,
+) -> str | bool:
     """
     Normalize a Markdown file in place.
 
@@ -98,9 +137,15 @@ def md_file_beautifier(
         read_encoding: Encoding used to read the file. ``None`` triggers
             automatic detection in :mod:`pymdtools.common`.
         write_encoding: Encoding used to write the normalized file.
+        skip_if_unchanged: If true, a file that is already normalized (same
+            bytes once encoded) is neither backed up nor rewritten. Each file
+            is logged at INFO level as changed or unchanged.
+        return_changed: If true, return whether the file was written instead
+            of its filename.
 
     Returns:
-        Normalized absolute filename as a string.
+        Normalized absolute filename as a string, or with ``return_changed``
+        whether the file was written.
 
     Raises:
         FileNotFoundError: If ``filename`` does not exist.
@@ -115,12 +160,15 @@ def md_file_beautifier(
     if not text:
         raise ValueError(f"The filename {checked} seems empty")
 
-    if backup_option:
-        common.create_backup(checked, ext=backup_ext)
-
-    normalized = md_beautifier(text)
-    common.set_file_content(checked, normalized, encoding=write_encoding)
-    return str(checked)
+    written = common.rewrite_file_content(
+        checked,
+        md_beautifier(text),
+        encoding=write_encoding,
+        backup=backup_option,
+        backup_ext=backup_ext,
+        skip_if_unchanged=skip_if_unchanged,
+    )
+    return written if return_changed else str(checked)
 
 
 # =============================================================================
@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ===============================================================================
+#                 Author: Florent TOURNOIS | License: MIT
+# ===============================================================================
+"""Local micro-benchmarks for the pymdtools hot paths.
+
+Each sub-command builds a synthetic workload, runs the measured operations a
+few times and prints the best wall-clock time. The numbers are only meant to
+be compared between runs on the same machine.
+
+Example::
+
+    python scripts/benchmark.py code-ranges --size-mb 5
+    python scripts/benchmark.py code-scanner
+    python scripts/benchmark.py directives
+    python scripts/benchmark.py tree-includes --files 200
+    python scripts/benchmark.py encodings --files 300
+    python scripts/benchmark.py binary-sniff --sample-kb 64
+    python scripts/benchmark.py pdf-pipeline --files 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Final, Sequence
+
+ROOT: Final = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pymdtools import common, instruction, mdcommon, mdtopdf  # noqa: E402
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall-clock time of ``repeat`` calls to ``func``."""
+    timings: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def report(label: str, seconds: float, *, baseline: float | None = None) -> None:
+    """Print one benchmark line, with the speedup against ``baseline``."""
+    line = f"{label:<40} {seconds * 1000:10.2f} ms"
+    if baseline is not None and seconds > 0:
+        line += f"   x{baseline / seconds:.1f}"
+    print(line)
+
+
+def synthetic_markdown(size_mb: float) -> str:
+    """Return a Markdown document with many code spans and directives."""
+    chunk = (
+        "# Section\n\n"
+        "Call `get()` then `put()` and ``raw `tick` `` before <!-- var(a)=\"1\" -->.\n"
+        "<!-- begin-include(header) -->old<!-- end-include -->\n"
+        "```python\n<!-- var(hidden)=\"x\" -->\nprint('fenced')\n```\n"
+        "    <!-- begin-ref(hidden) -->indented<!-- end-ref -->\n\n"
+        "Text with `inline` code and a [link](target.md \"title\").\n\n"
+    )
+    repeat = max(1, int(size_mb * 1024 * 1024) // len(chunk))
+    return chunk * repeat
+
+
+def _linear_position_in_ranges(index: int, ranges: Sequence[tuple[int, int]]) -> bool:
+    """Reference lookup that walks the range list from the start."""
+    for start, end in ranges:
+        if index < start:
+            return False
+        if index < end:
+            return True
+    return False
+
+
+def bench_code_ranges(args: argparse.Namespace) -> None:
+    """Compare linear range lookups with ``CodeRangeIndex`` bisection."""
+    text = synthetic_markdown(args.size_mb)
+    ranges = mdcommon.markdown_code_ranges(text)
+    index = mdcommon.CodeRangeIndex(ranges)
+    starts = [match.start() for match in instruction._VAR_RE.finditer(text)]
+    # Linear lookups are quadratic; time a bounded sample and extrapolate.
+    sample = starts[: args.sample]
+    print(
+        f"document: {len(text) / 1e6:.1f} MB, {len(ranges)} code ranges, "
+        f"{len(starts)} directive candidates"
+    )
+
+    linear = best_of(
+        lambda: [_linear_position_in_ranges(pos, ranges) for pos in sample],
+        args.repeat,
+    ) * len(starts) / max(1, len(sample))
+    indexed = best_of(lambda: [index.contains(pos) for pos in starts], args.repeat)
+    report("linear position_in_ranges (extrapolated)", linear)
+    report("CodeRangeIndex.contains", indexed, baseline=linear)
+
+
+def bench_code_scanner(args: argparse.Namespace) -> None:
+    """Report ``markdown_code_ranges`` throughput in MB/s."""
+    text = synthetic_markdown(args.size_mb)
+    megabytes = len(text.encode("utf-8")) / (1024 * 1024)
+    seconds = best_of(lambda: mdcommon.markdown_code_ranges(text), args.repeat)
+    report("markdown_code_ranges", seconds)
+    print(f"{'throughput':<40} {megabytes / seconds:10.2f} MB/s")
+
+
+def bench_directives(args: argparse.Namespace) -> None:
+    """Compare one ``finditer`` per directive pattern with the single lexer."""
+    text = synthetic_markdown(args.size_mb)
+    scan = mdcommon.DocumentScan(text)
+    patterns = list(instruction._DIRECTIVE_PATTERNS.values())
+
+    def per_pattern() -> None:
+        for pattern in patterns:
+            [
+                match
+                for match in pattern.finditer(text)
+                if not scan.code_ranges.contains(match.start())
+            ]
+
+    separate = best_of(per_pattern, args.repeat)
+    lexed = best_of(lambda: instruction._lex_directives(scan), args.repeat)
+    report(f"{len(patterns)} finditer passes", separate)
+    report("directive lexer", lexed, baseline=separate)
+
+
+def _write_handbook(root: Path, files: int) -> list[Path]:
+    """Create ``files`` pages spread over folders of ten, sharing one ref file."""
+    (root / "shared.md").write_text(
+        "<!-- begin-ref(footer) -->Footer<!-- end-ref -->\n", encoding="utf-8"
+    )
+    pages: list[Path] = []
+    for index in range(files):
+        page = root / f"part{index // 10:03d}" / f"page{index:04d}.md"
+        page.parent.mkdir(exist_ok=True)
+        page.write_text(
+            f"# Page {index}\n\n<!-- begin-ref(page{index}) -->{index}<!-- end-ref -->\n"
+            "<!-- begin-include(footer) --><!-- end-include -->\n",
+            encoding="utf-8",
+        )
+        pages.append(page)
+    return pages
+
+
+def bench_tree_includes(args: argparse.Namespace) -> None:
+    """Compare the per-file include loop with ``search_include_refs_in_tree``."""
+    with tempfile.TemporaryDirectory() as tmp:
+        loop_root = Path(tmp) / "loop" / "docs"
+        tree_root = Path(tmp) / "tree" / "docs"
+        loop_root.mkdir(parents=True)
+        pages = _write_handbook(loop_root, args.files)
+        shutil.copytree(loop_root, tree_root)
+
+        started = time.perf_counter()
+        for page in pages:
+            instruction.search_include_refs_to_md_file(
+                page, backup_option=False, depth_up=1
+            )
+        per_file = time.perf_counter() - started
+
+        started = time.perf_counter()
+        instruction.search_include_refs_in_tree(
+            tree_root, backup_option=False, depth_up=1, max_workers=args.workers
+        )
+        batched = time.perf_counter() - started
+
+    report(f"per-file loop ({args.files} files)", per_file)
+    report("search_include_refs_in_tree", batched, baseline=per_file)
+
+
+def _write_mixed_encodings(root: Path, files: int) -> list[Path]:
+    """Create ASCII, UTF-8 and CP1252 pages in a 7:2:1 ratio."""
+    paths: list[Path] = []
+    for index in range(files):
+        kind = index % 10
+        if kind < 7:
+            data = synthetic_markdown(0.01).encode("ascii")
+        elif kind < 9:
+            data = ("Café — naïve € déjà vu\n" * 400).encode("utf-8")
+        else:
+            data = ("Café — naïve € déjà vu\n" * 400).encode("cp1252")
+        path = root / f"page{index:04d}.md"
+        path.write_bytes(data)
+        paths.append(path)
+    return paths
+
+
+def bench_encodings(args: argparse.Namespace) -> None:
+    """Compare chardet on every file with ``detect_file_encoding``."""
+    import chardet
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = _write_mixed_encodings(Path(tmp), args.files)
+
+        def chardet_only() -> None:
+            for path in paths:
+                with path.open("rb") as f:
+                    chardet.detect(f.read(256 * 1024))
+
+        def detect_all() -> None:
+            for path in paths:
+                common.detect_file_encoding(path)
+
+        baseline = best_of(chardet_only, args.repeat)
+        fast = best_of(detect_all, args.repeat)
+        common.configure_encoding_cache()
+        try:
+            detect_all()
+            cached = best_of(detect_all, args.repeat)
+        finally:
+            common.configure_encoding_cache(0)
+
+    report(f"chardet.detect ({args.files} files)", baseline)
+    report("detect_file_encoding", fast, baseline=baseline)
+    report("detect_file_encoding, cached", cached, baseline=baseline)
+
+
+def bench_binary_sniff(args: argparse.Namespace) -> None:
+    """Compare per-character control counting with the byte tables."""
+    size = args.sample_kb * 1024
+    samples = [
+        synthetic_markdown(0.1).encode("utf-8")[:size],
+        ("Café — naïve € déjà vu\n" * (size // 20)).encode("utf-8")[:size],
+        ("Café — naïve € déjà vu\n" * (size // 20)).encode("cp1252")[:size],
+    ]
+
+    def per_character() -> None:
+        for sample in samples:
+            try:
+                text = sample.decode("utf-8")
+            except UnicodeDecodeError:
+                text = sample.decode("cp1252")
+            sum(1 for char in text if not char.isprintable() and char not in "\n\r\t\f")
+
+    def byte_tables() -> None:
+        for sample in samples:
+            common.fs._is_binary_sample(sample, None)
+
+    generator = best_of(per_character, args.repeat)
+    tables = best_of(byte_tables, args.repeat)
+    report(f"decode + generator ({len(samples)} x {args.sample_kb} KB)", generator)
+    report("byte tables", tables, baseline=generator)
+
+
+def bench_pdf_pipeline(args: argparse.Namespace) -> None:
+    """Compare the temp-folder PDF pipeline with the streaming one."""
+    try:
+        mdtopdf.find_wk_html_to_pdf()
+    except FileNotFoundError:
+        print("wkhtmltopdf not found, skipping")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pages: list[Path] = []
+        for index in range(args.files):
+            page = Path(tmp) / f"page{index:04d}.md"
+            page.write_text(synthetic_markdown(0.02), encoding="utf-8")
+            pages.append(page)
+
+        def convert(streaming: bool) -> None:
+            for page in pages:
+                mdtopdf.convert_md_to_pdf(
+                    page, streaming=streaming, metadata={"author": "bench"}
+                )
+
+        files = best_of(lambda: convert(False), args.repeat)
+        streamed = best_of(lambda: convert(True), args.repeat)
+
+    report(f"temp folder + re-read ({args.files} files)", files)
+    report("streaming", streamed, baseline=files)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the command-line parser."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measure")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    code_ranges = subparsers.add_parser(
+        "code-ranges", help="protected-offset lookups on a large document"
+    )
+    code_ranges.add_argument("--size-mb", type=float, default=5.0)
+    code_ranges.add_argument("--sample", type=int, default=2000)
+    code_ranges.set_defaults(handler=bench_code_ranges)
+
+    code_scanner = subparsers.add_parser(
+        "code-scanner", help="markdown_code_ranges throughput"
+    )
+    code_scanner.add_argument("--size-mb", type=float, default=5.0)
+    code_scanner.set_defaults(handler=bench_code_scanner)
+
+    directives = subparsers.add_parser(
+        "directives", help="directive lexing against per-pattern scans"
+    )
+    directives.add_argument("--size-mb", type=float, default=5.0)
+    directives.set_defaults(handler=bench_directives)
+
+    tree_includes = subparsers.add_parser(
+        "tree-includes", help="per-file include loop against one tree-wide run"
+    )
+    tree_includes.add_argument("--files", type=int, default=200)
+    tree_includes.add_argument("--workers", type=int, default=None)
+    tree_includes.set_defaults(handler=bench_tree_includes)
+
+    encodings = subparsers.add_parser(
+        "encodings", help="encoding detection on a mixed-encoding corpus"
+    )
+    encodings.add_argument("--files", type=int, default=300)
+    encodings.set_defaults(handler=bench_encodings)
+
+    binary_sniff = subparsers.add_parser(
+        "binary-sniff", help="binary classification of text samples"
+    )
+    binary_sniff.add_argument("--sample-kb", type=int, default=8)
+    binary_sniff.set_defaults(handler=bench_binary_sniff)
+
+    pdf_pipeline = subparsers.add_parser(
+        "pdf-pipeline", help="Markdown to PDF with and without intermediate files"
+    )
+    pdf_pipeline.add_argument("--files", type=int, default=20)
+    pdf_pipeline.set_defaults(handler=bench_pdf_pipeline)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the selected benchmark."""
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
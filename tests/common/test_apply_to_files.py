@@ -13,6 +13,32 @@ def _write(p: Path, text: str = "x") -> Path:
     return p
 
 
+def _supports_symlinks(tmp_path: Path) -> bool:
+    """
+    Detect whether the current environment supports creating symlinks.
+
+    On Windows this may require admin rights or Developer Mode.
+    """
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    _write(target)
+
+    try:
+        link.symlink_to(target)
+        ok = link.is_symlink()
+    except (OSError, NotImplementedError):
+        ok = False
+    finally:
+        try:
+            if link.exists() or link.is_symlink():
+                link.unlink()
+        except OSError:
+            pass
+        target.unlink()
+
+    return ok
+
+
 def test_apply_to_files_root_is_file(tmp_path: Path) -> None:
     f = _write(tmp_path / "a.md", "hello")
 
@@ -195,21 +221,16 @@ def test_apply_to_files_rejects_unknown_on_error(tmp_path: Path) -> None:
         apply_to_files(tmp_path, lambda path: path, on_error="ignore")
 
 
-def test_apply_to_files_follow_symlinks_controls_directory_traversal_without_links(
+def test_apply_to_files_follow_symlinks_controls_directory_traversal(
     tmp_path: Path,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    root = tmp_path / "root"
-    linked_directory = root / "linked"
-    _write(linked_directory / "inside.txt")
-    original_is_symlink = Path.is_symlink
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
 
-    def fake_is_symlink(self: Path) -> bool:
-        if self == linked_directory:
-            return True
-        return original_is_symlink(self)
-
-    monkeypatch.setattr(Path, "is_symlink", fake_is_symlink)
+    root = tmp_path / "root"
+    root.mkdir()
+    _write(tmp_path / "target" / "inside.txt")
+    (root / "linked").symlink_to(tmp_path / "target", target_is_directory=True)
 
     without_following, without_summary, _ = apply_to_files(
         root,
@@ -228,38 +249,24 @@ def test_apply_to_files_follow_symlinks_controls_directory_traversal_without_lin
     assert with_summary.processed == 1
 
 
-def test_apply_to_files_stops_revisiting_directory_identity(
-    tmp_path: Path,
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    root = tmp_path / "root"
-    repeated = root / "repeated"
-    _write(repeated / "inside.txt")
-    original_stat = Path.stat
-    original_resolve = Path.resolve
-
-    def fake_stat(self: Path, *args, **kwargs):
-        if self == repeated:
-            return original_stat(root)
-        return original_stat(self, *args, **kwargs)
-
-    def fake_resolve(self: Path, *args, **kwargs):
-        if self == repeated:
-            return original_resolve(root, *args, **kwargs)
-        return original_resolve(self, *args, **kwargs)
+def test_apply_to_files_stops_revisiting_directory_identity(tmp_path: Path) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
 
-    monkeypatch.setattr(Path, "stat", fake_stat)
-    monkeypatch.setattr(Path, "resolve", fake_resolve)
+    root = tmp_path / "root"
+    _write(root / "real" / "inside.txt")
+    (root / "again").symlink_to(root / "real", target_is_directory=True)
+    (root / "loop").symlink_to(root, target_is_directory=True)
 
     results, summary, errors = apply_to_files(
         root,
-        lambda path: path.name,
+        lambda path: path.relative_to(root).as_posix(),
         follow_symlinks=True,
     )
 
-    assert results == []
+    assert results == ["again/inside.txt"]
     assert errors == []
-    assert summary.processed == 0
+    assert summary.processed == 1
 
 
 def test_apply_to_files_globs_are_case_sensitive_on_every_platform(
@@ -315,3 +322,101 @@ def test_apply_to_files_skips_special_entry_and_continues_iteration(
     assert results == ["z.txt"]
     assert errors == []
     assert summary.processed == 1
+
+
+def _read_or_fail(p: Path) -> str:
+    text = p.read_text(encoding="utf-8")
+    if text.startswith("fail"):
+        raise ValueError(f"bad {p.name}")
+    return text
+
+
+def _tree_for_pool(root: Path) -> None:
+    for name in ("b.md", "a.md", "c.txt", "sub/d.md", "sub/e.md", "sub/z/f.md"):
+        _write(root / name, name)
+    _write(root / "sub" / "bad.md", "fail")
+    _write(root / "zz.md", "fail too")
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_apply_to_files_executor_keeps_order_and_counters(
+    tmp_path: Path, executor: str
+) -> None:
+    _tree_for_pool(tmp_path)
+
+    serial = apply_to_files(
+        tmp_path, _read_or_fail, expected_ext=".md", on_error="collect"
+    )
+    pooled = apply_to_files(
+        tmp_path,
+        _read_or_fail,
+        expected_ext=".md",
+        on_error="collect",
+        executor=executor,
+        max_workers=3,
+    )
+
+    assert pooled[0] == serial[0] == ["a.md", "b.md", "sub/d.md", "sub/e.md", "sub/z/f.md"]
+    assert pooled[1] == serial[1]
+    assert [(p, str(e)) for p, e in pooled[2]] == [
+        (tmp_path / "sub" / "bad.md", "bad bad.md"),
+        (tmp_path / "zz.md", "bad zz.md"),
+    ]
+
+
+def test_apply_to_files_raise_mode_cancels_pending_files(tmp_path: Path) -> None:
+    _tree_for_pool(tmp_path)
+    calls: list[str] = []
+
+    def fn(p: Path) -> str:
+        calls.append(p.name)
+        return _read_or_fail(p)
+
+    with pytest.raises(ValueError, match="bad bad.md"):
+        apply_to_files(tmp_path, fn, executor="thread", max_workers=1)
+
+    # Files after sub/bad.md in walk order were never started.
+    assert calls == ["a.md", "b.md", "c.txt", "bad.md"]
+
+
+def test_apply_to_files_timeout_fails_only_the_slow_file(tmp_path: Path) -> None:
+    import threading
+
+    _write(tmp_path / "a.md")
+    _write(tmp_path / "slow.md")
+    _write(tmp_path / "z.md")
+    release = threading.Event()
+
+    def fn(p: Path) -> str:
+        if p.name == "slow.md":
+            release.wait(5)
+        return p.name
+
+    try:
+        results, summary, errors = apply_to_files(
+            tmp_path,
+            fn,
+            on_error="collect",
+            executor="thread",
+            max_workers=2,
+            timeout=0.05,
+        )
+        with pytest.raises(TimeoutError, match="slow.md"):
+            apply_to_files(
+                tmp_path / "slow.md", fn, executor="thread", timeout=0.05
+            )
+    finally:
+        release.set()
+
+    assert results == ["a.md", "z.md"]
+    assert summary.failed == 1 and summary.succeeded == 2
+    assert isinstance(errors[0][1], TimeoutError)
+
+
+def test_apply_to_files_validates_executor_arguments(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="executor"):
+        apply_to_files(tmp_path, str, executor="fiber")
+    with pytest.raises(ValueError, match="max_workers"):
+        apply_to_files(tmp_path, str, executor="thread", max_workers=0)
+    with pytest.raises(ValueError, match="timeout requires"):
+        apply_to_files(tmp_path, str, timeout=1.0)
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pymdtools import common
+from pymdtools.common import BackupStore, create_backup
+
+
+def _blobs(store: Path) -> list[Path]:
+    return sorted(p for p in (store / "objects").rglob("*") if p.is_file())
+
+
+def test_backup_store_deduplicates_identical_content(tmp_path: Path) -> None:
+    store_root = tmp_path / "store"
+    first = tmp_path / "a.md"
+    second = tmp_path / "sub" / "a.md"
+    second.parent.mkdir()
+    for path in (first, second):
+        path.write_text("same", encoding="utf-8")
+    store = BackupStore(store_root)
+
+    snapshot = store.backup(first)
+    assert store.backup(first) == snapshot
+    other = store.backup(second)
+
+    assert other != snapshot
+    assert other.read_text(encoding="utf-8") == "same"
+    assert [p.name for p in _blobs(store_root)] == [snapshot.name.split(".")[1]]
+    assert os.stat(snapshot).st_ino == os.stat(other).st_ino
+
+    first.write_text("changed", encoding="utf-8")
+    changed = store.backup(first, ext="orig")
+    assert changed.name.endswith(".orig")
+    assert store.snapshots(first) == [snapshot, changed]
+    assert snapshot.read_text(encoding="utf-8") == "same"
+    assert len(_blobs(store_root)) == 2
+
+
+def test_create_backup_uses_the_active_store(tmp_path: Path) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+
+    with BackupStore() as store:
+        backup = create_backup(page, ext=".bak")
+        assert create_backup(page) == backup
+
+    assert backup.is_relative_to(tmp_path / ".pymdtools-backups")
+    assert store.snapshots(page) == [backup]
+    assert create_backup(page).parent == tmp_path
+
+
+def test_backup_stores_exit_in_order_and_stay_in_their_thread(tmp_path: Path) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    first = BackupStore(tmp_path / "first").__enter__()
+    second = BackupStore(tmp_path / "second").__enter__()
+
+    with pytest.raises(RuntimeError, match="BackupStore exited out of order"):
+        first.__exit__(None, None, None)
+    second.__exit__(None, None, None)
+    first.__exit__(None, None, None)
+    assert common.fs._backup_stores.get() is None
+
+    outcome: list[Path] = []
+    with BackupStore(tmp_path / "mine"):
+        other = threading.Thread(
+            target=lambda: outcome.append(create_backup(page, date_prefix="2026-01-01"))
+        )
+        other.start()
+        other.join()
+
+    assert outcome[0].parent == tmp_path
+
+
+def test_backup_store_retention_by_count_and_age(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    page = tmp_path / "page.md"
+    store_root = tmp_path / "store"
+    store = BackupStore(store_root, keep=2)
+
+    for index in range(4):
+        page.write_text(f"v{index}", encoding="utf-8")
+        store.backup(page)
+    assert [p.read_text(encoding="utf-8") for p in store.snapshots(page)] == ["v2", "v3"]
+    assert len(_blobs(store_root)) == 2
+
+    aged = BackupStore(store_root, max_age=timedelta(0))
+    page.write_text("v4", encoding="utf-8")
+    latest = aged.backup(page)
+    assert aged.snapshots(page) == [latest]
+    assert len(_blobs(store_root)) == 1
+
+    young = BackupStore(store_root, max_age=timedelta(days=1))
+    page.write_text("v5", encoding="utf-8")
+    young.backup(page)
+    assert len(young.snapshots(page)) == 2
+
+
+def test_backup_store_reserves_names_exclusively(tmp_path: Path) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    store = BackupStore(tmp_path / "store")
+    barrier = threading.Barrier(8)
+    results: list[Path] = []
+
+    def worker(index: int) -> None:
+        own = tmp_path / f"p{index}.md"
+        own.write_text(str(index), encoding="utf-8")
+        barrier.wait()
+        results.append(store.backup(own))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 8
+
+
+def test_backup_store_name_collisions_and_limits(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    store = BackupStore(tmp_path / "store")
+    folder = store._snapshot_folder(tmp_path / "store", page)
+    folder.mkdir(parents=True)
+
+    class _FrozenClock:
+        @staticmethod
+        def now(tz: Any) -> Any:
+            from datetime import datetime
+
+            return datetime(2026, 1, 1, tzinfo=tz)
+
+        strptime = staticmethod(__import__("datetime").datetime.strptime)
+
+    monkeypatch.setattr(common.fs, "datetime", _FrozenClock)
+    digest = common.fs._file_digest(page)
+    (folder / f"20260101T000000000000Z-001.{digest}.bak").touch()
+    (folder / f"20260101T000000000000Z-999.{digest[::-1]}.bak").touch()
+
+    assert store.backup(page).name == f"20260101T000000000000Z-002.{digest}.bak"
+    page.write_text("y", encoding="utf-8")
+    digest = common.fs._file_digest(page)
+    for index in (1, 2):
+        (folder / f"20260101T000000000000Z-00{index}.{digest}.bak").touch()
+    with pytest.raises(FileExistsError):
+        store.backup(page, max_tries=2)
+    with pytest.raises(ValueError, match="ext"):
+        store.backup(page, ext="")
+    with pytest.raises(ValueError, match="max_tries"):
+        store.backup(page, max_tries=0)
+    with pytest.raises(ValueError, match="keep"):
+        BackupStore(keep=0)
+    with pytest.raises(ValueError, match="max_age"):
+        BackupStore(max_age=timedelta(seconds=-1))
+    assert BackupStore().snapshots(tmp_path / "never.md") == []
+
+
+def test_backup_store_without_hard_links_copies_snapshots(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    store_root = tmp_path / "store"
+    store = BackupStore(store_root)
+
+    def no_link(src: Any, dst: Any) -> None:
+        raise PermissionError(1, "Operation not permitted")
+
+    monkeypatch.setattr(os, "link", no_link)
+    snapshot = store.backup(page)
+
+    assert snapshot.read_text(encoding="utf-8") == "x"
+    assert _blobs(store_root) == []
+    assert store.backup(page) == snapshot
+
+    page.write_text("y", encoding="utf-8")
+    monkeypatch.setattr(common.fs, "_reserve", lambda path: False)
+    with pytest.raises(FileExistsError):
+        store.backup(page, max_tries=1)
+
+
+def test_backup_store_recreates_a_blob_released_concurrently(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    store = BackupStore(tmp_path / "store")
+    real_link = os.link
+    calls: list[str] = []
+
+    def racing_link(src: Any, dst: Any) -> None:
+        if not calls:
+            calls.append("released")
+            Path(src).unlink()
+        real_link(src, dst)
+
+    monkeypatch.setattr(os, "link", racing_link)
+    snapshot = store.backup(page)
+
+    assert snapshot.read_text(encoding="utf-8") == "x"
+    assert calls == ["released"]
+
+
+def test_backup_copies_are_removed_when_the_copy_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+
+    def broken_copy(*args: Any, **kwargs: Any) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(common.fs.shutil, "copy2", broken_copy)
+    monkeypatch.setattr(common.fs.shutil, "copyfile", broken_copy)
+    monkeypatch.setattr(common.fs, "_reflink", lambda source_fd, destination_fd: False)
+
+    with pytest.raises(OSError, match="disk full"):
+        create_backup(page, date_prefix="2026-01-01")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["page.md"]
+
+    store_root = tmp_path / "store"
+    with pytest.raises(OSError, match="disk full"):
+        BackupStore(store_root).backup(page)
+    assert _blobs(store_root) == []
+    assert not any(p.name.startswith(".tmp-") for p in store_root.rglob("*"))
+
+    monkeypatch.setattr(os, "link", lambda src, dst: (_ for _ in ()).throw(OSError()))
+    calls: list[int] = []
+
+    def copy_blob_only(source: Any, destination: Any) -> None:
+        if calls:
+            raise OSError("disk full")
+        calls.append(1)
+        Path(destination).write_bytes(Path(source).read_bytes())
+
+    monkeypatch.setattr(common.fs.shutil, "copyfile", copy_blob_only)
+    with pytest.raises(OSError, match="disk full"):
+        BackupStore(store_root).backup(page)
+    assert BackupStore(store_root).snapshots(page) == []
+
+
+def test_backup_store_keeps_shared_blobs_and_explicit_store(tmp_path: Path) -> None:
+    store_root = tmp_path / "store"
+    store = BackupStore(store_root, keep=1)
+    first = tmp_path / "a.md"
+    second = tmp_path / "b.md"
+    for path in (first, second):
+        path.write_text("shared", encoding="utf-8")
+
+    shared = create_backup(first, store=store)
+    create_backup(second, store=store)
+    first.write_text("new", encoding="utf-8")
+    create_backup(first, store=store)
+
+    # The blob still backs the snapshot of b.md.
+    assert not shared.exists()
+    assert len(_blobs(store_root)) == 2
+
+    for blob in _blobs(store_root):
+        blob.unlink()
+    second.write_text("other", encoding="utf-8")
+    create_backup(second, store=store)
+    assert len(store.snapshots(second)) == 1
+
+
+def test_clone_file_uses_a_reflink_when_available(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"data")
+    destination = tmp_path / "b.bin"
+    destination.touch()
+    calls: list[int] = []
+
+    def ficlone(destination_fd: int, request: int, source_fd: int) -> None:
+        calls.append(request)
+        os.write(destination_fd, os.pread(source_fd, 4, 0))
+
+    monkeypatch.setattr(common.fs.fcntl, "ioctl", ficlone)
+    common.fs._clone_file(source, destination)
+
+    assert calls == [0x40049409]
+    assert destination.read_bytes() == b"data"
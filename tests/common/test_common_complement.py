@@ -321,7 +321,8 @@ def test_detect_file_encoding_utf8_bom_prefer_flag(tmp_path: Path) -> None:
 
 def test_detect_file_encoding_importerror_when_chardet_missing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     p = tmp_path / "x.txt"
-    _write_text(p, "hello")
+    # Not valid UTF-8, so detection has to reach chardet.
+    _write_bytes(p, b"caf\xe9")
 
     _block_import(monkeypatch, "chardet")
 
@@ -333,7 +334,7 @@ def test_detect_file_encoding_low_confidence_falls_back_to_default(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     p = tmp_path / "x.txt"
-    _write_bytes(p, b"plain ascii bytes")
+    _write_bytes(p, b"plain latin-1 bytes: caf\xe9")
 
     class FakeChardet:
         @staticmethod
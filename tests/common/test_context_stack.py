@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any
+
+import pytest
+
+from pymdtools.common import ContextStack, submit_in_context
+
+
+def test_context_stack_push_pop_and_nesting() -> None:
+    stack: ContextStack[str] = ContextStack("test_stack")
+
+    assert stack.get() is None
+    stack.push("a")
+    stack.push("b")
+    assert stack.get() == "b"
+    with pytest.raises(RuntimeError, match="str exited out of order"):
+        stack.pop("a")
+    stack.pop("b")
+    stack.pop("a")
+    assert stack.get() is None
+    with pytest.raises(RuntimeError, match="out of order"):
+        stack.pop("a")
+
+
+def test_context_stack_is_local_to_the_context() -> None:
+    stack: ContextStack[str] = ContextStack("test_stack")
+
+    def enter_only() -> str | None:
+        stack.push("inner")
+        return stack.get()
+
+    assert copy_context().run(enter_only) == "inner"
+    assert stack.get() is None
+
+
+def test_submit_in_context_carries_the_context_to_thread_workers() -> None:
+    stack: ContextStack[str] = ContextStack("test_stack")
+    stack.push("active")
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            carried = submit_in_context(pool, lambda suffix: f"{stack.get()}{suffix}", "!")
+            plain = pool.submit(stack.get)
+            assert carried.result() == "active!"
+            assert plain.result() is None
+    finally:
+        stack.pop("active")
+
+
+def test_submit_in_context_leaves_other_executors_unchanged() -> None:
+    calls: list[tuple[Any, ...]] = []
+
+    class _Recorder(Executor):
+        def submit(self, fn: Any, /, *args: Any, **kwargs: Any) -> Future[Any]:
+            calls.append((fn, args, kwargs))
+            future: Future[Any] = Future()
+            future.set_result(fn(*args, **kwargs))
+            return future
+
+    assert submit_in_context(_Recorder(), divmod, 7, 2).result() == (3, 1)
+    assert calls == [(divmod, (7, 2), {})]
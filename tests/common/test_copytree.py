@@ -1,12 +1,16 @@
 # tests/test_copytree.py
 from __future__ import annotations
 
+import errno
+import os
+import sys
 import time
 from pathlib import Path
+from typing import Any
 
 import pytest
 
-from pymdtools.common import copytree
+from pymdtools.common import CopyResult, copytree, fs
 
 
 # ---------------------------------------------------------------------------
@@ -399,3 +403,152 @@ def test_copytree_rejects_destination_file_link_without_platform_symlink(
         copytree(src, dst)
 
     assert _read(destination_file) == "old"
+
+
+# ---------------------------------------------------------------------------
+# Summary, hash comparison, parallel copy and zero-copy paths
+# ---------------------------------------------------------------------------
+
+def test_copytree_summary_counts_copied_and_skipped_files(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    _write(src / "a.txt", "AAAA")
+    _write(src / "sub" / "b.txt", "BB")
+
+    first = copytree(src, dst, summary=True)
+    assert first == CopyResult(destination=dst, copied=2, skipped=0, bytes_copied=6)
+
+    second = copytree(src, dst, summary=True)
+    assert (second.copied, second.skipped, second.bytes_copied) == (0, 2, 0)
+    assert os.stat(dst / "a.txt").st_mtime == os.stat(src / "a.txt").st_mtime
+
+
+def test_copytree_hash_mode_ignores_timestamps(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    _write(src / "same.txt", "same")
+    _write(src / "edited.txt", "new!")
+    _write(dst / "same.txt", "same")
+    _write(dst / "edited.txt", "old!")
+    # A fresh checkout: every source file looks newer than its copy.
+    for path in (dst / "same.txt", dst / "edited.txt"):
+        os.utime(path, (1, 1))
+
+    result = copytree(src, dst, compare="hash", summary=True)
+
+    assert (result.copied, result.skipped) == (1, 1)
+    assert _read(dst / "edited.txt") == "new!"
+    assert os.stat(dst / "same.txt").st_mtime == 1
+    assert copytree(src, dst, summary=True).copied == 1
+
+
+def test_copytree_parallel_matches_serial(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    for index in range(30):
+        _write(src / f"d{index % 3}" / f"f{index}.txt", "x" * index)
+
+    serial = copytree(src, tmp_path / "serial", summary=True)
+    pooled = copytree(src, tmp_path / "pooled", max_workers=4, summary=True)
+
+    assert (pooled.copied, pooled.bytes_copied) == (serial.copied, serial.bytes_copied)
+    assert sorted(
+        p.relative_to(tmp_path / "pooled") for p in (tmp_path / "pooled").rglob("*")
+    ) == sorted(
+        p.relative_to(tmp_path / "serial") for p in (tmp_path / "serial").rglob("*")
+    )
+    assert copytree(src, tmp_path / "pooled", max_workers=4) == tmp_path / "pooled"
+
+
+def test_copytree_parallel_raises_worker_errors(tmp_path: Path) -> None:
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    _write(src / "entry", "new file")
+    _write(dst / "entry" / "old.txt", "old")
+
+    with pytest.raises(FileExistsError, match="file over a directory"):
+        copytree(src, dst, max_workers=2)
+
+
+def test_copytree_validates_options(tmp_path: Path) -> None:
+    (tmp_path / "src").mkdir()
+    with pytest.raises(ValueError, match="compare"):
+        copytree(tmp_path / "src", tmp_path / "dst", compare="size")  # type: ignore[call-overload]
+    with pytest.raises(ValueError, match="max_workers"):
+        copytree(tmp_path / "src", tmp_path / "dst", max_workers=0)
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="reflinks are only tried on Linux"
+)
+def test_copy_file_data_prefers_reflinks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"data")
+    destination = tmp_path / "b.bin"
+    monkeypatch.setattr(
+        fs.fcntl,
+        "ioctl",
+        lambda dst_fd, request, src_fd: os.write(dst_fd, os.pread(src_fd, 4, 0)),
+    )
+    monkeypatch.setattr(os, "copy_file_range", _unexpected, raising=False)
+
+    assert fs._copy_file_data(source, destination) == 4
+    assert destination.read_bytes() == b"data"
+
+
+def test_copy_file_data_falls_back_to_copy2(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"data")
+    destination = tmp_path / "b.bin"
+    monkeypatch.setattr(fs, "_reflink", lambda source_fd, destination_fd: False)
+
+    def cross_device(*args: Any) -> int:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "copy_file_range", cross_device, raising=False)
+    assert fs._copy_file_data(source, destination) == 4
+    assert destination.read_bytes() == b"data"
+
+
+def test_copy_range_loops_and_reports_late_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "a.bin"
+    source.write_bytes(b"abcdef")
+    destination = tmp_path / "b.bin"
+    calls: list[int] = []
+
+    def two_bytes(src_fd: int, dst_fd: int, count: int) -> int:
+        calls.append(count)
+        return _copy_chunk(src_fd, dst_fd, min(count, 2))
+
+    monkeypatch.setattr(os, "copy_file_range", two_bytes, raising=False)
+    with open(source, "rb") as fsrc, open(destination, "wb") as fdst:
+        # A file that shrank stops the loop at its current end.
+        assert fs._copy_range(fsrc.fileno(), fdst.fileno(), 8)
+    assert calls == [8, 6, 4, 2]
+    assert destination.read_bytes() == b"abcdef"
+
+    def fails_midway(src_fd: int, dst_fd: int, count: int) -> int:
+        if calls:
+            calls.clear()
+            return _copy_chunk(src_fd, dst_fd, 2)
+        raise OSError(errno.EINVAL, "Invalid argument")
+
+    monkeypatch.setattr(os, "copy_file_range", fails_midway, raising=False)
+    calls.append(0)
+    with open(source, "rb") as fsrc, open(destination, "wb") as fdst:
+        with pytest.raises(OSError):
+            fs._copy_range(fsrc.fileno(), fdst.fileno(), 6)
+
+
+def _copy_chunk(src_fd: int, dst_fd: int, count: int) -> int:
+    """Stand in for ``os.copy_file_range`` with plain reads and writes."""
+    return os.write(dst_fd, os.read(src_fd, count))
+
+
+def _unexpected(*args: Any) -> int:
+    raise AssertionError("copy_file_range should not be called")
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from pymdtools import common
+
+
+class _CountingChardet:
+    calls = 0
+
+    @classmethod
+    def detect(cls, _: bytes) -> dict[str, object]:
+        cls.calls += 1
+        return {"encoding": "ISO-8859-1", "confidence": 0.9}
+
+
+@pytest.fixture
+def counting_chardet(monkeypatch: pytest.MonkeyPatch) -> type[_CountingChardet]:
+    _CountingChardet.calls = 0
+    monkeypatch.setitem(sys.modules, "chardet", _CountingChardet)
+    return _CountingChardet
+
+
+@pytest.fixture
+def encoding_cache() -> Iterator[None]:
+    common.configure_encoding_cache(2)
+    try:
+        yield
+    finally:
+        common.configure_encoding_cache(0)
+
+
+def test_utf8_and_ascii_samples_skip_chardet(
+    tmp_path: Path, counting_chardet: type[_CountingChardet]
+) -> None:
+    ascii_file = tmp_path / "a.md"
+    ascii_file.write_bytes(b"# plain\n")
+    utf8_file = tmp_path / "u.md"
+    utf8_file.write_text("Café — €\n", encoding="utf-8")
+
+    assert common.detect_file_encoding(ascii_file) == "ascii"
+    assert common.detect_file_encoding(utf8_file) == "utf-8"
+    # The sample stops inside "é"; the cut sequence is not an error.
+    assert common.detect_file_encoding(utf8_file, sample_size=4) == "utf-8"
+    assert counting_chardet.calls == 0
+
+
+def test_invalid_utf8_still_uses_chardet(
+    tmp_path: Path, counting_chardet: type[_CountingChardet]
+) -> None:
+    latin = tmp_path / "l.md"
+    latin.write_bytes(b"caf\xe9\n")
+    truncated = tmp_path / "t.md"
+    truncated.write_bytes("café".encode("utf-8")[:-1])
+
+    assert common.detect_file_encoding(latin) == "iso-8859-1"
+    assert common.detect_file_encoding(truncated) == "iso-8859-1"
+    assert counting_chardet.calls == 2
+
+
+@pytest.mark.usefixtures("encoding_cache")
+def test_encoding_cache_reuses_results_until_the_file_changes(
+    tmp_path: Path, counting_chardet: type[_CountingChardet]
+) -> None:
+    page = tmp_path / "p.md"
+    page.write_bytes(b"caf\xe9\n")
+
+    assert common.read_text_with_info(page).text == "café\n"
+    assert common.detect_file_encoding(page) == "iso-8859-1"
+    assert common.detect_file_encoding(page) == "iso-8859-1"
+    assert counting_chardet.calls == 1
+
+    page.write_bytes(b"caf\xe9s\n")
+    os.utime(page, ns=(1, 1))
+    assert common.detect_file_encoding(page) == "iso-8859-1"
+    assert common.read_text_with_info(page).encoding == "iso-8859-1"
+    assert counting_chardet.calls == 2
+    assert common.read_text_with_info(page, encoding="latin-1").text == "cafés\n"
+
+    common.clear_encoding_cache()
+    common.detect_file_encoding(page)
+    assert counting_chardet.calls == 3
+
+
+@pytest.mark.usefixtures("encoding_cache")
+def test_encoding_cache_evicts_least_recently_used(
+    tmp_path: Path, counting_chardet: type[_CountingChardet]
+) -> None:
+    pages = [tmp_path / f"{name}.md" for name in "abc"]
+    for page in pages:
+        page.write_bytes(b"\xe9")
+
+    for page in (pages[0], pages[1], pages[0], pages[2], pages[0], pages[1]):
+        common.detect_file_encoding(page)
+
+    # a stays in use; b is evicted by c and read again.
+    assert counting_chardet.calls == 4
+
+    common.configure_encoding_cache(1)
+    common.detect_file_encoding(pages[1])
+    assert counting_chardet.calls == 4
+    common.configure_encoding_cache(0)
+    common.detect_file_encoding(pages[1])
+    assert counting_chardet.calls == 5
+
+
+def test_configure_encoding_cache_rejects_negative_size() -> None:
+    with pytest.raises(ValueError, match="maxsize"):
+        common.configure_encoding_cache(-1)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pymdtools.common import FileLocator, find_file
+
+
+def _outcome(func: Any, *args: Any, **kwargs: Any) -> object:
+    try:
+        return func(*args, **kwargs)
+    except (FileNotFoundError, ValueError) as exc:
+        return (type(exc), str(exc))
+
+
+def _tree(root: Path) -> None:
+    for name in ("a/b/target.txt", "a/docs/target.txt", "a/docs/other.md", "c/x.md"):
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name, encoding="utf-8")
+    (root / "a" / "b" / "folder.md").mkdir()
+    (root / "a" / "b" / "plain.txt").write_text("x", encoding="utf-8")
+
+
+def _supports_symlinks(tmp_path: Path) -> bool:
+    """
+    Detect whether the current environment supports creating symlinks.
+
+    On Windows this may require admin rights or Developer Mode.
+    """
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    target.write_text("x", encoding="utf-8")
+
+    try:
+        link.symlink_to(target)
+        ok = link.is_symlink()
+    except (OSError, NotImplementedError):
+        ok = False
+    finally:
+        try:
+            if link.exists() or link.is_symlink():
+                link.unlink()
+        except OSError:
+            pass
+        target.unlink()
+
+    return ok
+
+
+def _assert_matches_find_file(tmp_path: Path, filename: str) -> None:
+    locator = FileLocator()
+    args = (
+        filename,
+        [tmp_path / "a" / "b", tmp_path / "missing", tmp_path / "c"],
+        [".", "docs", "plain.txt", Path("b")],
+    )
+
+    for max_up in (0, 1, 2):
+        expected = _outcome(find_file, *args, max_up=max_up)
+        assert _outcome(locator.find_file, *args, max_up=max_up) == expected
+        # A second lookup is answered from the cache with the same outcome.
+        assert _outcome(locator.find_file, *args, max_up=max_up) == expected
+
+
+@pytest.mark.parametrize(
+    "filename", ["target.txt", "other.md", "x.md", "folder.md", "none"]
+)
+def test_file_locator_matches_find_file(tmp_path: Path, filename: str) -> None:
+    _tree(tmp_path)
+    _assert_matches_find_file(tmp_path, filename)
+
+
+@pytest.mark.parametrize("filename", ["link.md", "broken.md"])
+def test_file_locator_matches_find_file_for_links(
+    tmp_path: Path, filename: str
+) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    _tree(tmp_path)
+    (tmp_path / "a" / "b" / "link.md").symlink_to(tmp_path / "c" / "x.md")
+    (tmp_path / "a" / "b" / "broken.md").symlink_to(tmp_path / "missing.md")
+    _assert_matches_find_file(tmp_path, filename)
+
+
+def test_file_locator_lists_each_folder_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _tree(tmp_path)
+    scanned: list[str] = []
+    real_scandir = os.scandir
+
+    def spy(path: Any) -> Any:
+        scanned.append(str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", spy)
+    locator = FileLocator()
+
+    for name in ("target.txt", "other.md", "nothing.md", "nothing.md"):
+        _outcome(locator.find_file, name, [tmp_path / "a" / "b"], [".", "docs"])
+
+    assert len(scanned) == len(set(scanned))
+    assert locator.misses == len(scanned)
+    assert locator.hits > locator.misses
+
+
+def test_file_locator_keeps_anchor_escape_checks(tmp_path: Path) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    anchor = tmp_path / "anchor"
+    outside = tmp_path / "outside"
+    anchor.mkdir()
+    outside.mkdir()
+    (outside / "target.txt").write_text("x", encoding="utf-8")
+    (anchor / "escape").symlink_to(outside, target_is_directory=True)
+    (anchor / "target.txt").symlink_to(outside / "target.txt")
+    locator = FileLocator()
+
+    for rel in ("escape", "."):
+        with pytest.raises(ValueError, match="escapes its anchor"):
+            locator.find_file("target.txt", [anchor], [rel], max_up=0)
+    with pytest.raises(ValueError, match="plain filename"):
+        locator.find_file("a/b.txt", [anchor], ["."])
+
+
+def test_file_locator_relative_anchors_follow_the_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _tree(tmp_path)
+    locator = FileLocator()
+
+    monkeypatch.chdir(tmp_path / "a")
+    assert locator.find_file("target.txt", ["b"], ["."], max_up=0) == (
+        tmp_path / "a" / "b" / "target.txt"
+    )
+    monkeypatch.chdir(tmp_path / "c")
+    with pytest.raises(FileNotFoundError):
+        locator.find_file("target.txt", ["b"], ["."], max_up=0)
+
+
+def test_file_locator_invalidation(tmp_path: Path) -> None:
+    _tree(tmp_path)
+    folder = tmp_path / "a" / "b"
+    locator = FileLocator()
+
+    with pytest.raises(FileNotFoundError):
+        locator.find_file("new.md", [folder], ["."], max_up=0)
+    (folder / "new.md").write_text("x", encoding="utf-8")
+    # The negative result is cached until the folder is invalidated.
+    with pytest.raises(FileNotFoundError):
+        locator.find_file("new.md", [folder], ["."], max_up=0)
+
+    assert locator.invalidate(folder / "new.md") == 1
+    assert locator.find_file("new.md", [folder], ["."], max_up=0) == folder / "new.md"
+
+    assert locator.invalidate(tmp_path / "elsewhere") == 0
+    assert locator.invalidate() == 1
+    assert locator.find_file("new.md", [folder], ["."], max_up=0) == folder / "new.md"
+
+
+def test_file_locator_invalidation_sees_new_links(tmp_path: Path) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    _tree(tmp_path)
+    folder = tmp_path / "a" / "b"
+    locator = FileLocator()
+    with pytest.raises(FileNotFoundError):
+        locator.find_file("alias.md", [folder], ["."], max_up=0)
+
+    (folder / "alias.md").symlink_to(folder / "plain.txt")
+    assert locator.invalidate(folder) == 1
+    assert locator.find_file("alias.md", [folder], ["."], max_up=0) == (
+        folder / "plain.txt"
+    )
+    (folder / "alias.md").unlink()
+    assert locator.invalidate(folder / "alias.md") == 1
+    with pytest.raises(FileNotFoundError):
+        locator.find_file("alias.md", [folder], ["."], max_up=0)
+
+
+def test_file_locator_falls_back_for_unreadable_folders(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _tree(tmp_path)
+
+    def denied(path: Any) -> Any:
+        raise PermissionError(path)
+
+    monkeypatch.setattr(os, "scandir", denied)
+    locator = FileLocator()
+
+    assert locator.find_file("target.txt", [tmp_path / "a"], ["b"], max_up=0) == (
+        tmp_path / "a" / "b" / "target.txt"
+    )
+    with pytest.raises(FileNotFoundError):
+        locator.find_file("none.md", [tmp_path / "a"], ["b"], max_up=0)
@@ -1,8 +1,10 @@
 import codecs
+import random
 import pytest
 from pathlib import Path
 
 from pymdtools.common import is_binary_file
+from pymdtools.common.fs import _is_binary_sample
 
 
 def test_is_binary_file_text_ascii(tmp_path):
@@ -185,3 +187,63 @@ def test_is_binary_file_accepts_codec_state_sequence_with_no_text(tmp_path: Path
     p.write_bytes(b"\x1b(B")
 
     assert is_binary_file(p, encoding="iso2022_jp") is False
+
+
+def _decode_reference(chunk: bytes, encoding: str | None) -> bool:
+    """Character-level classification used before the byte tables."""
+    if not chunk:
+        return False
+    boms = (b"\xef\xbb\xbf", b"\xff\xfe", b"\xfe\xff")
+    if chunk.startswith(boms) or chunk.startswith(b"\x00\x00\xfe\xff"):
+        return False
+    normalized = codecs.lookup(encoding).name if encoding is not None else None
+    if b"\x00" in chunk and not (
+        normalized is not None and normalized.startswith(("utf-16", "utf-32"))
+    ):
+        return True
+
+    def controls(text: str) -> bool:
+        if not text:
+            return False
+        count = sum(1 for c in text if not c.isprintable() and c not in "\n\r\t\f")
+        return count / len(text) > 0.30
+
+    for candidate in [normalized] if normalized else ["utf-8", "cp1252"]:
+        try:
+            return controls(chunk.decode(candidate))
+        except UnicodeDecodeError:
+            continue
+    return True
+
+
+_TEXT_PIECES = (
+    b"text ", b"\n", b"\r\n", b"\t", b"\x0c", "é".encode(), "€".encode(),
+    "\u00a0".encode(), "\u00ad".encode(), "\u0085".encode(), "\u200b".encode(),
+    "\U0001f600".encode(),
+)
+_NOISE_PIECES = (
+    b"\x01", b"\x1b[0m", b"\x7f", b"\x80", b"\x81", b"\x9d", b"\xc3", b"\xa9",
+    b"\xe9", b"\xff", b"\x00",
+)
+
+
+@pytest.mark.parametrize(
+    "encoding",
+    [None, "utf-8", "cp1252", "latin-1", "ascii", "iso-8859-15", "utf-16-le", "shift_jis"],
+)
+def test_byte_tables_match_decode_classification_on_fuzzed_samples(
+    encoding: str | None,
+) -> None:
+    rng = random.Random(20260310)
+    for _ in range(1500):
+        noise = rng.random()
+        pieces = [
+            rng.choice(_NOISE_PIECES if rng.random() < noise / 4 else _TEXT_PIECES)
+            for _ in range(rng.randint(1, 40))
+        ]
+        if rng.random() < 0.2:
+            pieces.append(bytes(rng.randrange(256) for _ in range(rng.randint(1, 20))))
+        chunk = b"".join(pieces)
+        assert _is_binary_sample(chunk, encoding) is _decode_reference(
+            chunk, encoding
+        ), (chunk, encoding)
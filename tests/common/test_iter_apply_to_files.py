@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pymdtools.common import ApplyResult, apply_to_files, iter_apply_to_files
+
+
+def _write(p: Path, text: str = "x") -> Path:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(text, encoding="utf-8")
+    return p
+
+
+def _tree(root: Path) -> None:
+    for name in ("b.md", "a.md", "c.txt", "sub/d.md", "sub/z/e.md", "build/out.md"):
+        _write(root / name, name)
+    _write(root / "sub" / "bad.md", "fail")
+
+
+def _supports_symlinks(tmp_path: Path) -> bool:
+    """
+    Detect whether the current environment supports creating symlinks.
+
+    On Windows this may require admin rights or Developer Mode.
+    """
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    _write(target)
+
+    try:
+        link.symlink_to(target)
+        ok = link.is_symlink()
+    except (OSError, NotImplementedError):
+        ok = False
+    finally:
+        try:
+            if link.exists() or link.is_symlink():
+                link.unlink()
+        except OSError:
+            pass
+        target.unlink()
+
+    return ok
+
+
+def _read_or_fail(p: Path) -> str:
+    text = p.read_text(encoding="utf-8")
+    if text == "fail":
+        raise ValueError(f"bad {p.name}")
+    return text
+
+
+def test_iter_apply_to_files_matches_apply_to_files(tmp_path: Path) -> None:
+    _tree(tmp_path)
+
+    items = list(
+        iter_apply_to_files(
+            tmp_path, _read_or_fail, expected_ext="md", include_globs=("*.md", "*/*")
+        )
+    )
+    results, summary, errors = apply_to_files(
+        tmp_path,
+        _read_or_fail,
+        expected_ext="md",
+        include_globs=("*.md", "*/*"),
+        on_error="collect",
+    )
+
+    assert items[-1] == summary
+    pairs = items[:-1]
+    assert [value for _, value in pairs if isinstance(value, str)] == results
+    assert [
+        (path, str(value)) for path, value in pairs if isinstance(value, Exception)
+    ] == [(path, str(exc)) for path, exc in errors]
+
+
+def test_iter_apply_to_files_prunes_excluded_directories(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _tree(tmp_path)
+    (tmp_path / "sub" / ".git").mkdir()
+    scanned: list[str] = []
+    real_scandir = os.scandir
+
+    def spy(path: str) -> object:
+        scanned.append(Path(path).relative_to(tmp_path).as_posix())
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", spy)
+
+    items = list(
+        iter_apply_to_files(
+            tmp_path, lambda p: p.name, exclude_globs=("build/*", "*/.git/*", "*.txt")
+        )
+    )
+
+    assert scanned == [".", "sub", "sub/z"]
+    assert items[-1] == ApplyResult(processed=6, succeeded=5, failed=0, skipped=1)
+
+
+def test_iter_apply_to_files_with_a_pool_yields_every_outcome(tmp_path: Path) -> None:
+    _tree(tmp_path)
+
+    serial = list(iter_apply_to_files(tmp_path, _read_or_fail))
+    for executor in ("thread", "process"):
+        pooled = list(
+            iter_apply_to_files(
+                tmp_path, _read_or_fail, executor=executor, max_workers=2
+            )
+        )
+        assert pooled[-1] == serial[-1]
+        assert sorted(
+            (str(path), str(value)) for path, value in pooled[:-1]  # type: ignore[misc]
+        ) == sorted(
+            (str(path), str(value)) for path, value in serial[:-1]  # type: ignore[misc]
+        )
+
+
+def test_closing_the_stream_cancels_pending_calls(tmp_path: Path) -> None:
+    for index in range(20):
+        _write(tmp_path / f"f{index:02d}.md")
+    calls: list[str] = []
+
+    def fn(p: Path) -> str:
+        calls.append(p.name)
+        return p.name
+
+    stream = iter_apply_to_files(tmp_path, fn, executor="thread", max_workers=1)
+    next(stream)
+    stream.close()
+
+    assert len(calls) <= 3
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+def test_iter_apply_to_files_links_and_special_roots(tmp_path: Path) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    _write(tmp_path / "docs" / "a.md")
+    _write(tmp_path / "other" / "o.md")
+    (tmp_path / "docs" / "ext").symlink_to(tmp_path / "other")
+    (tmp_path / "docs" / "loop").symlink_to(tmp_path / "docs")
+    (tmp_path / "docs" / "link.md").symlink_to(tmp_path / "docs" / "a.md")
+    (tmp_path / "docs" / "broken.md").symlink_to(tmp_path / "missing.md")
+
+    def names(**kwargs: object) -> list[str]:
+        return [
+            item[0].relative_to(tmp_path / "docs").as_posix()
+            for item in iter_apply_to_files(tmp_path / "docs", str, **kwargs)  # type: ignore[arg-type]
+            if not isinstance(item, ApplyResult)
+        ]
+
+    assert names() == ["a.md", "link.md"]
+    assert names(follow_symlinks=True) == ["a.md", "ext/o.md", "link.md"]
+    assert names(recursive=False, follow_symlinks=True) == ["a.md", "link.md"]
+    assert list(iter_apply_to_files(tmp_path / "docs" / "a.md", lambda p: 1)) == [
+        (tmp_path / "docs" / "a.md", 1),
+        ApplyResult(processed=1, succeeded=1, failed=0, skipped=0),
+    ]
+
+    fifo = tmp_path / "pipe"
+    os.mkfifo(fifo)
+    with pytest.raises(NotADirectoryError):
+        list(iter_apply_to_files(fifo, str))
+    with pytest.raises(FileNotFoundError):
+        list(iter_apply_to_files(tmp_path / "missing", str))
+    with pytest.raises(FileNotFoundError):
+        list(iter_apply_to_files(tmp_path / "missing", str, executor="thread"))
+
+
+def test_iter_apply_to_files_validates_arguments(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="executor"):
+        next(iter_apply_to_files(tmp_path, str, executor="fiber"))
+    with pytest.raises(ValueError, match="max_workers"):
+        next(iter_apply_to_files(tmp_path, str, max_workers=0))
+    assert list(iter_apply_to_files(tmp_path, str, executor="thread")) == [
+        ApplyResult(processed=0, succeeded=0, failed=0, skipped=0)
+    ]
+
+
+def test_walk_files_orders_prunes_and_limits_depth(tmp_path: Path) -> None:
+    from pymdtools.common import walk_files
+
+    _tree(tmp_path)
+    os.mkfifo(tmp_path / "sub" / "fifo")
+
+    def rel(**kwargs: object) -> list[str]:
+        return [
+            p.relative_to(tmp_path).as_posix()
+            for p in walk_files(tmp_path, **kwargs)  # type: ignore[arg-type]
+        ]
+
+    assert rel(exclude_globs=("build/*", "*.txt")) == [
+        "a.md", "b.md", "sub/bad.md", "sub/d.md", "sub/z/e.md",
+    ]
+    assert rel(max_depth=1, files_first=True) == [
+        "a.md", "b.md", "c.txt", "build/out.md", "sub/bad.md", "sub/d.md",
+    ]
+    assert "sub/fifo" in rel(files_only=False)
+    with pytest.raises(NotADirectoryError):
+        list(walk_files(tmp_path / "a.md"))
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pymdtools import common
+from pymdtools.common import PathCache
+
+
+@pytest.fixture
+def stat_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    real_stat = Path.stat
+
+    def spy(self: Path, **kwargs: Any) -> os.stat_result:
+        calls.append(self.name)
+        return real_stat(self, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", spy)
+    return calls
+
+
+def _supports_symlinks(tmp_path: Path) -> bool:
+    """
+    Detect whether the current environment supports creating symlinks.
+
+    On Windows this may require admin rights or Developer Mode.
+    """
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    target.write_text("x", encoding="utf-8")
+
+    try:
+        link.symlink_to(target)
+        ok = link.is_symlink()
+    except (OSError, NotImplementedError):
+        ok = False
+    finally:
+        try:
+            if link.exists() or link.is_symlink():
+                link.unlink()
+        except OSError:
+            pass
+        target.unlink()
+
+    return ok
+
+
+def test_path_cache_collapses_repeated_checks(
+    tmp_path: Path, stat_calls: list[str]
+) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+
+    with PathCache() as cache:
+        for _ in range(3):
+            assert common.check_file(page, ".md") == page
+            assert common.check_folder(tmp_path) == tmp_path
+            assert common.ensure_folder(tmp_path) == tmp_path
+        assert common.get_file_content(page) == "x"
+
+    # One stat inside resolve() and one for the file type, for the whole batch.
+    assert stat_calls.count("page.md") == 2
+    assert stat_calls.count(tmp_path.name) == 2
+    assert cache.misses == 4
+    assert cache.hits > cache.misses
+
+    stat_calls.clear()
+    common.check_file(page)
+    assert stat_calls.count("page.md") == 3
+
+
+def test_path_cache_keeps_the_helper_errors(tmp_path: Path) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+
+    with PathCache():
+        with pytest.raises(FileNotFoundError, match="File does not exist"):
+            common.check_file(tmp_path / "missing.md")
+        with pytest.raises(IsADirectoryError):
+            common.check_file(tmp_path)
+        with pytest.raises(NotADirectoryError, match="Not a folder"):
+            common.check_folder(page)
+        with pytest.raises(FileNotFoundError):
+            common.check_folder(page / "below")
+        with pytest.raises(NotADirectoryError):
+            common.ensure_folder(page)
+        with pytest.raises(ValueError, match="extension"):
+            common.check_file(page, ".txt")
+        with pytest.raises(FileNotFoundError):
+            common.to_path(tmp_path / "missing", resolve=True, strict=True)
+        assert not common.fs._exists(tmp_path / "nul\0")
+
+
+def test_path_cache_sees_created_paths_and_forgets_on_invalidate(
+    tmp_path: Path,
+) -> None:
+    page = tmp_path / "page.md"
+
+    with PathCache() as cache:
+        with pytest.raises(FileNotFoundError):
+            common.check_file(page)
+        page.write_text("x", encoding="utf-8")
+        assert common.check_file(page) == page
+
+        created = common.ensure_folder(tmp_path / "new" / "sub")
+        assert common.check_folder(created) == created
+
+        page.unlink()
+        assert common.check_file(page) == page
+        cache.invalidate()
+        with pytest.raises(FileNotFoundError):
+            common.check_file(page)
+
+
+def test_path_cache_keeps_resolved_links_until_invalidated(tmp_path: Path) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    link = tmp_path / "link.md"
+
+    with PathCache() as cache:
+        link.symlink_to(page)
+        assert common.normpath(link) == page
+        link.unlink()
+        link.symlink_to(folder)
+        assert common.normpath(link) == page
+        cache.invalidate(link)
+        assert common.normpath(link) == folder
+
+
+def test_path_cache_keys_relative_paths_by_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "a" / "page.md").write_text("x", encoding="utf-8")
+
+    with PathCache():
+        monkeypatch.chdir(tmp_path / "a")
+        assert common.check_file("page.md") == tmp_path / "a" / "page.md"
+        monkeypatch.chdir(tmp_path / "b")
+        with pytest.raises(FileNotFoundError):
+            common.check_file("page.md")
+
+
+def test_path_cache_propagates_unexpected_stat_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def denied(self: Path, **kwargs: Any) -> os.stat_result:
+        raise PermissionError(13, "denied", str(self))
+
+    monkeypatch.setattr(Path, "stat", denied)
+    with PathCache(), pytest.raises(PermissionError):
+        common.check_folder(tmp_path)
+
+
+def test_path_caches_nest_and_serve_pool_workers_only(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+
+    with PathCache() as outer:
+        with PathCache() as inner:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                common.submit_in_context(pool, common.check_file, page).result()
+                # A plain submission runs outside the caller's context.
+                pool.submit(common.check_file, page).result()
+            common.check_file(page)
+        common.check_file(page)
+
+    assert (inner.hits, inner.misses) == (4, 2)
+    assert (outer.hits, outer.misses) == (1, 2)
+    assert common.fs._path_caches.get() is None
+
+
+def test_path_caches_of_other_threads_stay_invisible(tmp_path: Path) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    entered = threading.Event()
+    release = threading.Event()
+    seen: list[object] = []
+
+    def other_thread() -> None:
+        with PathCache():
+            entered.set()
+            release.wait()
+
+    worker = threading.Thread(target=other_thread)
+    worker.start()
+    entered.wait()
+    seen.append(common.fs._path_caches.get())
+    with PathCache() as mine:
+        release.set()
+        worker.join()
+        seen.append(common.fs._path_caches.get())
+
+    assert seen == [None, mine]
+    assert common.fs._path_caches.get() is None
+
+
+def test_path_caches_must_exit_in_reverse_order(tmp_path: Path) -> None:
+    page = tmp_path / "page.md"
+    page.write_text("x", encoding="utf-8")
+    first = PathCache().__enter__()
+    second = PathCache().__enter__()
+
+    with pytest.raises(RuntimeError, match="PathCache exited out of order"):
+        first.__exit__(None, None, None)
+    second.__exit__(None, None, None)
+    first.__exit__(None, None, None)
+
+    assert common.fs._path_caches.get() is None
+    page.unlink()
+    with pytest.raises(FileNotFoundError):
+        common.check_file(page)
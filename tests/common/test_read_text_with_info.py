@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import codecs
+import os
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import pytest
+
+import pymdtools.common.fs as fs
+from pymdtools.common import (
+    TextFileInfo,
+    detect_file_encoding,
+    get_file_content,
+    is_binary_file,
+    read_text_with_info,
+)
+
+
+def _three_reads(path: Path) -> str:
+    """Previous get_file_content pipeline: detect, sniff, then read_text."""
+    encoding = detect_file_encoding(path)
+    if is_binary_file(path, encoding=encoding):
+        raise ValueError(f"Binary file detected: {path}")
+    text = path.read_text(encoding=encoding)
+    return text[1:] if text.startswith("﻿") else text
+
+
+_CORPUS: dict[str, bytes] = {
+    "empty": b"",
+    "ascii": b"# Title\n\nplain text\n",
+    "crlf": b"line one\r\nline two\r\n",
+    "cr": b"old mac\rline\r\r\n",
+    "utf8": "Café — naïve €\n".encode("utf-8"),
+    "utf8_bom": codecs.BOM_UTF8 + "été\r\n".encode("utf-8"),
+    "utf16_le": codecs.BOM_UTF16_LE + "tête\r\nx".encode("utf-16-le"),
+    "utf16_be": codecs.BOM_UTF16_BE + "abc".encode("utf-16-be"),
+    "utf32_le": codecs.BOM_UTF32_LE + "abc".encode("utf-32-le"),
+    "cp1252": ("Café — 10 € " * 20).encode("cp1252"),
+    "binary": bytes(range(256)) * 4,
+    "nul": b"text\x00more",
+}
+
+
+@pytest.mark.parametrize("name", sorted(_CORPUS))
+def test_read_text_with_info_matches_the_three_read_pipeline(
+    tmp_path: Path, name: str
+) -> None:
+    path = tmp_path / f"{name}.txt"
+    path.write_bytes(_CORPUS[name])
+
+    try:
+        expected: str | type[Exception] = _three_reads(path)
+    except (ValueError, UnicodeDecodeError) as exc:
+        expected = type(exc)
+
+    try:
+        info = read_text_with_info(path)
+    except (ValueError, UnicodeDecodeError) as exc:
+        assert expected is type(exc)
+        return
+
+    assert info.text == expected == get_file_content(path)
+    assert info.size == len(_CORPUS[name])
+    assert info.encoding == detect_file_encoding(path)
+
+
+def test_read_text_with_info_reports_explicit_encoding(tmp_path: Path) -> None:
+    path = tmp_path / "a.md"
+    path.write_bytes("déjà\r\n".encode("latin-1"))
+
+    info = read_text_with_info(path, encoding="latin-1")
+
+    assert info == TextFileInfo(text="déjà\n", encoding="latin-1", size=6)
+    assert read_text_with_info(
+        path, encoding="utf-8", errors="replace", reject_binary=False
+    ).text == path.read_text(encoding="utf-8", errors="replace")
+
+
+def test_read_text_with_info_checks_arguments_like_the_helpers(tmp_path: Path) -> None:
+    path = tmp_path / "a.md"
+    path.write_text("x", encoding="utf-8")
+
+    with pytest.raises(FileNotFoundError):
+        read_text_with_info(tmp_path / "missing.md", sample_size=0)
+    with pytest.raises(ValueError, match="min_confidence"):
+        read_text_with_info(path, min_confidence=2.0)
+    with pytest.raises(ValueError, match="sample_size"):
+        read_text_with_info(path, encoding="utf-8", sample_size=0)
+
+    assert read_text_with_info(
+        path, encoding="utf-8", min_confidence=2.0, sample_size=0, reject_binary=False
+    ).text == "x"
+
+
+def test_read_text_with_info_rejects_binary_from_the_sample_alone(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    binary = tmp_path / "blob.bin"
+    binary.write_bytes(b"\x00" * 4096)
+    text = tmp_path / "a.md"
+    text.write_text("abc" * 100, encoding="utf-8")
+    reads: list[int] = []
+    real_open = Path.open
+
+    class Spy:
+        def __init__(self, stream: BinaryIO) -> None:
+            self.stream = stream
+
+        def __enter__(self) -> Spy:
+            return self
+
+        def __exit__(self, *exc: object) -> None:
+            self.stream.close()
+
+        def fileno(self) -> int:
+            return self.stream.fileno()
+
+        def readinto(self, buffer: Any) -> int:
+            size = self.stream.readinto(buffer)
+            reads.append(size)
+            return size
+
+    def spy_open(path: Path, *args: Any, **kwargs: Any) -> Any:
+        return Spy(real_open(path, *args, **kwargs))
+
+    monkeypatch.setattr(Path, "open", spy_open)
+
+    with pytest.raises(ValueError, match="Binary file detected"):
+        read_text_with_info(binary, sample_size=16)
+    assert reads == [17]
+
+    reads.clear()
+    assert read_text_with_info(text, sample_size=16).text == "abc" * 100
+    assert reads == [17, 300 - 17]
+
+
+def test_read_text_with_info_reads_past_a_stale_size(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "a.md"
+    path.write_text("abc" * 100, encoding="utf-8")
+    real_fstat = os.fstat
+
+    def stale_fstat(fd: int) -> os.stat_result:
+        st = real_fstat(fd)
+        return os.stat_result((*st[:6], 0, *st[7:]))
+
+    monkeypatch.setattr(fs.os, "fstat", stale_fstat)
+
+    assert read_text_with_info(path, encoding="utf-8", sample_size=16) == (
+        TextFileInfo(text="abc" * 100, encoding="utf-8", size=300)
+    )
@@ -5,7 +5,12 @@ from pathlib import Path
 
 import pytest
 
-from pymdtools.common import set_file_content, get_file_content
+from pymdtools.common import (
+    get_file_content,
+    rewrite_file_content,
+    same_file_content,
+    set_file_content,
+)
 
 
 def test_set_file_content_creates_file(tmp_path):
@@ -98,3 +103,66 @@ def test_set_file_content_atomic_write_preserves_posix_mode(tmp_path: Path) -> N
     set_file_content(path, "new", atomic=True)
 
     assert stat.S_IMODE(path.stat().st_mode) == 0o751
+
+
+@pytest.mark.parametrize(
+    ("content", "kwargs"),
+    [
+        ("a\nb\n", {}),
+        ("a\nb\n", {"newline": "\r\n"}),
+        ("a\nb\n", {"newline": None}),
+        ("été\n", {"encoding": "latin-1"}),
+        ("été\n", {"bom": True}),
+        ("", {}),
+    ],
+)
+def test_set_file_content_skips_identical_content(
+    tmp_path: Path, content: str, kwargs: dict[str, object]
+) -> None:
+    path = tmp_path / "page.md"
+    assert set_file_content(path, content, skip_if_unchanged=True, **kwargs) is True  # type: ignore[call-overload]
+    os.utime(path, ns=(1, 1))
+
+    assert same_file_content(path, content, **kwargs)  # type: ignore[arg-type]
+    assert set_file_content(path, content, skip_if_unchanged=True, **kwargs) is False  # type: ignore[call-overload]
+    assert path.stat().st_mtime_ns == 1
+
+    assert set_file_content(path, content + "x", skip_if_unchanged=True, **kwargs) is True  # type: ignore[call-overload]
+    assert path.stat().st_mtime_ns != 1
+
+
+def test_same_file_content_rejects_missing_and_different_files(tmp_path: Path) -> None:
+    path = tmp_path / "page.md"
+    path.write_bytes(b"abc")
+
+    assert same_file_content(path, "abc")
+    assert not same_file_content(path, "abd")
+    assert not same_file_content(path, "abcd")
+    assert not same_file_content(tmp_path / "missing.md", "abc")
+    assert not same_file_content(tmp_path, "")
+    assert set_file_content(
+        tmp_path / "new" / "direct.md", "x", atomic=False, skip_if_unchanged=True
+    ) is True
+    with pytest.raises(ValueError, match="only supported with UTF-8"):
+        same_file_content(path, "abc", encoding="latin-1", bom=True)
+
+
+def test_rewrite_file_content_backs_up_only_what_it_writes(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    caplog.set_level("INFO")
+    f = tmp_path / "a.md"
+    f.write_text("old\n", encoding="utf-8")
+
+    assert rewrite_file_content(
+        f, "new\n", backup=True, backup_date_prefix="2026-01-01"
+    )
+    assert not rewrite_file_content(f, "new\n", backup=True, skip_if_unchanged=True)
+    assert rewrite_file_content(f, "newer\n", skip_if_unchanged=True)
+
+    assert f.read_text(encoding="utf-8") == "newer\n"
+    assert [p.name for p in tmp_path.glob("*.bak")] == ["a.md.2026-01-01-001.bak"]
+    assert [r.getMessage() for r in caplog.records] == [
+        f"Unchanged {f}",
+        f"Changed {f}",
+    ]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 import pytest
 
+from pymdtools import common
 from pymdtools.filetools import FileContent
 
 
@@ -197,3 +199,102 @@ def test_filecontent_none_content_write_keeps_original_path(tmp_path: Path) -> N
 
     assert fc.full_filename == str(original.resolve())
     assert not destination.exists()
+
+
+def test_filecontent_write_skips_unchanged_content(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    path = tmp_path / "page.md"
+    path.write_text("same\n", encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    compared: list[str] = []
+    real_same = common.same_file_content
+
+    def spy(target, content, *args, **kwargs):
+        compared.append(content)
+        return real_same(target, content, *args, **kwargs)
+
+    monkeypatch.setattr("pymdtools.filetools.common.same_file_content", spy)
+    fc = FileContent(path)
+    fc.content = "same\n"
+
+    assert fc.write(skip_if_unchanged=True) is False
+    assert fc.save_needed is False
+    assert path.stat().st_mtime_ns == 1
+    assert list(tmp_path.iterdir()) == [path]
+
+    # Content that differs from what was read is written without comparing.
+    fc.content = "new\n"
+    assert fc.write(skip_if_unchanged=True) is True
+    assert compared == ["same\n"]
+    assert path.read_text(encoding="utf-8") == "new\n"
+    assert len(list(tmp_path.iterdir())) == 2
+
+    other = tmp_path / "copy.md"
+    assert fc.write(other, skip_if_unchanged=True) is True
+    assert fc.write(other, skip_if_unchanged=True) is False
+    assert fc.write() is True
+
+
+def test_filecontent_lazy_reads_on_first_access(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "page.md"
+    path.write_text("body\n", encoding="utf-8")
+    reads: list[Path] = []
+    real_get = common.get_file_content
+
+    def spy(target, *args, **kwargs):
+        reads.append(target)
+        return real_get(target, *args, **kwargs)
+
+    monkeypatch.setattr("pymdtools.filetools.common.get_file_content", spy)
+    fc = FileContent(path, lazy=True, encoding="utf-8")
+
+    assert fc.filename_ext == ".md"
+    assert (fc.loaded, reads) == (False, [])
+    assert "content_len=None" in repr(fc)
+    assert fc.content == "body\n"
+    assert fc.content == "body\n"
+    assert (fc.loaded, fc.save_needed, reads) == (True, False, [path])
+
+    # Overwriting before the first access never reads the file.
+    other = FileContent(path, lazy=True)
+    other.content = "new\n"
+    assert other.write(skip_if_unchanged=True) is True
+    assert reads == [path]
+
+
+def test_filecontent_lazy_keeps_dirty_tracking_and_renames(tmp_path: Path) -> None:
+    path = tmp_path / "page.md"
+    path.write_text("same\n", encoding="utf-8")
+
+    fc = FileContent(path, lazy=True, backup=False)
+    assert fc.write(skip_if_unchanged=True) is False
+    assert fc.loaded
+
+    renamed = FileContent(path, lazy=True, backup=False)
+    renamed.filename = "copy.md"
+    assert renamed.content == "same\n"
+    assert renamed.full_filename == str(tmp_path / "copy.md")
+    assert renamed.write(skip_if_unchanged=True) is True
+    assert (tmp_path / "copy.md").read_text(encoding="utf-8") == "same\n"
+
+
+def test_filecontent_raw_view_maps_the_file(tmp_path: Path) -> None:
+    path = tmp_path / "page.md"
+    path.write_bytes(b"# T\n<!-- var(a)=\"1\" -->\n")
+    fc = FileContent(path, lazy=True)
+
+    with fc.raw_view() as view:
+        assert view.find(b"<!--") == 4
+        assert view[:3] == b"# T"
+    assert not fc.loaded
+
+    path.write_bytes(b"")
+    with fc.raw_view() as view:
+        assert view == b""
+    with pytest.raises(ValueError, match="filename"):
+        with FileContent().raw_view():
+            pass
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pymdtools.filetools as filetools
+from pymdtools import common
+
+
+@pytest.fixture(autouse=True)
+def template_cache() -> Iterator[None]:
+    filetools.configure_template_cache(4)
+    filetools.clear_template_cache()
+    yield
+    filetools.configure_template_cache(0)
+    filetools.clear_template_cache()
+
+
+def _templates(root: Path) -> Path:
+    template_dir = root / "template"
+    (template_dir / "emails").mkdir(parents=True)
+    (template_dir / "a.txt").write_text("A", encoding="utf-8")
+    (template_dir / "emails" / "welcome.html").write_text("<p>hi</p>", encoding="utf-8")
+    (template_dir / "emails" / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\x00\x00")
+    return template_dir
+
+
+def test_template_cache_reads_and_checks_each_template_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _templates(tmp_path)
+    reads: list[str] = []
+    checks: list[str] = []
+    real_get = common.get_file_content
+    real_resolve = filetools._resolve_template_child
+
+    def spy_get(path: Any, *args: Any, **kwargs: Any) -> str:
+        reads.append(Path(path).name)
+        return real_get(path, *args, **kwargs)
+
+    def spy_resolve(template_dir: Path, relative: Path, *, name: str) -> Path:
+        checks.append(relative.as_posix())
+        return real_resolve(template_dir, relative, name=name)
+
+    monkeypatch.setattr(filetools.common, "get_file_content", spy_get)
+    monkeypatch.setattr(filetools, "_resolve_template_child", spy_resolve)
+
+    for _ in range(3):
+        assert filetools.get_template_file("a.txt", start_folder=tmp_path) == "A"
+
+    assert (reads, checks) == (["a.txt"], ["a.txt"])
+    assert filetools.template_cache_info() == filetools.TemplateCacheInfo(
+        hits=2, misses=1, currsize=1, maxsize=4
+    )
+
+
+def test_template_cache_reloads_changed_files(tmp_path: Path) -> None:
+    template_dir = _templates(tmp_path)
+    page = template_dir / "a.txt"
+    assert filetools.get_template_file("a.txt", start_folder=tmp_path) == "A"
+
+    page.write_text("AB", encoding="utf-8")
+    assert filetools.get_template_file("a.txt", start_folder=tmp_path) == "AB"
+
+    page.write_text("CD", encoding="utf-8")
+    os.utime(page, ns=(1, 1))
+    assert filetools.get_template_file("a.txt", start_folder=tmp_path) == "CD"
+
+    page.unlink()
+    with pytest.raises(FileNotFoundError):
+        filetools.get_template_file("a.txt", start_folder=tmp_path)
+    page.mkdir()
+    with pytest.raises(IsADirectoryError):
+        filetools.get_template_file("a.txt", start_folder=tmp_path)
+
+
+def test_template_cache_keeps_listings_until_the_folder_changes(tmp_path: Path) -> None:
+    template_dir = _templates(tmp_path)
+    expected = ["emails/logo.png", "emails/welcome.html"]
+
+    assert filetools.get_template_files_in_folder("emails", tmp_path) == expected
+    listed = filetools.get_template_files_in_folder("emails", tmp_path)
+    listed.append("mutated")
+    assert filetools.get_template_files_in_folder("emails", tmp_path) == expected
+    assert filetools.template_cache_info().hits == 2
+
+    (template_dir / "emails" / "bye.html").write_text("bye", encoding="utf-8")
+    os.utime(template_dir / "emails", ns=(2, 2))
+    assert filetools.get_template_files_in_folder("emails", tmp_path) == [
+        "emails/bye.html", *expected,
+    ]
+
+    (template_dir / "emails").rename(template_dir / "old")
+    with pytest.raises(FileNotFoundError):
+        filetools.get_template_files_in_folder("emails", tmp_path)
+
+
+def test_preload_templates_skips_binary_files_and_honours_the_bound(
+    tmp_path: Path,
+) -> None:
+    template_dir = _templates(tmp_path)
+    assert filetools.preload_templates(start_folder=tmp_path) == 2
+    assert filetools.template_cache_info().currsize == 2
+
+    for index in range(5):
+        (template_dir / f"t{index}.txt").write_text(str(index), encoding="utf-8")
+    assert filetools.preload_templates(".", tmp_path) == 7
+    assert filetools.template_cache_info().currsize == 4
+
+    filetools.configure_template_cache(1)
+    assert filetools.template_cache_info().currsize == 1
+    with pytest.raises(ValueError, match="maxsize"):
+        filetools.configure_template_cache(-1)
+
+    filetools.configure_template_cache(0)
+    with pytest.raises(ValueError, match="disabled"):
+        filetools.preload_templates(start_folder=tmp_path)
+    assert filetools.get_template_file("t1.txt", tmp_path) == "1"
+    assert filetools.get_template_files_in_folder("emails", tmp_path) == [
+        "emails/logo.png", "emails/welcome.html",
+    ]
+
+
+def test_template_cache_keys_relative_start_folders_by_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("one", "two"):
+        (tmp_path / name / "template").mkdir(parents=True)
+        (tmp_path / name / "template" / "a.txt").write_text(name, encoding="utf-8")
+
+    monkeypatch.chdir(tmp_path / "one")
+    assert filetools.get_template_file("a.txt", start_folder=".") == "one"
+    monkeypatch.chdir(tmp_path / "two")
+    assert filetools.get_template_file("a.txt", start_folder=".") == "two"
+
+    # Without a start folder the lookup is anchored next to the module.
+    with pytest.raises(FileNotFoundError):
+        filetools.get_template_file("a.txt")
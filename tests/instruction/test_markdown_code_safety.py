@@ -98,3 +98,45 @@ def test_include_resolution_rejects_result_outside_allowed_roots(
             search_folders=[allowed],
             include_cwd=False,
         )
+
+
+def test_include_file_search_resumes_after_protected_code_span(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+
+    def fake_include(name: str, **kwargs: object) -> str:
+        del kwargs
+        calls.append(name)
+        return "INCLUDED"
+
+    monkeypatch.setattr(instruction, "get_file_content_to_include", fake_include)
+    text = (
+        "Use `<!-- include-file(example.md)` in docs.\n"
+        "<!-- include-file(real.md) -->\n"
+    )
+
+    out = instruction.include_files_to_md_text(text, render_mode="raw")
+
+    assert calls == ["real.md"]
+    assert out == "Use `<!-- include-file(example.md)` in docs.\nINCLUDED\n"
+
+
+def test_text_helpers_share_one_precomputed_scan() -> None:
+    text = (
+        "# Title\n"
+        "<!-- var(name)=\"value\" -->\n"
+        "<!-- include-file(a.md) -->\n"
+        "<!-- begin-var(name) -->old<!-- end-var -->\n"
+        "`<!-- var(hidden)=\"x\" -->`\n"
+    )
+    scan = instruction.scan_markdown(text)
+
+    assert instruction.get_vars_from_md_text(text, scan=scan) == {"name": "value"}
+    assert instruction.get_include_file_list(text, scan=scan) == ["a.md"]
+    assert instruction.get_title_from_md_text(text, scan=scan) == "Title"
+    assert "begin-var(name) -->value<!--" in (
+        instruction.search_include_vars_to_md_text(text, scan=scan)
+    )
+    with pytest.raises(ValueError, match="different text"):
+        instruction.get_refs_from_md_text("other", scan=scan)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import pymdtools.instruction as instruction
+
+
+def _build_tree(root: Path) -> None:
+    files = {
+        "b.md": '<!-- begin-ref(b) -->B<!-- end-ref -->\n<!-- var(b)="B" -->\n',
+        "a.md": '<!-- begin-ref(a) -->A<!-- end-ref -->\n<!-- var(a)="A" -->\n',
+        "notes.txt": "<!-- begin-ref(txt) -->T<!-- end-ref -->\n",
+        "sub/c.md": '<!-- begin-ref(c) -->C<!-- end-ref -->\n<!-- var(c)="C" -->\n',
+        "sub/deeper/d.md": (
+            '<!-- begin-ref(d) -->D<!-- end-ref -->\n<!-- var(d)="D" -->\n'
+        ),
+    }
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+@pytest.mark.parametrize("depth", [-1, 0, 1])
+def test_parallel_directory_scan_matches_sequential(tmp_path: Path, depth: int) -> None:
+    _build_tree(tmp_path)
+
+    for func in (
+        instruction.get_refs_from_md_directory,
+        instruction.get_vars_from_md_directory,
+    ):
+        sequential = func(tmp_path, depth=depth)
+        parallel = func(tmp_path, depth=depth, max_workers=4)
+        assert parallel == sequential
+        assert list(parallel) == list(sequential)
+
+    assert "txt" not in instruction.get_refs_from_md_directory(tmp_path)
+
+
+def test_parallel_directory_scan_raises_the_sequential_error(tmp_path: Path) -> None:
+    _build_tree(tmp_path)
+    (tmp_path / "sub" / "dup.md").write_text(
+        '<!-- begin-ref(a) -->again<!-- end-ref -->\n<!-- var(a)="again" -->\n',
+        encoding="utf-8",
+    )
+    (tmp_path / "sub" / "deeper" / "broken.md").write_text(
+        "<!-- begin-ref(x) -->X\n", encoding="utf-8"
+    )
+
+    with pytest.raises(ValueError, match=r"duplicate begin-ref\(a\)"):
+        instruction.get_refs_from_md_directory(tmp_path, max_workers=3)
+    with pytest.raises(ValueError, match=r"duplicate var\(a\)"):
+        instruction.get_vars_from_md_directory(tmp_path, max_workers=3)
+    with pytest.raises(ValueError, match="without end-ref"):
+        instruction.get_refs_from_md_directory(
+            tmp_path / "sub" / "deeper", max_workers=3
+        )
+
+
+def test_large_directory_scans_use_a_process_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _build_tree(tmp_path)
+    monkeypatch.setattr(instruction, "_PROCESS_POOL_MIN_BYTES", 0)
+
+    refs = instruction.get_refs_from_md_directory(
+        tmp_path, previous_refs={"z": "Z"}, max_workers=2
+    )
+
+    assert refs == {"z": "Z", "a": "A", "b": "B", "c": "C", "d": "D"}
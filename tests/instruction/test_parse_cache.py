@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import pymdtools.instruction as instruction
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_parse_cache_skips_unchanged_files(tmp_path: Path) -> None:
+    _write(tmp_path / "docs" / "a.md", "<!-- begin-ref(a) -->A<!-- end-ref -->\n")
+    _write(tmp_path / "docs" / "b.md", '<!-- var(b)="B\\n" -->\n')
+    db = tmp_path / "cache.sqlite"
+
+    with instruction.ParseCache(db) as cache:
+        first_refs = instruction.get_refs_from_md_directory(tmp_path, cache=cache)
+        first_vars = instruction.get_vars_from_md_directory(tmp_path, cache=cache)
+        assert (cache.hits, cache.misses) == (0, 4)
+
+    with instruction.ParseCache(db) as cache:
+        assert instruction.get_refs_from_md_directory(tmp_path, cache=cache) == first_refs
+        assert instruction.get_vars_from_md_directory(tmp_path, cache=cache) == first_vars
+        assert (cache.hits, cache.misses) == (4, 0)
+
+    assert first_refs == {"a": "A"}
+    assert first_vars == {"b": "B\n"}
+
+
+def test_parse_cache_detects_changes_and_invalidation(tmp_path: Path) -> None:
+    page = _write(tmp_path / "page.md", '<!-- var(x)="1" -->\n')
+    cache = instruction.ParseCache(":memory:")
+
+    assert instruction.get_vars_from_md_file(page, cache=cache) == {"x": "1"}
+    _write(page, '<!-- var(x)="22" -->\n')
+    assert instruction.get_vars_from_md_file(page, cache=cache) == {"x": "22"}
+    assert instruction.get_vars_from_md_file(page, cache=cache) == {"x": "22"}
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    assert cache.invalidate(page) == 1
+    assert cache.invalidate(page) == 0
+    assert instruction.get_vars_from_md_file(page, cache=cache) == {"x": "22"}
+    assert cache.misses == 3
+
+    assert cache.clear() == 1
+    assert (cache.hits, cache.misses) == (0, 0)
+    cache.close()
+
+
+def _supports_symlinks(tmp_path: Path) -> bool:
+    """
+    Detect whether the current environment supports creating symlinks.
+
+    On Windows this may require admin rights or Developer Mode.
+    """
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    target.write_text("x", encoding="utf-8")
+
+    try:
+        link.symlink_to(target)
+        ok = link.is_symlink()
+    except (OSError, NotImplementedError):
+        ok = False
+    finally:
+        try:
+            if link.exists() or link.is_symlink():
+                link.unlink()
+        except OSError:
+            pass
+        target.unlink()
+
+    return ok
+
+
+def test_parse_cache_invalidates_through_a_symlink(tmp_path: Path) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("symlinks are not supported here")
+    page = _write(tmp_path / "docs" / "page.md", '<!-- var(x)="1" -->\n')
+    alias = tmp_path / "alias.md"
+    alias.symlink_to(page)
+    cache = instruction.ParseCache(":memory:")
+
+    assert instruction.get_vars_from_md_file(alias, cache=cache) == {"x": "1"}
+    assert instruction.get_vars_from_md_file(page, cache=cache) == {"x": "1"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert cache.invalidate(alias) == 1
+    assert instruction.get_vars_from_md_file(page, cache=cache) == {"x": "1"}
+    assert cache.misses == 2
+    assert cache.invalidate(tmp_path / "docs" / ".." / "alias.md") == 1
+    cache.close()
+
+
+def test_parse_cache_keeps_duplicate_errors(tmp_path: Path) -> None:
+    page = _write(tmp_path / "page.md", "<!-- begin-ref(a) -->A<!-- end-ref -->\n")
+    broken = _write(tmp_path / "broken.md", "<!-- begin-ref(b) -->B\n")
+    cache = instruction.ParseCache(":memory:")
+    instruction.get_refs_from_md_file(page, cache=cache)
+
+    with pytest.raises(ValueError, match=r"duplicate begin-ref\(a\)"):
+        instruction.get_refs_from_md_file(page, previous_refs={"a": "x"}, cache=cache)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="without end-ref"):
+            instruction.get_refs_from_md_file(broken, cache=cache)
+
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_parse_cache_resets_outdated_schema(tmp_path: Path) -> None:
+    db = tmp_path / "cache.sqlite"
+    with sqlite3.connect(db) as connection:
+        connection.execute("CREATE TABLE entries (path TEXT)")
+        connection.execute("INSERT INTO entries VALUES ('old')")
+    connection.close()
+    page = _write(tmp_path / "page.md", "<!-- begin-ref(a) -->A<!-- end-ref -->\n")
+
+    with instruction.ParseCache(db) as cache:
+        assert cache.path == str(db)
+        assert instruction.get_refs_from_md_file(page, cache=cache) == {"a": "A"}
+        assert cache.clear() == 1
+
+
+def test_search_include_helpers_accept_a_parse_cache(tmp_path: Path) -> None:
+    _write(tmp_path / "refs.md", "<!-- begin-ref(r) -->R<!-- end-ref -->\n")
+    page = _write(
+        tmp_path / "page.md",
+        '<!-- var(v)="V" -->\n'
+        "<!-- begin-include(r) --><!-- end-include -->\n"
+        "<!-- begin-var(v) --><!-- end-var -->\n",
+    )
+    cache = instruction.ParseCache(":memory:")
+
+    instruction.search_include_refs_to_md_file(
+        page, backup_option=False, depth_up=0, cache=cache
+    )
+    instruction.search_include_vars_to_md_file(
+        page, backup_option=False, depth_up=0, cache=cache
+    )
+    refs = instruction.get_refs_from_search_folders([tmp_path], cache=cache)
+
+    assert page.read_text(encoding="utf-8") == (
+        '<!-- var(v)="V" -->\n'
+        "<!-- begin-include(r) -->R<!-- end-include -->\n"
+        "<!-- begin-var(v) -->V<!-- end-var -->\n"
+    )
+    assert refs == {"r": "R"}
+    assert cache.hits == 1
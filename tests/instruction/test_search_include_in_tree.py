@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+import pymdtools.instruction as instruction
+
+
+def _build_tree(root: Path) -> None:
+    files = {
+        "index.md": (
+            "<!-- begin-ref(nav) -->NAV <!-- begin-include(footer) -->"
+            "<!-- end-include --><!-- end-ref -->\n"
+            "<!-- begin-include(nav) --><!-- end-include -->\n"
+        ),
+        "a/page.md": (
+            '<!-- var(title)="A" -->\n'
+            "<!-- begin-include(nav) --><!-- end-include -->\n"
+            "<!-- begin-var(title) --><!-- end-var -->\n"
+        ),
+        "a/deep/leaf.md": (
+            '<!-- var(leaf)="L" -->\n'
+            "<!-- begin-var(leaf) --><!-- end-var -->\n"
+        ),
+        "z/footer.md": "<!-- begin-ref(footer) -->FOOT<!-- end-ref -->\n",
+        "z/notes.txt": "<!-- begin-ref(ignored) -->x<!-- end-ref -->\n",
+    }
+    for name, text in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+
+def _snapshot(root: Path) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def _supports_symlinks(tmp_path: Path) -> bool:
+    """
+    Detect whether the current environment supports creating symlinks.
+
+    On Windows this may require admin rights or Developer Mode.
+    """
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    target.write_text("x", encoding="utf-8")
+
+    try:
+        link.symlink_to(target)
+        ok = link.is_symlink()
+    except (OSError, NotImplementedError):
+        ok = False
+    finally:
+        try:
+            if link.exists() or link.is_symlink():
+                link.unlink()
+        except OSError:
+            pass
+        target.unlink()
+
+    return ok
+
+
+def _outcome(func: Callable[[], object]) -> str | None:
+    try:
+        func()
+    except (KeyError, ValueError) as exc:
+        return repr(exc)
+    return None
+
+
+@pytest.mark.parametrize("kind", ["refs", "vars"])
+@pytest.mark.parametrize(
+    ("depth_up", "depth_down"), [(0, -1), (0, 0), (1, -1), (1, 1), (2, 1), (3, 0)]
+)
+def test_tree_run_matches_the_per_file_loop(
+    tmp_path: Path, kind: str, depth_up: int, depth_down: int
+) -> None:
+    batch = tmp_path / "batch" / "x" / "docs"
+    loop = tmp_path / "loop" / "x" / "docs"
+    _build_tree(batch)
+    shutil.copytree(batch, loop)
+    if kind == "refs":
+        tree_func = instruction.search_include_refs_in_tree
+        file_func = instruction.search_include_refs_to_md_file
+    else:
+        tree_func = instruction.search_include_vars_in_tree
+        file_func = instruction.search_include_vars_to_md_file
+    order = instruction._DirectiveTree(kind, ".md").files(str(loop), -1)  # type: ignore[arg-type]
+
+    def per_file_loop() -> None:
+        for filename in order:
+            file_func(
+                filename,
+                backup_option=False,
+                depth_up=depth_up,
+                depth_down=depth_down,
+            )
+
+    batch_outcome = _outcome(
+        lambda: tree_func(
+            batch,
+            backup_option=False,
+            depth_up=depth_up,
+            depth_down=depth_down,
+            max_workers=4,
+        )
+    )
+
+    assert batch_outcome == _outcome(per_file_loop)
+    assert _snapshot(batch) == _snapshot(loop)
+
+
+def test_tree_run_propagates_rewritten_refs_to_later_files(tmp_path: Path) -> None:
+    _build_tree(tmp_path / "docs")
+
+    processed = instruction.search_include_refs_in_tree(
+        tmp_path / "docs", backup_option=False
+    )
+
+    assert [
+        Path(name).relative_to(tmp_path / "docs").as_posix() for name in processed
+    ] == ["index.md", "a/page.md", "a/deep/leaf.md", "z/footer.md"]
+    assert "NAV <!-- begin-include(footer) -->FOOT" in (
+        tmp_path / "docs" / "a" / "page.md"
+    ).read_text(encoding="utf-8")
+
+
+def test_tree_run_stops_at_the_first_failing_file(tmp_path: Path) -> None:
+    (tmp_path / "a.md").write_text(
+        "<!-- begin-include(x) --><!-- end-include -->\n", encoding="utf-8"
+    )
+    (tmp_path / "b.md").write_text(
+        "<!-- begin-ref(x) -->X<!-- end-ref -->\n<!-- begin-ref(y) -->\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="without end-ref"):
+        instruction.search_include_refs_in_tree(tmp_path, depth_up=0)
+    with pytest.raises(ValueError, match=r"depth_up must be >= 0"):
+        instruction.search_include_vars_in_tree(tmp_path, depth_up=-1)
+
+    assert not list(tmp_path.glob("*.bak"))
+
+
+def test_tree_run_reports_duplicates_and_reads_with_encoding(tmp_path: Path) -> None:
+    (tmp_path / "a.md").write_text('<!-- var(v)="1" -->\n', encoding="utf-8")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.md").write_text(
+        '<!-- var(w)="é" -->\n<!-- begin-var(w) --><!-- end-var -->\n',
+        encoding="utf-8",
+    )
+
+    processed = instruction.search_include_vars_in_tree(
+        tmp_path / "sub", backup_option=True, depth_up=0, encoding="utf-8"
+    )
+    (tmp_path / "sub" / "c.md").write_text('<!-- var(w)="2" -->\n', encoding="utf-8")
+
+    assert len(processed) == 1
+    assert (tmp_path / "sub" / "b.md").read_text(encoding="utf-8").endswith(
+        "<!-- begin-var(w) -->é<!-- end-var -->\n"
+    )
+    assert len(list((tmp_path / "sub").glob("*.bak"))) == 1
+    with pytest.raises(ValueError, match=r"duplicate var\(w\)"):
+        instruction.search_include_vars_in_tree(tmp_path, depth_up=0)
+
+
+def test_tree_run_reads_a_symlinked_folder_once(tmp_path: Path) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    for name in ("batch", "loop"):
+        docs = tmp_path / name / "docs"
+        (docs / "real").mkdir(parents=True)
+        (docs / "real" / "refs.md").write_text(
+            "<!-- begin-ref(r1) -->R<!-- end-ref -->\n"
+            "<!-- begin-include(r1) --><!-- end-include -->\n",
+            encoding="utf-8",
+        )
+        (docs / "alias").symlink_to(docs / "real", target_is_directory=True)
+
+    instruction.search_include_refs_to_md_file(
+        tmp_path / "loop" / "docs" / "real" / "refs.md", backup_option=False
+    )
+    processed = instruction.search_include_refs_in_tree(
+        tmp_path / "batch" / "docs", backup_option=False
+    )
+
+    assert len(processed) == 1
+    assert _snapshot(tmp_path / "batch") == _snapshot(tmp_path / "loop")
+
+
+def test_tree_run_releases_texts_once_files_are_rewritten(tmp_path: Path) -> None:
+    _build_tree(tmp_path / "docs")
+    (tmp_path / "outside.md").write_text(
+        "<!-- begin-ref(out) -->O<!-- end-ref -->\n", encoding="utf-8"
+    )
+    tree = instruction._DirectiveTree("refs", ".md")
+    kept: list[int] = []
+    real_take_text = tree.take_text
+
+    def take_text(filename: str) -> str:
+        kept.append(len(tree._texts))
+        return real_take_text(filename)
+
+    tree.take_text = take_text  # type: ignore[method-assign]
+    processed, rewritten = instruction._search_include_in_tree(
+        tree,
+        tmp_path / "docs",
+        depth_up=1,
+        depth_down=-1,
+        backup_option=False,
+        backup_ext=".bak",
+        max_workers=None,
+        skip_if_unchanged=False,
+    )
+
+    # Only the files still waiting to be rewritten keep their text.
+    assert kept == [4, 3, 2, 1]
+    assert len(processed) == 4
+    assert rewritten == processed
+    assert tree._texts == {}
+
+
+def test_tree_run_keeps_the_text_of_a_file_failing_outside_its_scope(
+    tmp_path: Path,
+) -> None:
+    for name in ("batch", "loop"):
+        (tmp_path / name / "sub").mkdir(parents=True)
+        (tmp_path / name / "sub" / "bad.md").write_text(
+            "<!-- begin-ref(y) -->\n", encoding="utf-8"
+        )
+
+    def per_file() -> None:
+        instruction.search_include_refs_to_md_file(
+            tmp_path / "loop" / "sub" / "bad.md",
+            backup_option=False,
+            depth_up=1,
+            depth_down=0,
+        )
+
+    tree = instruction._DirectiveTree("refs", ".md")
+    processed, rewritten = instruction._search_include_in_tree(
+        tree,
+        tmp_path / "batch",
+        depth_up=1,
+        depth_down=0,
+        backup_option=False,
+        backup_ext=".bak",
+        max_workers=None,
+        skip_if_unchanged=False,
+    )
+
+    assert _outcome(per_file) is None
+    assert len(processed) == 1
+    assert rewritten == processed
+    assert list(tree._texts) == processed
+    assert _snapshot(tmp_path / "batch") == _snapshot(tmp_path / "loop")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pymdtools.instruction as instruction
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    return path
+
+
+def _backups(root: Path) -> list[Path]:
+    return sorted(root.rglob("*.bak"))
+
+
+def test_in_place_helpers_skip_unchanged_files(tmp_path: Path) -> None:
+    docs = tmp_path / "docs"
+    page = _write(
+        docs / "page.md",
+        "<!-- begin-include(a) -->A<!-- end-include -->\n"
+        "<!-- begin-var(v) -->V<!-- end-var -->\n"
+        "<!-- include-file(part.md)\n",
+    )
+    _write(docs / "refs.md", "<!-- begin-ref(a) -->A<!-- end-ref -->\n")
+    _write(docs / "vars.md", '<!-- var(v)="V" -->\n')
+
+    changed = [
+        instruction.include_refs_to_md_file(
+            page, {"a": "A"}, skip_if_unchanged=True, return_changed=True
+        ),
+        instruction.include_vars_to_md_file(
+            page, {"v": "V"}, skip_if_unchanged=True, return_changed=True
+        ),
+        instruction.search_include_refs_to_md_file(
+            page, skip_if_unchanged=True, return_changed=True
+        ),
+        instruction.search_include_vars_to_md_file(
+            page, skip_if_unchanged=True, return_changed=True
+        ),
+        instruction.include_files_to_md_file(
+            page, skip_if_unchanged=True, return_changed=True
+        ),
+    ]
+
+    assert changed == [False] * 5
+    assert page.stat().st_mtime_ns == 1
+    assert _backups(tmp_path) == []
+    assert instruction.include_refs_to_md_file(
+        page, {"a": "A"}, skip_if_unchanged=True
+    ) == str(page)
+
+    assert instruction.include_refs_to_md_file(
+        page, {"a": "B"}, skip_if_unchanged=True, return_changed=True
+    )
+    assert "<!-- begin-include(a) -->B<!-- end-include -->" in page.read_text(
+        encoding="utf-8"
+    )
+    assert len(_backups(tmp_path)) == 1
+    # Without skip_if_unchanged every file is written.
+    assert instruction.include_files_to_md_file(
+        page, backup_option=False, return_changed=True
+    )
+
+
+@pytest.mark.parametrize(
+    "run", [instruction.search_include_refs_in_tree, instruction.search_include_vars_in_tree]
+)
+def test_tree_runs_skip_unchanged_files(tmp_path: Path, run: Any) -> None:
+    docs = tmp_path / "docs"
+    stale = _write(
+        docs / "a.md",
+        '<!-- var(v)="V" -->\n<!-- begin-ref(r) -->R<!-- end-ref -->\n'
+        "<!-- begin-include(r) -->old<!-- end-include -->\n"
+        "<!-- begin-var(v) -->old<!-- end-var -->\n",
+    )
+    fresh = _write(docs / "b.md", "nothing to do\n")
+
+    processed, rewritten = run(docs, skip_if_unchanged=True, return_changed=True)
+
+    assert sorted(processed) == [str(stale), str(fresh)]
+    assert rewritten == [str(stale)]
+    assert stale.stat().st_mtime_ns != 1
+    assert fresh.stat().st_mtime_ns == 1
+    assert [p.name.split(".")[0] for p in _backups(docs)] == ["a"]
+    assert run(docs, skip_if_unchanged=True) == processed
@@ -30,3 +30,15 @@ def test_strip_xml_comment_empty_string():
 def test_strip_xml_comment_raises_on_non_string():
     with pytest.raises(TypeError):
         strip_xml_comment(None)  # type: ignore[arg-type]
+
+
+def test_strip_xml_comment_removes_what_document_scan_protects():
+    from pymdtools.mdcommon import DocumentScan
+
+    text = "a <!-- c1 --> b <!--\nc2 --> c <!-- open"
+    spans = DocumentScan(text).comment_spans
+    kept = "".join(
+        text[start:end]
+        for start, end in zip([0] + [e for _, e in spans], [s for s, _ in spans] + [len(text)])
+    )
+    assert strip_xml_comment(text) == kept
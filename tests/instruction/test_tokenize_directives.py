@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+import pymdtools.instruction as instruction
+from pymdtools.mdcommon import DocumentScan
+
+
+def test_tokenize_directives_classifies_in_document_order() -> None:
+    text = (
+        "<!-- var(a)=\"1\" -->\n"
+        "`<!-- var(hidden)=\"x\" -->`\n"
+        "<!-- begin-ref(r) -->R<!-- end-ref -->\n"
+        "<!-- begin-include(r) --><!-- end-include -->\n"
+        "<!-- begin-var(a) --><!-- end-var -->\n"
+        "<!-- include-file(f.md) -->\n"
+        "<!-- varnish -->\n"
+    )
+
+    tokens = instruction.tokenize_directives(text)
+
+    assert [(token.kind, token.name) for token in tokens] == [
+        ("var", "a"),
+        ("begin-ref", "r"),
+        ("end-ref", None),
+        ("begin-include", "r"),
+        ("end-include", None),
+        ("begin-var", "a"),
+        ("end-var", None),
+        ("include-file", "f.md"),
+    ]
+    assert text[tokens[0].start:tokens[0].end] == "<!-- var(a)=\"1\" -->"
+    assert instruction.tokenize_directives(text) == tokens
+
+
+def test_tokenize_directives_skips_directives_nested_in_the_same_kind() -> None:
+    text = "<!-- include-file(a.md) <!-- include-file(b.md) --> <!-- end-ref -->"
+
+    tokens = instruction.tokenize_directives(text)
+
+    assert [(token.kind, token.name) for token in tokens] == [
+        ("include-file", "a.md"),
+        ("end-ref", None),
+    ]
+
+
+def test_string_patterns_are_compiled_once() -> None:
+    pattern = r"<!--\s*use\((?P<name>[a-z.]+)\)\s*-->"
+
+    assert instruction._compile_pattern(pattern) is instruction._compile_pattern(
+        pattern
+    )
+    assert instruction.get_include_file_list(
+        "<!-- use(a.md) --> <!-- include-file(b.md) -->",
+        include_file_re=pattern,
+    ) == ["a.md"]
+
+
+_FUZZ_TOKENS = (
+    "<!-- var(a)=\"1\" -->", "<!-- var(b)='<!-- var(c)=\"2\" -->' -->",
+    "<!-- begin-ref(r) -->", "<!-- end-ref -->", "<!-- begin-include(r) -->",
+    "<!-- end-include -->", "<!-- begin-var(a) -->", "<!-- end-var -->",
+    "<!-- include-file(x.md)", "<!-- include-file(y.md) -->", "-->", "<!--",
+    "<!-- var(", "`", "```\n", "    ", "\n", "text", " ",
+)
+
+
+def _span(match: re.Match[str] | None) -> tuple[int, int] | None:
+    return None if match is None else match.span()
+
+
+def test_directive_lexer_matches_per_pattern_scans_on_fuzzed_corpus() -> None:
+    rng = random.Random(20260301)
+    for _ in range(600):
+        text = "".join(rng.choice(_FUZZ_TOKENS) for _ in range(rng.randint(0, 30)))
+        scan = DocumentScan(text)
+        for pattern in instruction._DIRECTIVE_KINDS:
+            lexed = instruction._directive_matches(scan, pattern)
+            assert [_span(m) for m in lexed] == [
+                _span(m) for m in scan.matches(pattern)
+            ], repr(text)
+            for pos in range(0, len(text) + 1, 5):
+                assert _span(instruction._directive_search(scan, pattern, pos)) == (
+                    _span(scan.search(pattern, pos))
+                ), (repr(text), pos)
+
+
+def test_tokenize_directives_rejects_non_str() -> None:
+    with pytest.raises(TypeError):
+        instruction.tokenize_directives(None)  # type: ignore[arg-type]
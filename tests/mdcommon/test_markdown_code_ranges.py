@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import random
+import re
+
+import pytest
+
+import pymdtools.mdcommon as mdcommon
+
+
+def _legacy_markdown_code_ranges(text: str) -> list[tuple[int, int]]:
+    """Multi-pass implementation kept as the reference for differential tests."""
+    ranges: list[tuple[int, int]] = []
+    fenced_ranges: list[tuple[int, int]] = []
+    offset = 0
+    fence_start: int | None = None
+    fence_char = ""
+    fence_length = 0
+
+    for line in text.splitlines(keepends=True):
+        if fence_start is None:
+            opener = re.match(r" {0,3}(`{3,}|~{3,})(.*?)(?:\r?\n)?$", line)
+            if opener and not (
+                opener.group(1).startswith("`") and "`" in opener.group(2)
+            ):
+                fence_start = offset
+                fence_char = opener.group(1)[0]
+                fence_length = len(opener.group(1))
+        else:
+            closer = re.match(
+                rf" {{0,3}}{re.escape(fence_char)}{{{fence_length},}}[ \t]*(?:\r?\n)?$",
+                line,
+            )
+            if closer:
+                fenced_ranges.append((fence_start, offset + len(line)))
+                fence_start = None
+                fence_char = ""
+                fence_length = 0
+        offset += len(line)
+
+    if fence_start is not None:
+        fenced_ranges.append((fence_start, len(text)))
+
+    indented_ranges = [
+        match.span()
+        for match in re.finditer(
+            r"(?m)^(?: {4}|\t)[^\r\n]*(?:\r?\n|$)"
+            r"(?:^[ \t]*(?:\r?\n|$)|^(?: {4}|\t)[^\r\n]*(?:\r?\n|$))*",
+            text,
+        )
+    ]
+    block_ranges = mdcommon.merge_ranges([*fenced_ranges, *indented_ranges])
+    ranges.extend(block_ranges)
+
+    def in_block_range(index: int) -> tuple[int, int] | None:
+        for start, end in block_ranges:
+            if start <= index < end:
+                return start, end
+            if index < start:
+                break
+        return None
+
+    index = 0
+    while index < len(text):
+        code_block = in_block_range(index)
+        if code_block is not None:
+            index = code_block[1]
+            continue
+        escape_start = index
+        while escape_start > 0 and text[escape_start - 1] == "\\":
+            escape_start -= 1
+        is_escaped = (index - escape_start) % 2 == 1
+        if text[index] != "`" or is_escaped:
+            index += 1
+            continue
+
+        opener_end = index + 1
+        while opener_end < len(text) and text[opener_end] == "`":
+            opener_end += 1
+        delimiter_length = opener_end - index
+        search_at = opener_end
+        closing_end: int | None = None
+        while search_at < len(text):
+            next_tick = text.find("`", search_at)
+            if next_tick < 0:
+                break
+            code_block = in_block_range(next_tick)
+            if code_block is not None:
+                search_at = code_block[1]
+                continue
+            run_end = next_tick + 1
+            while run_end < len(text) and text[run_end] == "`":
+                run_end += 1
+            if run_end - next_tick == delimiter_length:
+                closing_end = run_end
+                break
+            search_at = run_end
+
+        if closing_end is None:
+            index = opener_end
+            continue
+        ranges.append((index, closing_end))
+        index = closing_end
+
+    return mdcommon.merge_ranges(ranges)
+
+
+_FUZZ_TOKENS = (
+    "`", "``", "```", "````", "~~~", "~~~~", " ", "   ", "    ", "\t",
+    "\n", "\n", "\r\n", "\r", "\\", "\\\\", "a", "text", "python",
+    "<!-- var(a)=\"b\" -->", "\x0c", " ",
+)
+
+
+def _fuzz_corpus(count: int, *, seed: int = 20260217) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(_FUZZ_TOKENS) for _ in range(rng.randint(0, 60)))
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "plain text\n",
+        "```\ncode\n```\nafter `x`\n",
+        "~~~~\n~~~\n~~~~\n",
+        "``` info `tick`\nnot a fence `a`\n",
+        "   ```\nfence\n   ```   \n",
+        "```\r\ncode\r\n```\r\n",
+        "```\runclosed\r```\r",
+        "    code\n\n\n    more\nplain\n",
+        "    code\r\n  \r\n\tmore\r\n",
+        "    a\rb\n    c\n",
+        "    last\r",
+        "    x\n  \r",
+        "\\`not code` but `code`",
+        "\\``double``",
+        "`a\x0c```\nb`",
+        "```      x\n```\n",
+    ],
+)
+def test_markdown_code_ranges_matches_legacy_on_edge_cases(text: str) -> None:
+    assert mdcommon.markdown_code_ranges(text) == _legacy_markdown_code_ranges(text)
+
+
+def test_markdown_code_ranges_matches_legacy_on_fuzzed_corpus() -> None:
+    for text in _fuzz_corpus(3000):
+        assert mdcommon.markdown_code_ranges(text) == _legacy_markdown_code_ranges(
+            text
+        ), repr(text)
+
+
+def test_markdown_code_ranges_scales_with_many_blocks_and_spans() -> None:
+    chunk = "    code\nplain `x`\n"
+    text = chunk * 20_000
+
+    ranges = mdcommon.markdown_code_ranges(text)
+
+    assert len(ranges) == 40_000
+    assert ranges[:2] == [(0, 9), (15, 18)]
+    assert ranges[-1] == (len(text) - 4, len(text) - 1)
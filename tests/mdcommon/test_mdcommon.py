@@ -117,6 +117,70 @@ def test_markdown_code_range_edge_cases() -> None:
     assert not mdcommon.position_in_ranges(0, [(2, 3)])
 
 
+def test_code_range_index_answers_membership_and_skip_queries() -> None:
+    index = mdcommon.CodeRangeIndex([(10, 12), (2, 5), (4, 7), (7, 8)])
+
+    assert index.ranges == [(2, 8), (10, 12)]
+    assert len(index) == 2
+    assert [offset for offset in range(14) if index.contains(offset)] == [
+        2, 3, 4, 5, 6, 7, 10, 11,
+    ]
+    assert index.next_unprotected(0) == 0
+    assert index.next_unprotected(2) == 8
+    assert index.next_unprotected(7) == 8
+    assert index.next_unprotected(8) == 8
+    assert index.next_unprotected(11) == 12
+    assert index.next_unprotected(40) == 40
+
+    empty = mdcommon.CodeRangeIndex()
+    assert len(empty) == 0
+    assert not empty.contains(0)
+    assert empty.next_unprotected(3) == 3
+
+
+def test_code_range_index_from_text_matches_markdown_code_ranges() -> None:
+    text = "a `b` c\n```\nfenced\n```\n    indented\n``x`` end\n"
+
+    index = mdcommon.CodeRangeIndex.from_text(text)
+
+    assert index.ranges == mdcommon.markdown_code_ranges(text)
+    for offset in range(len(text) + 1):
+        assert index.contains(offset) == mdcommon.position_in_ranges(
+            offset, index.ranges
+        )
+
+
+def test_scan_markdown_memoizes_and_checks_explicit_scans() -> None:
+    text = "[A](a.md)\n`[B](b.md)`\n<!-- c -->\n[C][c]\n\n[c]: c.md\n"
+
+    scan = mdcommon.scan_markdown(text)
+
+    assert mdcommon.scan_markdown(text) is scan
+    assert mdcommon.scan_markdown(text, scan) is scan
+    assert scan.comment_spans == [(22, 32)]
+    assert scan.protected_ranges.ranges == [(10, 21), (22, 32)]
+    assert [m.group("name") for m in scan.inline_links] == ["A"]
+    assert scan.inline_links is scan.matches(mdcommon._INLINE_LINK_RE)
+    assert [m.group("id_link") for m in scan.reference_definitions] == ["c"]
+    assert scan.line_number(0) == 1
+    assert scan.line_number(len(text)) == 7
+    with pytest.raises(ValueError, match="different text"):
+        mdcommon.scan_markdown(text + "x", scan)
+
+
+def test_link_helpers_accept_a_precomputed_scan() -> None:
+    text = "[A](a.md)\n`[A](a.md)`\n"
+    scan = mdcommon.DocumentScan(text)
+
+    links = mdcommon.search_link_in_md_text(text, scan=scan)
+    updated = mdcommon.update_link_in_md_text(
+        text, "A", {"name": "B", "url": "b.md"}, scan=scan
+    )
+
+    assert links == [{"name": "A", "url": "a.md", "title": None, "line": 1}]
+    assert updated == "[B](b.md)\n`[A](a.md)`\n"
+
+
 def test_apply_replacements_skips_overlapping_source_ranges() -> None:
     assert mdcommon._apply_replacements(
         "abcd",
@@ -14,6 +14,11 @@ def test_markdown_content_reads_existing_file_with_default_encoding(tmp_path: Pa
     assert content.content == "# Titre\n\nEte\n"
     assert content.title == "Titre"
 
+    lazy = mdfile.MarkdownContent(source, lazy=True)
+    assert not lazy.loaded
+    assert lazy.title == "Titre"
+    assert lazy.loaded
+
 
 def test_markdown_content_empty_buffer_behaves_like_empty_text() -> None:
     content = mdfile.MarkdownContent()
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import io
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pymdtools.mdtopdf as mdtopdf
+from pymdtools.mdtopdf import BuildCache
+
+PdfWriter = mdtopdf.PdfWriter
+
+
+def _pdf_bytes(pages: int = 1) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    stream = io.BytesIO()
+    writer.write(stream)
+    return stream.getvalue()
+
+
+@pytest.fixture
+def renders(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> list[str]:
+    """Fake the wkhtmltopdf pipe and record every page it renders."""
+    calls: list[str] = []
+
+    def fake_from_string(html: str, output_path: Any, **kwargs: Any) -> bytes:
+        calls.append(html)
+        return _pdf_bytes()
+
+    monkeypatch.setattr(mdtopdf, "find_wk_html_to_pdf", lambda: tmp_path / "wk")
+    monkeypatch.setattr(mdtopdf, "_wkhtmltopdf_version", lambda: "wkhtmltopdf 0.12.6")
+    monkeypatch.setattr(mdtopdf.pdfkit, "configuration", lambda wkhtmltopdf: object())
+    monkeypatch.setattr(mdtopdf.pdfkit, "from_string", fake_from_string)
+    return calls
+
+
+def _misses(caplog: pytest.LogCaptureFixture) -> list[str]:
+    return [
+        record.getMessage().split(": ", 1)[1]
+        for record in caplog.records
+        if record.getMessage().startswith("Build cache miss")
+    ]
+
+
+def test_build_cache_reuses_pdfs_and_logs_why_each_miss_happened(
+    tmp_path: Path, renders: list[str], caplog: pytest.LogCaptureFixture
+) -> None:
+    caplog.set_level(logging.INFO)
+    source = tmp_path / "doc.md"
+    source.write_text("# Doc\n", encoding="utf-8")
+    (tmp_path / "mark.pdf").write_bytes(_pdf_bytes())
+    pdf = tmp_path / "doc.pdf"
+
+    def convert(**kwargs: Any) -> Path:
+        return mdtopdf.convert_md_to_pdf(source, streaming=True, path=tmp_path, **kwargs)
+
+    with BuildCache(tmp_path / "cache") as cache:
+        assert convert() == pdf
+        pdf.unlink()
+        assert convert() == pdf
+        assert len(renders) == 1
+        entry = next((tmp_path / "cache" / "objects").rglob("*.pdf"))
+        assert os.stat(entry).st_ino == os.stat(pdf).st_ino
+
+        source.write_text("# Changed\n", encoding="utf-8")
+        convert()
+        convert(metadata={"author": "Ada"})
+        convert(metadata={"author": "Ada"}, watermark_pdf="mark.pdf")
+        (tmp_path / "mark.pdf").write_bytes(_pdf_bytes(pages=2))
+        convert(metadata={"author": "Ada"}, watermark_pdf="mark.pdf")
+        convert(metadata={"author": "Ada"}, watermark_pdf="mark.pdf")
+        for entry in (tmp_path / "cache" / "objects").rglob("*.pdf"):
+            entry.unlink()
+        convert(metadata={"author": "Ada"}, watermark_pdf="mark.pdf")
+
+    assert (cache.hits, cache.misses) == (2, 6)
+    assert len(renders) == 6
+    assert _misses(caplog) == [
+        "no previous build",
+        "markdown changed",
+        "features changed",
+        "features changed",
+        "features changed",
+        "entry evicted",
+    ]
+    assert mdtopdf._build_caches.get() is None
+
+
+def test_build_cache_serves_html_pages_and_republishes_assets(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    caplog.set_level(logging.INFO)
+    source = tmp_path / "page.md"
+    source.write_text("# Page\n", encoding="utf-8")
+    out = tmp_path / "out"
+    out.mkdir()
+
+    with BuildCache(tmp_path / "cache") as cache:
+        html = mdtopdf.convert_md_to_html(source, path_dest=out)
+        expected = html.read_text(encoding="utf-8")
+        for path in sorted(out.rglob("*"), reverse=True):
+            path.rmdir() if path.is_dir() else path.unlink()
+
+        assert mdtopdf.convert_md_to_html(source, path_dest=out) == html
+        assert html.read_text(encoding="utf-8") == expected
+        assert (out / "_pymdtools_assets" / "jasonm23-swiss" / "style.css").is_file()
+
+        mdtopdf.convert_md_to_html(source, path_dest=out, converter="markdown")
+        mdtopdf.convert_md_to_html(source, path_dest=out, converter="unknown")
+
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert _misses(caplog) == ["no previous build", "converter changed"]
+
+
+def test_build_cache_does_not_cache_the_html_stage_of_a_pdf(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, renders: list[str]
+) -> None:
+    source = tmp_path / "doc.md"
+    source.write_text("# Doc\n", encoding="utf-8")
+
+    def fake_convert_html_to_pdf(filename: Path, title: str | None = None) -> Path:
+        pdf = Path(filename).with_suffix(".pdf")
+        pdf.write_bytes(_pdf_bytes())
+        return pdf
+
+    monkeypatch.setattr(mdtopdf, "convert_html_to_pdf", fake_convert_html_to_pdf)
+
+    with BuildCache(tmp_path / "cache") as cache:
+        mdtopdf.convert_md_to_pdf(source)
+        mdtopdf.convert_md_to_pdf(source)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert [p.suffix for p in (tmp_path / "cache" / "objects").rglob("*.*")] == [".pdf"]
+    assert len(list((tmp_path / "cache" / "sources").iterdir())) == 1
+
+
+def test_build_cache_evicts_least_recently_used_entries(
+    tmp_path: Path, renders: list[str]
+) -> None:
+    sources = []
+    for index in range(3):
+        source = tmp_path / f"f{index}.md"
+        source.write_text(f"# Page {index}\n", encoding="utf-8")
+        sources.append(source)
+    size = len(_pdf_bytes())
+
+    with BuildCache(tmp_path / "cache", max_bytes=5 * size // 2) as cache:
+        for source in sources[:2]:
+            mdtopdf.convert_md_to_pdf(source, streaming=True)
+        entries = {
+            source.stem: entry
+            for entry in (tmp_path / "cache" / "objects").rglob("*.pdf")
+            for source in sources[:2]
+            if entry.stat().st_ino == source.with_suffix(".pdf").stat().st_ino
+        }
+        os.utime(entries["f0"], (1000, 1000))
+        os.utime(entries["f1"], (2000, 2000))
+        # The hit makes f0 the most recently used entry, so f1 is evicted.
+        mdtopdf.convert_md_to_pdf(sources[0], streaming=True)
+        mdtopdf.convert_md_to_pdf(sources[2], streaming=True)
+
+        assert entries["f0"].exists()
+        assert not entries["f1"].exists()
+        assert len(list((tmp_path / "cache" / "objects").rglob("*.pdf"))) == 2
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    with pytest.raises(ValueError, match="max_bytes"):
+        BuildCache(tmp_path / "cache", max_bytes=0)
+
+
+def test_build_cache_only_lists_entries_when_the_limit_is_crossed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, renders: list[str]
+) -> None:
+    walks: list[Path] = []
+    real_walk_files = mdtopdf.common.walk_files
+
+    def counting_walk(root: Path) -> Any:
+        walks.append(root)
+        return real_walk_files(root)
+
+    monkeypatch.setattr(mdtopdf.common, "walk_files", counting_walk)
+    size = len(_pdf_bytes())
+    with BuildCache(tmp_path / "cache", max_bytes=4 * size) as cache:
+        for index in range(6):
+            source = tmp_path / f"f{index}.md"
+            source.write_text(f"# Page {index}\n", encoding="utf-8")
+            mdtopdf.convert_md_to_pdf(source, streaming=True)
+        # Rebuilding an entry in place does not grow the recorded size.
+        cache.store(cache.pdf_key(source, {}), source.with_suffix(".pdf"))
+
+    object_walks = [root for root in walks if root.name == "objects"]
+    # The first store, then the 5th (over 4 entries, evicted down to 3) only.
+    assert len(object_walks) == 2
+    assert len(list((tmp_path / "cache" / "objects").rglob("*.pdf"))) == 4
+    assert cache._size == 4 * size
+
+
+def test_build_caches_must_exit_in_reverse_order(tmp_path: Path) -> None:
+    first = BuildCache(tmp_path / "first").__enter__()
+    second = BuildCache(tmp_path / "second").__enter__()
+
+    with pytest.raises(RuntimeError, match="BuildCache exited out of order"):
+        first.__exit__(None, None, None)
+    second.__exit__(None, None, None)
+    first.__exit__(None, None, None)
+
+    assert mdtopdf._build_caches.get() is None
+
+
+def test_build_cache_copies_without_hard_links_and_survives_races(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    renders: list[str],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    caplog.set_level(logging.INFO)
+    source = tmp_path / "doc.md"
+    source.write_text("# Doc\n", encoding="utf-8")
+    pdf = tmp_path / "doc.pdf"
+
+    def no_link(src: Any, dst: Any) -> None:
+        raise PermissionError(1, "Operation not permitted")
+
+    with BuildCache(tmp_path / "cache") as cache:
+        monkeypatch.setattr(os, "link", no_link)
+        mdtopdf.convert_md_to_pdf(source, streaming=True)
+        mdtopdf.convert_md_to_pdf(source, streaming=True)
+        entry = next((tmp_path / "cache" / "objects").rglob("*.pdf"))
+        assert os.stat(entry).st_ino != os.stat(pdf).st_ino
+        assert entry.read_bytes() == pdf.read_bytes()
+
+        def evicted_meanwhile(src: Any, dst: Any) -> None:
+            if Path(src).is_relative_to(tmp_path / "cache"):
+                Path(src).unlink()
+                raise FileNotFoundError(src)
+            no_link(src, dst)
+
+        monkeypatch.setattr(os, "link", evicted_meanwhile)
+        mdtopdf.convert_md_to_pdf(source, streaming=True)
+
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert _misses(caplog) == ["no previous build", "entry evicted"]
+    assert len(renders) == 2
+    assert not [p for p in tmp_path.iterdir() if p.name.startswith(".")]
+
+
+def test_build_cache_miss_reasons_and_stacking(tmp_path: Path) -> None:
+    output = tmp_path / "doc.pdf"
+    parts = {"markdown": "a", "versions": "1"}
+
+    with BuildCache(tmp_path / "outer") as outer, BuildCache(tmp_path / "inner") as inner:
+        assert mdtopdf._build_caches.get() is inner
+        assert inner._miss_reason(parts, output) == "no previous build"
+        index = inner._index(output)
+        index.parent.mkdir(parents=True)
+        index.write_text("[]", encoding="utf-8")
+        assert inner._miss_reason(parts, output) == "no previous build"
+        inner._record({"markdown": "b", "versions": "2"}, output)
+        assert inner._miss_reason(parts, output) == "markdown, versions changed"
+        # Files still being staged are not counted as entries.
+        staged = tmp_path / "inner" / "objects" / "ab" / ".staged.tmp"
+        staged.parent.mkdir(parents=True)
+        staged.write_bytes(b"x" * 10)
+        inner.max_bytes = 1
+        inner._evict(keep=staged)
+        assert staged.exists()
+        assert inner._size == 0
+        assert mdtopdf._build_caches.get() is inner
+
+    assert mdtopdf._build_caches.get() is None
+    assert (outer.hits, outer.misses) == (0, 0)
+
+
+def test_features_digest_ignores_option_order_and_the_overlay_folder(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    for folder in ("a", "b"):
+        (tmp_path / folder / "bg.pdf").write_bytes(_pdf_bytes())
+
+    first = mdtopdf._features_digest(
+        {"metadata": {"a": 1, "b": 2}, "path": tmp_path / "a", "background_pdf": "bg.pdf"}
+    )
+    second = mdtopdf._features_digest(
+        {"background_pdf": "bg.pdf", "path": tmp_path / "b", "metadata": {"b": 2, "a": 1}}
+    )
+
+    assert first == second
+    assert mdtopdf._features_digest({"metadata": {"a": 2}}) != mdtopdf._features_digest(
+        {"metadata": {"a": 1}}
+    )
+
+
+def test_wkhtmltopdf_version_reads_the_banner(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    executable = tmp_path / "wkhtmltopdf"
+    executable.write_text("#!/bin/sh\necho 'wkhtmltopdf 0.12.6'\n", encoding="utf-8")
+    executable.chmod(0o755)
+    silent = tmp_path / "silent"
+    silent.write_text("#!/bin/sh\n", encoding="utf-8")
+    silent.chmod(0o755)
+
+    monkeypatch.setattr(mdtopdf, "find_wk_html_to_pdf", lambda: executable)
+    assert mdtopdf._wkhtmltopdf_version() == "wkhtmltopdf 0.12.6"
+    monkeypatch.setattr(mdtopdf, "find_wk_html_to_pdf", lambda: silent)
+    assert mdtopdf._wkhtmltopdf_version() == f"{silent} unknown version"
+
+    def missing() -> Path:
+        raise FileNotFoundError("wkhtmltopdf")
+
+    monkeypatch.setattr(mdtopdf, "find_wk_html_to_pdf", missing)
+    assert mdtopdf._wkhtmltopdf_version() == "wkhtmltopdf missing"
+
+
+def test_build_cache_handles_layouts_without_assets(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    layout = tmp_path / "layouts" / "plain"
+    layout.mkdir(parents=True)
+    (layout / "page.html").write_text("<h1>{{title}}</h1>{{~> content}}", encoding="utf-8")
+    monkeypatch.setattr(mdtopdf, "_get_layout_page", lambda name: layout / "page.html")
+    source = tmp_path / "page.md"
+    source.write_text("# Page\n", encoding="utf-8")
+
+    with BuildCache(tmp_path / "cache") as cache:
+        for _ in range(2):
+            html = mdtopdf.convert_md_to_html(source, layout="plain")
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert html.read_text(encoding="utf-8").startswith("<h1>Page</h1>")
+    assert not (tmp_path / "_pymdtools_assets").exists()
+
+
+def test_build_cache_eviction_skips_vanished_and_kept_entries(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    cache = BuildCache(tmp_path / "cache", max_bytes=1)
+    objects = tmp_path / "cache" / "objects" / "ab"
+    objects.mkdir(parents=True)
+    kept = objects / "kept.pdf"
+    newer = objects / "newer.pdf"
+    for age, entry in enumerate((kept, newer)):
+        entry.write_bytes(b"x" * 10)
+        os.utime(entry, (1000 + age, 1000 + age))
+    real_walk_files = mdtopdf.common.walk_files
+
+    def walk_with_a_vanished_entry(root: Path) -> Any:
+        yield objects / "vanished.pdf"
+        yield from real_walk_files(root)
+
+    monkeypatch.setattr(mdtopdf.common, "walk_files", walk_with_a_vanished_entry)
+    cache._evict(keep=kept)
+
+    assert kept.exists()
+    assert not newer.exists()
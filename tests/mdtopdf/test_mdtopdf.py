@@ -31,6 +31,32 @@ def _page_count(path: Path) -> int:
         return len(PdfReader(stream).pages)
 
 
+def _supports_symlinks(tmp_path: Path) -> bool:
+    """
+    Detect whether the current environment supports creating symlinks.
+
+    On Windows this may require admin rights or Developer Mode.
+    """
+    target = tmp_path / "target.txt"
+    link = tmp_path / "link.txt"
+    target.write_text("x", encoding="utf-8")
+
+    try:
+        link.symlink_to(target)
+        ok = link.is_symlink()
+    except (OSError, NotImplementedError):
+        ok = False
+    finally:
+        try:
+            if link.exists() or link.is_symlink():
+                link.unlink()
+        except OSError:
+            pass
+        target.unlink()
+
+    return ok
+
+
 def test_check_odd_pages_adds_blank_page_to_odd_pdf(tmp_path: Path) -> None:
     pdf = _write_pdf(tmp_path / "odd.pdf", pages=1)
 
@@ -954,6 +980,38 @@ def test_copy_layout_assets_rejects_existing_directory_or_different_content(
     assert mdtopdf._copy_layout_assets(layout, tmp_path).name == "layout"
 
 
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires os.mkfifo")
+def test_copy_layout_assets_skips_linked_folders_and_rejects_special_files(
+    tmp_path: Path,
+) -> None:
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    layout = tmp_path / "layout"
+    assets = layout / "assets"
+    (assets / "img").mkdir(parents=True)
+    (assets / "img" / "logo.svg").write_text("<svg/>", encoding="utf-8")
+    (assets / "a.css").write_text("a", encoding="utf-8")
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "x.css").write_text("x", encoding="utf-8")
+    (assets / "shared").symlink_to(tmp_path / "shared", target_is_directory=True)
+    out = tmp_path / "out"
+    out.mkdir()
+
+    namespace = mdtopdf._copy_layout_assets(layout, out)
+
+    copied = sorted(
+        path.relative_to(out / namespace).as_posix()
+        for path in (out / namespace).rglob("*")
+        if path.is_file()
+    )
+    assert copied == ["a.css", "img/logo.svg"]
+
+    os.mkfifo(assets / "pipe")
+    with pytest.raises(ValueError, match="not a regular file"):
+        mdtopdf._copy_layout_assets(layout, out)
+
+
 def test_replace_layout_placeholders_rejects_source_escape_and_missing_namespace(
     monkeypatch: Any,
     tmp_path: Path,
@@ -1001,3 +1059,433 @@ def test_replace_layout_placeholders_rejects_source_escape_and_missing_namespace
             layout_path=layout,
             path_dest=tmp_path,
         )
+
+
+def _fake_batch_pipeline(
+    monkeypatch: Any, tmp_path: Path, *, slow: float = 0.0
+) -> dict[str, Any]:
+    import tempfile
+    import threading
+    import time
+
+    work = tmp_path / "work"
+    work.mkdir()
+    state: dict[str, Any] = {"work": work, "running": 0, "peak": 0, "features": []}
+    lock = threading.Lock()
+
+    def fake_convert_md_to_html(filename: Path, converter: str) -> Path:
+        if not Path(filename).read_text(encoding="utf-8"):
+            raise ValueError(f"The filename {filename} seems empty")
+        html = Path(filename).with_suffix(".html")
+        html.write_text("<h1>Title</h1>", encoding="utf-8")
+        return html
+
+    def fake_convert_html_to_pdf(filename: Path, title: str | None = None) -> Path:
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.05 if slow == 0 or Path(filename).stem == "f0" else slow)
+        with lock:
+            state["running"] -= 1
+        return _write_pdf(Path(filename).with_suffix(".pdf"), pages=1)
+
+    def fake_pdf_features(filename: Path, filename_ext: str = ".pdf", **kwargs: Any) -> Path:
+        state["features"].append((Path(filename).name, kwargs.get("option")))
+        return filename
+
+    monkeypatch.setattr(
+        mdtopdf.common, "make_temp_dir", lambda: Path(tempfile.mkdtemp(dir=work))
+    )
+    monkeypatch.setattr(mdtopdf, "convert_md_to_html", fake_convert_md_to_html)
+    monkeypatch.setattr(mdtopdf, "convert_html_to_pdf", fake_convert_html_to_pdf)
+    monkeypatch.setattr(mdtopdf, "pdf_features", fake_pdf_features)
+    return state
+
+
+def test_convert_many_md_to_pdf_streams_results_and_bounds_wkhtmltopdf(
+    monkeypatch: Any, tmp_path: Path
+) -> None:
+    state = _fake_batch_pipeline(monkeypatch, tmp_path)
+    sources = []
+    for index in range(6):
+        source = tmp_path / f"f{index}.md"
+        source.write_text("" if index == 3 else f"# Page {index}\n", encoding="utf-8")
+        sources.append(source)
+
+    items = list(
+        mdtopdf.convert_many_md_to_pdf(
+            (str(path) for path in sources),
+            max_workers=4,
+            max_wkhtmltopdf=2,
+            option="value",
+        )
+    )
+
+    summary = items[-1]
+    assert summary == mdtopdf.common.ApplyResult(
+        processed=6, succeeded=5, failed=1, skipped=0
+    )
+    outcomes = dict(items[:-1])  # type: ignore[arg-type]
+    assert sorted(outcomes) == sources
+    assert isinstance(outcomes[sources[3]], ValueError)
+    assert outcomes[sources[0]] == tmp_path / "f0.pdf"
+    assert (tmp_path / "f5.pdf").is_file()
+    assert state["peak"] == 2
+    assert {option for _, option in state["features"]} == {"value"}
+    assert list(state["work"].iterdir()) == []
+
+
+def test_convert_many_md_to_pdf_cleans_up_when_closed_early(
+    monkeypatch: Any, tmp_path: Path
+) -> None:
+    state = _fake_batch_pipeline(monkeypatch, tmp_path, slow=0.3)
+    sources = []
+    for index in range(10):
+        source = tmp_path / f"f{index}.md"
+        source.write_text(f"# Page {index}\n", encoding="utf-8")
+        sources.append(source)
+
+    stream = mdtopdf.convert_many_md_to_pdf(sources, max_workers=2, max_wkhtmltopdf=2)
+    assert next(stream) == (sources[0], tmp_path / "f0.pdf")
+    stream.close()
+
+    # The running conversion stopped before post-processing and cleaned up.
+    assert state["features"] == [("f0.pdf", None)]
+    assert list(state["work"].iterdir()) == []
+    assert sorted(p.name for p in tmp_path.glob("*.pdf")) == ["f0.pdf"]
+
+
+def test_convert_many_md_to_pdf_validates_limits(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="max_workers"):
+        next(mdtopdf.convert_many_md_to_pdf([], max_workers=0))
+    with pytest.raises(ValueError, match="max_wkhtmltopdf"):
+        next(mdtopdf.convert_many_md_to_pdf([], max_wkhtmltopdf=0))
+    with pytest.raises(ValueError, match="executor"):
+        next(mdtopdf.convert_many_md_to_pdf([], executor="fork"))
+    with pytest.raises(ValueError, match="requires streaming"):
+        next(mdtopdf.convert_many_md_to_pdf([], executor="process"))
+    assert list(mdtopdf.convert_many_md_to_pdf([])) == [
+        mdtopdf.common.ApplyResult(processed=0, succeeded=0, failed=0, skipped=0)
+    ]
+
+
+def test_compile_layout_splits_literals_and_slots() -> None:
+    compiled = mdtopdf._compile_layout(
+        "<t>{{title}}</t>{{~> toc}}{{author}}{{~> content}}{{ asset 'a.css' }}!"
+    )
+
+    slot = mdtopdf._LayoutSlot
+    assert compiled.segments == (
+        "<t>",
+        slot("title", "", "{{title}}"),
+        "</t>",
+        slot("var", "author", "{{author}}"),
+        slot("content", "", "{{~> content}}"),
+        slot("asset", "a.css", "{{ asset 'a.css' }}"),
+        "!",
+    )
+    assert compiled.has_assets
+    assert mdtopdf._compile_layout("{{title}}").segments == (
+        slot("title", "", "{{title}}"),
+    )
+
+
+def test_replace_layout_placeholders_does_not_expand_substituted_text(
+    tmp_path: Path,
+) -> None:
+    html = mdtopdf._replace_layout_placeholders(
+        "{{~> content}}|{{author}}|{{title}}",
+        title="{{author}}",
+        content="<code>{{title}} {{author}}</code>",
+        content_vars={"author": "Ada"},
+        layout_path=tmp_path,
+        path_dest=tmp_path,
+    )
+
+    assert html == "<code>{{title}} {{author}}</code>|Ada|{{author}}"
+
+
+def test_load_layout_caches_until_page_html_changes(
+    monkeypatch: Any, tmp_path: Path
+) -> None:
+    page = tmp_path / "page.html"
+    page.write_text("<h1>{{title}}</h1>", encoding="utf-8")
+    reads: list[Path] = []
+    real_get = mdtopdf.common.get_file_content
+
+    def spy(path: Any, *args: Any, **kwargs: Any) -> str:
+        reads.append(Path(path))
+        return real_get(path, *args, **kwargs)
+
+    monkeypatch.setattr(mdtopdf.common, "get_file_content", spy)
+
+    first = mdtopdf._load_layout(page)
+    assert mdtopdf._load_layout(page) is first
+    assert reads == [page]
+
+    page.write_text("<h2>{{title}}</h2>", encoding="utf-8")
+    os.utime(page, ns=(1, 1))
+    assert mdtopdf._load_layout(page).segments[0] == "<h2>"
+    assert reads == [page, page]
+
+
+def test_convert_md_to_html_reads_the_layout_once(
+    monkeypatch: Any, tmp_path: Path
+) -> None:
+    page = mdtopdf._get_layout_page("jasonm23-swiss")
+    mdtopdf._load_layout(page)
+    calls: list[Path] = []
+    real_get = mdtopdf.common.get_file_content
+
+    def spy(path: Any, *args: Any, **kwargs: Any) -> str:
+        calls.append(Path(path))
+        return real_get(path, *args, **kwargs)
+
+    monkeypatch.setattr(mdtopdf.common, "get_file_content", spy)
+    for index in range(2):
+        source = tmp_path / f"s{index}.md"
+        source.write_text(f"# T{index}\n", encoding="utf-8")
+        assert "<title>T" in mdtopdf.convert_md_to_html(source).read_text(encoding="utf-8")
+
+    assert page not in calls
+
+
+def test_asset_publisher_publishes_each_namespace_once(
+    monkeypatch: Any, tmp_path: Path
+) -> None:
+    import hashlib
+
+    calls: list[Path] = []
+    real_copy = mdtopdf._copy_layout_assets
+
+    def spy(layout_path: Path, path_dest: Path, manifest: Any = None) -> Path:
+        calls.append(path_dest)
+        return real_copy(layout_path, path_dest, manifest)
+
+    monkeypatch.setattr(mdtopdf, "_copy_layout_assets", spy)
+    out = tmp_path / "out"
+    other = tmp_path / "other"
+    out.mkdir()
+    other.mkdir()
+    layout = mdtopdf._get_layout_page("jasonm23-swiss").parent
+
+    with mdtopdf.AssetPublisher() as publisher:
+        for index in range(3):
+            source = tmp_path / f"s{index}.md"
+            source.write_text(f"# T{index}\n", encoding="utf-8")
+            mdtopdf.convert_md_to_html(source, path_dest=out)
+        mdtopdf.convert_md_to_html(tmp_path / "s0.md", path_dest=other)
+
+    assert calls == [out.resolve(), other.resolve()]
+    assert (publisher.hits, publisher.misses) == (2, 2)
+    manifest = publisher.manifest(layout, out)
+    assert manifest is not None
+    style = next(entry for entry in manifest if entry[0] == "style.css")
+    data = (layout / "assets" / "style.css").read_bytes()
+    assert style == ("style.css", len(data), hashlib.sha256(data).hexdigest())
+    assert [entry[0] for entry in manifest] == sorted(
+        p.relative_to(layout / "assets").as_posix()
+        for p in (layout / "assets").rglob("*")
+        if p.is_file()
+    )
+    assert publisher.manifest(layout, tmp_path) is None
+
+    mdtopdf.convert_md_to_html(tmp_path / "s1.md", path_dest=out)
+    assert len(calls) == 3
+
+
+def test_asset_publisher_rechecks_a_replaced_namespace(tmp_path: Path) -> None:
+    import shutil
+
+    if not _supports_symlinks(tmp_path):
+        pytest.skip("Symlinks not supported in this environment.")
+
+    source = tmp_path / "s.md"
+    source.write_text("# T\n", encoding="utf-8")
+    namespace = tmp_path / "_pymdtools_assets" / "jasonm23-swiss"
+    elsewhere = tmp_path / "elsewhere"
+
+    with mdtopdf.AssetPublisher() as outer, mdtopdf.AssetPublisher() as publisher:
+        mdtopdf.convert_md_to_html(source)
+        shutil.move(namespace, elsewhere)
+        namespace.symlink_to(elsewhere, target_is_directory=True)
+        with pytest.raises(ValueError, match="must not be a symlink"):
+            mdtopdf.convert_md_to_html(source)
+
+        namespace.unlink()
+        mdtopdf.convert_md_to_html(source)
+        assert (namespace / "style.css").is_file()
+
+    assert (publisher.hits, publisher.misses) == (0, 2)
+    assert (outer.hits, outer.misses) == (0, 0)
+    assert mdtopdf._asset_publishers.get() is None
+
+
+def test_asset_publishers_must_exit_in_reverse_order() -> None:
+    first = mdtopdf.AssetPublisher().__enter__()
+    second = mdtopdf.AssetPublisher().__enter__()
+
+    with pytest.raises(RuntimeError, match="AssetPublisher exited out of order"):
+        first.__exit__(None, None, None)
+    second.__exit__(None, None, None)
+    first.__exit__(None, None, None)
+
+    assert mdtopdf._asset_publishers.get() is None
+
+
+def test_copy_layout_assets_rejects_a_different_file_of_another_size(
+    tmp_path: Path,
+) -> None:
+    layout = mdtopdf._get_layout_page("jasonm23-swiss").parent
+    mdtopdf._copy_layout_assets(layout, tmp_path)
+    style = tmp_path / "_pymdtools_assets" / "jasonm23-swiss" / "style.css"
+    style.write_text("short", encoding="utf-8")
+
+    with pytest.raises(FileExistsError, match="overwrite"):
+        mdtopdf._copy_layout_assets(layout, tmp_path)
+
+
+def _fake_pdfkit_pipe(
+    monkeypatch: Any, tmp_path: Path, *, output: bytes | None = None
+) -> dict[str, Any]:
+    import io
+
+    calls: dict[str, Any] = {}
+
+    def fake_from_string(
+        html: str, output_path: Any, options: Any = None, configuration: Any = None
+    ) -> bytes:
+        calls["html"] = html
+        calls["output_path"] = output_path
+        calls["options"] = options
+        if output is not None:
+            return output
+        writer = PdfWriter()
+        writer.add_blank_page(width=72, height=72)
+        stream = io.BytesIO()
+        writer.write(stream)
+        return stream.getvalue()
+
+    def no_temp_dir() -> Path:
+        raise AssertionError("the streaming pipeline must not use a temp dir")
+
+    monkeypatch.setattr(mdtopdf, "find_wk_html_to_pdf", lambda: tmp_path / "wk")
+    monkeypatch.setattr(mdtopdf.pdfkit, "configuration", lambda wkhtmltopdf: object())
+    monkeypatch.setattr(mdtopdf.pdfkit, "from_string", fake_from_string)
+    monkeypatch.setattr(mdtopdf.common, "make_temp_dir", no_temp_dir)
+    return calls
+
+
+def test_convert_md_to_pdf_streaming_keeps_intermediates_in_memory(
+    monkeypatch: Any,
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "source.md"
+    source.write_text('<!-- var(page:title)="Page Title" -->\n# Title\n', encoding="utf-8")
+    _write_pdf(tmp_path / "watermark.pdf", pages=1)
+    calls = _fake_pdfkit_pipe(monkeypatch, tmp_path)
+
+    out = mdtopdf.convert_md_to_pdf(
+        source,
+        streaming=True,
+        path=tmp_path,
+        metadata={"author": "Ada"},
+        watermark_pdf="watermark.pdf",
+    )
+
+    layout = mdtopdf._get_layout_page(mdtopdf.DEFAULT_LAYOUT).parent.resolve()
+    assert out == tmp_path / "source.pdf"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "source.md", "source.pdf", "watermark.pdf",
+    ]
+    assert calls["output_path"] is False
+    assert calls["options"]["allow"] == str(layout)
+    assert calls["options"]["header-center"] == "Page Title"
+    assert (layout / "assets" / "style.css").as_uri() in calls["html"]
+    with out.open("rb") as stream:
+        reader = PdfReader(stream)
+        assert len(reader.pages) == 1
+        assert reader.metadata["/Author"] == "Ada"
+
+
+def test_convert_md_to_pdf_streaming_rejects_invalid_output(
+    monkeypatch: Any,
+    tmp_path: Path,
+) -> None:
+    source = tmp_path / "doc.md"
+    source.write_text("# Doc\n", encoding="utf-8")
+    target = _write_pdf(tmp_path / "doc.pdf", pages=2)
+
+    for output, error, match in (
+        (b"", RuntimeError, "invalid PDF output: doc.pdf"),
+        (b"not a pdf", RuntimeError, "invalid PDF output: doc.pdf"),
+        ((tmp_path / "doc.pdf").read_bytes(), None, None),
+    ):
+        _fake_pdfkit_pipe(monkeypatch, tmp_path, output=output)
+        if error is None:
+            assert mdtopdf.convert_md_to_pdf(source, streaming=True) == target
+            continue
+        with pytest.raises(error, match=match):
+            mdtopdf.convert_md_to_pdf(source, streaming=True)
+        assert _page_count(target) == 2
+
+    empty = _write_pdf(tmp_path / "empty.pdf", pages=0).read_bytes()
+    _fake_pdfkit_pipe(monkeypatch, tmp_path, output=empty)
+    with pytest.raises(ValueError, match="at least one page"):
+        mdtopdf.convert_md_to_pdf(source, streaming=True)
+
+
+def test_convert_many_md_to_pdf_streaming(monkeypatch: Any, tmp_path: Path) -> None:
+    sources = []
+    for index in range(3):
+        source = tmp_path / f"f{index}.md"
+        source.write_text(f"# Page {index}\n", encoding="utf-8")
+        sources.append(source)
+    _fake_pdfkit_pipe(monkeypatch, tmp_path)
+
+    items = list(
+        mdtopdf.convert_many_md_to_pdf(
+            sources, max_workers=2, max_wkhtmltopdf=1, streaming=True
+        )
+    )
+
+    assert items[-1] == mdtopdf.common.ApplyResult(
+        processed=3, succeeded=3, failed=0, skipped=0
+    )
+    assert all(_page_count(path.with_suffix(".pdf")) == 1 for path in sources)
+
+
+def test_convert_many_md_to_pdf_renders_in_worker_processes(
+    monkeypatch: Any, tmp_path: Path
+) -> None:
+    sources = []
+    for index in range(3):
+        source = tmp_path / f"f{index}.md"
+        source.write_text(f"# Page {index}\n", encoding="utf-8")
+        sources.append(source)
+    (tmp_path / "empty.md").write_text("", encoding="utf-8")
+    calls = _fake_pdfkit_pipe(monkeypatch, tmp_path)
+
+    items = list(
+        mdtopdf.convert_many_md_to_pdf(
+            [*sources, tmp_path / "empty.md"],
+            max_workers=2,
+            max_wkhtmltopdf=1,
+            streaming=True,
+            executor="process",
+            metadata={"author": "Ada"},
+        )
+    )
+
+    assert items[-1] == mdtopdf.common.ApplyResult(
+        processed=4, succeeded=3, failed=1, skipped=0
+    )
+    outcomes = dict(items[:-1])  # type: ignore[arg-type]
+    assert isinstance(outcomes[tmp_path / "empty.md"], ValueError)
+    assert "seems empty" in str(outcomes[tmp_path / "empty.md"])
+    assert "Page" in calls["html"]
+    for path in sources:
+        with path.with_suffix(".pdf").open("rb") as stream:
+            reader = PdfReader(stream)
+            assert len(reader.pages) == 1
+            assert reader.metadata["/Author"] == "Ada"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import pytest
@@ -68,3 +69,24 @@ def test_md_file_beautifier_rejects_unexpected_extension(tmp_path: Path) -> None
 
     with pytest.raises(ValueError, match="Unexpected file extension"):
         normalize.md_file_beautifier(source, backup_option=False)
+
+
+def test_md_file_beautifier_skips_normalized_files(tmp_path: Path) -> None:
+    source = tmp_path / "doc.md"
+    source.write_text("# Title\n\nBody", encoding="utf-8")
+    os.utime(source, ns=(1, 1))
+
+    assert not normalize.md_file_beautifier(
+        source, skip_if_unchanged=True, return_changed=True
+    )
+
+    assert source.stat().st_mtime_ns == 1
+    assert list(tmp_path.iterdir()) == [source]
+
+    source.write_text("# Title\n\nBody\n\n", encoding="utf-8")
+    assert normalize.md_file_beautifier(
+        source, skip_if_unchanged=True, return_changed=True
+    )
+
+    assert source.read_text(encoding="utf-8") == "# Title\n\nBody"
+    assert len(list(tmp_path.glob("doc.md.*.bak"))) == 1